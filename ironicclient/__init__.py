@@ -15,16 +15,32 @@
 
 from __future__ import annotations
 
-import importlib.metadata
+import importlib
+from typing import Any
 
-from ironicclient import client
 from ironicclient import exc as exceptions
 
 
-__version__ = importlib.metadata.version("python-ironicclient")
-
 __all__: tuple[str, ...] = (
     'client',
     'exc',
     'exceptions',
 )
+
+
+def __getattr__(name: str) -> Any:
+    # NOTE: the client (with its dependencies) and the package metadata are
+    # loaded on first access to keep importing ironicclient modules cheap.
+    if name == '__version__':
+        from importlib import metadata
+
+        version = metadata.version("python-ironicclient")
+        globals()['__version__'] = version
+        return version
+    if name == 'client':
+        return importlib.import_module('ironicclient.client')
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -12,6 +12,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 import logging
 import types
 from typing import Any, cast
@@ -20,6 +21,7 @@ from keystoneauth1 import session as ks_session
 from openstack import config
 from oslo_utils import importutils
 
+from ironicclient.common import hooks as hooks_module
 from ironicclient.common.i18n import _
 from ironicclient import exc
 from ironicclient.v1 import client as v1_client
@@ -40,6 +42,7 @@ def get_client(
     region_name: str | None = None,
     additional_headers: dict[str, str] | None = None,
     global_request_id: str | None = None,
+    hooks: Iterable[hooks_module.RequestHook] | None = None,
     **kwargs: Any,
 ) -> v1_client.Client:
     """Get an authenticated client, based on the credentials.
@@ -63,6 +66,9 @@ def get_client(
         specified per request will take priority.
     :param global_request_id: A header (in the form of ``req-$uuid``) that will
         be passed on all requests. Enables cross project request id tracking.
+    :param hooks: Instrumentation hooks (see
+        :class:`ironicclient.common.hooks.RequestHook`) called for every
+        request of the client.
     :param kwargs: all the other params that are passed to keystoneauth for
         session construction.
     """
@@ -126,6 +132,7 @@ def get_client(
         max_retries=max_retries,
         retry_interval=retry_interval,
         interface=interface,
+        hooks=hooks,
     )
 
 
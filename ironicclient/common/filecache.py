@@ -19,11 +19,14 @@ from __future__ import annotations
 import dbm
 import logging
 import os
-from typing import cast
+from typing import cast, TYPE_CHECKING
 
-import dogpile.cache
+from oslo_utils import strutils
 import platformdirs
 
+if TYPE_CHECKING:
+    import dogpile.cache
+
 
 LOG = logging.getLogger(__name__)
 
@@ -36,30 +39,40 @@ CACHE_EXPIRY_ENV_VAR: str = 'IRONICCLIENT_CACHE_EXPIRY'  # environment variable
 CACHE_FILENAME: str = os.path.join(CACHE_DIR, 'ironic-api-version.dbm')
 DEFAULT_EXPIRY: int = 300  # seconds
 
+AUTH_CACHE: dogpile.cache.CacheRegion | None = None
+AUTH_CACHE_ENV_VAR: str = 'IRONICCLIENT_AUTH_CACHE'  # environment variable
+AUTH_CACHE_FILENAME: str = os.path.join(CACHE_DIR, 'ironic-auth.dbm')
+
+
+def get_expiry() -> int:
+    """Get the cache expiry, which may be specified in an env var."""
+    expiry_time = os.environ.get(CACHE_EXPIRY_ENV_VAR, DEFAULT_EXPIRY)
+    try:
+        return int(expiry_time)
+    except ValueError:
+        LOG.warning("Environment variable %(env_var)s should be an "
+                    "integer (not '%(curr_val)s'). Using default "
+                    "expiry of %(default)s seconds instead.",
+                    {'env_var': CACHE_EXPIRY_ENV_VAR,
+                     'curr_val': expiry_time,
+                     'default': DEFAULT_EXPIRY})
+        return DEFAULT_EXPIRY
+
 
 def _get_cache() -> dogpile.cache.CacheRegion:
     """Configure file caching."""
     global CACHE
     if CACHE is None:
+        # NOTE: dogpile is only imported when the cache is used, which most
+        # CLI invocations do not need.
+        import dogpile.cache
 
         # Ensure cache directory present; exist_ok tolerates a concurrent
         # create by another client process.
         if not os.path.exists(CACHE_DIR):
             os.makedirs(CACHE_DIR, exist_ok=True)
 
-        # Use the cache expiry if specified in an env var
-        expiry_time = os.environ.get(CACHE_EXPIRY_ENV_VAR, DEFAULT_EXPIRY)
-        try:
-            expiry_time = int(expiry_time)
-        except ValueError:
-            LOG.warning("Environment variable %(env_var)s should be an "
-                        "integer (not '%(curr_val)s'). Using default "
-                        "expiry of %(default)s seconds instead.",
-                        {'env_var': CACHE_EXPIRY_ENV_VAR,
-                         'curr_val': expiry_time,
-                         'default': DEFAULT_EXPIRY})
-            expiry_time = DEFAULT_EXPIRY
-
+        expiry_time = get_expiry()
         CACHE = dogpile.cache.make_region(key_mangler=str).configure(
             'dogpile.cache.dbm',
             expiration_time=expiry_time,
@@ -75,6 +88,11 @@ def _build_key(host: str, port: str | int) -> str:
     return "%s:%s" % (host, port)
 
 
+def _build_range_key(host: str, port: str | int) -> str:
+    """Build a key for the API version range of a host."""
+    return "%s:range" % _build_key(host, port)
+
+
 def save_data(host: str, port: str | int, data: str) -> None:
     """Save 'data' for a particular 'host' in the appropriate cache dir.
 
@@ -114,6 +132,122 @@ def retrieve_data(
                   '%(error)s', {'cache': CACHE_FILENAME, 'error': e})
         return None
 
+    import dogpile.cache
+
+    if data == dogpile.cache.api.NO_VALUE:
+        return None
+    return cast(str, data)
+
+
+def save_version_range(
+    host: str, port: str | int, min_version: str, max_version: str
+) -> None:
+    """Save the API version range supported by an ironic 'host'.
+
+    param host: The host that we need to save data for
+    param port: The port on the host that we need to save data for
+    param min_version: The minimum API version supported by the server
+    param max_version: The maximum API version supported by the server
+    """
+    key = _build_range_key(host, port)
+    try:
+        _get_cache().set(key, (min_version, max_version))
+    except dbm.error as e:
+        LOG.debug('Could not write API version range to cache file '
+                  '%(cache)s: %(error)s',
+                  {'cache': CACHE_FILENAME, 'error': e})
+
+
+def retrieve_version_range(
+    host: str, port: str | int, expiry: int | None = None
+) -> tuple[str, str] | None:
+    """Retrieve the API version range of an ironic 'host', if not stale.
+
+    param host: The host that we need to retrieve data for
+    param port: The port on the host that we need to retrieve data for
+    param expiry: The age in seconds before cached data is deemed invalid
+    returns: A tuple (minimum version, maximum version) or None.
+    """
+    if not os.path.isfile(CACHE_FILENAME):
+        return None
+
+    key = _build_range_key(host, port)
+    try:
+        data = _get_cache().get(key, expiration_time=expiry)
+    except dbm.error as e:
+        LOG.debug('Could not read API version range from cache file '
+                  '%(cache)s: %(error)s',
+                  {'cache': CACHE_FILENAME, 'error': e})
+        return None
+
+    import dogpile.cache
+
+    if data == dogpile.cache.api.NO_VALUE:
+        return None
+    min_version, max_version = data
+    return min_version, max_version
+
+
+def auth_cache_enabled() -> bool:
+    """Whether caching of endpoints and authentication state is enabled."""
+    return strutils.bool_from_string(os.environ.get(AUTH_CACHE_ENV_VAR))
+
+
+def _get_auth_cache() -> dogpile.cache.CacheRegion:
+    """Configure file caching of endpoints and authentication state."""
+    global AUTH_CACHE
+    if AUTH_CACHE is None:
+        import dogpile.cache
+
+        # NOTE: the cache contains tokens, only the current user may read it.
+        umask = os.umask(0o077)
+        try:
+            if not os.path.exists(CACHE_DIR):
+                os.makedirs(CACHE_DIR, exist_ok=True)
+            # Tokens carry their own expiry, the endpoints are retrieved
+            # with an explicit expiration time.
+            AUTH_CACHE = dogpile.cache.make_region(key_mangler=str).configure(
+                'dogpile.cache.dbm',
+                arguments={
+                    "filename": AUTH_CACHE_FILENAME,
+                }
+            )
+        finally:
+            os.umask(umask)
+    return AUTH_CACHE
+
+
+def save_auth_data(key: str, data: str) -> None:
+    """Save an endpoint or an authentication state in the auth cache.
+
+    param key: The key to save data for
+    param data: The data we want saved
+    """
+    try:
+        _get_auth_cache().set(key, data)
+    except dbm.error as e:
+        LOG.debug('Could not write to cache file %(cache)s: %(error)s',
+                  {'cache': AUTH_CACHE_FILENAME, 'error': e})
+
+
+def retrieve_auth_data(key: str, expiry: int | None = None) -> str | None:
+    """Retrieve an endpoint or an authentication state from the auth cache.
+
+    param key: The key that we need to retrieve data for
+    param expiry: The age in seconds before cached data is deemed invalid
+    """
+    if not os.path.isfile(AUTH_CACHE_FILENAME):
+        return None
+
+    try:
+        data = _get_auth_cache().get(key, expiration_time=expiry)
+    except dbm.error as e:
+        LOG.debug('Could not read from cache file %(cache)s: %(error)s',
+                  {'cache': AUTH_CACHE_FILENAME, 'error': e})
+        return None
+
+    import dogpile.cache
+
     if data == dogpile.cache.api.NO_VALUE:
         return None
     return cast(str, data)
@@ -0,0 +1,245 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Instrumentation hooks for the requests made by the HTTP client.
+
+Hooks are registered per client, either when creating it::
+
+    collector = hooks.HistogramCollector()
+    ironic = client.get_client(1, ..., hooks=[collector])
+
+or later with ``ironic.http_client.add_hook(collector)``. Nothing is
+measured for clients without hooks.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Sequence
+import threading
+from typing import Any, NamedTuple
+from urllib import parse as urlparse
+
+
+# Path segments followed by the name or UUID of a resource.
+_COLLECTIONS: frozenset[str] = frozenset([
+    'allocations', 'bios', 'chassis', 'conductors', 'connectors',
+    'deploy_templates', 'drivers', 'history', 'inspection_rules', 'nodes',
+    'portgroups', 'ports', 'runbooks', 'targets', 'traits', 'vifs'])
+# Path segments following a collection that are not resource names.
+_NOT_IDENTIFIERS: frozenset[str] = frozenset(['detail'])
+
+# Upper bounds of the latency histogram buckets in seconds.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Request(NamedTuple):
+    """An API request as seen by hooks."""
+
+    method: str
+    url: str
+    # The API version header, None for unversioned requests.
+    api_version: str | None
+    # The size of the request body in bytes.
+    size: int
+
+
+class RequestHook(object):
+    """Base class for request instrumentation hooks.
+
+    Subclasses override the events they are interested in. Hooks are called
+    synchronously, possibly from several threads at once, and must be quick.
+    Exceptions raised by hooks are logged and ignored.
+    """
+
+    def before_request(self, request: Request) -> None:
+        """Called before sending a request.
+
+        :param request: The request.
+        """
+
+    def after_response(
+        self,
+        request: Request,
+        status: int | None,
+        size: int,
+        elapsed: float,
+        error: BaseException | None,
+    ) -> None:
+        """Called after a response is received or the request failed.
+
+        :param request: The request.
+        :param status: The HTTP status code, None if the request failed.
+        :param size: The size of the response body in bytes.
+        :param elapsed: The latency in seconds.
+        :param error: The exception if the request failed without a
+            response, e.g. a connection failure.
+        """
+
+    def on_retry(self, request: Request, attempt: int,
+                 error: Exception) -> None:
+        """Called when a failed request is going to be retried.
+
+        :param request: The request, sent again after the retry interval.
+        :param attempt: The number of the attempt that failed, from 1.
+        :param error: The error that caused the retry.
+        """
+
+    def on_negotiation(self, requested: str | list[str] | None,
+                       negotiated: str, elapsed: float) -> None:
+        """Called after the API version has been negotiated.
+
+        :param requested: The API version requested by the user.
+        :param negotiated: The API version that will be used.
+        :param elapsed: The time taken by the negotiation in seconds.
+        """
+
+
+def endpoint_template(url: str) -> str:
+    """Get the path of a URL without resource names and query strings.
+
+    Used to aggregate measurements, e.g. ``/v1/nodes/<uuid>/states/power``
+    becomes ``/v1/nodes/{id}/states/power``.
+
+    :param url: An absolute or relative URL.
+    :returns: The path with names and UUIDs of resources replaced by
+        ``{id}``.
+    """
+    path = urlparse.urlsplit(url).path
+    segments = path.split('/')
+    for index in range(1, len(segments)):
+        if (segments[index - 1] in _COLLECTIONS and segments[index]
+                and segments[index] not in _NOT_IDENTIFIERS):
+            segments[index] = '{id}'
+    return '/'.join(segments)
+
+
+class Histogram(object):
+    """A latency histogram with fixed buckets.
+
+    :param buckets: Increasing upper bounds of the buckets, the last bucket
+        has no upper bound.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram.
+
+        :param value: The value, e.g. a latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the histogram as a JSON-serializable dictionary.
+
+        :returns: A dictionary with the ``count``, the ``sum`` and the
+            ``buckets`` as a list of ``[upper bound, count]`` pairs (the last
+            upper bound is None).
+        """
+        bounds: list[float | None] = list(self.buckets)
+        bounds.append(None)
+        return {'count': self.count, 'sum': self.sum,
+                'buckets': [[bound, count]
+                            for bound, count in zip(bounds, self.counts)]}
+
+
+class HistogramCollector(RequestHook):
+    """Collects request latencies and counters in memory.
+
+    Measurements are aggregated per HTTP method and endpoint (see
+    :func:`endpoint_template`), use :meth:`snapshot` to scrape them.
+
+    :param buckets: Upper bounds of the latency histogram buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all measurements."""
+        with self._lock:
+            self._requests: dict[tuple[str, str], dict[str, Any]] = {}
+            self._negotiations = Histogram(self.buckets)
+
+    def _get(self, request: Request) -> dict[str, Any]:
+        key = (request.method, endpoint_template(request.url))
+        try:
+            return self._requests[key]
+        except KeyError:
+            stats: dict[str, Any] = {
+                'latency': Histogram(self.buckets), 'statuses': {},
+                'api_versions': {}, 'retries': 0, 'bytes_sent': 0,
+                'bytes_received': 0}
+            self._requests[key] = stats
+            return stats
+
+    def after_response(
+        self,
+        request: Request,
+        status: int | None,
+        size: int,
+        elapsed: float,
+        error: BaseException | None,
+    ) -> None:
+        status_key = str(status) if status is not None else 'error'
+        version_key = request.api_version or 'none'
+        with self._lock:
+            stats = self._get(request)
+            stats['latency'].observe(elapsed)
+            stats['statuses'][status_key] = (
+                stats['statuses'].get(status_key, 0) + 1)
+            stats['api_versions'][version_key] = (
+                stats['api_versions'].get(version_key, 0) + 1)
+            stats['bytes_sent'] += request.size
+            stats['bytes_received'] += size
+
+    def on_retry(self, request: Request, attempt: int,
+                 error: Exception) -> None:
+        with self._lock:
+            self._get(request)['retries'] += 1
+
+    def on_negotiation(self, requested: str | list[str] | None,
+                       negotiated: str, elapsed: float) -> None:
+        with self._lock:
+            self._negotiations.observe(elapsed)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the current measurements.
+
+        :returns: A JSON-serializable dictionary with the ``requests`` as a
+            list of dictionaries with the ``method``, ``endpoint``,
+            ``latency`` histogram (see :meth:`Histogram.snapshot`),
+            ``statuses`` and ``api_versions`` counts, ``retries``,
+            ``bytes_sent`` and ``bytes_received``, and the ``negotiations``
+            latency histogram.
+        """
+        with self._lock:
+            requests = [
+                dict(stats, method=method, endpoint=endpoint,
+                     latency=stats['latency'].snapshot(),
+                     statuses=dict(stats['statuses']),
+                     api_versions=dict(stats['api_versions']))
+                for (method, endpoint), stats
+                in sorted(self._requests.items())
+            ]
+            return {'requests': requests,
+                    'negotiations': self._negotiations.snapshot()}
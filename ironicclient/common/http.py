@@ -15,6 +15,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+import contextlib
 import functools
 from http import client as http_client
 import json
@@ -23,7 +25,7 @@ import re
 import textwrap
 import threading
 import time
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Iterable, TypeVar
 from urllib import parse as urlparse
 
 from keystoneauth1 import adapter
@@ -32,7 +34,9 @@ from keystoneauth1 import session as ks_session
 import requests
 
 from ironicclient.common import filecache
+from ironicclient.common import hooks
 from ironicclient.common.i18n import _
+from ironicclient.common import timing
 from ironicclient import exc
 
 
@@ -124,9 +128,101 @@ def get_server(
     return parts.hostname, str(parts.port)
 
 
+def _select_version(
+    requested_version: str | list[str],
+    min_ver: str,
+    max_ver: str,
+) -> str:
+    """Select the API version to use with a server.
+
+    :param requested_version: The version or list of versions requested.
+    :param min_ver: The minimum version supported by the server.
+    :param max_ver: The maximum version supported by the server and the
+        client.
+    :returns: The version to use.
+    :raises: UnsupportedVersion if none of the requested versions is
+        supported.
+    :raises: ValueError if the requested version is invalid.
+    """
+    if isinstance(requested_version, str):
+        if requested_version == 'latest':
+            negotiated_ver = max_ver
+        else:
+            negotiated_ver = str(
+                min(_Version(requested_version), _Version(max_ver))
+            )
+
+    elif isinstance(requested_version, list):
+        if 'latest' in requested_version:
+            raise ValueError(textwrap.fill(
+                _("The 'latest' API version can not be requested "
+                  "in a list of versions. Please explicitly request "
+                  "'latest' or request only versions between "
+                  "%(min)s to %(max)s")
+                % {'min': min_ver, 'max': max_ver}))
+
+        versions = []
+        for version in requested_version:
+            if _Version(min_ver) <= _Version(version) <= _Version(max_ver):
+                versions.append(_Version(version))
+        if versions:
+            negotiated_ver = str(max(versions))
+        else:
+            raise exc.UnsupportedVersion(textwrap.fill(
+                _("Requested API version specified and the requested "
+                  "operation was not supported by the client's "
+                  "requested API version %(req)s.  Supported "
+                  "version range is: %(min)s to %(max)s")
+                % {'req': requested_version,
+                   'min': min_ver, 'max': max_ver}))
+
+    else:
+        raise ValueError(textwrap.fill(
+            _("Requested API version %(req)s type is unsupported. "
+              "Valid types are Strings such as '1.1', 'latest' "
+              "or a list of string values representing API versions.")
+            % {'req': requested_version}))
+
+    if _Version(negotiated_ver) < _Version(min_ver):
+        negotiated_ver = min_ver
+    return negotiated_ver
+
+
 class VersionNegotiationMixin(object):
     os_ironic_api_version: str | list[str]
     api_version_select_state: str
+    # The requested version and selection state before a version was picked
+    # from a cached version range, see use_version_range.
+    _version_range_request: tuple[str | list[str], str] | None = None
+
+    def use_version_range(self, min_ver: str, max_ver: str) -> None:
+        """Select the API version from a known server version range.
+
+        This avoids negotiating the version with the server. If the server
+        rejects the selected version (e.g. because it was downgraded since
+        the range was cached), the version is negotiated as usual.
+
+        :param min_ver: The minimum version supported by the server.
+        :param max_ver: The maximum version supported by the server.
+        """
+        if _Version(max_ver) > _Version(LATEST_VERSION):
+            max_ver = LATEST_VERSION
+        try:
+            version = _select_version(self.os_ironic_api_version, min_ver,
+                                      max_ver)
+        except (exc.UnsupportedVersion, ValueError) as e:
+            LOG.debug('Cannot select an API version from the cached range '
+                      '%(min)s to %(max)s: %(error)s',
+                      {'min': min_ver, 'max': max_ver, 'error': e})
+            return
+
+        LOG.debug('Using API version %(ver)s from the cached range %(min)s '
+                  'to %(max)s', {'ver': version, 'min': min_ver,
+                                 'max': max_ver})
+        self._version_range_request = (self.os_ironic_api_version,
+                                       self.api_version_select_state)
+        self.api_version_select_state = 'negotiated'
+        self.os_ironic_api_version = version
 
     def negotiate_version(
         self,
@@ -154,6 +250,13 @@ class VersionNegotiationMixin(object):
                 raise exc.from_response(resp, method='GET', url=base_version)
             return resp
 
+        if self._version_range_request is not None:
+            # NOTE: the version was selected from an outdated cached range,
+            # negotiate it again from what was initially requested.
+            (self.os_ironic_api_version,
+             self.api_version_select_state) = self._version_range_request
+            self._version_range_request = None
+
         version_overridden = False
 
         if (resp and hasattr(resp, 'request')
@@ -201,6 +304,17 @@ class VersionNegotiationMixin(object):
                 _('Could not determine API version range from server; '
                   'version headers missing from response.'))
 
+        # Cache the version range for this server, also when its endpoint
+        # was resolved from the service catalog.
+        endpoint_override = getattr(self, 'endpoint_override', None)
+        host, port = get_server(endpoint_override)
+        range_host, range_port = get_server(
+            endpoint_override or getattr(self, 'endpoint_trimmed', None))
+        if range_host is not None and range_port is not None:
+            filecache.save_version_range(host=range_host, port=range_port,
+                                         min_version=min_ver,
+                                         max_version=max_ver)
+
         if _Version(max_ver) > _Version(LATEST_VERSION):
             LOG.debug("Remote API version %(max_ver)s is greater than the "
                       "version supported by ironicclient. Maximum available "
@@ -235,47 +349,7 @@ class VersionNegotiationMixin(object):
                 % {'req': requested_version,
                    'min': min_ver, 'max': max_ver}))
 
-        if isinstance(requested_version, str):
-            if requested_version == 'latest':
-                negotiated_ver = max_ver
-            else:
-                negotiated_ver = str(
-                    min(_Version(requested_version), _Version(max_ver))
-                )
-
-        elif isinstance(requested_version, list):
-            if 'latest' in requested_version:
-                raise ValueError(textwrap.fill(
-                    _("The 'latest' API version can not be requested "
-                      "in a list of versions. Please explicitly request "
-                      "'latest' or request only versions between "
-                      "%(min)s to %(max)s")
-                    % {'min': min_ver, 'max': max_ver}))
-
-            versions = []
-            for version in requested_version:
-                if _Version(min_ver) <= _Version(version) <= _Version(max_ver):
-                    versions.append(_Version(version))
-            if versions:
-                negotiated_ver = str(max(versions))
-            else:
-                raise exc.UnsupportedVersion(textwrap.fill(
-                    _("Requested API version specified and the requested "
-                      "operation was not supported by the client's "
-                      "requested API version %(req)s.  Supported "
-                      "version range is: %(min)s to %(max)s")
-                    % {'req': requested_version,
-                       'min': min_ver, 'max': max_ver}))
-
-        else:
-            raise ValueError(textwrap.fill(
-                _("Requested API version %(req)s type is unsupported. "
-                  "Valid types are Strings such as '1.1', 'latest' "
-                  "or a list of string values representing API versions.")
-                % {'req': requested_version}))
-
-        if _Version(negotiated_ver) < _Version(min_ver):
-            negotiated_ver = min_ver
+        negotiated_ver = _select_version(requested_version, min_ver, max_ver)
 
         # server handles microversions, but doesn't support
         # the requested version, so try a negotiated version
@@ -284,8 +358,6 @@ class VersionNegotiationMixin(object):
         LOG.debug('Negotiated API version is %s', negotiated_ver)
 
         # Cache the negotiated version for this server
-        endpoint_override = getattr(self, 'endpoint_override', None)
-        host, port = get_server(endpoint_override)
         if host is not None and port is not None:
             filecache.save_data(host=host, port=port, data=negotiated_ver)
 
@@ -359,24 +431,69 @@ def with_retries(
                     raise
                 else:
                     LOG.debug(msg)
+                    if self._hooks:
+                        self._call_hooks(
+                            'on_retry',
+                            self._hook_request(url, method, kwargs),
+                            attempt, error)
                     time.sleep(self.conflict_retry_interval)
         raise AssertionError('unreachable')
 
     return wrapper
 
 
+@contextlib.contextmanager
+def cached_auth_state(session: ks_session.Session,
+                      auth: Any) -> Iterator[None]:
+    """Use the on-disk authentication cache in a block.
+
+    The authentication state (token and service catalog) is restored from
+    the cache before the block, so that endpoint lookups in the block do not
+    contact keystone, and saved back after it if it changed. Nothing is done
+    if the cache is disabled or the authentication plugin cannot be cached.
+
+    :param session: The keystoneauth session.
+    :param auth: The authentication plugin used by the session.
+    """
+    get_cache_id = getattr(auth, 'get_cache_id', None)
+    cache_id = get_cache_id() if callable(get_cache_id) else None
+    if not cache_id or not filecache.auth_cache_enabled():
+        yield
+        return
+
+    auth_key = 'auth:%s' % cache_id
+    auth_state = filecache.retrieve_auth_data(auth_key)
+    if auth_state:
+        LOG.debug('Using cached authentication state')
+        auth.set_auth_state(auth_state)
+    yield
+    # NOTE: this only contacts keystone if the cached token is missing or
+    # expired, which the first request would do anyway.
+    auth.get_access(session)
+    new_state = auth.get_auth_state()
+    if new_state and new_state != auth_state:
+        filecache.save_auth_data(auth_key, new_state)
+
+
 class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
     """HTTP client based on Keystone client session."""
 
+    # Set to record the time spent in requests, see --timing of the CLI.
+    timings: timing.Timings | None = None
+    _hooks: tuple[hooks.RequestHook, ...] = ()
+
     def __init__(
         self,
         os_ironic_api_version: str | list[str],
         api_version_select_state: str,
         max_retries: int | None,
         retry_interval: int | None,
+        hooks: Iterable[hooks.RequestHook] | None = None,
         **kwargs: Any,
     ) -> None:
         self.os_ironic_api_version = os_ironic_api_version
+        if hooks:
+            self._hooks = tuple(hooks)
         self.api_version_select_state = api_version_select_state
         self.conflict_max_retries = max_retries
         self.conflict_retry_interval = retry_interval
@@ -387,10 +504,13 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
         super(SessionClient, self).__init__(**kwargs)
 
         endpoint_filter = self._get_endpoint_filter()
-        # type of endpoint_filter is incompatible with ksa stubs
-        endpoint = self.get_endpoint(
-            **endpoint_filter  # type: ignore[arg-type]
-        )
+        if self.endpoint_override is None and filecache.auth_cache_enabled():
+            endpoint = self._get_endpoint_cached(endpoint_filter)
+        else:
+            # type of endpoint_filter is incompatible with ksa stubs
+            endpoint = self.get_endpoint(
+                **endpoint_filter  # type: ignore[arg-type]
+            )
         if endpoint is None:
             raise exc.EndpointNotFound(
                 _('The Bare Metal API endpoint cannot be detected and was '
@@ -404,6 +524,35 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
     ) -> tuple[str | None, str | None]:
         return self._generic_parse_version_headers(resp.headers.get)
 
+    def _get_endpoint_cached(
+        self,
+        endpoint_filter: dict[str, str | list[str] | None],
+    ) -> str | None:
+        """Resolve the endpoint using the on-disk authentication cache.
+
+        The authentication state is cached as described in
+        :func:`cached_auth_state`, the resolved endpoint is cached for
+        ``IRONICCLIENT_CACHE_EXPIRY`` seconds.
+        """
+        auth = self.auth or self.session.auth
+        with cached_auth_state(self.session, auth):
+            endpoint_key = 'endpoint:%s' % ':'.join(
+                str(item) for item in (getattr(auth, 'auth_url', None),
+                                       self.region_name, self.interface,
+                                       self.service_type))
+            endpoint = filecache.retrieve_auth_data(
+                endpoint_key, expiry=filecache.get_expiry())
+            if endpoint is None:
+                # type of endpoint_filter is incompatible with ksa stubs
+                endpoint = self.get_endpoint(
+                    **endpoint_filter  # type: ignore[arg-type]
+                )
+                if endpoint is not None:
+                    filecache.save_auth_data(endpoint_key, endpoint)
+            else:
+                LOG.debug('Using cached endpoint %s', endpoint)
+        return endpoint
+
     def _get_endpoint_filter(self) -> dict[str, str | list[str] | None]:
         return {
             'interface': self.interface,
@@ -418,10 +567,95 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
         url: str,
     ) -> requests.Response:
         # NOTE: conn is self.session for this class
-        return conn.request(url, method, raise_exc=False,
-                            user_agent=USER_AGENT,
-                            endpoint_filter=self._get_endpoint_filter(),
-                            endpoint_override=self.endpoint_override)
+        return self._send_request(
+            conn, url, method, raise_exc=False, user_agent=USER_AGENT,
+            endpoint_filter=self._get_endpoint_filter(),
+            endpoint_override=self.endpoint_override)
+
+    def _send_request(
+        self,
+        conn: ks_session.Session,
+        url: str,
+        method: str,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if self.timings is None and not self._hooks:
+            return conn.request(url, method, **kwargs)
+
+        request = None
+        if self._hooks:
+            request = self._hook_request(url, method, kwargs)
+            self._call_hooks('before_request', request)
+        resp = None
+        error = None
+        size = 0
+        start = time.perf_counter()
+        try:
+            resp = conn.request(url, method, **kwargs)
+            size = len(resp.content or b'')
+            return resp
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            status = resp.status_code if resp is not None else None
+            if self.timings is not None:
+                self.timings.add_request(method, url, status, size, elapsed)
+            if request is not None:
+                self._call_hooks('after_response', request, status, size,
+                                 elapsed, error)
+
+    def _negotiate_version(
+        self,
+        resp: requests.Response | None,
+    ) -> str:
+        if self.timings is None and not self._hooks:
+            return self.negotiate_version(self.session, resp)
+
+        requested = self.os_ironic_api_version
+        start = time.perf_counter()
+        if self.timings is None:
+            negotiated = self.negotiate_version(self.session, resp)
+        else:
+            with self.timings.measure(timing.VERSION_NEGOTIATION):
+                negotiated = self.negotiate_version(self.session, resp)
+        self._call_hooks('on_negotiation', requested, negotiated,
+                         time.perf_counter() - start)
+        return negotiated
+
+    def add_hook(self, hook: hooks.RequestHook) -> None:
+        """Register an instrumentation hook.
+
+        :param hook: A :class:`ironicclient.common.hooks.RequestHook`.
+        """
+        self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: hooks.RequestHook) -> None:
+        """Unregister an instrumentation hook.
+
+        :param hook: A hook previously passed to :meth:`add_hook`.
+        """
+        self._hooks = tuple(item for item in self._hooks if item is not hook)
+
+    def _hook_request(self, url: str, method: str,
+                      kwargs: dict[str, Any]) -> hooks.Request:
+        headers = kwargs.get('headers') or {}
+        if kwargs.get('json') is not None:
+            size = len(json.dumps(kwargs['json']).encode())
+        else:
+            size = len(kwargs.get('data') or b'')
+        return hooks.Request(method, url,
+                             headers.get('X-OpenStack-Ironic-API-Version'),
+                             size)
+
+    def _call_hooks(self, event: str, *args: Any) -> None:
+        for hook in self._hooks:
+            try:
+                getattr(hook, event)(*args)
+            except Exception:
+                LOG.exception('Instrumentation hook %(hook)r failed on '
+                              '%(event)s', {'hook': hook, 'event': event})
 
     @with_retries
     def _http_request(
@@ -436,7 +670,7 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
         if self.os_ironic_api_version and self._must_negotiate_version():
             with self._first_negotiation_lock:
                 if self._must_negotiate_version():
-                    self.negotiate_version(self.session, None)
+                    self._negotiate_version(None)
 
         kwargs.setdefault('user_agent', USER_AGENT)
         kwargs.setdefault('auth', self.auth)
@@ -459,10 +693,10 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
         endpoint_filter.setdefault('service_type', self.service_type)
         endpoint_filter.setdefault('region_name', self.region_name)
 
-        resp = self.session.request(url, method,
-                                    raise_exc=False, **kwargs)
+        resp = self._send_request(self.session, url, method,
+                                   raise_exc=False, **kwargs)
         if resp.status_code == http_client.NOT_ACCEPTABLE:
-            negotiated_ver = self.negotiate_version(self.session, resp)
+            negotiated_ver = self._negotiate_version(resp)
             kwargs['headers']['X-OpenStack-Ironic-API-Version'] = (
                 negotiated_ver)
             return self._http_request(url, method, **kwargs)
@@ -507,7 +741,11 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
             return resp, list()
         if 'application/json' in content_type:
             try:
-                body = resp.json()
+                if self.timings is None:
+                    body = resp.json()
+                else:
+                    with self.timings.measure(timing.JSON_DECODING):
+                        body = resp.json()
             except ValueError:
                 LOG.error('Could not decode response body as JSON')
         else:
@@ -0,0 +1,181 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Journal of bulk operations.
+
+A journal is an append-only file with one JSON object per line, recording
+the outcome of every item of a bulk operation (creation of resources,
+provisioning or deletion of nodes). When the same operation is repeated
+with the same journal, items that already succeeded are skipped, so an
+interrupted operation can be resumed without duplicating work.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import contextlib
+import json
+import logging
+import threading
+from typing import Any, TextIO
+
+from ironicclient import exc
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+
+class Journal(object):
+    """An append-only journal of items of a bulk operation.
+
+    Every line of the file is a JSON object with the ``key`` of the item,
+    the ``uuid`` of the resulting resource (if any) and the ``error`` if the
+    item failed. Items done in several steps (e.g. creating a node, then
+    setting its traits) record the ``uuid`` as soon as the resource exists,
+    with ``partial`` set until the remaining steps succeed. Later lines
+    override earlier ones with the same key.
+
+    :param path: path to the journal file. It is created if it does not
+        exist, otherwise it is loaded and appended to.
+    :raises: ClientException if the file cannot be opened.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        try:
+            complete = self._load()
+            self._file: TextIO = open(path, 'a')
+        except OSError as e:
+            raise exc.ClientException(
+                'Cannot open journal "%(path)s" due to error: %(err)s' %
+                {'path': path, 'err': e})
+        if not complete:
+            # The last write was interrupted, start a new line.
+            self._file.write('\n')
+
+    def _load(self) -> bool:
+        """Load the existing entries.
+
+        :returns: whether the file ends with a complete line.
+        """
+        try:
+            f = open(self.path)
+        except FileNotFoundError:
+            return True
+        line = ''
+        with f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry['key']] = entry
+                except (ValueError, KeyError, TypeError):
+                    LOG.warning('Ignoring invalid line %(line)d in journal '
+                                '%(path)s', {'line': number,
+                                             'path': self.path})
+        LOG.debug('Loaded %(count)d entries from journal %(path)s',
+                  {'count': len(self._entries), 'path': self.path})
+        return not line or line.endswith('\n')
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    def __enter__(self) -> Journal:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_done(self, key: str) -> bool:
+        """Check whether an item has succeeded.
+
+        :param key: the key of the item.
+        """
+        entry = self._entries.get(key)
+        return (entry is not None and 'error' not in entry
+                and not entry.get('partial'))
+
+    def get(self, key: str) -> str | None:
+        """Get the UUID of the resource created by a successful item.
+
+        :param key: the key of the item.
+        :returns: the UUID or None if the item has not succeeded or did not
+            record a UUID.
+        """
+        if not self.is_done(key):
+            return None
+        return self._entries[key].get('uuid')
+
+    def get_created(self, key: str) -> str | None:
+        """Get the UUID of the resource created by an item.
+
+        Unlike :meth:`get`, the UUID is also returned if a later step of the
+        item failed or did not finish.
+
+        :param key: the key of the item.
+        :returns: the UUID or None if no resource was created.
+        """
+        entry = self._entries.get(key)
+        return entry.get('uuid') if entry is not None else None
+
+    def record(
+        self,
+        key: str,
+        uuid: str | None = None,
+        error: Exception | str | None = None,
+        partial: bool = False,
+    ) -> None:
+        """Record the outcome of an item.
+
+        The entry is written and flushed immediately. This method is thread
+        safe.
+
+        :param key: the key of the item.
+        :param uuid: the UUID of the resulting resource, if any. It is also
+            recorded with an error if the resource was created by a failed
+            item.
+        :param error: the error if the item failed.
+        :param partial: whether the resource was created but the remaining
+            steps of the item are still to be done.
+        """
+        entry: dict[str, Any] = {'key': key}
+        if uuid is not None:
+            entry['uuid'] = uuid
+        if error is not None:
+            entry['error'] = str(error)
+        elif partial:
+            entry['partial'] = True
+        line = json.dumps(entry, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._entries[key] = entry
+
+
+@contextlib.contextmanager
+def open_journal(path: str | None) -> Iterator[Journal | None]:
+    """Open a journal if a path is provided.
+
+    :param path: path to the journal file or None.
+    :returns: a context manager returning a :class:`Journal` or None.
+    """
+    if path is None:
+        yield None
+        return
+    with Journal(path) as journal:
+        yield journal
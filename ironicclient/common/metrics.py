@@ -0,0 +1,374 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Metrics of the API requests made by bare metal clients.
+
+:class:`MetricsCollector` is an instrumentation hook (see
+:mod:`ironicclient.common.hooks`) aggregating requests per HTTP method and
+endpoint::
+
+    collector = metrics.MetricsCollector()
+    ironic = client.get_client(1, ..., hooks=[collector])
+    ...
+    print(collector.to_prometheus())
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+import json
+import threading
+from typing import Any
+
+from ironicclient.common.apiclient import exceptions
+from ironicclient.common import hooks
+
+
+DEFAULT_PREFIX: str = 'ironicclient'
+# Percentiles of latencies included in snapshots.
+PERCENTILES: tuple[float, ...] = (50.0, 90.0, 99.0, 99.9)
+
+# Names of the exceptions raised for HTTP error status codes.
+_HTTP_ERRORS: dict[int, str] = {
+    obj.http_status: name
+    for name, obj in vars(exceptions).items()
+    if isinstance(obj, type) and issubclass(obj, exceptions.HttpError)
+    and obj.http_status
+}
+
+
+def error_class(
+    status: int | None,
+    error: BaseException | None,
+) -> str | None:
+    """Get the class of the error of a request.
+
+    :param status: The HTTP status code, None if no response was received.
+    :param error: The exception raised instead of receiving a response.
+    :returns: The name of the exception raised for the request, e.g.
+        ``Conflict``, ``ServiceUnavailable`` or ``ConnectFailure`` for
+        a connection failure, None for successful requests.
+    """
+    if error is not None:
+        return type(error).__name__
+    if status is None or status < 400:
+        return None
+    try:
+        return _HTTP_ERRORS[status]
+    except KeyError:
+        return 'HttpServerError' if status >= 500 else 'HTTPClientError'
+
+
+class HdrHistogram(object):
+    """A histogram of values with a bounded relative error.
+
+    Like HDR histograms, values are counted in buckets whose width grows
+    with the magnitude of the values: each power of 2 is split into
+    ``2 ** (significant_bits - 1)`` buckets. This keeps the relative error
+    of percentiles below ``2 ** (1 - significant_bits)`` with a small number
+    of buckets over any range of values.
+
+    :param significant_bits: The precision of the buckets.
+    :param unit: The smallest distinguishable value, e.g. one microsecond
+        for latencies in seconds.
+    """
+
+    def __init__(self, significant_bits: int = 7,
+                 unit: float = 1e-6) -> None:
+        self.significant_bits = significant_bits
+        self.unit = unit
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def _bucket(self, value: float) -> int:
+        ticks = max(int(value / self.unit), 0)
+        shift = max(ticks.bit_length() - self.significant_bits, 0)
+        return (ticks >> shift) << shift
+
+    def _width(self, bucket: int) -> int:
+        return 1 << max(bucket.bit_length() - self.significant_bits, 0)
+
+    def record(self, value: float) -> None:
+        """Add a value to the histogram.
+
+        :param value: A non-negative value.
+        """
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: HdrHistogram) -> None:
+        """Add the values of another histogram with the same precision.
+
+        :param other: The other histogram.
+        """
+        if (other.significant_bits, other.unit) != (self.significant_bits,
+                                                    self.unit):
+            raise ValueError('Cannot merge histograms of different precision')
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Get a percentile of the values.
+
+        :param percentile: The percentile between 0 and 100.
+        :returns: The highest value equivalent to the percentile (within
+            the precision of the histogram), None if there are no values.
+        """
+        if self.max is None:
+            return None
+        rank = max(percentile / 100.0 * self.count, 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min((bucket + self._width(bucket)) * self.unit,
+                           self.max)
+        return self.max
+
+    def count_below(self, bound: float) -> int:
+        """Count the values up to a bound.
+
+        :param bound: The bound.
+        :returns: The number of values in buckets ending at or below the
+            bound. Values in the bucket containing the bound are not
+            counted, so the result is never above the exact count and
+            below it only within the precision of the histogram.
+        """
+        limit = bound / self.unit
+        return sum(count for bucket, count in self.counts.items()
+                   if bucket + self._width(bucket) <= limit)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the histogram as a JSON-serializable dictionary.
+
+        :returns: A dictionary with the ``count``, ``sum``, ``min``, ``max``,
+            the ``percentiles`` from :data:`PERCENTILES` and the non-empty
+            ``buckets`` as ``[lower bound, count]`` pairs.
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'percentiles': {'p%g' % item: self.percentile(item)
+                            for item in PERCENTILES},
+            'buckets': [[bucket * self.unit, self.counts[bucket]]
+                        for bucket in sorted(self.counts)],
+        }
+
+
+class _EndpointMetrics(object):
+
+    def __init__(self) -> None:
+        self.statuses: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.retries: dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = HdrHistogram()
+
+
+def _increment(counts: dict[str, int], key: str) -> None:
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _labels(**labels: str) -> str:
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value))
+                             for name, value in labels.items())
+
+
+class MetricsCollector(hooks.RequestHook):
+    """Aggregates request metrics per HTTP method and endpoint.
+
+    Counts requests by status, errors by class (see :func:`error_class`),
+    retries by the class of the error that caused them and transferred
+    bytes, and records latencies in :class:`HdrHistogram` histograms.
+    Endpoints are paths without resource names, see
+    :func:`ironicclient.common.hooks.endpoint_template`.
+
+    :param buckets: Upper bounds of the latency buckets in the Prometheus
+        export.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = hooks.DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], _EndpointMetrics] = {}
+        self._negotiations = HdrHistogram()
+
+    def reset(self) -> None:
+        """Drop all metrics."""
+        with self._lock:
+            self._endpoints = {}
+            self._negotiations = HdrHistogram()
+
+    def _get(self, request: hooks.Request) -> _EndpointMetrics:
+        key = (request.method, hooks.endpoint_template(request.url))
+        try:
+            return self._endpoints[key]
+        except KeyError:
+            metrics = self._endpoints[key] = _EndpointMetrics()
+            return metrics
+
+    def after_response(
+        self,
+        request: hooks.Request,
+        status: int | None,
+        size: int,
+        elapsed: float,
+        error: BaseException | None,
+    ) -> None:
+        error_name = error_class(status, error)
+        with self._lock:
+            metrics = self._get(request)
+            _increment(metrics.statuses,
+                       'error' if status is None else str(status))
+            if error_name is not None:
+                _increment(metrics.errors, error_name)
+            metrics.bytes_sent += request.size
+            metrics.bytes_received += size
+            metrics.latency.record(elapsed)
+
+    def on_retry(self, request: hooks.Request, attempt: int,
+                 error: Exception) -> None:
+        with self._lock:
+            _increment(self._get(request).retries, type(error).__name__)
+
+    def on_negotiation(self, requested: str | list[str] | None,
+                       negotiated: str, elapsed: float) -> None:
+        with self._lock:
+            self._negotiations.record(elapsed)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the current metrics.
+
+        :returns: A JSON-serializable dictionary with the ``requests`` as a
+            list of dictionaries with the ``method``, ``endpoint``,
+            ``requests`` count, ``statuses``, ``errors`` and ``retries``
+            counts, ``bytes_sent``, ``bytes_received`` and the ``latency``
+            (see :meth:`HdrHistogram.snapshot`), sorted by decreasing number
+            of requests, and the ``negotiations`` latency.
+        """
+        with self._lock:
+            # NOTE: busiest endpoints first, then by method and endpoint.
+            endpoints = sorted(
+                self._endpoints.items(),
+                key=lambda entry: (-entry[1].latency.count, entry[0]))
+            requests = [
+                {'method': method, 'endpoint': endpoint,
+                 'requests': metrics.latency.count,
+                 'statuses': dict(metrics.statuses),
+                 'errors': dict(metrics.errors),
+                 'retries': dict(metrics.retries),
+                 'bytes_sent': metrics.bytes_sent,
+                 'bytes_received': metrics.bytes_received,
+                 'latency': metrics.latency.snapshot()}
+                for (method, endpoint), metrics in endpoints
+            ]
+            negotiations = self._negotiations.snapshot()
+        return {'requests': requests, 'negotiations': negotiations}
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Export the metrics as JSON.
+
+        :param kwargs: Arguments to :func:`json.dumps`, e.g. ``indent``.
+        :returns: The JSON of :meth:`snapshot`.
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = DEFAULT_PREFIX) -> str:
+        """Export the metrics in the Prometheus text exposition format.
+
+        :param prefix: The prefix of the metric names.
+        :returns: The metrics, ending with a new line.
+        """
+        with self._lock:
+            lines = list(self._prometheus_lines(prefix))
+        return '\n'.join(lines) + '\n'
+
+    def _prometheus_lines(self, prefix: str) -> Iterator[str]:
+        items = sorted(self._endpoints.items())
+
+        def _counter(name: str, help_text: str, label: str | None,
+                     attribute: str) -> Iterator[str]:
+            yield '# HELP %s_%s %s' % (prefix, name, help_text)
+            yield '# TYPE %s_%s counter' % (prefix, name)
+            for (method, endpoint), metrics in items:
+                value = getattr(metrics, attribute)
+                if label is None:
+                    yield '%s_%s%s %d' % (
+                        prefix, name,
+                        _labels(method=method, endpoint=endpoint), value)
+                    continue
+                for key, count in sorted(value.items()):
+                    yield '%s_%s%s %d' % (
+                        prefix, name,
+                        _labels(method=method, endpoint=endpoint,
+                                **{label: key}), count)
+
+        yield from _counter('requests_total', 'Bare metal API requests.',
+                            'status', 'statuses')
+        yield from _counter('request_errors_total',
+                            'Failed bare metal API requests by error.',
+                            'error', 'errors')
+        yield from _counter('request_retries_total',
+                            'Retried bare metal API requests by error.',
+                            'error', 'retries')
+        yield from _counter('request_bytes_total',
+                            'Bytes sent in request bodies.', None,
+                            'bytes_sent')
+        yield from _counter('response_bytes_total',
+                            'Bytes received in response bodies.', None,
+                            'bytes_received')
+
+        name = '%s_request_duration_seconds' % prefix
+        yield '# HELP %s Latency of bare metal API requests.' % name
+        yield '# TYPE %s histogram' % name
+        for (method, endpoint), metrics in items:
+            latency = metrics.latency
+            for bound in self.buckets:
+                yield '%s_bucket%s %d' % (
+                    name, _labels(method=method, endpoint=endpoint,
+                                  le='%g' % bound),
+                    latency.count_below(bound))
+            yield '%s_bucket%s %d' % (
+                name, _labels(method=method, endpoint=endpoint, le='+Inf'),
+                latency.count)
+            labels = _labels(method=method, endpoint=endpoint)
+            yield '%s_sum%s %r' % (name, labels, latency.sum)
+            yield '%s_count%s %d' % (name, labels, latency.count)
+
+        name = '%s_version_negotiations_total' % prefix
+        yield '# HELP %s API version negotiations.' % name
+        yield '# TYPE %s counter' % name
+        yield '%s %d' % (name, self._negotiations.count)
@@ -0,0 +1,136 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Timing of the phases of a command and of its API requests."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import contextlib
+import threading
+import time
+from typing import NamedTuple
+
+from ironicclient.common.i18n import _
+
+
+# Phases measured by the CLI and the HTTP client, in the display order.
+STARTUP: str = 'startup'
+CLIENT_SETUP: str = 'client setup'
+VERSION_NEGOTIATION: str = 'version negotiation'
+HTTP_REQUESTS: str = 'HTTP requests'
+JSON_DECODING: str = 'JSON decoding'
+PHASES: tuple[str, ...] = (STARTUP, CLIENT_SETUP, VERSION_NEGOTIATION,
+                           HTTP_REQUESTS, JSON_DECODING)
+
+
+class RequestTiming(NamedTuple):
+    """Timing of one API request."""
+
+    method: str
+    url: str
+    status: int | None
+    size: int
+    elapsed: float  # seconds
+
+
+class Timings(object):
+    """Accumulates the time spent in the phases of a command.
+
+    Requests made while another phase (e.g. version negotiation) is being
+    measured are listed but only accounted to that phase.
+
+    :param started: The start of the command as returned by
+        :func:`time.perf_counter`, defaults to now.
+    """
+
+    def __init__(self, started: float | None = None) -> None:
+        self.started = time.perf_counter() if started is None else started
+        self.phases: dict[str, float] = {}
+        self.requests: list[RequestTiming] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add(self, phase: str, elapsed: float) -> None:
+        """Account time to a phase.
+
+        :param phase: The name of the phase.
+        :param elapsed: The time in seconds.
+        """
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Measure the time spent in the block as a phase.
+
+        :param phase: The name of the phase.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if not depth:
+                self.add(phase, time.perf_counter() - start)
+
+    def add_request(self, method: str, url: str, status: int | None,
+                    size: int, elapsed: float) -> None:
+        """Record an API request.
+
+        :param method: The HTTP method.
+        :param url: The requested URL.
+        :param status: The status code, None if no response was received.
+        :param size: The size of the response body in bytes.
+        :param elapsed: The latency in seconds.
+        """
+        with self._lock:
+            self.requests.append(
+                RequestTiming(method, url, status, size, elapsed))
+        if not getattr(self._local, 'depth', 0):
+            self.add(HTTP_REQUESTS, elapsed)
+
+    def format(self, finished: float | None = None) -> str:
+        """Format the phases and the requests as two text tables.
+
+        :param finished: The end of the command as returned by
+            :func:`time.perf_counter`, defaults to now.
+        :returns: The tables, ending with a new line.
+        """
+        if finished is None:
+            finished = time.perf_counter()
+        total = finished - self.started
+        phases = [(name, self.phases[name]) for name in PHASES
+                  if name in self.phases]
+        phases += [(name, elapsed) for name, elapsed in self.phases.items()
+                   if name not in PHASES]
+        phases.append((_('command and output formatting'),
+                       max(total - sum(item[1] for item in phases), 0.0)))
+        phases.append((_('total'), total))
+
+        lines = ['%-32s %10s' % (_('Phase'), _('Seconds'))]
+        lines.extend('%-32s %10.3f' % item for item in phases)
+        if self.requests:
+            lines.append('')
+            lines.append('%-7s %6s %10s %10s  %s'
+                         % (_('Method'), _('Status'), _('Bytes'), _('ms'),
+                            _('URL')))
+            for request in self.requests:
+                lines.append('%-7s %6s %10d %10.1f  %s'
+                             % (request.method,
+                                '-' if request.status is None
+                                else request.status,
+                                request.size, request.elapsed * 1000,
+                                request.url))
+        return '\n'.join(lines) + '\n'
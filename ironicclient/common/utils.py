@@ -16,8 +16,11 @@
 from __future__ import annotations
 
 import base64
+from concurrent import futures
 import contextlib
 import gzip
+import heapq
+import itertools
 import json
 import os
 import shutil
@@ -25,16 +28,29 @@ import subprocess
 import sys
 import tempfile
 import time
-from typing import Any, Callable, Generator, Iterator, Protocol
+from typing import (Any, Callable, Generator, Iterable, Iterator, Mapping,
+                    Protocol, Sequence, TYPE_CHECKING, TypeVar)
 
 from cliff import columns
 from oslo_utils import strutils
-import yaml
 
 from ironicclient.common.http import _Version
 from ironicclient.common.i18n import _
 from ironicclient import exc
 
+if TYPE_CHECKING:
+    from ironicclient.v1 import resource_fields
+
+
+DEFAULT_MAX_WORKERS: int = 8
+"""Default number of threads used for concurrent API requests."""
+
+DEFAULT_SCAN_THRESHOLD: int = 50
+"""Number of items from which one full listing replaces per-item lookups."""
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
 
 class ListCommandArgs(Protocol):
     """Protocol for parsed args passed to list commands (marker, limit, etc).
@@ -401,6 +417,9 @@ def handle_json_or_file_arg(
     """
 
     if os.path.isfile(json_arg):
+        # NOTE: imported here since most commands never read files.
+        import yaml
+
         try:
             with open(json_arg, 'r') as f:
                 # safe_load returns Any; we treat as list | dict
@@ -519,6 +538,305 @@ class HashColumn(columns.FormattableColumn[Any]):
         return format_hash(self._value)
 
 
+def run_concurrently(
+    func: Callable[[_T], _R],
+    items: Iterable[_T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[_R]:
+    """Call a function for each item using a pool of threads.
+
+    :param func: the function to call with each item.
+    :param items: the items to process.
+    :param max_workers: the maximum number of concurrent calls.
+    :returns: the results in the order of items.
+    :raises: the first exception (in the order of items) raised by func.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+    with futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _merge_key(value: Any) -> tuple[bool, Any]:
+    # NOTE: None cannot be compared with other values, sort it first.
+    return (value is not None, value)
+
+
+def merge_resources(
+    results: Sequence[Iterable[Any]],
+    sort_key: str | None = None,
+    sort_dir: str | None = None,
+    limit: int | None = None,
+) -> Iterator[Any]:
+    """Merge resources returned by several list queries.
+
+    :param results: lists of resources, one per query.
+    :param sort_key: if set, every list is expected to be sorted by this
+        field and the merged result is sorted by it as well.
+    :param sort_dir: the direction of sorting, 'asc' (default) or 'desc'.
+    :param limit: the maximum number of resources to return, None or 0
+        for no limit.
+    :returns: an iterator over resources de-duplicated by UUID.
+    """
+    merged: Iterator[Any]
+    if sort_key:
+        merged = heapq.merge(
+            *results,
+            key=lambda item: _merge_key(getattr(item, sort_key, None)),
+            reverse=sort_dir == 'desc')
+    else:
+        merged = itertools.chain.from_iterable(results)
+
+    seen = set()
+    for item in merged:
+        if item.uuid in seen:
+            continue
+        seen.add(item.uuid)
+        yield item
+        if limit and len(seen) >= limit:
+            return
+
+
+def _with_field(fields: list[str], field: str) -> list[str]:
+    return fields if field in fields else list(fields) + [field]
+
+
+# Arguments of list calls evaluated with several queries or locally.
+_UNPAGINATED_ARGUMENTS: tuple[str, ...] = ('parallel_by', 'where')
+
+# Default maximum page size of the Bare Metal API (its api.max_limit option).
+DEFAULT_PAGE_SIZE: int = 1000
+
+
+def iter_list(
+    list_func: Callable[..., Iterable[_R]],
+    limit: int | None = 0,
+    **kwargs: Any,
+) -> Iterator[_R]:
+    """Iterate over the results of a list call page by page.
+
+    Calls ``list_func`` once per page of results (the size of a page is set
+    by Ironic's ``api.max_limit`` option), passing the UUID of the last
+    resource of a page as the marker for the next one. Resources are yielded
+    as soon as their page is received instead of collecting all of them
+    first. The first page is requested by this call, so that errors are
+    raised immediately, the next ones while iterating.
+
+    :param list_func: the ``list`` method of a manager.
+    :param limit: the maximum number of resources to return: None for only
+        one page, 0 for all of them (the default), same as for ``list``.
+    :param kwargs: other arguments to ``list_func``. If ``fields`` is set,
+        ``uuid`` is fetched as well since it is required for markers. Lists
+        of filter values, ``parallel_by`` and ``where`` expressions that are
+        not fully evaluated by the server do not work with markers, the
+        results are returned at once in these cases, unless the manager
+        merges several queries itself (``NodeManager`` with lists of filter
+        values or ``parallel_by``).
+    :returns: an iterator over resources.
+    """
+    if limit is not None:
+        limit = int(limit)
+    if (limit is None
+            or any(kwargs.get(name) is not None
+                   for name in _UNPAGINATED_ARGUMENTS)
+            or any(isinstance(value, (list, tuple, set))
+                   for name, value in kwargs.items()
+                   if name not in ('fields', 'shards'))):
+        # NOTE: managers merging several queries per listing stream the
+        # merged resources, e.g. NodeManager with lists of filter values.
+        iter_merged: Callable[..., Iterator[_R] | None] | None = getattr(
+            getattr(list_func, '__self__', None), '_iter_merged', None)
+        merged = (iter_merged(limit=limit, **kwargs)
+                  if iter_merged is not None else None)
+        if merged is not None:
+            return merged
+        return iter(list_func(limit=limit, **kwargs))
+
+    if kwargs.get('fields') is not None:
+        kwargs['fields'] = _with_field(kwargs['fields'], 'uuid')
+    # NOTE: request at most one page at a time, ``list_func`` would
+    # otherwise follow the next links itself before returning.
+    page_limit = limit if limit and limit <= DEFAULT_PAGE_SIZE else None
+    page = list(list_func(limit=page_limit, **kwargs))[:limit or None]
+    if not page or page_limit is not None or len(page) == limit:
+        return iter(page)
+    return itertools.chain(page, _iter_next_pages(list_func, page, limit,
+                                                  kwargs))
+
+
+def _iter_next_pages(
+    list_func: Callable[..., Iterable[_R]],
+    page: list[_R],
+    limit: int,
+    kwargs: dict[str, Any],
+) -> Iterator[_R]:
+    # NOTE: the first page tells the maximum page size of the server.
+    page_size = len(page)
+    count = len(page)
+    while True:
+        marker = getattr(page[-1], 'uuid')
+        if marker == kwargs.get('marker'):
+            return
+        kwargs['marker'] = marker
+        remaining = limit - count if limit else None
+        page_limit = (remaining if remaining is not None
+                      and remaining <= page_size else None)
+        page = list(list_func(limit=page_limit, **kwargs))[:remaining]
+        count += len(page)
+        yield from page
+        if (not page or page_limit is not None or len(page) < page_size
+                or count == limit):
+            return
+
+
+def list_for_output(
+    list_func: Callable[..., Iterable[_R]],
+    params: Mapping[str, Any],
+    sort: str | None = None,
+) -> Iterable[_R]:
+    """List resources to be rendered by a list command.
+
+    Without sorting, resources are returned page by page as with
+    :func:`iter_list`, so that the first rows are rendered before the last
+    pages are received. Sorting happens on the client side and needs all
+    resources, they are listed at once then.
+
+    :param list_func: the ``list`` method of a manager.
+    :param params: arguments to ``list_func``.
+    :param sort: sort keys and directions in the format of the ``--sort``
+        option, e.g. ``name:desc,uuid``.
+    :returns: an iterable over resources.
+    """
+    if not sort:
+        return iter_list(list_func, **params)
+    from osc_lib import utils as oscutils
+    return oscutils.sort_items(list(list_func(**params)), sort)
+
+
+def fields_for_columns(
+    resource: resource_fields.Resource,
+    columns: Sequence[str],
+    requested: Iterable[str] | None,
+    api_version: str | list[str],
+) -> tuple[Sequence[str], list[str] | None]:
+    """Only fetch the fields shown in the requested output columns.
+
+    :param resource: the detailed resource the columns are taken from.
+    :param columns: the columns that would be listed otherwise.
+    :param requested: output columns requested with ``-c``, as fields or
+        labels of ``resource``.
+    :param api_version: the current API version, selecting fields requires
+        1.8 or newer.
+    :returns: a tuple of the columns to list and the fields to request
+        them with, the latter being None if all fields have to be fetched.
+    """
+    if not requested:
+        return columns, None
+    fields = resource.fields_for_columns(requested)
+    if not fields or not check_api_version_support(api_version, '1.8'):
+        return columns, None
+    return fields, fields
+
+
+def bulk_get(
+    keys: Iterable[str],
+    get_one: Callable[[str], _R],
+    list_all: Callable[[], Iterable[_R]],
+    key_field: str,
+    scan_threshold: int = DEFAULT_SCAN_THRESHOLD,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> tuple[dict[str, _R], list[str]]:
+    """Get many resources by a unique field.
+
+    Small batches are resolved with concurrent calls to ``get_one``.
+    Starting with ``scan_threshold`` keys, ``list_all`` is called once
+    instead and its result is indexed by ``key_field`` locally.
+
+    :param keys: values of the field to look up, compared case-insensitively.
+    :param get_one: a function returning the resource for one key or
+        raising NotFound.
+    :param list_all: a function returning all candidate resources.
+    :param key_field: the name of the field.
+    :param scan_threshold: the number of keys from which ``list_all`` is
+        used.
+    :param max_workers: the maximum number of concurrent requests.
+    :returns: a tuple (dictionary mapping found keys to resources, list of
+        keys that were not found).
+    """
+    keys = list(dict.fromkeys(keys))
+
+    found: dict[str, _R] = {}
+    if len(keys) >= scan_threshold:
+        index = {}
+        for item in list_all():
+            value = getattr(item, key_field, None)
+            if value:
+                index[value.lower()] = item
+        for key in keys:
+            if key.lower() in index:
+                found[key] = index[key.lower()]
+    else:
+        def _get(key: str) -> _R | None:
+            try:
+                return get_one(key)
+            except exc.NotFound:
+                return None
+
+        results = run_concurrently(_get, keys, max_workers=max_workers)
+        found = {key: item for key, item in zip(keys, results)
+                 if item is not None}
+
+    missing = [key for key in keys if key not in found]
+    return found, missing
+
+
+def get_by_addresses(
+    manager: Any,
+    addresses: Iterable[str],
+    fields: list[str] | None = None,
+    scan_threshold: int = DEFAULT_SCAN_THRESHOLD,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    os_ironic_api_version: str | None = None,
+    global_request_id: str | None = None,
+) -> tuple[dict[str, Any], list[str]]:
+    """Get many ports or port groups by their MAC addresses.
+
+    Small batches are resolved with concurrent ``get_by_address`` calls.
+    Starting with ``scan_threshold`` addresses, all resources are listed
+    once instead and indexed by their address locally, see
+    :func:`bulk_get`.
+
+    :param manager: a manager with ``get_by_address`` and ``list`` methods.
+    :param addresses: MAC addresses to look up.
+    :param fields: Optional, a list of fields of the resources to return.
+    :param scan_threshold: the number of addresses from which a full listing
+        is used.
+    :param max_workers: the maximum number of concurrent requests.
+    :param os_ironic_api_version: String version (e.g. "1.35") to use for
+        the requests. If not specified, the client's default is used.
+    :param global_request_id: String containing global request ID header
+        value (in form "req-<UUID>") to use for the requests.
+    :returns: a tuple (dictionary mapping found addresses to resources,
+        list of addresses that were not found).
+    """
+    request_args = {'os_ironic_api_version': os_ironic_api_version,
+                    'global_request_id': global_request_id}
+
+    def _get(address: str) -> Any:
+        return manager.get_by_address(address, fields=fields, **request_args)
+
+    def _list() -> Any:
+        if fields is None:
+            return manager.list(limit=0, detail=True, **request_args)
+        return manager.list(limit=0, fields=_with_field(fields, 'address'),
+                            **request_args)
+
+    return bulk_get(addresses, _get, _list, 'address',
+                    scan_threshold=scan_threshold, max_workers=max_workers)
+
+
 def check_api_version_support(
     current_version: str | list[str],
     required_version: str,
@@ -0,0 +1,336 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Optional local daemon running ``baremetal`` commands with warm clients.
+
+When the ``IRONICCLIENT_DAEMON`` environment variable is set to a true value,
+the standalone ``baremetal`` command sends its command line to a daemon
+listening on a Unix socket, starting the daemon on demand. The daemon keeps
+the bare metal clients (with their authentication, endpoints, connections
+and negotiated API versions) between invocations, runs one command at a time
+and exits after ``IRONICCLIENT_DAEMON_IDLE_TIMEOUT`` seconds without
+requests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+
+from openstack.config import cloud_region as os_cloud_region
+from oslo_utils import strutils
+import platformdirs
+
+from ironicclient.common import filecache
+from ironicclient.common.i18n import _
+from ironicclient.common import timing
+from ironicclient import shell
+from ironicclient.v1 import client
+
+
+LOG = logging.getLogger(__name__)
+
+DAEMON_ENV_VAR: str = 'IRONICCLIENT_DAEMON'
+IDLE_TIMEOUT_ENV_VAR: str = 'IRONICCLIENT_DAEMON_IDLE_TIMEOUT'
+DEFAULT_IDLE_TIMEOUT: int = 900  # seconds
+START_TIMEOUT: int = 10  # seconds
+SOCKET_NAME: str = 'daemon.sock'
+
+
+def enabled() -> bool:
+    """Whether commands should be run by the daemon."""
+    return strutils.bool_from_string(os.environ.get(DAEMON_ENV_VAR))
+
+
+def socket_path() -> str:
+    """Path to the socket of the daemon of the current user."""
+    return os.path.join(
+        platformdirs.user_runtime_dir(filecache.PROGNAME, filecache.AUTHOR),
+        SOCKET_NAME)
+
+
+def _idle_timeout() -> float:
+    value = os.environ.get(IDLE_TIMEOUT_ENV_VAR, DEFAULT_IDLE_TIMEOUT)
+    try:
+        return float(value)
+    except ValueError:
+        LOG.warning("Environment variable %(env_var)s should be a number "
+                    "(not '%(curr_val)s'). Using default idle timeout of "
+                    "%(default)s seconds instead.",
+                    {'env_var': IDLE_TIMEOUT_ENV_VAR, 'curr_val': value,
+                     'default': DEFAULT_IDLE_TIMEOUT})
+        return DEFAULT_IDLE_TIMEOUT
+
+
+def _connect(path: str) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _start(path: str) -> socket.socket:
+    """Start a daemon listening on the path and connect to it."""
+    subprocess.Popen([sys.executable, '-m', __name__, path],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while True:
+        try:
+            return _connect(path)
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+def run(argv: list[str], path: str | None = None) -> int | None:
+    """Run a command in the daemon, starting it if needed.
+
+    :param argv: The command line arguments.
+    :param path: The socket path, defaults to :func:`socket_path`.
+    :returns: The exit code of the command or None if the command has to be
+        run in the current process (the interactive mode, commands reading
+        the standard input or no daemon available).
+    """
+    if not argv or '-' in argv:
+        return None
+
+    path = path or socket_path()
+    try:
+        try:
+            sock = _connect(path)
+        except OSError:
+            sock = _start(path)
+    except OSError as e:
+        LOG.warning('Cannot use the ironicclient daemon at %(path)s: '
+                    '%(error)s. Running the command in process.',
+                    {'path': path, 'error': e})
+        return None
+
+    request = {'argv': argv, 'env': dict(os.environ), 'cwd': os.getcwd()}
+    with sock, sock.makefile('rwb') as stream:
+        stream.write(json.dumps(request).encode() + b'\n')
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if 'exit' in message:
+                code: int = message['exit']
+                return code
+            output = (sys.stdout if message['stream'] == 'stdout'
+                      else sys.stderr)
+            output.write(message['data'])
+            output.flush()
+
+    sys.stderr.write(_('The ironicclient daemon exited unexpectedly\n'))
+    return 1
+
+
+class _Output(io.TextIOBase):
+    """A text stream forwarding everything written to the daemon client."""
+
+    def __init__(self, wfile: io.BufferedIOBase, name: str) -> None:
+        super(_Output, self).__init__()
+        self._wfile = wfile
+        self._name = name
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return 'utf-8'
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            message = {'stream': self._name, 'data': data}
+            self._wfile.write(json.dumps(message).encode() + b'\n')
+            self._wfile.flush()
+        return len(data)
+
+
+class _ClientManager(shell.ClientManager):
+    """A client manager reusing the clients created by earlier commands."""
+
+    def __init__(
+        self,
+        cloud_region: os_cloud_region.CloudRegion,
+        options: argparse.Namespace,
+        clients: dict[str, client.Client],
+        timings: timing.Timings | None = None,
+    ) -> None:
+        super(_ClientManager, self).__init__(cloud_region, options, timings)
+        self._clients = clients
+
+    def _create_ironic_client(self) -> client.Client:
+        key = json.dumps([self.cloud_region.config,
+                          self.options.os_baremetal_api_version,
+                          self.options.max_retries,
+                          self.options.retry_interval],
+                         sort_keys=True, default=str)
+        try:
+            return self._clients[key]
+        except KeyError:
+            LOG.debug('Creating a new bare metal client in the daemon')
+            ironic = super(_ClientManager, self)._create_ironic_client()
+            self._clients[key] = ironic
+            return ironic
+
+
+class _App(shell.App):
+
+    def __init__(self, clients: dict[str, client.Client]) -> None:
+        self._clients = clients
+        super(_App, self).__init__()
+
+    def initialize_app(self, argv: list[str]) -> None:
+        super(_App, self).initialize_app(argv)
+        self.client_manager = _ClientManager(self.cloud_region, self.options,
+                                             self._clients, self.timings)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    server: Server
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        code = self.server.execute(request['argv'], request['env'],
+                                   request['cwd'],
+                                   _Output(self.wfile, 'stdout'),
+                                   _Output(self.wfile, 'stderr'))
+        try:
+            self.wfile.write(json.dumps({'exit': code}).encode() + b'\n')
+        except OSError as e:
+            LOG.debug('Client went away before the end of the command: %s',
+                      e)
+
+
+class Server(socketserver.UnixStreamServer):
+    """Unix socket server executing commands one at a time.
+
+    :param path: The socket path.
+    :param idle_timeout: Seconds without requests after which
+        :attr:`idle` is set.
+    """
+
+    request_queue_size = 64
+
+    def __init__(self, path: str, idle_timeout: float) -> None:
+        self.timeout = idle_timeout
+        self.idle = False
+        self.clients: dict[str, client.Client] = {}
+        super(Server, self).__init__(path, _Handler)
+        self.inode = os.stat(path).st_ino
+
+    def handle_timeout(self) -> None:
+        self.idle = True
+
+    def execute(self, argv: list[str], env: dict[str, str], cwd: str,
+                stdout: io.TextIOBase, stderr: io.TextIOBase) -> int:
+        """Run a command with the environment of the client.
+
+        :param argv: The command line arguments.
+        :param env: The environment variables of the client.
+        :param cwd: The working directory of the client.
+        :param stdout: The standard output of the client.
+        :param stderr: The standard error of the client.
+        :returns: The exit code.
+        """
+        saved_env = dict(os.environ)
+        saved_cwd = os.getcwd()
+        saved_streams = sys.stdin, sys.stdout, sys.stderr
+        # NOTE: cliff and the shell attach handlers to the current streams on
+        # every run, drop them afterwards.
+        loggers = [logging.getLogger(name) for name in ('', 'ironicclient')]
+        saved_handlers = [list(logger.handlers) for logger in loggers]
+
+        os.environ.clear()
+        os.environ.update(env)
+        sys.stdin = io.StringIO()
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            os.chdir(cwd)
+            code: int = _App(self.clients).run(argv)
+            return code
+        except SystemExit as e:
+            # argparse exits on --help, --version and invalid arguments.
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            stderr.write('%s\n' % e.code)
+            return 1
+        except Exception as e:
+            LOG.exception('Unexpected error when running %s', argv)
+            stderr.write('%s\n' % e)
+            return 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            for logger, handlers in zip(loggers, saved_handlers):
+                logger.handlers[:] = handlers
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+
+def serve(path: str, idle_timeout: float) -> None:
+    """Serve commands on the socket until idle.
+
+    :param path: The socket path.
+    :param idle_timeout: Seconds without requests after which to exit.
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+    # Only the current user may talk to the daemon.
+    umask = os.umask(0o177)
+    try:
+        server = Server(path, idle_timeout)
+    finally:
+        os.umask(umask)
+
+    with server:
+        try:
+            while not server.idle:
+                server.handle_request()
+        finally:
+            # NOTE: the socket may have been replaced by a daemon started
+            # concurrently, only remove our own.
+            with contextlib.suppress(OSError):
+                if os.stat(path).st_ino == server.inode:
+                    os.unlink(path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Daemon running baremetal commands with warm clients')
+    parser.add_argument('socket', nargs='?',
+                        help='Socket path, defaults to %s' % socket_path())
+    args = parser.parse_args(argv)
+    serve(args.socket or socket_path(), _idle_timeout())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+"""Output formatters for ironicclient OSC commands.
+
+The formatters are registered in the ``cliff.formatter.list`` namespace and
+are available as ``-f <name>`` for every list command.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Sequence
+import json
+from typing import Any, TextIO
+
+from cliff import columns
+from cliff.formatters import base
+
+
+class NDJSONFormatter(base.ListFormatter):
+    """Newline-delimited JSON: one JSON object per row.
+
+    Every row is written and flushed as soon as it is produced, so consumers
+    (``jq``, log shippers) receive the first rows while the rest are still
+    being fetched.
+    """
+
+    def add_argument_group(self, parser: argparse.ArgumentParser) -> None:
+        pass
+
+    def emit_list(
+        self,
+        column_names: Sequence[str],
+        data: Iterable[Sequence[Any]],
+        stdout: TextIO,
+        parsed_args: argparse.Namespace,
+    ) -> None:
+        for row in data:
+            item = {
+                name: (value.machine_readable()
+                       if isinstance(value, columns.FormattableColumn)
+                       else value)
+                for name, value in zip(column_names, row)
+            }
+            stdout.write(json.dumps(item, separators=(',', ':'),
+                                    default=str) + '\n')
+            stdout.flush()
@@ -253,7 +253,7 @@ class ListBaremetalAllocation(command.Lister):
                 params[field] = value
 
         if parsed_args.long:
-            columns = res_fields.ALLOCATION_DETAILED_RESOURCE.fields
+            columns: Sequence[str] = res_fields.ALLOCATION_DETAILED_RESOURCE.fields
         elif parsed_args.fields:
             fields = itertools.chain.from_iterable(parsed_args.fields)
             resource = res_fields.Resource(list(fields))
@@ -262,10 +262,18 @@ class ListBaremetalAllocation(command.Lister):
         else:
             columns = res_fields.ALLOCATION_RESOURCE.fields
 
-        self.log.debug("params(%s)", params)
-        data = client.allocation.list(**params)
+        if not parsed_args.fields and not parsed_args.sort:
+            columns, column_fields = utils.fields_for_columns(
+                res_fields.ALLOCATION_DETAILED_RESOURCE, columns,
+                parsed_args.columns, client.current_api_version)
+            if column_fields:
+                params['fields'] = column_fields
+                # Columns may be given as labels, select them by field.
+                parsed_args.columns = column_fields
 
-        data = oscutils.sort_items(data, parsed_args.sort)
+        self.log.debug("params(%s)", params)
+        data = utils.list_for_output(client.allocation.list, params,
+                                     parsed_args.sort)
 
         return (columns,
                 (oscutils.get_item_properties(s, columns) for s in data))
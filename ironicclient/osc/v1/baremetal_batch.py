@@ -0,0 +1,241 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Iterable, Iterator
+from concurrent import futures
+import io
+import logging
+import shlex
+import threading
+from typing import Any
+
+from ironicclient.common.i18n import _
+from ironicclient.common import utils
+from ironicclient import exc
+from ironicclient.osc import command
+
+
+def _read_commands(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """Read commands, joining lines ending with a backslash.
+
+    :param lines: The lines of the batch file.
+    :returns: An iterator over tuples (line number, command line), skipping
+        blank lines and comments.
+    """
+    start = None
+    parts: list[str] = []
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if start is None:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            start = number
+        if line.endswith('\\'):
+            parts.append(line[:-1])
+            continue
+        parts.append(line)
+        yield start, ' '.join(parts)
+        start = None
+        parts = []
+    if start is not None:
+        yield start, ' '.join(parts)
+
+
+class _CommandOutput(object):
+    """An output stream buffering the output of each thread.
+
+    Used with concurrent commands so that their output does not interleave.
+
+    :param stream: The stream to write to outside of commands.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self.stream = stream
+        self._local = threading.local()
+
+    def start(self) -> None:
+        """Start buffering the output of the current thread."""
+        self._local.buffer = io.StringIO()
+
+    def finish(self) -> str:
+        """Stop buffering the output of the current thread.
+
+        :returns: The buffered output.
+        """
+        buffer: io.StringIO | None = self._local.__dict__.pop('buffer', None)
+        return buffer.getvalue() if buffer is not None else ''
+
+    def write(self, data: str) -> int:
+        buffer: io.StringIO | None = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            result: int = self.stream.write(data)
+            return result
+        return buffer.write(data)
+
+    def flush(self) -> None:
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+class BatchBaremetal(command.Command):
+    """Run baremetal commands from a file in one process"""
+
+    log: logging.Logger = logging.getLogger(__name__ + ".BatchBaremetal")
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser: argparse.ArgumentParser = super().get_parser(prog_name)
+
+        parser.add_argument(
+            "batch_file", metavar="<file>",
+            help=_("File with one command per line using the command line "
+                   "syntax, with or without the leading 'baremetal' or "
+                   "'openstack baremetal'. Blank lines and lines starting "
+                   "with '#' are ignored, a trailing backslash continues a "
+                   "command on the next line. Use '-' to read the commands "
+                   "from the standard input."))
+        parser.add_argument(
+            "--parallel", metavar="<workers>", type=int, nargs="?",
+            const=utils.DEFAULT_MAX_WORKERS, default=None,
+            help=_("Run up to <workers> commands concurrently (%d if not "
+                   "specified), printing the output of each command when it "
+                   "finishes. Commands are run in order by default.")
+            % utils.DEFAULT_MAX_WORKERS)
+        parser.add_argument(
+            "--stop-on-error", action="store_true", default=False,
+            help=_("Do not start new commands once a command has failed."))
+        return parser
+
+    def _find_command(self, argv: list[str]) -> tuple[Any, str, list[str]]:
+        if argv[:1] == ['openstack']:
+            argv = argv[1:]
+        # NOTE: the standalone CLI registers commands without the
+        # 'baremetal' prefix, the OpenStack CLI with it.
+        if argv[:1] == ['baremetal']:
+            candidates = [argv, argv[1:]]
+        else:
+            candidates = [argv, ['baremetal'] + argv]
+        for candidate in candidates:
+            if not candidate:
+                continue
+            try:
+                cmd_factory, cmd_name, sub_argv = (
+                    self.app.command_manager.find_command(candidate))
+            except ValueError:
+                continue
+            if cmd_name == self.cmd_name:
+                raise exc.CommandError(
+                    _("Batch commands cannot be nested"))
+            return cmd_factory, cmd_name, sub_argv
+        raise exc.CommandError(_("Unknown command: %s") % ' '.join(argv))
+
+    def _run_command(self, line: str) -> int:
+        argv = shlex.split(line, comments=True)
+        if not argv:
+            return 0
+        cmd_factory, cmd_name, sub_argv = self._find_command(argv)
+        cmd = cmd_factory(self.app, self.app_args, cmd_name=cmd_name)
+        parser = cmd.get_parser(cmd_name)
+        try:
+            parsed_args = parser.parse_args(sub_argv)
+        except SystemExit:
+            # argparse has already printed the error.
+            raise exc.CommandError(_("Invalid arguments"))
+        result: int = cmd.run(parsed_args)
+        return result
+
+    def take_action(self, parsed_args: argparse.Namespace) -> None:
+        if parsed_args.parallel is not None and parsed_args.parallel < 1:
+            raise exc.CommandError(
+                _("The number of workers must be a positive integer"))
+
+        lock = threading.Lock()
+        failed = threading.Event()
+        counts = {'total': 0, 'failed': 0}
+        output = None
+        if parsed_args.parallel is not None and parsed_args.parallel > 1:
+            output = _CommandOutput(self.app.stdout)
+
+        def _run(item: tuple[int, str]) -> None:
+            number, line = item
+            ok = False
+            if output is not None:
+                output.start()
+            if failed.is_set() and parsed_args.stop_on_error:
+                status = _("SKIPPED")
+            else:
+                try:
+                    result = self._run_command(line)
+                except Exception as e:
+                    self.log.debug('Line %d failed', number, exc_info=True)
+                    status = _("FAILED: %s") % e
+                else:
+                    ok = not result
+                    status = (_("OK") if ok
+                              else _("FAILED: exit code %d") % result)
+            with lock:
+                counts['total'] += 1
+                if not ok:
+                    counts['failed'] += 1
+                    failed.set()
+                if output is not None:
+                    output.stream.write(output.finish())
+                self.app.stderr.write(_("Line %(line)d: %(status)s") %
+                                      {'line': number, 'status': status}
+                                      + '\n')
+                self.app.stderr.flush()
+
+        stdout = self.app.stdout
+        if output is not None:
+            self.app.stdout = output
+        try:
+            if parsed_args.batch_file == '-':
+                commands = _read_commands(self.app.stdin)
+                self._run_all(_run, commands, parsed_args.parallel)
+            else:
+                try:
+                    with open(parsed_args.batch_file) as f:
+                        self._run_all(_run, _read_commands(f),
+                                      parsed_args.parallel)
+                except OSError as e:
+                    raise exc.CommandError(
+                        _("Cannot read file %(file)s: %(error)s")
+                        % {'file': parsed_args.batch_file, 'error': e})
+        finally:
+            self.app.stdout = stdout
+
+        if counts['failed']:
+            raise exc.CommandError(
+                _("%(failed)d of %(total)d commands did not succeed")
+                % counts)
+
+    def _run_all(
+        self,
+        run: Callable[[tuple[int, str]], None],
+        commands: Iterator[tuple[int, str]],
+        max_workers: int | None,
+    ) -> None:
+        if not max_workers or max_workers <= 1:
+            for item in commands:
+                run(item)
+            return
+
+        # NOTE: create the client before starting the threads so that all
+        # commands share it.
+        self.app.client_manager.baremetal
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(run, commands))
@@ -179,7 +179,7 @@ class ListBaremetalChassis(command.Lister):
         manager = self.app.client_manager
         client = manager.baremetal
 
-        columns = res_fields.CHASSIS_RESOURCE.fields
+        columns: Sequence[str] = res_fields.CHASSIS_RESOURCE.fields
 
         params: dict[str, object] = {}
         if parsed_args.limit is not None and parsed_args.limit < 0:
@@ -198,10 +198,19 @@ class ListBaremetalChassis(command.Lister):
             columns = resource.fields
             params['fields'] = columns
 
-        self.log.debug("params(%s)", params)
-        data = client.chassis.list(**params)
+        if not parsed_args.fields and not parsed_args.sort:
+            columns, column_fields = utils.fields_for_columns(
+                res_fields.CHASSIS_DETAILED_RESOURCE, columns,
+                parsed_args.columns, client.current_api_version)
+            if column_fields:
+                params['detail'] = False
+                params['fields'] = column_fields
+                # Columns may be given as labels, select them by field.
+                parsed_args.columns = column_fields
 
-        data = oscutils.sort_items(data, parsed_args.sort)
+        self.log.debug("params(%s)", params)
+        data = utils.list_for_output(client.chassis.list, params,
+                                     parsed_args.sort)
 
         return (columns,
                 (oscutils.get_item_properties(s, columns, formatters={
@@ -16,8 +16,12 @@ import argparse
 import logging
 
 from ironicclient.common.i18n import _
+from ironicclient.common import journal
+from ironicclient.common import utils
+from ironicclient import exc
 from ironicclient.osc import command
 from ironicclient.v1 import create_resources
+from ironicclient.v1 import reconcile
 
 
 class CreateBaremetal(command.Command):
@@ -31,11 +35,78 @@ class CreateBaremetal(command.Command):
 
         parser.add_argument(
             "resource_files", metavar="<file>", nargs="+",
-            help=_("File (.yaml or .json) containing descriptions of the "
-                   "resources to create. Can be specified multiple times."))
+            help=_("File (.yaml, .json, .ndjson or .jsonl) containing "
+                   "descriptions of the resources to create. Can be "
+                   "specified multiple times."))
+        parser.add_argument(
+            "--parallel", metavar="<workers>", type=int, nargs="?",
+            const=utils.DEFAULT_MAX_WORKERS, default=None,
+            help=_("Create resources concurrently using up to <workers> "
+                   "concurrent requests (%d if not specified). Nodes are "
+                   "created once their chassis is created, port groups and "
+                   "ports once their node is created. With --reconcile, "
+                   "changes are always applied concurrently, this option "
+                   "sets the number of concurrent requests.")
+            % utils.DEFAULT_MAX_WORKERS)
+        parser.add_argument(
+            "--stream", action="store_true", default=False,
+            help=_("Start creating resources while reading the files "
+                   "instead of validating all of them first. Invalid "
+                   "descriptions are reported at the end together with "
+                   "creation errors."))
+        parser.add_argument(
+            "--resume", metavar="<journal>", default=None,
+            help=_("Record created resources in the journal file "
+                   "<journal>. If the file exists, resources already "
+                   "created according to it are skipped, which allows "
+                   "resuming an interrupted creation."))
+        parser.add_argument(
+            "--reconcile", action="store_true", default=False,
+            help=_("Instead of creating all resources, compare them with "
+                   "the existing ones, then create the missing resources "
+                   "and update the ones that differ. Resources are matched "
+                   "by UUID, name (nodes and port groups), description "
+                   "(chassis) or address (ports and port groups)."))
+        parser.add_argument(
+            "--delete", action="store_true", default=False,
+            help=_("With --reconcile, also delete chassis, nodes, port "
+                   "groups and ports that are not described in the files."))
+        parser.add_argument(
+            "--dry-run", action="store_true", default=False,
+            help=_("With --reconcile, only print the changes that would be "
+                   "made."))
         return parser
 
     def take_action(self, parsed_args: argparse.Namespace) -> None:
-        create_resources.create_resources(
+        if parsed_args.parallel is not None and parsed_args.parallel < 1:
+            raise exc.CommandError(
+                _("The number of workers must be a positive integer"))
+
+        if parsed_args.reconcile and (parsed_args.stream
+                                      or parsed_args.resume):
+            raise exc.CommandError(
+                _("--stream and --resume cannot be used with --reconcile"))
+
+        if not parsed_args.reconcile:
+            if parsed_args.delete or parsed_args.dry_run:
+                raise exc.CommandError(
+                    _("--delete and --dry-run can only be used with "
+                      "--reconcile"))
+            with journal.open_journal(parsed_args.resume) as bulk_journal:
+                create_resources.create_resources(
+                    self.app.client_manager.baremetal,
+                    parsed_args.resource_files,
+                    max_workers=parsed_args.parallel or 1,
+                    stream=parsed_args.stream,
+                    journal=bulk_journal)
+            return
+
+        actions = reconcile.reconcile_resources(
             self.app.client_manager.baremetal,
-            parsed_args.resource_files)
+            parsed_args.resource_files,
+            delete=parsed_args.delete,
+            dry_run=parsed_args.dry_run,
+            max_workers=parsed_args.parallel or utils.DEFAULT_MAX_WORKERS,
+            output=lambda line: self.app.stdout.write(line + '\n'))
+        if not actions:
+            self.app.stdout.write(_('Nothing to do') + '\n')
@@ -0,0 +1,64 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from ironicclient.common.i18n import _
+from ironicclient import exc
+from ironicclient.osc import command
+from ironicclient.v1 import export_resources
+
+
+class ExportBaremetal(command.Command):
+    """Export resources to a file accepted by 'baremetal create'"""
+
+    log: logging.Logger = logging.getLogger(
+        __name__ + ".ExportBaremetal")
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser: argparse.ArgumentParser = super().get_parser(prog_name)
+
+        parser.add_argument(
+            "--format", dest="export_format", metavar="<format>",
+            choices=export_resources.FORMATS, default="ndjson",
+            help=_("Output format: 'ndjson' (the default) for one JSON "
+                   "document per line or 'yaml' for a YAML stream with one "
+                   "document per chassis or node."))
+        parser.add_argument(
+            "--output", metavar="<file>", default=None,
+            help=_("File to write the resources to. Defaults to the "
+                   "standard output. Secrets, such as BMC passwords, are "
+                   "masked by the API and are not exported."))
+        return parser
+
+    def take_action(self, parsed_args: argparse.Namespace) -> None:
+        self.log.debug("take_action(%s)", parsed_args)
+        client = self.app.client_manager.baremetal
+
+        if parsed_args.output is None:
+            export_resources.export_resources(
+                client, self.app.stdout, parsed_args.export_format)
+            return
+
+        try:
+            with open(parsed_args.output, 'w') as output:
+                count = export_resources.export_resources(
+                    client, output, parsed_args.export_format)
+        except OSError as e:
+            raise exc.CommandError(
+                _('Cannot write to "%(file)s": %(err)s') %
+                {'file': parsed_args.output, 'err': e})
+        self.log.info('Exported %(count)d resources descriptions to %(file)s',
+                      {'count': count, 'file': parsed_args.output})
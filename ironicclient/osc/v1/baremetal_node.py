@@ -17,19 +17,23 @@
 from __future__ import annotations
 
 import argparse
+import collections
 from collections.abc import Iterable, Sequence
 import itertools
 import json
 import logging
 import sys
+import time
 from typing import Any, cast
 
 from osc_lib import utils as oscutils
 
 from ironicclient.common.i18n import _
+from ironicclient.common import journal
 from ironicclient.common import utils
 from ironicclient import exc
 from ironicclient.osc import command
+from ironicclient.v1 import join
 from ironicclient.v1 import resource_fields as res_fields
 from ironicclient.v1 import utils as v1_utils
 
@@ -52,6 +56,26 @@ NETWORK_DATA_ARG_HELP = _(
     "being used, network configuration may or may not been served to the "
     "node for offline network configuration.")
 
+
+class StoreOrAppendAction(argparse.Action):
+    """Store a value, collect values into a list if repeated."""
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Any,
+        option_string: str | None = None,
+    ) -> None:
+        current = getattr(namespace, self.dest, None)
+        if current is None:
+            setattr(namespace, self.dest, values)
+        elif isinstance(current, list):
+            current.append(values)
+        else:
+            setattr(namespace, self.dest, [current, values])
+
+
 SUPPORTED_INTERFACES: list[str] = [
     'bios', 'boot', 'console', 'deploy', 'firmware',
     'inspect', 'management', 'network', 'power', 'raid',
@@ -82,6 +106,14 @@ class ProvisionStateBaremetalNode(command.Command):
             required=False,
             choices=[self.PROVISION_STATE],
             help=argparse.SUPPRESS)
+        parser.add_argument(
+            '--resume',
+            metavar='<journal>',
+            default=None,
+            help=_("Record nodes whose provision state was changed in the "
+                   "journal file <journal>. If the file exists, nodes "
+                   "already recorded in it are skipped, which allows "
+                   "resuming an interrupted operation."))
         return parser
 
     def take_action(self, parsed_args: argparse.Namespace) -> None:
@@ -119,17 +151,30 @@ class ProvisionStateBaremetalNode(command.Command):
                 _("You cannot supply --runbook and --disable-ramdisk together")
             )
 
-        for node in parsed_args.nodes:
-            baremetal_client.node.set_provision_state(
-                node,
-                parsed_args.provision_state,
-                configdrive=config_drive,
-                cleansteps=clean_steps,
-                deploysteps=deploy_steps,
-                rescue_password=rescue_password,
-                servicesteps=service_steps,
-                runbook=runbook,
-                disable_ramdisk=disable_ramdisk)
+        with journal.open_journal(parsed_args.resume) as bulk_journal:
+            for node in parsed_args.nodes:
+                key = 'provision:%s:%s' % (parsed_args.provision_state, node)
+                if bulk_journal is not None and bulk_journal.is_done(key):
+                    self.log.debug("Skipping node %s, already processed "
+                                   "according to the journal", node)
+                    continue
+                try:
+                    baremetal_client.node.set_provision_state(
+                        node,
+                        parsed_args.provision_state,
+                        configdrive=config_drive,
+                        cleansteps=clean_steps,
+                        deploysteps=deploy_steps,
+                        rescue_password=rescue_password,
+                        servicesteps=service_steps,
+                        runbook=runbook,
+                        disable_ramdisk=disable_ramdisk)
+                except Exception as e:
+                    if bulk_journal is not None:
+                        bulk_journal.record(key, error=e)
+                    raise
+                if bulk_journal is not None:
+                    bulk_journal.record(key)
 
 
 class ProvisionStateWithWait(ProvisionStateBaremetalNode):
@@ -708,6 +753,14 @@ class DeleteBaremetalNode(command.Command):
             metavar="<node>",
             nargs="+",
             help=_("Node(s) to delete (name or UUID)"))
+        parser.add_argument(
+            "--resume",
+            metavar="<journal>",
+            default=None,
+            help=_("Record deleted nodes in the journal file <journal>. If "
+                   "the file exists, nodes already deleted according to it "
+                   "are skipped, which allows resuming an interrupted "
+                   "deletion."))
 
         return parser
 
@@ -717,13 +770,24 @@ class DeleteBaremetalNode(command.Command):
         baremetal_client = self.app.client_manager.baremetal
 
         failures: list[str] = []
-        for node in parsed_args.nodes:
-            try:
-                baremetal_client.node.delete(node)
-                print(_('Deleted node %s') % node)
-            except exc.ClientException as e:
-                failures.append(_("Failed to delete node %(node)s: %(error)s")
-                                % {'node': node, 'error': e})
+        with journal.open_journal(parsed_args.resume) as bulk_journal:
+            for node in parsed_args.nodes:
+                key = 'delete:node:%s' % node
+                if bulk_journal is not None and bulk_journal.is_done(key):
+                    print(_('Skipping node %s, already deleted') % node)
+                    continue
+                try:
+                    baremetal_client.node.delete(node)
+                    print(_('Deleted node %s') % node)
+                except exc.ClientException as e:
+                    failures.append(
+                        _("Failed to delete node %(node)s: %(error)s")
+                        % {'node': node, 'error': e})
+                    if bulk_journal is not None:
+                        bulk_journal.record(key, error=e)
+                else:
+                    if bulk_journal is not None:
+                        bulk_journal.record(key)
 
         if failures:
             raise exc.ClientException("\n".join(failures))
@@ -778,6 +842,11 @@ class ListBaremetalNode(command.Lister):
         'active', 'deleted', 'rebuild', 'inspect', 'provide',
         'manage', 'clean', 'adopt', 'abort']
 
+    WATCH_INTERVAL: int = 5  # seconds
+    WATCH_FIELDS: list[str] = ['provision_state', 'power_state']
+    # Set once watching is interrupted, the changes are already output.
+    _watch_finished: bool = False
+
     def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
         parser: argparse.ArgumentParser
         parser = super().get_parser(prog_name)
@@ -837,7 +906,9 @@ class ListBaremetalNode(command.Lister):
             '--fault',
             dest='fault',
             metavar='<fault>',
-            help=_("List nodes in specified fault."))
+            action=StoreOrAppendAction,
+            help=_("List nodes in specified fault. Can be repeated to list "
+                   "nodes matching any of the values."))
         associated_group = parser.add_mutually_exclusive_group()
         associated_group.add_argument(
             '--associated',
@@ -853,26 +924,37 @@ class ListBaremetalNode(command.Lister):
             '--provision-state',
             dest='provision_state',
             metavar='<provision state>',
-            help=_("List nodes in specified provision state."))
+            action=StoreOrAppendAction,
+            help=_("List nodes in specified provision state. Can be repeated "
+                   "to list nodes matching any of the values."))
         parser.add_argument(
             '--driver',
             dest='driver',
             metavar='<driver>',
-            help=_("Limit list to nodes with driver <driver>"))
+            action=StoreOrAppendAction,
+            help=_("Limit list to nodes with driver <driver>. Can be "
+                   "repeated to list nodes matching any of the values."))
         parser.add_argument(
             '--resource-class',
             dest='resource_class',
             metavar='<resource class>',
-            help=_("Limit list to nodes with resource class <resource class>"))
+            action=StoreOrAppendAction,
+            help=_("Limit list to nodes with resource class <resource class>. "
+                   "Can be repeated to list nodes matching any of the "
+                   "values."))
         parser.add_argument(
             '--conductor-group',
             metavar='<conductor_group>',
+            action=StoreOrAppendAction,
             help=_("Limit list to nodes with conductor group <conductor "
-                   "group>"))
+                   "group>. Can be repeated to list nodes matching any of "
+                   "the values."))
         parser.add_argument(
             '--conductor',
             metavar='<conductor>',
-            help=_("Limit list to nodes with conductor <conductor>"))
+            action=StoreOrAppendAction,
+            help=_("Limit list to nodes with conductor <conductor>. Can be "
+                   "repeated to list nodes matching any of the values."))
         parser.add_argument(
             '--chassis',
             dest='chassis',
@@ -881,13 +963,15 @@ class ListBaremetalNode(command.Lister):
         parser.add_argument(
             '--owner',
             metavar='<owner>',
-            help=_("Limit list to nodes with owner "
-                   "<owner>"))
+            action=StoreOrAppendAction,
+            help=_("Limit list to nodes with owner <owner>. Can be repeated "
+                   "to list nodes matching any of the values."))
         parser.add_argument(
             '--lessee',
             metavar='<lessee>',
-            help=_("Limit list to nodes with lessee "
-                   "<lessee>"))
+            action=StoreOrAppendAction,
+            help=_("Limit list to nodes with lessee <lessee>. Can be "
+                   "repeated to list nodes matching any of the values."))
         parser.add_argument(
             '--description-contains',
             metavar='<description_contains>',
@@ -915,6 +999,31 @@ class ListBaremetalNode(command.Lister):
             nargs='+',
             metavar='<shards>',
             help=_("List only nodes that are in shards <shards>."))
+        parser.add_argument(
+            '--with-ports',
+            action='store_true',
+            default=False,
+            help=_("Also show the ports and port groups of each node. With "
+                   "'--limit 0', all ports and port groups are fetched with "
+                   "one listing each and joined locally, otherwise only the "
+                   "ones of the listed nodes."))
+        parser.add_argument(
+            '--parallel-by',
+            dest='parallel_by',
+            choices=['shard'],
+            help=_("List nodes of each shard concurrently. Speeds up "
+                   "listing all nodes of large deployments."))
+        parser.add_argument(
+            '--where',
+            metavar='<expression>',
+            help=_("Limit list to nodes matching the query expression, e.g. "
+                   "\"properties/memory_mb > 65536 and traits contains "
+                   "CUSTOM_GPU\". Supports comparisons (==, !=, <, <=, >, "
+                   ">=, =~, in, not in, contains) of fields, nested fields "
+                   "separated with '/', combined with and, or and not. "
+                   "Conditions supported by the API are evaluated on the "
+                   "server, the rest locally; --limit then applies to the "
+                   "nodes fetched from the server."))
         display_group = parser.add_mutually_exclusive_group(required=False)
         display_group.add_argument(
             '--long',
@@ -944,6 +1053,27 @@ class ListBaremetalNode(command.Lister):
             metavar="<parent_node>",
             help=_('List only nodes associated with a parent node.'),
         )
+        parser.add_argument(
+            '--watch',
+            metavar='<interval>',
+            type=float,
+            nargs='?',
+            const=self.WATCH_INTERVAL,
+            default=None,
+            help=_("Poll the nodes every <interval> seconds (%d if not "
+                   "specified) until interrupted. All nodes are shown "
+                   "first, then only the nodes that appeared or whose "
+                   "provision or power state changed. Deleted nodes are "
+                   "reported on the standard error. All nodes are polled "
+                   "unless --limit is specified.")
+            % self.WATCH_INTERVAL)
+        parser.add_argument(
+            '--watch-summary',
+            action='store_true',
+            default=False,
+            help=_("With --watch, show the number of nodes in each "
+                   "provision and power state instead of the nodes, "
+                   "whenever it changes. Only the states are fetched."))
         return parser
 
     def take_action(
@@ -952,7 +1082,7 @@ class ListBaremetalNode(command.Lister):
         self.log.debug("take_action(%s)", parsed_args)
         client = self.app.client_manager.baremetal
 
-        columns = res_fields.NODE_RESOURCE.fields
+        columns: Sequence[str] = res_fields.NODE_RESOURCE.fields
 
         params: dict[str, object] = {}
         if parsed_args.limit is not None and parsed_args.limit < 0:
@@ -978,6 +1108,10 @@ class ListBaremetalNode(command.Lister):
                 params[field] = getattr(parsed_args, field)
         if parsed_args.include_children:
             params['include_children'] = True
+        if parsed_args.where:
+            params['where'] = parsed_args.where
+        if parsed_args.parallel_by:
+            params['parallel_by'] = parsed_args.parallel_by
         if parsed_args.long:
             params['detail'] = parsed_args.long
             columns = res_fields.NODE_DETAILED_RESOURCE.fields
@@ -988,15 +1122,146 @@ class ListBaremetalNode(command.Lister):
             columns = resource.fields
             params['fields'] = columns
 
+        if not parsed_args.fields and not parsed_args.sort:
+            columns, column_fields = utils.fields_for_columns(
+                res_fields.NODE_DETAILED_RESOURCE, columns,
+                parsed_args.columns, client.current_api_version)
+            if column_fields:
+                params['detail'] = False
+                params['fields'] = column_fields
+                # Columns may be given as labels, select them by field.
+                parsed_args.columns = column_fields
+
         self.log.debug("params(%s)", params)
-        data = client.node.list(**params)
+        if parsed_args.watch is not None:
+            return self._watch(client, params, columns, parsed_args)
+        if parsed_args.watch_summary:
+            raise exc.CommandError(
+                _('--watch-summary can only be used with --watch'))
+        if parsed_args.with_ports:
+            return self._list_with_ports(client, params, columns,
+                                         parsed_args.sort)
 
-        data = oscutils.sort_items(data, parsed_args.sort)
+        data = utils.list_for_output(client.node.list, params,
+                                     parsed_args.sort)
 
         return (columns,
                 (oscutils.get_item_properties(s, columns, formatters={
                     'Properties': utils.HashColumn},) for s in data))
 
+    def _watch(
+        self,
+        client: Any,
+        params: dict[str, Any],
+        columns: Sequence[str],
+        parsed_args: argparse.Namespace,
+    ) -> tuple[Sequence[str], Iterable[Any]]:
+        """Poll the nodes, printing only changes, until interrupted."""
+        if parsed_args.watch <= 0:
+            raise exc.CommandError(
+                _('Expected a positive --watch interval, got %s') %
+                parsed_args.watch)
+        if parsed_args.with_ports or parsed_args.marker:
+            raise exc.CommandError(
+                _('--watch cannot be used with --with-ports or --marker'))
+
+        if parsed_args.watch_summary:
+            columns = self.WATCH_FIELDS + ['count']
+            parsed_args.columns = []
+            if utils.check_api_version_support(client.current_api_version,
+                                               '1.8'):
+                params['detail'] = False
+                params['fields'] = self.WATCH_FIELDS
+        elif params.get('fields'):
+            # The UUID and the states are needed to detect changes, even if
+            # not shown.
+            params['fields'] = list(params['fields']) + [
+                field for field in ['uuid'] + self.WATCH_FIELDS
+                if field not in params['fields']]
+        if params.get('limit') is None:
+            # Poll all nodes, not only the first page.
+            params['limit'] = 0
+
+        previous_states: dict[str, tuple[Any, ...]] = {}
+        previous_counts: collections.Counter[tuple[Any, ...]] | None = None
+        try:
+            while True:
+                nodes = list(utils.iter_list(client.node.list, **params))
+                if parsed_args.watch_summary:
+                    counts = collections.Counter(
+                        tuple(getattr(node, field, None)
+                              for field in self.WATCH_FIELDS)
+                        for node in nodes)
+                    if counts != previous_counts:
+                        rows = [states + (count,) for states, count in
+                                sorted(counts.items(),
+                                       key=lambda item: str(item[0]))]
+                        self.produce_output(parsed_args, columns, rows)
+                    previous_counts = counts
+                else:
+                    states = {node.uuid: tuple(getattr(node, field, None)
+                                               for field in self.WATCH_FIELDS)
+                              for node in nodes}
+                    changed = [node for node in nodes
+                               if previous_states.get(node.uuid)
+                               != states[node.uuid]]
+                    if parsed_args.sort:
+                        changed = oscutils.sort_items(changed,
+                                                      parsed_args.sort)
+                    if changed:
+                        self.produce_output(
+                            parsed_args, columns,
+                            [oscutils.get_item_properties(
+                                node, columns,
+                                formatters={'Properties': utils.HashColumn})
+                             for node in changed])
+                    for uuid in previous_states:
+                        if uuid not in states:
+                            self.app.stderr.write(
+                                _('Node %s was deleted\n') % uuid)
+                    previous_states = states
+                time.sleep(parsed_args.watch)
+        except KeyboardInterrupt:
+            self._watch_finished = True
+        return columns, []
+
+    def produce_output(
+        self,
+        parsed_args: argparse.Namespace,
+        column_names: Sequence[str],
+        data: Iterable[Any],
+    ) -> int:
+        # NOTE: there is no result set left to output after watching.
+        if self._watch_finished:
+            return 0
+        result: int = super().produce_output(parsed_args, column_names, data)
+        return result
+
+    def _list_with_ports(
+        self,
+        client: Any,
+        params: dict[str, Any],
+        columns: Sequence[str],
+        sort: str | None,
+    ) -> tuple[Sequence[str], Iterable[Any]]:
+        data = join.list_nodes_with_ports(
+            client,
+            port_fields=['address'],
+            portgroup_fields=['name', 'address'],
+            **params)
+        for node in data:
+            node['ports'] = ', '.join(port['address']
+                                      for port in node['ports'])
+            node['portgroups'] = ', '.join(pg['name'] or pg['uuid']
+                                           for pg in node['portgroups'])
+        if sort:
+            data = oscutils.sort_items(data, sort)
+
+        columns = tuple(columns) + ('ports', 'portgroups')
+        return (columns,
+                (oscutils.get_dict_properties(s, columns, formatters={
+                    'Properties': utils.HashColumn},) for s in data))
+
 
 class MaintenanceSetBaremetalNode(command.Command):
     """Set baremetal node to maintenance mode"""
@@ -1807,6 +2072,102 @@ class ShowBaremetalNode(command.ShowOne):
         return self.dict2columns(node)
 
 
+class SummaryBaremetalNode(command.Lister):
+    """Count baremetal nodes grouped by the values of some fields"""
+
+    log: logging.Logger = logging.getLogger(
+        __name__ + ".SummaryBaremetalNode")
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser: argparse.ArgumentParser = super().get_parser(prog_name)
+        parser.add_argument(
+            '--group-by',
+            metavar='<field>[,<field>...]',
+            default='provision_state',
+            help=_("Comma-separated node fields to group nodes by (default: "
+                   "provision_state), nested fields separated with '/', "
+                   "e.g. \"provision_state,conductor_group\" or "
+                   "\"properties/cpu_arch\". Only these fields are fetched "
+                   "from the server."))
+        maint_group = parser.add_mutually_exclusive_group(required=False)
+        maint_group.add_argument(
+            '--maintenance',
+            dest='maintenance',
+            action='store_true',
+            default=None,
+            help=_("Only count nodes in maintenance mode"),
+        )
+        maint_group.add_argument(
+            '--no-maintenance',
+            dest='maintenance',
+            action='store_false',
+            default=None,
+            help=_("Only count nodes not in maintenance mode"),
+        )
+        for option, metavar in [('--provision-state', '<provision state>'),
+                                ('--driver', '<driver>'),
+                                ('--resource-class', '<resource class>'),
+                                ('--conductor-group', '<conductor group>'),
+                                ('--owner', '<owner>'),
+                                ('--lessee', '<lessee>')]:
+            parser.add_argument(
+                option,
+                metavar=metavar,
+                action=StoreOrAppendAction,
+                help=_("Only count nodes with %(option)s %(metavar)s. Can be "
+                       "repeated to count nodes matching any of the values.")
+                % {'option': option[2:].replace('-', ' '),
+                   'metavar': metavar})
+        parser.add_argument(
+            '--parallel-by',
+            dest='parallel_by',
+            choices=['shard'],
+            help=_("List nodes of each shard concurrently."))
+        parser.add_argument(
+            '--where',
+            metavar='<expression>',
+            help=_("Only count nodes matching the query expression, see "
+                   "'baremetal node list --where'."))
+        return parser
+
+    def take_action(
+        self, parsed_args: argparse.Namespace,
+    ) -> tuple[list[str], list[tuple[Any, ...]]]:
+        self.log.debug("take_action(%s)", parsed_args)
+        client = self.app.client_manager.baremetal
+
+        group_by = [field.strip() for field in parsed_args.group_by.split(',')
+                    if field.strip()]
+        if not group_by:
+            raise exc.CommandError(_('Expected at least one --group-by field'))
+        valid = res_fields.NODE_DETAILED_RESOURCE.fields
+        invalid = [field for field in group_by
+                   if field.split('/', 1)[0] not in valid]
+        if invalid:
+            raise exc.CommandError(
+                _('Invalid --group-by fields: %(fields)s. Valid fields are: '
+                  '%(valid)s') % {'fields': ', '.join(invalid),
+                                  'valid': ', '.join(valid)})
+        if not utils.check_api_version_support(client.current_api_version,
+                                               '1.8'):
+            raise exc.CommandError(
+                _('Node summaries require API version 1.8 or newer'))
+
+        params: dict[str, Any] = {}
+        for field in ['maintenance', 'provision_state', 'driver',
+                      'resource_class', 'conductor_group', 'owner', 'lessee',
+                      'parallel_by', 'where']:
+            if getattr(parsed_args, field) is not None:
+                params[field] = getattr(parsed_args, field)
+        self.log.debug("params(%s)", params)
+
+        counts = client.node.summary(group_by, **params)
+        rows = sorted((values + (count,) for values, count in counts.items()),
+                      key=lambda row: [('' if value is None else str(value))
+                                       for value in row[:-1]])
+        return group_by + ['count'], rows
+
+
 class UndeployBaremetalNode(ProvisionStateWithWait):
     """Set provision state of baremetal node to 'deleted'"""
 
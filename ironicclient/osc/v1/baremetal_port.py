@@ -579,6 +579,13 @@ class ListBaremetalPort(command.Lister):
                    '(asc or desc) (default: asc). Multiple fields and '
                    'directions can be specified, separated by comma.')
         )
+        parser.add_argument(
+            '--parallel-by',
+            dest='parallel_by',
+            choices=['shard'],
+            help=_('List ports of each shard concurrently. Speeds up listing '
+                   'all ports of large deployments.')
+        )
         display_group = parser.add_mutually_exclusive_group()
         display_group.add_argument(
             '--long',
@@ -608,7 +615,7 @@ class ListBaremetalPort(command.Lister):
         manager = self.app.client_manager
         client = manager.baremetal
 
-        columns = res_fields.PORT_RESOURCE.fields
+        columns: Sequence[str] = res_fields.PORT_RESOURCE.fields
 
         params: dict[str, object] = {}
         if parsed_args.limit is not None and parsed_args.limit < 0:
@@ -624,6 +631,8 @@ class ListBaremetalPort(command.Lister):
             params['node'] = parsed_args.node
         if parsed_args.portgroup is not None:
             params['portgroup'] = parsed_args.portgroup
+        if parsed_args.parallel_by is not None:
+            params['parallel_by'] = parsed_args.parallel_by
 
         if parsed_args.detail:
             params['detail'] = parsed_args.detail
@@ -636,10 +645,19 @@ class ListBaremetalPort(command.Lister):
             columns = resource.fields
             params['fields'] = columns
 
-        self.log.debug("params(%s)", params)
-        data = client.port.list(**params)
+        if not parsed_args.fields and not parsed_args.sort:
+            columns, column_fields = utils.fields_for_columns(
+                res_fields.PORT_DETAILED_RESOURCE, columns,
+                parsed_args.columns, client.current_api_version)
+            if column_fields:
+                params['detail'] = False
+                params['fields'] = column_fields
+                # Columns may be given as labels, select them by field.
+                parsed_args.columns = column_fields
 
-        data = oscutils.sort_items(data, parsed_args.sort)
+        self.log.debug("params(%s)", params)
+        data = utils.list_for_output(client.port.list, params,
+                                     parsed_args.sort)
 
         return (columns,
                 (oscutils.get_item_properties(s, columns, formatters={
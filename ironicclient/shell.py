@@ -13,22 +13,26 @@
 from __future__ import annotations
 
 import argparse
-import importlib.metadata
+from collections.abc import Sequence
 import logging
 import sys
+import time
+from typing import Any, TYPE_CHECKING
 
 from cliff import app
+from cliff import command
 from cliff import commandmanager
-import openstack
-from openstack import config as os_config
-from openstack.config import cloud_region as os_cloud_region
-from osc_lib import utils
 
 from ironicclient.common import http
 from ironicclient.common.i18n import _
+from ironicclient.common import timing
 from ironicclient import exc
 from ironicclient.v1 import client
 
+if TYPE_CHECKING:
+    from openstack import config as os_config
+    from openstack.config import cloud_region as os_cloud_region
+
 
 _DEFAULTS: dict[str, str] = {
     'auth_type': 'none',
@@ -50,15 +54,23 @@ class ClientManager(object):
         self,
         cloud_region: os_cloud_region.CloudRegion,
         options: argparse.Namespace,
+        timings: timing.Timings | None = None,
     ) -> None:
         self.cloud_region = cloud_region
         self.options = options
+        self.timings = timings
         self._ironic: client.Client | None = None
 
     @property
     def baremetal(self) -> client.Client:
         if self._ironic is None:
-            self._ironic = self._create_ironic_client()
+            if self.timings is None:
+                self._ironic = self._create_ironic_client()
+            else:
+                with self.timings.measure(timing.CLIENT_SETUP):
+                    self._ironic = self._create_ironic_client()
+            # NOTE: the daemon reuses clients, always reset their timings.
+            self._ironic.http_client.timings = self.timings
         return self._ironic
 
     def _create_ironic_client(self) -> client.Client:
@@ -73,14 +85,16 @@ class ClientManager(object):
             'Using bare metal API version %s, downgrade %s', api_version,
             'allowed' if allow_api_version_downgrade else 'disallowed')
 
+        session = self.cloud_region.get_session()
         # NOTE(dtantsur): endpoint_override is required to respect settings in
         # clouds.yaml, such as baremetal_endpoint_override.
-        endpoint_override = self.cloud_region.get_endpoint(_TYPE)
+        with http.cached_auth_state(session, session.auth):
+            endpoint_override = self.cloud_region.get_endpoint(_TYPE)
         try:
             return client.Client(
                 os_ironic_api_version=api_version,
                 allow_api_version_downgrade=allow_api_version_downgrade,
-                session=self.cloud_region.get_session(),
+                session=session,
                 region_name=self.cloud_region.get_region_name(_TYPE),
                 endpoint_override=endpoint_override,
                 max_retries=self.options.max_retries,
@@ -105,14 +119,37 @@ class CommandManager(commandmanager.CommandManager):
         )
 
 
+class _VersionAction(argparse.Action):
+    """Print the version, reading the package metadata only when asked."""
+
+    def __init__(self, option_strings: Sequence[str], dest: str,
+                 **kwargs: Any) -> None:
+        super(_VersionAction, self).__init__(
+            option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS,
+            nargs=0, help=_("show program's version number and exit"))
+
+    def __call__(self, parser: argparse.ArgumentParser,
+                 namespace: argparse.Namespace, values: object,
+                 option_string: str | None = None) -> None:
+        import ironicclient
+
+        sys.stdout.write('%s %s\n' % (parser.prog, ironicclient.__version__))
+        parser.exit()
+
+
 class App(app.App):
 
     def __init__(self) -> None:
-        version_info = importlib.metadata.version('python-ironicclient')
+        self._started = time.perf_counter()
+        self.timings: timing.Timings | None = None
+        self._profiler: Any = None
         mgr = CommandManager(_NAMESPACE)
-        self.config = os_config.OpenStackConfig(override_defaults=_DEFAULTS)
+        # NOTE: openstacksdk is imported when building the argument parser,
+        # see build_option_parser. The version is only looked up in the
+        # package metadata when --version is used.
+        self.config: os_config.OpenStackConfig
         super(App, self).__init__(description=_DESCRIPTION,
-                                  version=str(version_info),
+                                  version=None,
                                   command_manager=mgr,
                                   deferred_help=True)
 
@@ -122,9 +159,19 @@ class App(app.App):
         version: str | None,
         argparse_kwargs: dict[str, object] | None = None,
     ) -> argparse.ArgumentParser:
+        from openstack import config as os_config
+        from osc_lib import utils
+
         parser: argparse.ArgumentParser
         parser = super(App, self).build_option_parser(
             description, version, argparse_kwargs=argparse_kwargs)
+        # Replace the --version option of cliff with a lazy one.
+        version_action = parser._option_string_actions.pop('--version')
+        parser._remove_action(version_action)
+        parser._optionals._group_actions.remove(version_action)
+        parser.add_argument('--version', action=_VersionAction)
+
+        self.config = os_config.OpenStackConfig(override_defaults=_DEFAULTS)
         self.config.register_argparse_arguments(parser, sys.argv[1:])
 
         parser.add_argument(
@@ -150,12 +197,29 @@ class App(app.App):
             type=int,
             help='Interval in seconds between two retries'
         )
+        parser.add_argument(
+            '--timing',
+            default=False,
+            action='store_true',
+            help='Print the time spent in the phases of the command (startup, '
+                 'client setup, version negotiation, HTTP requests, JSON '
+                 'decoding) and the latency of every API request to the '
+                 'standard error'
+        )
+        parser.add_argument(
+            '--profile',
+            metavar='<file>',
+            help='Profile the command with cProfile and write the '
+                 'statistics to <file>, e.g. for "python -m pstats <file>"'
+        )
         return parser
 
     # This is the openstacksdk default value
     _STREAM_FORMAT: str = '%(asctime)s %(levelname)s: %(name)s %(message)s'
 
     def _configure_ironic_logging(self) -> None:
+        import openstack
+
         debug_enabled = self.options.debug or self.options.verbose_level > 1
 
         openstack.enable_logging(debug=debug_enabled, stream=sys.stderr,
@@ -182,13 +246,50 @@ class App(app.App):
             logger.propagate = False
 
     def initialize_app(self, argv: list[str]) -> None:
+        if self.options.profile:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if self.options.timing:
+            self.timings = timing.Timings(self._started)
         super(App, self).initialize_app(argv)
         self._configure_ironic_logging()
         self.cloud_region = self.config.get_one(argparse=self.options)
         # Compatibility with OSC
-        self.client_manager = ClientManager(self.cloud_region, self.options)
+        self.client_manager = ClientManager(self.cloud_region, self.options,
+                                            self.timings)
+
+    def prepare_to_run_command(self, cmd: command.Command) -> None:
+        if self.timings is not None:
+            self.timings.add(timing.STARTUP,
+                             time.perf_counter() - self._started)
+
+    def clean_up(
+        self,
+        cmd: command.Command,
+        result: int,
+        err: BaseException | None,
+    ) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+            try:
+                self._profiler.dump_stats(self.options.profile)
+            except OSError as e:
+                LOG.error('Cannot write the profile to %(file)s: %(error)s',
+                          {'file': self.options.profile, 'error': e})
+            self._profiler = None
+        if self.timings is not None:
+            self.stderr.write(self.timings.format())
+            self.timings = None
 
 
 def main(argv: list[str] = sys.argv[1:]) -> int:
+    from ironicclient import daemon
+
+    if daemon.enabled():
+        code = daemon.run(argv)
+        if code is not None:
+            return code
     result: int = App().run(argv)
     return result
@@ -234,3 +234,83 @@ class FileCacheTest(utils.BaseTestCase):
                                          ) -> None:
         mock_isfile.return_value = False
         self.assertIsNone(filecache.retrieve_data(host='spam', port='eggs'))
+
+    @mock.patch.object(dogpile.cache.region, 'CacheRegion', autospec=True)
+    @mock.patch.object(filecache, '_get_cache', autospec=True)
+    def test_save_version_range(self, mock_get_cache: mock.MagicMock,
+                                mock_cache: mock.MagicMock) -> None:
+        mock_get_cache.return_value = mock_cache
+        filecache.save_version_range('fred', '1234', '1.1', '1.50')
+        mock_cache.set.assert_called_once_with('fred:1234:range',
+                                               ('1.1', '1.50'))
+
+    @mock.patch.object(os.path, 'isfile', autospec=True)
+    @mock.patch.object(dogpile.cache.region, 'CacheRegion', autospec=True)
+    @mock.patch.object(filecache, '_get_cache', autospec=True)
+    def test_retrieve_version_range(self, mock_get_cache: mock.MagicMock,
+                                    mock_cache: mock.MagicMock,
+                                    mock_isfile: mock.MagicMock) -> None:
+        mock_isfile.return_value = True
+        mock_cache.get.return_value = ('1.1', '1.50')
+        mock_get_cache.return_value = mock_cache
+        self.assertEqual(('1.1', '1.50'),
+                         filecache.retrieve_version_range('fred', '1234'))
+        mock_cache.get.assert_called_once_with('fred:1234:range',
+                                               expiration_time=None)
+
+    @mock.patch.object(os.path, 'isfile', autospec=True)
+    @mock.patch.object(dogpile.cache.region, 'CacheRegion', autospec=True)
+    @mock.patch.object(filecache, '_get_cache', autospec=True)
+    def test_retrieve_version_range_not_found(
+        self,
+        mock_get_cache: mock.MagicMock,
+        mock_cache: mock.MagicMock,
+        mock_isfile: mock.MagicMock,
+    ) -> None:
+        mock_isfile.return_value = True
+        mock_cache.get.return_value = dogpile.cache.api.NO_VALUE
+        mock_get_cache.return_value = mock_cache
+        self.assertIsNone(filecache.retrieve_version_range('fred', '1234'))
+
+    @mock.patch.object(filecache, 'AUTH_CACHE', None)
+    @mock.patch.object(os, 'umask', autospec=True)
+    @mock.patch.object(os.path, 'exists', autospec=True)
+    @mock.patch.object(os, 'makedirs', autospec=True)
+    @mock.patch.object(dogpile.cache, 'make_region', autospec=True)
+    def test__get_auth_cache_private(self, mock_makeregion: mock.MagicMock,
+                                     mock_makedirs: mock.MagicMock,
+                                     mock_exists: mock.MagicMock,
+                                     mock_umask: mock.MagicMock) -> None:
+        mock_exists.return_value = False
+        mock_umask.return_value = 0o022
+        filecache._get_auth_cache()
+        mock_umask.assert_has_calls([mock.call(0o077), mock.call(0o022)])
+        mock_makedirs.assert_called_once_with(filecache.CACHE_DIR,
+                                              exist_ok=True)
+        mock_makeregion.return_value.configure.assert_called_once_with(
+            'dogpile.cache.dbm',
+            arguments={'filename': filecache.AUTH_CACHE_FILENAME})
+
+    @mock.patch.object(os.path, 'isfile', autospec=True)
+    @mock.patch.object(dogpile.cache.region, 'CacheRegion', autospec=True)
+    @mock.patch.object(filecache, '_get_auth_cache', autospec=True)
+    def test_auth_data(self, mock_get_cache: mock.MagicMock,
+                       mock_cache: mock.MagicMock,
+                       mock_isfile: mock.MagicMock) -> None:
+        mock_isfile.return_value = True
+        mock_cache.get.return_value = 'http://ironic:6385'
+        mock_get_cache.return_value = mock_cache
+        filecache.save_auth_data('endpoint:key', 'http://ironic:6385')
+        mock_cache.set.assert_called_once_with('endpoint:key',
+                                               'http://ironic:6385')
+        self.assertEqual('http://ironic:6385',
+                         filecache.retrieve_auth_data('endpoint:key', 300))
+        mock_cache.get.assert_called_once_with('endpoint:key',
+                                               expiration_time=300)
+
+    @mock.patch.object(os.path, 'isfile', autospec=True)
+    def test_retrieve_auth_data_no_cache_file(
+        self, mock_isfile: mock.MagicMock,
+    ) -> None:
+        mock_isfile.return_value = False
+        self.assertIsNone(filecache.retrieve_auth_data('auth:abcd'))
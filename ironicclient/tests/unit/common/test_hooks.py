@@ -0,0 +1,83 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import json
+
+from ironicclient.common import hooks
+from ironicclient.tests.unit import utils
+
+
+class EndpointTemplateTest(utils.BaseTestCase):
+
+    def test_endpoint_template(self) -> None:
+        for url, expected in [
+                ('/v1/nodes', '/v1/nodes'),
+                ('/v1/nodes/?limit=10&marker=abcd', '/v1/nodes/'),
+                ('/v1/nodes/detail?fields=uuid', '/v1/nodes/detail'),
+                ('/v1/nodes/node-1/states/provision',
+                 '/v1/nodes/{id}/states/provision'),
+                ('https://host:6385/v1/nodes/1be26c0b/vifs/abcd',
+                 '/v1/nodes/{id}/vifs/{id}'),
+                ('/v1/nodes/n1/traits/CUSTOM_GPU',
+                 '/v1/nodes/{id}/traits/{id}'),
+                ('/v1/drivers/ipmi/properties', '/v1/drivers/{id}/properties'),
+                ('/', '/')]:
+            self.assertEqual(expected, hooks.endpoint_template(url))
+
+
+class HistogramTest(utils.BaseTestCase):
+
+    def test_observe(self) -> None:
+        histogram = hooks.Histogram([0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual({'count': 4, 'sum': 3.65,
+                          'buckets': [[0.1, 2], [1.0, 1], [None, 1]]},
+                         histogram.snapshot())
+
+
+class HistogramCollectorTest(utils.BaseTestCase):
+
+    def test_collect(self) -> None:
+        collector = hooks.HistogramCollector([0.1, 1.0])
+        get = hooks.Request('GET', '/v1/nodes/n1', '1.99', 0)
+        patch = hooks.Request('PATCH', '/v1/nodes/n2', '1.99', 50)
+        collector.before_request(get)
+        collector.after_response(get, 200, 1000, 0.05, None)
+        collector.after_response(hooks.Request('GET', '/v1/nodes/n2', None,
+                                               0), None, 0, 2.0, OSError())
+        collector.on_retry(patch, 1, OSError())
+        collector.after_response(patch, 409, 100, 0.5, None)
+        collector.on_negotiation('latest', '1.99', 0.2)
+
+        snapshot = collector.snapshot()
+        # Snapshots can be serialized to JSON as they are.
+        self.assertEqual(snapshot, json.loads(json.dumps(snapshot)))
+        self.assertEqual([
+            {'method': 'GET', 'endpoint': '/v1/nodes/{id}',
+             'latency': {'count': 2, 'sum': 2.05,
+                         'buckets': [[0.1, 1], [1.0, 0], [None, 1]]},
+             'statuses': {'200': 1, 'error': 1},
+             'api_versions': {'1.99': 1, 'none': 1},
+             'retries': 0, 'bytes_sent': 0, 'bytes_received': 1000},
+            {'method': 'PATCH', 'endpoint': '/v1/nodes/{id}',
+             'latency': {'count': 1, 'sum': 0.5,
+                         'buckets': [[0.1, 0], [1.0, 1], [None, 0]]},
+             'statuses': {'409': 1}, 'api_versions': {'1.99': 1},
+             'retries': 1, 'bytes_sent': 50, 'bytes_received': 100},
+        ], snapshot['requests'])
+        self.assertEqual(1, snapshot['negotiations']['count'])
+
+        collector.reset()
+        self.assertEqual([], collector.snapshot()['requests'])
@@ -21,10 +21,13 @@ import time
 from typing import Any
 from unittest import mock
 
+import fixtures
 from keystoneauth1 import exceptions as kexc
 
 from ironicclient.common import filecache
+from ironicclient.common import hooks
 from ironicclient.common import http
+from ironicclient.common import timing
 from ironicclient import exc
 from ironicclient.tests.unit import utils
 
@@ -78,6 +81,10 @@ class VersionNegotiationMixinTest(utils.BaseTestCase):
             {}, status=http_client.NOT_ACCEPTABLE)
         self.test_object.get_server = mock.MagicMock(
             return_value=('localhost', '1234'))
+        patcher = mock.patch.object(filecache, 'save_version_range',
+                                    autospec=True)
+        self.mock_save_range = patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test__generic_parse_version_headers_has_headers(self) -> None:
         response = {'X-OpenStack-Ironic-API-Minimum-Version': '1.1',
@@ -398,6 +405,91 @@ class VersionNegotiationMixinTest(utils.BaseTestCase):
         self.assertEqual(2, mock_pvh.call_count)
         self.assertFalse(mock_save_data.called)
 
+    @mock.patch.object(filecache, 'save_data', autospec=True)
+    @mock.patch.object(http.VersionNegotiationMixin, '_parse_version_headers',
+                       autospec=True)
+    def test_negotiate_version_saves_range(
+        self,
+        mock_pvh: mock.MagicMock,
+        mock_save_data: mock.MagicMock,
+    ) -> None:
+        mock_pvh.return_value = ('1.1', '1.5')
+        self.test_object.negotiate_version(mock.MagicMock(), self.response)
+        self.mock_save_range.assert_called_once_with(
+            host='localhost', port='1234', min_version='1.1',
+            max_version='1.5')
+
+    @mock.patch.object(filecache, 'save_data', autospec=True)
+    @mock.patch.object(http.VersionNegotiationMixin, '_parse_version_headers',
+                       autospec=True)
+    def test_negotiate_version_saves_range_resolved_endpoint(
+        self,
+        mock_pvh: mock.MagicMock,
+        mock_save_data: mock.MagicMock,
+    ) -> None:
+        mock_pvh.return_value = ('1.1', '1.5')
+        self.test_object.endpoint_override = None
+        self.test_object.endpoint_trimmed = 'http://ironic:6385'
+        self.test_object.negotiate_version(mock.MagicMock(), self.response)
+        self.mock_save_range.assert_called_once_with(
+            host='ironic', port='6385', min_version='1.1', max_version='1.5')
+        self.assertFalse(mock_save_data.called)
+
+    def test_use_version_range_latest(self) -> None:
+        self.test_object.api_version_select_state = 'user'
+        self.test_object.os_ironic_api_version = 'latest'
+        self.test_object.use_version_range('1.1', '1.50')
+        self.assertEqual('1.50', self.test_object.os_ironic_api_version)
+        self.assertEqual('negotiated',
+                         self.test_object.api_version_select_state)
+
+    def test_use_version_range_downgrade(self) -> None:
+        self.test_object.use_version_range('1.1', '1.5')
+        self.assertEqual('1.5', self.test_object.os_ironic_api_version)
+        self.assertEqual('negotiated',
+                         self.test_object.api_version_select_state)
+
+    def test_use_version_range_newer_server(self) -> None:
+        self.test_object.api_version_select_state = 'user'
+        self.test_object.os_ironic_api_version = 'latest'
+        self.test_object.use_version_range('1.1', '1.999')
+        self.assertEqual(http.LATEST_VERSION,
+                         self.test_object.os_ironic_api_version)
+
+    def test_use_version_range_unsupported(self) -> None:
+        self.test_object.api_version_select_state = 'user'
+        self.test_object.os_ironic_api_version = ['1.60', '1.61']
+        self.test_object.use_version_range('1.1', '1.50')
+        self.assertEqual(['1.60', '1.61'],
+                         self.test_object.os_ironic_api_version)
+        self.assertEqual('user', self.test_object.api_version_select_state)
+
+    @mock.patch.object(filecache, 'save_data', autospec=True)
+    @mock.patch.object(http.VersionNegotiationMixin, '_parse_version_headers',
+                       autospec=True)
+    def test_negotiate_version_outdated_range(
+        self,
+        mock_pvh: mock.MagicMock,
+        mock_save_data: mock.MagicMock,
+    ) -> None:
+        self.test_object.api_version_select_state = 'user'
+        self.test_object.os_ironic_api_version = 'latest'
+        self.test_object.use_version_range('1.1', '1.50')
+        # The server has been downgraded since the range was cached.
+        mock_pvh.return_value = ('1.1', '1.40')
+        response = utils.FakeResponse(
+            {}, status=http_client.NOT_ACCEPTABLE,
+            request_headers={'X-OpenStack-Ironic-API-Version': '1.50'})
+
+        result = self.test_object.negotiate_version(mock.MagicMock(),
+                                                    response)
+
+        self.assertEqual('1.40', result)
+        self.assertEqual('negotiated',
+                         self.test_object.api_version_select_state)
+        mock_save_data.assert_called_once_with(host='localhost',
+                                               port='1234', data='1.40')
+
     def test_get_server(self) -> None:
         host = 'ironic-host'
         port = '6385'
@@ -409,7 +501,7 @@ class SessionClientTest(utils.BaseTestCase):
     def test_server_exception_empty_body(self) -> None:
         error_body = _get_error_body()
 
-        fake_session = utils.mockSession({'Content-Type': 'application/json'},
+        fake_session = utils.mockSession({'content-type': 'application/json'},
                                          error_body,
                                          http_client.INTERNAL_SERVER_ERROR)
 
@@ -462,6 +554,89 @@ class SessionClientTest(utils.BaseTestCase):
             user_agent=http.USER_AGENT)
         self.assertEqual(res, session.request.return_value)
 
+    def _cached_session_client(
+        self, auth: mock.Mock, enabled: bool = True,
+    ) -> http.SessionClient:
+        self.useFixture(fixtures.EnvironmentVariable(
+            filecache.AUTH_CACHE_ENV_VAR, 'true' if enabled else None))
+        return http.SessionClient(os_ironic_api_version='1.6',
+                                  api_version_select_state='default',
+                                  max_retries=5,
+                                  retry_interval=2,
+                                  auth=auth,
+                                  interface='publicURL',
+                                  service_type='baremetal',
+                                  region_name='RegionOne',
+                                  session=utils.mockSession({}))
+
+    @mock.patch.object(filecache, 'save_auth_data', autospec=True)
+    @mock.patch.object(filecache, 'retrieve_auth_data', autospec=True)
+    @mock.patch.object(http.SessionClient, 'get_endpoint', autospec=True)
+    def test_endpoint_cache_miss(
+        self,
+        mock_get_endpoint: mock.MagicMock,
+        mock_retrieve: mock.MagicMock,
+        mock_save: mock.MagicMock,
+    ) -> None:
+        mock_get_endpoint.return_value = 'http://ironic:6385'
+        mock_retrieve.return_value = None
+        auth = mock.Mock(auth_url='http://keystone:5000')
+        auth.get_cache_id.return_value = 'abcd'
+        auth.get_auth_state.return_value = '{"token": "new"}'
+
+        client = self._cached_session_client(auth)
+
+        self.assertEqual('http://ironic:6385', client.endpoint_trimmed)
+        self.assertFalse(auth.set_auth_state.called)
+        auth.get_access.assert_called_once_with(client.session)
+        mock_save.assert_has_calls([
+            mock.call('endpoint:http://keystone:5000:RegionOne:publicURL:'
+                      'baremetal', 'http://ironic:6385'),
+            mock.call('auth:abcd', '{"token": "new"}'),
+        ])
+
+    @mock.patch.object(filecache, 'save_auth_data', autospec=True)
+    @mock.patch.object(filecache, 'retrieve_auth_data', autospec=True)
+    @mock.patch.object(http.SessionClient, 'get_endpoint', autospec=True)
+    def test_endpoint_cache_hit(
+        self,
+        mock_get_endpoint: mock.MagicMock,
+        mock_retrieve: mock.MagicMock,
+        mock_save: mock.MagicMock,
+    ) -> None:
+        cached = {
+            'auth:abcd': '{"token": "cached"}',
+            'endpoint:http://keystone:5000:RegionOne:publicURL:baremetal':
+                'http://ironic:6385',
+        }
+        mock_retrieve.side_effect = lambda key, expiry=None: cached.get(key)
+        auth = mock.Mock(auth_url='http://keystone:5000')
+        auth.get_cache_id.return_value = 'abcd'
+        auth.get_auth_state.return_value = '{"token": "cached"}'
+
+        client = self._cached_session_client(auth)
+
+        self.assertEqual('http://ironic:6385', client.endpoint_trimmed)
+        self.assertFalse(mock_get_endpoint.called)
+        auth.set_auth_state.assert_called_once_with('{"token": "cached"}')
+        self.assertFalse(mock_save.called)
+
+    @mock.patch.object(filecache, 'retrieve_auth_data', autospec=True)
+    @mock.patch.object(http.SessionClient, 'get_endpoint', autospec=True)
+    def test_endpoint_cache_disabled(
+        self,
+        mock_get_endpoint: mock.MagicMock,
+        mock_retrieve: mock.MagicMock,
+    ) -> None:
+        mock_get_endpoint.return_value = 'http://ironic:6385'
+        auth = mock.Mock(auth_url='http://keystone:5000')
+
+        client = self._cached_session_client(auth, enabled=False)
+
+        self.assertEqual('http://ironic:6385', client.endpoint_trimmed)
+        self.assertFalse(mock_retrieve.called)
+        self.assertFalse(auth.get_access.called)
+
     @mock.patch.object(http.SessionClient, 'get_endpoint', autospec=True)
     def test_endpoint_not_found(
         self, mock_get_endpoint: mock.MagicMock,
@@ -497,6 +672,84 @@ class SessionClientTest(utils.BaseTestCase):
             user_agent=http.USER_AGENT
         )
 
+    def test_json_request_timings(self) -> None:
+        session = utils.mockSession({'content-type': 'application/json'},
+                                    content='{"nodes": []}', status_code=200)
+        session.request.return_value.json.return_value = {'nodes': []}
+        client = _session_client(session=session)
+        client.timings = timing.Timings()
+        client.json_request('GET', '/v1/nodes')
+
+        [request] = client.timings.requests
+        self.assertEqual(('GET', '/v1/nodes', 200, 13),
+                         request[:4])
+        self.assertEqual({timing.HTTP_REQUESTS, timing.JSON_DECODING},
+                         set(client.timings.phases))
+
+    @mock.patch.object(http.VersionNegotiationMixin, 'negotiate_version',
+                       autospec=True)
+    def test_http_request_timings_negotiation(
+            self, mock_negotiate: mock.Mock) -> None:
+        session = utils.mockSession({}, status_code=406)
+
+        def _negotiate(*args: Any) -> str:
+            session.request.return_value = utils.mockSessionResponse(
+                {}, status_code=204)
+            return '1.10'
+
+        mock_negotiate.side_effect = _negotiate
+        client = _session_client(session=session)
+        client.timings = timing.Timings()
+        client.json_request('GET', '/v1/nodes')
+
+        self.assertEqual([406, 204], [request.status for request
+                                      in client.timings.requests])
+        self.assertEqual({timing.HTTP_REQUESTS, timing.VERSION_NEGOTIATION},
+                         set(client.timings.phases))
+
+    def test_hooks(self) -> None:
+        session = utils.mockSession({}, content=b'{}', status_code=200)
+        hook = mock.Mock(spec=hooks.RequestHook)
+        client = _session_client(session=session, hooks=[hook])
+        client.json_request('POST', '/v1/nodes', body={'driver': 'ipmi'})
+
+        request = hooks.Request('POST', '/v1/nodes', '1.6', 18)
+        hook.before_request.assert_called_once_with(request)
+        hook.after_response.assert_called_once_with(request, 200, 2,
+                                                    mock.ANY, None)
+
+    def test_hooks_connection_failure(self) -> None:
+        session = utils.mockSession({})
+        session.request.side_effect = kexc.ConnectFailure()
+        hook = mock.Mock(spec=hooks.RequestHook)
+        client = _session_client(session=session)
+        client.conflict_max_retries = 0
+        client.add_hook(hook)
+        self.assertRaises(kexc.ConnectFailure, client.json_request,
+                          'GET', '/v1/nodes')
+
+        hook.after_response.assert_called_once_with(
+            mock.ANY, None, 0, mock.ANY, session.request.side_effect)
+        client.remove_hook(hook)
+        self.assertEqual((), client._hooks)
+
+    def test_hooks_failure_ignored(self) -> None:
+        session = utils.mockSession({}, status_code=204)
+        hook = mock.Mock(spec=hooks.RequestHook)
+        hook.before_request.side_effect = RuntimeError('boom')
+        client = _session_client(session=session, hooks=[hook])
+        client.json_request('DELETE', '/v1/nodes/abcd')
+        self.assertTrue(hook.after_response.called)
+
+    @mock.patch.object(http.VersionNegotiationMixin, 'negotiate_version',
+                       autospec=True, return_value='1.10')
+    def test_hooks_negotiation(self, mock_negotiate: mock.Mock) -> None:
+        session = utils.mockSession({}, status_code=204)
+        hook = mock.Mock(spec=hooks.RequestHook)
+        client = _session_client(session=session, hooks=[hook])
+        client._negotiate_version(None)
+        hook.on_negotiation.assert_called_once_with('1.6', '1.10', mock.ANY)
+
 
 @mock.patch.object(time, 'sleep', lambda *_: None)
 class RetriesTestCase(utils.BaseTestCase):
@@ -519,6 +772,22 @@ class RetriesTestCase(utils.BaseTestCase):
         client.json_request('GET', '/v1/resources')
         self.assertEqual(2, fake_session.request.call_count)
 
+    def test_session_retry_hooks(self) -> None:
+        fake_resp = utils.mockSessionResponse(
+            {'Content-Type': 'application/json'}, _get_error_body(),
+            http_client.CONFLICT)
+        ok_resp = utils.mockSessionResponse({}, b"OK", http_client.OK)
+        fake_session = utils.mockSession({})
+        fake_session.request.side_effect = iter((fake_resp, ok_resp))
+        collector = hooks.HistogramCollector()
+
+        client = _session_client(session=fake_session, hooks=[collector])
+        client.json_request('GET', '/v1/resources')
+
+        [stats] = collector.snapshot()['requests']
+        self.assertEqual(1, stats['retries'])
+        self.assertEqual({'409': 1, '200': 1}, stats['statuses'])
+
     def test_session_retry_503(self) -> None:
         error_body = _get_error_body()
 
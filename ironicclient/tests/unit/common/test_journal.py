@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import os
+import tempfile
+
+from ironicclient.common import journal
+from ironicclient import exc
+from ironicclient.tests.unit import utils
+
+
+class JournalTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(JournalTest, self).setUp()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'journal.ndjson')
+
+    def test_record(self) -> None:
+        with journal.Journal(self.path) as j:
+            self.assertEqual(0, len(j))
+            j.record('node:1', uuid='uuid-1')
+            j.record('node:2', error=exc.ClientException('boom'))
+            j.record('delete:node:3')
+            self.assertTrue(j.is_done('node:1'))
+            self.assertEqual('uuid-1', j.get('node:1'))
+            self.assertFalse(j.is_done('node:2'))
+            self.assertIsNone(j.get('node:2'))
+            self.assertTrue(j.is_done('delete:node:3'))
+            self.assertIsNone(j.get('delete:node:3'))
+            self.assertFalse(j.is_done('node:4'))
+
+        with open(self.path) as f:
+            self.assertEqual(['{"key":"node:1","uuid":"uuid-1"}\n',
+                              '{"key":"node:2","error":"boom"}\n',
+                              '{"key":"delete:node:3"}\n'],
+                             f.readlines())
+
+    def test_resume(self) -> None:
+        with journal.Journal(self.path) as j:
+            j.record('node:1', uuid='uuid-1')
+            j.record('node:2', error='boom')
+
+        with journal.Journal(self.path) as j:
+            self.assertEqual(2, len(j))
+            self.assertEqual('uuid-1', j.get('node:1'))
+            self.assertFalse(j.is_done('node:2'))
+            j.record('node:2', uuid='uuid-2')
+
+        with journal.Journal(self.path) as j:
+            self.assertEqual('uuid-2', j.get('node:2'))
+
+    def test_partial(self) -> None:
+        with journal.Journal(self.path) as j:
+            j.record('node:1', uuid='uuid-1', partial=True)
+            j.record('node:2', uuid='uuid-2', error='boom')
+            self.assertFalse(j.is_done('node:1'))
+            self.assertIsNone(j.get('node:1'))
+            self.assertEqual('uuid-1', j.get_created('node:1'))
+            self.assertFalse(j.is_done('node:2'))
+            self.assertIsNone(j.get('node:2'))
+            self.assertEqual('uuid-2', j.get_created('node:2'))
+            self.assertIsNone(j.get_created('node:3'))
+
+        with open(self.path) as f:
+            self.assertEqual(
+                ['{"key":"node:1","uuid":"uuid-1","partial":true}\n',
+                 '{"key":"node:2","uuid":"uuid-2","error":"boom"}\n'],
+                f.readlines())
+
+        with journal.Journal(self.path) as j:
+            self.assertEqual('uuid-1', j.get_created('node:1'))
+            j.record('node:1', uuid='uuid-1')
+            self.assertEqual('uuid-1', j.get('node:1'))
+
+    def test_interrupted_write(self) -> None:
+        with open(self.path, 'w') as f:
+            f.write('{"key":"node:1","uuid":"uuid-1"}\n'
+                    'garbage\n'
+                    '{"key":"node:2","uu')
+
+        with journal.Journal(self.path) as j:
+            self.assertEqual(1, len(j))
+            j.record('node:2', uuid='uuid-2')
+
+        with journal.Journal(self.path) as j:
+            self.assertEqual('uuid-1', j.get('node:1'))
+            self.assertEqual('uuid-2', j.get('node:2'))
+
+    def test_cannot_open(self) -> None:
+        self.assertRaisesRegex(exc.ClientException, 'Cannot open journal',
+                               journal.Journal,
+                               os.path.join(self.path, 'nested'))
+
+    def test_open_journal(self) -> None:
+        with journal.open_journal(None) as j:
+            self.assertIsNone(j)
+        with journal.open_journal(self.path) as j:
+            self.assertIsInstance(j, journal.Journal)
@@ -0,0 +1,161 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import json
+
+from keystoneauth1 import exceptions as kexc
+
+from ironicclient.common import hooks
+from ironicclient.common import metrics
+from ironicclient import exc
+from ironicclient.tests.unit import utils
+
+
+class ErrorClassTest(utils.BaseTestCase):
+
+    def test_error_class(self) -> None:
+        self.assertIsNone(metrics.error_class(200, None))
+        self.assertIsNone(metrics.error_class(None, None))
+        self.assertEqual('Conflict', metrics.error_class(409, None))
+        self.assertEqual('ServiceUnavailable', metrics.error_class(503, None))
+        self.assertEqual('HttpServerError', metrics.error_class(599, None))
+        self.assertEqual('HTTPClientError', metrics.error_class(499, None))
+        self.assertEqual('ConnectFailure',
+                         metrics.error_class(None, kexc.ConnectFailure()))
+
+
+class HdrHistogramTest(utils.BaseTestCase):
+
+    def test_percentiles(self) -> None:
+        histogram = metrics.HdrHistogram()
+        for value in range(1, 1001):
+            histogram.record(value / 1000.0)
+
+        self.assertEqual(1000, histogram.count)
+        self.assertEqual(0.001, histogram.min)
+        self.assertEqual(1.0, histogram.max)
+        for percentile in (50, 90, 99):
+            result = histogram.percentile(percentile)
+            assert result is not None
+            self.assertAlmostEqual(percentile / 100.0, result,
+                                   delta=percentile / 100.0 / 64)
+        self.assertEqual(1.0, histogram.percentile(100))
+        # Far fewer buckets than values.
+        self.assertLess(len(histogram.counts), 500)
+
+    def test_empty(self) -> None:
+        histogram = metrics.HdrHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        self.assertEqual(0, histogram.count_below(1.0))
+        self.assertEqual({'count': 0, 'sum': 0.0, 'min': None, 'max': None,
+                          'percentiles': {'p50': None, 'p90': None,
+                                          'p99': None, 'p99.9': None},
+                          'buckets': []}, histogram.snapshot())
+
+    def test_count_below_and_merge(self) -> None:
+        first = metrics.HdrHistogram()
+        second = metrics.HdrHistogram()
+        for value in (0.002, 0.02, 0.2):
+            first.record(value)
+        second.record(2.0)
+        first.merge(second)
+
+        self.assertEqual(4, first.count)
+        self.assertEqual(2.0, first.max)
+        self.assertEqual([0, 1, 2, 3, 4],
+                         [first.count_below(bound)
+                          for bound in (0.001, 0.01, 0.1, 1.0, 10.0)])
+        self.assertRaises(ValueError, first.merge,
+                          metrics.HdrHistogram(significant_bits=3))
+
+    def test_count_below_bucket_containing_bound(self) -> None:
+        histogram = metrics.HdrHistogram()
+        histogram.record(0.099)
+        # Shares a bucket with 0.1 but is above it.
+        histogram.record(0.1003)
+
+        self.assertEqual(1, histogram.count_below(0.1))
+        self.assertEqual(2, histogram.count_below(0.101))
+
+
+class MetricsCollectorTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(MetricsCollectorTest, self).setUp()
+        self.collector = metrics.MetricsCollector(buckets=[0.1, 1.0])
+        get = hooks.Request('GET', '/v1/nodes/?limit=5', '1.99', 0)
+        patch = hooks.Request('PATCH', '/v1/nodes/n1', '1.99', 120)
+        self.collector.after_response(get, 200, 5000, 0.05, None)
+        self.collector.after_response(get, 200, 3000, 0.5, None)
+        self.collector.after_response(get, None, 0, 2.0,
+                                      kexc.ConnectFailure())
+        self.collector.after_response(patch, 409, 200, 0.02, None)
+        self.collector.on_retry(patch, 1, exc.Conflict())
+        self.collector.after_response(patch, 200, 1000, 0.03, None)
+        self.collector.on_negotiation('latest', '1.99', 0.01)
+
+    def test_snapshot(self) -> None:
+        snapshot = self.collector.snapshot()
+
+        self.assertEqual(snapshot, json.loads(self.collector.to_json()))
+        get, patch = snapshot['requests']
+        self.assertEqual('GET', get['method'])
+        self.assertEqual('/v1/nodes/', get['endpoint'])
+        self.assertEqual(3, get['requests'])
+        self.assertEqual({'200': 2, 'error': 1}, get['statuses'])
+        self.assertEqual({'ConnectFailure': 1}, get['errors'])
+        self.assertEqual({}, get['retries'])
+        self.assertEqual(8000, get['bytes_received'])
+        self.assertEqual(2.0, get['latency']['max'])
+
+        self.assertEqual('/v1/nodes/{id}', patch['endpoint'])
+        self.assertEqual(2, patch['requests'])
+        self.assertEqual({'Conflict': 1}, patch['errors'])
+        self.assertEqual({'Conflict': 1}, patch['retries'])
+        self.assertEqual(240, patch['bytes_sent'])
+        self.assertEqual(1, snapshot['negotiations']['count'])
+
+        self.collector.reset()
+        self.assertEqual([], self.collector.snapshot()['requests'])
+
+    def test_to_prometheus(self) -> None:
+        lines = self.collector.to_prometheus(prefix='test').splitlines()
+
+        get = 'method="GET",endpoint="/v1/nodes/"'
+        patch = 'method="PATCH",endpoint="/v1/nodes/{id}"'
+        for line in [
+                '# TYPE test_requests_total counter',
+                'test_requests_total{%s,status="200"} 2' % get,
+                'test_requests_total{%s,status="error"} 1' % get,
+                'test_request_errors_total{%s,error="ConnectFailure"} 1'
+                % get,
+                'test_request_errors_total{%s,error="Conflict"} 1' % patch,
+                'test_request_retries_total{%s,error="Conflict"} 1' % patch,
+                'test_request_bytes_total{%s} 240' % patch,
+                'test_response_bytes_total{%s} 8000' % get,
+                '# TYPE test_request_duration_seconds histogram',
+                'test_request_duration_seconds_bucket{%s,le="0.1"} 1' % get,
+                'test_request_duration_seconds_bucket{%s,le="1"} 2' % get,
+                'test_request_duration_seconds_bucket{%s,le="+Inf"} 3'
+                % get,
+                'test_request_duration_seconds_sum{%s} 2.55' % get,
+                'test_request_duration_seconds_count{%s} 3' % get,
+                'test_version_negotiations_total 1']:
+            self.assertIn(line, lines)
+
+    def test_label_escaping(self) -> None:
+        collector = metrics.MetricsCollector()
+        collector.after_response(hooks.Request('GET', '/v1/"x"\\', None, 0),
+                                 200, 0, 0.1, None)
+        self.assertIn(r'endpoint="/v1/\"x\"\\"', collector.to_prometheus())
@@ -0,0 +1,59 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+from unittest import mock
+
+from ironicclient.common import timing
+from ironicclient.tests.unit import utils
+
+
+class TimingsTest(utils.BaseTestCase):
+
+    @mock.patch('time.perf_counter', autospec=True)
+    def test_measure(self, mock_counter: mock.Mock) -> None:
+        mock_counter.side_effect = [1.0, 1.5, 2.25]
+        timings = timing.Timings(0.0)
+        with timings.measure(timing.VERSION_NEGOTIATION):
+            # Nested phases and requests are accounted to the outer phase.
+            with timings.measure(timing.JSON_DECODING):
+                timings.add_request('GET', '/', 200, 10, 0.1)
+        timings.add_request('GET', '/v1/nodes', 200, 100, 0.2)
+
+        self.assertEqual({timing.VERSION_NEGOTIATION: 1.25,
+                          timing.HTTP_REQUESTS: 0.2}, timings.phases)
+        self.assertEqual(2, len(timings.requests))
+
+    def test_format(self) -> None:
+        timings = timing.Timings(10.0)
+        timings.add(timing.STARTUP, 0.5)
+        timings.add(timing.CLIENT_SETUP, 0.25)
+        timings.add_request('GET', '/v1/nodes', 200, 1234, 0.125)
+        timings.add_request('PATCH', '/v1/nodes/abcd', None, 0, 0.5)
+
+        lines = timings.format(12.0).splitlines()
+
+        self.assertEqual(['Phase', 'Seconds'], lines[0].split())
+        self.assertEqual(['startup', '0.500'], lines[1].split())
+        self.assertEqual(['client', 'setup', '0.250'], lines[2].split())
+        self.assertEqual(['HTTP', 'requests', '0.625'], lines[3].split())
+        self.assertEqual(['command', 'and', 'output', 'formatting', '0.625'],
+                         lines[4].split())
+        self.assertEqual(['total', '2.000'], lines[5].split())
+        self.assertEqual('', lines[6])
+        self.assertEqual(['Method', 'Status', 'Bytes', 'ms', 'URL'],
+                         lines[7].split())
+        self.assertEqual(['GET', '200', '1234', '125.0', '/v1/nodes'],
+                         lines[8].split())
+        self.assertEqual(['PATCH', '-', '0', '500.0', '/v1/nodes/abcd'],
+                         lines[9].split())
@@ -28,6 +28,7 @@ from unittest import mock
 from ironicclient.common import utils
 from ironicclient import exc
 from ironicclient.tests.unit import utils as test_utils
+from ironicclient.v1 import resource_fields
 
 
 class UtilsTest(test_utils.BaseTestCase):
@@ -260,6 +261,138 @@ class CommonFiltersTest(test_utils.BaseTestCase):
         self.assertEqual(['fields=a,b,c'], result)
 
 
+class RunConcurrentlyTest(test_utils.BaseTestCase):
+
+    def test_order(self) -> None:
+        self.assertEqual([1, 4, 9, 16],
+                         utils.run_concurrently(lambda x: x * x, [1, 2, 3, 4]))
+
+    def test_serial(self) -> None:
+        self.assertEqual([2], utils.run_concurrently(lambda x: x * 2, [1]))
+        self.assertEqual([], utils.run_concurrently(lambda x: x * 2, []))
+        self.assertEqual([2, 4], utils.run_concurrently(lambda x: x * 2,
+                                                        [1, 2], max_workers=1))
+
+    def test_error(self) -> None:
+        def _func(x: int) -> int:
+            if x > 1:
+                raise exc.NotFound(str(x))
+            return x
+
+        self.assertRaisesRegex(exc.NotFound, '2',
+                               utils.run_concurrently, _func, [1, 2, 3])
+
+
+class IterListTest(test_utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(IterListTest, self).setUp()
+        self.items = [mock.Mock(uuid=str(i)) for i in range(7)]
+        self.list_func = mock.Mock(side_effect=self._list)
+
+    def _list(self, limit: int | None = None, marker: str | None = None,
+              **kwargs: Any) -> list[Any]:
+        # NOTE: pages have 3 items, a limit is reached by following links.
+        start = 0 if marker is None else int(marker) + 1
+        return self.items[start:start + (limit or 3)]
+
+    def test_all(self) -> None:
+        result = utils.iter_list(self.list_func, detail=True)
+        self.list_func.assert_called_once_with(limit=None, detail=True)
+        self.assertEqual(self.items, list(result))
+        self.list_func.assert_has_calls([
+            mock.call(limit=None, detail=True),
+            mock.call(limit=None, detail=True, marker='2'),
+            mock.call(limit=None, detail=True, marker='5'),
+        ])
+        self.assertEqual(3, self.list_func.call_count)
+
+    def test_exact_pages(self) -> None:
+        del self.items[6]
+        self.assertEqual(self.items, list(utils.iter_list(self.list_func)))
+        self.assertEqual(3, self.list_func.call_count)
+        self.list_func.assert_called_with(limit=None, marker='5')
+
+    def test_fields(self) -> None:
+        self.assertEqual(self.items,
+                         list(utils.iter_list(self.list_func,
+                                              fields=['name'])))
+        self.list_func.assert_called_with(limit=None, marker='5',
+                                          fields=['name', 'uuid'])
+
+    def test_limit(self) -> None:
+        self.assertEqual(self.items[:4],
+                         list(utils.iter_list(self.list_func, limit=4)))
+        self.list_func.assert_called_once_with(limit=4)
+
+    @mock.patch.object(utils, 'DEFAULT_PAGE_SIZE', 3)
+    def test_limit_several_pages(self) -> None:
+        self.assertEqual(self.items[:5],
+                         list(utils.iter_list(self.list_func, limit=5)))
+        self.assertEqual([mock.call(limit=None),
+                          mock.call(limit=2, marker='2')],
+                         self.list_func.call_args_list)
+
+    def test_one_page(self) -> None:
+        self.assertEqual(self.items[:3],
+                         list(utils.iter_list(self.list_func, limit=None,
+                                              fields=['name'])))
+        self.list_func.assert_called_once_with(limit=None, fields=['name'])
+
+    def test_not_paginated(self) -> None:
+        self.list_func.side_effect = None
+        self.list_func.return_value = self.items
+        self.assertEqual(self.items,
+                         list(utils.iter_list(self.list_func,
+                                              driver=['ipmi', 'redfish'])))
+        self.list_func.assert_called_once_with(limit=0,
+                                               driver=['ipmi', 'redfish'])
+
+    def test_list_for_output(self) -> None:
+        result = utils.list_for_output(self.list_func, {'limit': 0})
+        self.list_func.assert_called_once_with(limit=None)
+        self.assertEqual(self.items, list(result))
+
+    def test_list_for_output_sort(self) -> None:
+        self.list_func.side_effect = None
+        self.list_func.return_value = self.items
+        result = utils.list_for_output(self.list_func, {'limit': 0},
+                                       'uuid:desc')
+        self.list_func.assert_called_once_with(limit=0)
+        self.assertEqual(self.items[::-1], result)
+
+
+class FieldsForColumnsTest(test_utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(FieldsForColumnsTest, self).setUp()
+        self.resource = resource_fields.Resource(['uuid', 'name', 'extra'])
+        self.columns = ('uuid', 'name')
+
+    def test_columns(self) -> None:
+        self.assertEqual(
+            (['name', 'extra'], ['name', 'extra']),
+            utils.fields_for_columns(self.resource, self.columns,
+                                     ['Name', 'extra'], '1.8'))
+
+    def test_no_columns(self) -> None:
+        self.assertEqual(
+            (self.columns, None),
+            utils.fields_for_columns(self.resource, self.columns, [], '1.8'))
+
+    def test_unknown_column(self) -> None:
+        self.assertEqual(
+            (self.columns, None),
+            utils.fields_for_columns(self.resource, self.columns,
+                                     ['name', 'driver'], '1.8'))
+
+    def test_old_api_version(self) -> None:
+        self.assertEqual(
+            (self.columns, None),
+            utils.fields_for_columns(self.resource, self.columns, ['name'],
+                                     '1.7'))
+
+
 @mock.patch.object(subprocess, 'Popen', autospec=True)
 class MakeConfigDriveTest(test_utils.BaseTestCase):
 
@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import copy
 import sys
 
 
@@ -61,6 +62,9 @@ class FakeResource(object):
         for (k, v) in info.items():
             setattr(self, k, v)
 
+    def to_dict(self) -> dict[str, object]:
+        return copy.deepcopy(self._info)
+
     def __repr__(self) -> str:
         reprkeys = sorted(k for k in self.__dict__.keys()
                           if k[0] != '_' and k != 'manager')
@@ -0,0 +1,52 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+import io
+from typing import Any
+
+import testtools
+
+from ironicclient.common import utils
+from ironicclient.osc import formatters
+
+
+class NDJSONFormatterTest(testtools.TestCase):
+
+    def test_emit_list(self) -> None:
+        stdout = io.StringIO()
+        formatters.NDJSONFormatter().emit_list(
+            ('UUID', 'Properties', 'Maintenance'),
+            [('uuid-1', utils.HashColumn({'cpus': 4}), False),
+             ('uuid-2', utils.HashColumn({}), None)],
+            stdout, argparse.Namespace())
+        self.assertEqual(
+            '{"UUID":"uuid-1","Properties":{"cpus":4},"Maintenance":false}\n'
+            '{"UUID":"uuid-2","Properties":{},"Maintenance":null}\n',
+            stdout.getvalue())
+
+    def test_emit_list_streams(self) -> None:
+        stdout = io.StringIO()
+
+        def _rows() -> Iterator[tuple[Any, ...]]:
+            yield ('uuid-1',)
+            # The first row is written before the next one is produced.
+            self.assertEqual('{"UUID":"uuid-1"}\n', stdout.getvalue())
+            yield ('uuid-2',)
+
+        formatters.NDJSONFormatter().emit_list(('UUID',), _rows(), stdout,
+                                               argparse.Namespace())
+        self.assertEqual('{"UUID":"uuid-1"}\n{"UUID":"uuid-2"}\n',
+                         stdout.getvalue())
@@ -0,0 +1,179 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import tempfile
+import time
+from typing import Any
+from unittest import mock
+
+from osc_lib.tests import utils as oscutils
+
+from ironicclient import exc
+from ironicclient.osc.v1 import baremetal_batch
+from ironicclient.tests.unit.osc.v1 import fakes as baremetal_fakes
+
+
+class FakeCommand(object):
+
+    def __init__(self, app: Any, app_args: Any, cmd_name: str) -> None:
+        self.app = app
+        self.cmd_name = cmd_name
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(prog=prog_name)
+        parser.add_argument('node')
+        parser.add_argument('--name')
+        return parser
+
+    def run(self, parsed_args: argparse.Namespace) -> int:
+        if parsed_args.node == 'broken':
+            raise exc.CommandError('node is broken')
+        self.app.executed.append((self.cmd_name, parsed_args.node,
+                                  parsed_args.name))
+        self.app.stdout.write('begin %s\n' % parsed_args.node)
+        time.sleep(0.001)
+        self.app.stdout.write('end %s\n' % parsed_args.node)
+        return 0
+
+
+class TestReadCommands(baremetal_fakes.TestBaremetal):
+
+    def test_read_commands(self) -> None:
+        lines = ['# comment\n', '\n', 'node set a --name x\n',
+                 'node set b \\\n', '  --name y\n', '  \n', 'node show c']
+        self.assertEqual([(3, 'node set a --name x'),
+                          (4, 'node set b    --name y'),
+                          (7, 'node show c')],
+                         list(baremetal_batch._read_commands(lines)))
+
+
+class TestBaremetalBatch(baremetal_fakes.TestBaremetal):
+
+    def setUp(self) -> None:
+        super(TestBaremetalBatch, self).setUp()
+        self.app.executed = []
+        self.app.stderr = io.StringIO()
+        self.app.stdout = io.StringIO()
+        self.app.command_manager = mock.Mock(
+            spec=['find_command', 'namespace'])
+        self.app.command_manager.namespace = 'openstack.baremetal.v1'
+        self.app.command_manager.find_command.side_effect = self._find
+        self.cmd = baremetal_batch.BatchBaremetal(self.app, None,
+                                                  cmd_name='baremetal batch')
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'commands.sh')
+
+    def _find(self, argv: list[str]) -> tuple[Any, str, list[str]]:
+        # Emulates the OpenStack CLI command names.
+        if argv[:2] == ['baremetal', 'batch']:
+            return FakeCommand, 'baremetal batch', argv[2:]
+        if argv[:3] == ['baremetal', 'node', 'set']:
+            return FakeCommand, 'baremetal node set', argv[3:]
+        raise ValueError(argv)
+
+    def _write(self, content: str) -> None:
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+    def test_batch(self) -> None:
+        self._write('baremetal node set n1 --name a\n'
+                    'openstack baremetal node set n2\n'
+                    'node set n3 --name "with space"\n')
+        parsed_args = self.check_parser(self.cmd, [self.path],
+                                        [('batch_file', self.path),
+                                         ('parallel', None),
+                                         ('stop_on_error', False)])
+
+        self.cmd.take_action(parsed_args)
+
+        self.assertEqual([('baremetal node set', 'n1', 'a'),
+                          ('baremetal node set', 'n2', None),
+                          ('baremetal node set', 'n3', 'with space')],
+                         self.app.executed)
+        self.assertEqual('Line 1: OK\nLine 2: OK\nLine 3: OK\n',
+                         self.app.stderr.getvalue())
+
+    def test_batch_stdin(self) -> None:
+        self.app.stdin = io.StringIO('node set n1\n')
+        parsed_args = self.check_parser(self.cmd, ['-'], [])
+
+        self.cmd.take_action(parsed_args)
+
+        self.assertEqual([('baremetal node set', 'n1', None)],
+                         self.app.executed)
+
+    def test_batch_failures(self) -> None:
+        self._write('node set broken\nnode unknown\nnode set n2\n'
+                    'batch other\n')
+        parsed_args = self.check_parser(self.cmd, [self.path], [])
+
+        self.assertRaisesRegex(exc.CommandError,
+                               '3 of 4 commands did not succeed',
+                               self.cmd.take_action, parsed_args)
+        self.assertEqual([('baremetal node set', 'n2', None)],
+                         self.app.executed)
+        self.assertEqual('Line 1: FAILED: node is broken\n'
+                         'Line 2: FAILED: Unknown command: node unknown\n'
+                         'Line 3: OK\n'
+                         'Line 4: FAILED: Batch commands cannot be nested\n',
+                         self.app.stderr.getvalue())
+
+    def test_batch_stop_on_error(self) -> None:
+        self._write('node set broken\nnode set n2\n')
+        parsed_args = self.check_parser(
+            self.cmd, [self.path, '--stop-on-error'], [])
+
+        self.assertRaises(exc.CommandError, self.cmd.take_action,
+                          parsed_args)
+        self.assertEqual([], self.app.executed)
+        self.assertEqual('Line 1: FAILED: node is broken\n'
+                         'Line 2: SKIPPED\n', self.app.stderr.getvalue())
+
+    def test_batch_parallel(self) -> None:
+        self._write(''.join('node set n%d\n' % i for i in range(20)))
+        parsed_args = self.check_parser(self.cmd, [self.path, '--parallel'],
+                                        [('parallel', 8)])
+
+        self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            sorted(('baremetal node set', 'n%d' % i, None)
+                   for i in range(20)),
+            sorted(self.app.executed))
+        self.assertEqual(20, self.app.stderr.getvalue().count(': OK\n'))
+        lines = self.app.stdout.getvalue().splitlines()
+        self.assertEqual(40, len(lines))
+        for begin, end in zip(lines[::2], lines[1::2]):
+            self.assertEqual(begin.replace('begin', 'end'), end)
+        self.assertIsInstance(self.app.stdout, io.StringIO)
+
+    def test_batch_missing_file(self) -> None:
+        parsed_args = self.check_parser(self.cmd, [self.path], [])
+        self.assertRaisesRegex(exc.CommandError, 'Cannot read file',
+                               self.cmd.take_action, parsed_args)
+
+    def test_batch_invalid_parallel(self) -> None:
+        parsed_args = self.check_parser(
+            self.cmd, [self.path, '--parallel', '0'], [])
+        self.assertRaises(exc.CommandError, self.cmd.take_action,
+                          parsed_args)
+
+    def test_batch_no_file(self) -> None:
+        self.assertRaises(oscutils.ParserException, self.check_parser,
+                          self.cmd, [], [])
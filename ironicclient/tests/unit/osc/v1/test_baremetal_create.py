@@ -13,13 +13,19 @@
 
 from __future__ import annotations
 
+import os
+import tempfile
+from typing import Any, Callable
 from unittest import mock
 
 from osc_lib.tests import utils as oscutils
 
+from ironicclient.common import journal
+from ironicclient import exc
 from ironicclient.osc.v1 import baremetal_create
 from ironicclient.tests.unit.osc.v1 import fakes as baremetal_fakes
 from ironicclient.v1 import create_resources
+from ironicclient.v1 import reconcile
 
 
 class TestBaremetalCreate(baremetal_fakes.TestBaremetal):
@@ -42,4 +48,106 @@ class TestBaremetalCreate(baremetal_fakes.TestBaremetal):
 
         self.cmd.take_action(parsed_args)
         mock_create.assert_called_once_with(self.app.client_manager.baremetal,
-                                            ['file.yaml', 'file.json'])
+                                            ['file.yaml', 'file.json'],
+                                            max_workers=1, stream=False,
+                                            journal=None)
+
+    @mock.patch.object(create_resources, 'create_resources', autospec=True)
+    def test_baremetal_create_parallel(self, mock_create: mock.Mock) -> None:
+        arglist = ['--parallel', '16', 'file.yaml']
+        verifylist = [('resource_files', ['file.yaml']), ('parallel', 16)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        mock_create.assert_called_once_with(self.app.client_manager.baremetal,
+                                            ['file.yaml'], max_workers=16,
+                                            stream=False, journal=None)
+
+    @mock.patch.object(create_resources, 'create_resources', autospec=True)
+    def test_baremetal_create_parallel_default(
+            self, mock_create: mock.Mock) -> None:
+        arglist = ['file.yaml', '--parallel']
+        verifylist = [('resource_files', ['file.yaml']), ('parallel', 8)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        mock_create.assert_called_once_with(self.app.client_manager.baremetal,
+                                            ['file.yaml'], max_workers=8,
+                                            stream=False, journal=None)
+
+    @mock.patch.object(create_resources, 'create_resources', autospec=True)
+    def test_baremetal_create_stream(self, mock_create: mock.Mock) -> None:
+        arglist = ['--stream', '--parallel', '4', 'file.ndjson']
+        verifylist = [('resource_files', ['file.ndjson']), ('stream', True)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        mock_create.assert_called_once_with(self.app.client_manager.baremetal,
+                                            ['file.ndjson'], max_workers=4,
+                                            stream=True, journal=None)
+
+    @mock.patch.object(create_resources, 'create_resources', autospec=True)
+    def test_baremetal_create_resume(self, mock_create: mock.Mock) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'journal')
+        arglist = ['--resume', path, 'file.yaml']
+        verifylist = [('resource_files', ['file.yaml']), ('resume', path)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        mock_create.assert_called_once_with(self.app.client_manager.baremetal,
+                                            ['file.yaml'], max_workers=1,
+                                            stream=False, journal=mock.ANY)
+        self.assertIsInstance(mock_create.call_args[1]['journal'],
+                              journal.Journal)
+        self.assertTrue(os.path.exists(path))
+
+    def test_baremetal_create_stream_reconcile(self) -> None:
+        arglist = ['--stream', '--reconcile', 'file.ndjson']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exc.CommandError, self.cmd.take_action, parsed_args)
+
+    @mock.patch.object(create_resources, 'create_resources', autospec=True)
+    def test_baremetal_create_parallel_invalid(
+            self, mock_create: mock.Mock) -> None:
+        arglist = ['--parallel', '0', 'file.yaml']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exc.CommandError, self.cmd.take_action, parsed_args)
+        self.assertFalse(mock_create.called)
+
+    @mock.patch.object(reconcile, 'reconcile_resources', autospec=True)
+    def test_baremetal_create_reconcile(
+            self, mock_reconcile: mock.Mock) -> None:
+        arglist = ['--reconcile', '--delete', '--dry-run', 'file.yaml']
+        verifylist = [('resource_files', ['file.yaml']),
+                      ('reconcile', True), ('delete', True),
+                      ('dry_run', True)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        def _reconcile(client: Any, filenames: list[str],
+                       output: Callable[[str], Any],
+                       **kwargs: Any) -> list[Any]:
+            output('create node node-1')
+            return [mock.sentinel.action]
+
+        mock_reconcile.side_effect = _reconcile
+        self.cmd.take_action(parsed_args)
+        mock_reconcile.assert_called_once_with(
+            self.app.client_manager.baremetal, ['file.yaml'],
+            delete=True, dry_run=True, max_workers=8, output=mock.ANY)
+        self.assertEqual('create node node-1\n', self.app.stdout.make_string())
+
+    @mock.patch.object(reconcile, 'reconcile_resources', autospec=True)
+    def test_baremetal_create_reconcile_nothing_to_do(
+            self, mock_reconcile: mock.Mock) -> None:
+        arglist = ['--reconcile', 'file.yaml']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        mock_reconcile.return_value = []
+        self.cmd.take_action(parsed_args)
+        self.assertEqual('Nothing to do\n', self.app.stdout.make_string())
+
+    def test_baremetal_create_delete_without_reconcile(self) -> None:
+        arglist = ['--delete', 'file.yaml']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exc.CommandError, self.cmd.take_action, parsed_args)
@@ -0,0 +1,73 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+from __future__ import annotations
+
+import os
+import tempfile
+from unittest import mock
+
+from osc_lib.tests import utils as oscutils
+
+from ironicclient import exc
+from ironicclient.osc.v1 import baremetal_export
+from ironicclient.tests.unit.osc.v1 import fakes as baremetal_fakes
+from ironicclient.v1 import export_resources
+
+
+@mock.patch.object(export_resources, 'iter_export', autospec=True)
+class TestBaremetalExport(baremetal_fakes.TestBaremetal):
+    def setUp(self) -> None:
+        super(TestBaremetalExport, self).setUp()
+        self.cmd = baremetal_export.ExportBaremetal(self.app, None)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'fleet.ndjson')
+
+    def test_baremetal_export(self, mock_export: mock.Mock) -> None:
+        mock_export.return_value = iter([{'nodes': [{'name': 'node-1'}]}])
+        parsed_args = self.check_parser(self.cmd, [],
+                                        [('export_format', 'ndjson'),
+                                         ('output', None)])
+
+        self.cmd.take_action(parsed_args)
+
+        mock_export.assert_called_once_with(
+            self.app.client_manager.baremetal)
+        self.assertEqual('{"nodes":[{"name":"node-1"}]}\n',
+                         self.app.stdout.make_string())
+
+    def test_baremetal_export_yaml_file(self, mock_export: mock.Mock) -> None:
+        mock_export.return_value = iter([{'chassis': [{'uuid': 'c'}]},
+                                         {'nodes': [{'name': 'node-1'}]}])
+        arglist = ['--format', 'yaml', '--output', self.path]
+        parsed_args = self.check_parser(self.cmd, arglist,
+                                        [('export_format', 'yaml'),
+                                         ('output', self.path)])
+
+        self.cmd.take_action(parsed_args)
+
+        with open(self.path) as f:
+            self.assertEqual('---\nchassis:\n- uuid: c\n'
+                             '---\nnodes:\n- name: node-1\n', f.read())
+
+    def test_baremetal_export_invalid_format(
+            self, mock_export: mock.Mock) -> None:
+        self.assertRaises(oscutils.ParserException, self.check_parser,
+                          self.cmd, ['--format', 'xml'], [])
+
+    def test_baremetal_export_cannot_write(
+            self, mock_export: mock.Mock) -> None:
+        arglist = ['--output', os.path.join(self.path, 'nested')]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exc.CommandError, self.cmd.take_action, parsed_args)
@@ -19,9 +19,13 @@ from __future__ import annotations
 import copy
 import io
 import json
+import os
 import sys
+import tempfile
+from typing import Any
 from unittest import mock
 
+from cliff import lister
 from osc_lib.tests import utils as oscutils
 
 from ironicclient.common import utils as commonutils
@@ -1071,6 +1075,25 @@ class TestBaremetalDelete(TestBaremetal):
         )
         self.assertEqual(2, self.baremetal_mock.node.delete.call_count)
 
+    def test_baremetal_delete_resume(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'journal')
+        arglist = ['node1', 'node2', 'node3', '--resume', path]
+        verifylist = [('nodes', ['node1', 'node2', 'node3']),
+                      ('resume', path)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.baremetal_mock.node.delete.side_effect = [
+            None, exc.ClientException, None]
+        self.assertRaises(exc.ClientException,
+                          self.cmd.take_action, parsed_args)
+
+        self.baremetal_mock.node.delete.reset_mock()
+        self.baremetal_mock.node.delete.side_effect = None
+        self.cmd.take_action(parsed_args)
+        self.baremetal_mock.node.delete.assert_called_once_with('node2')
+
 
 class TestBaremetalList(TestBaremetal):
 
@@ -1430,6 +1453,35 @@ class TestBaremetalList(TestBaremetal):
             **kwargs
         )
 
+    def test_baremetal_list_provision_state_multiple(self) -> None:
+        arglist = [
+            '--provision-state', 'deploy failed',
+            '--provision-state', 'clean failed',
+            '--provision-state', 'error',
+            '--owner', 'me',
+        ]
+        verifylist = [
+            ('provision_state', ['deploy failed', 'clean failed', 'error']),
+            ('owner', 'me'),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        # DisplayCommandBase.take_action() returns two tuples
+        self.cmd.take_action(parsed_args)
+
+        # Set expected values
+        kwargs = {
+            'marker': None,
+            'limit': None,
+            'provision_state': ['deploy failed', 'clean failed', 'error'],
+            'owner': 'me',
+        }
+
+        self.baremetal_mock.node.list.assert_called_with(
+            **kwargs
+        )
+
     def test_baremetal_list_driver(self) -> None:
         arglist = [
             '--driver', 'ipmi',
@@ -1842,6 +1894,354 @@ class TestBaremetalList(TestBaremetal):
             **kwargs
         )
 
+    def test_baremetal_list_parallel_by(self) -> None:
+        arglist = [
+            '--parallel-by', 'shard',
+        ]
+        verifylist = [
+            ('parallel_by', 'shard'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        # DisplayCommandBase.take_action() returns two tuples
+        self.cmd.take_action(parsed_args)
+
+        kwargs = {
+            'marker': None,
+            'limit': None,
+            'parallel_by': 'shard',
+        }
+
+        self.baremetal_mock.node.list.assert_called_with(
+            **kwargs
+        )
+
+    def test_baremetal_list_parallel_by_invalid(self) -> None:
+        arglist = ['--parallel-by', 'conductor_group']
+        verifylist: list[tuple[str, object]] = []
+
+        self.assertRaises(oscutils.ParserException,
+                          self.check_parser,
+                          self.cmd, arglist, verifylist)
+
+    def test_baremetal_list_with_ports(self) -> None:
+        self.baremetal_mock.port.list.return_value = [
+            baremetal_fakes.FakeBaremetalResource(
+                None,
+                {'uuid': baremetal_fakes.baremetal_port_uuid,
+                 'address': baremetal_fakes.baremetal_port_address,
+                 'node_uuid': baremetal_fakes.baremetal_uuid,
+                 'portgroup_uuid': None},
+                loaded=True,
+            ),
+        ]
+        self.baremetal_mock.portgroup.list.return_value = [
+            baremetal_fakes.FakeBaremetalResource(
+                None,
+                {'uuid': baremetal_fakes.baremetal_portgroup_uuid,
+                 'name': None,
+                 'node_uuid': baremetal_fakes.baremetal_uuid},
+                loaded=True,
+            ),
+        ]
+        arglist = ['--with-ports']
+        verifylist = [('with_ports', True)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        # DisplayCommandBase.take_action() returns two tuples
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=None)
+        # NOTE: only one page of nodes is listed, so are their ports.
+        self.baremetal_mock.port.list.assert_called_once_with(
+            node=baremetal_fakes.baremetal_uuid, limit=0,
+            fields=['address', 'uuid', 'node_uuid', 'portgroup_uuid'])
+        self.baremetal_mock.portgroup.list.assert_called_once_with(
+            node=baremetal_fakes.baremetal_uuid, limit=0,
+            fields=['name', 'address', 'uuid', 'node_uuid'])
+        self.assertEqual(('ports', 'portgroups'), columns[-2:])
+        datalist = ((
+            baremetal_fakes.baremetal_uuid,
+            baremetal_fakes.baremetal_name,
+            baremetal_fakes.baremetal_instance_uuid,
+            baremetal_fakes.baremetal_power_state,
+            baremetal_fakes.baremetal_provision_state,
+            baremetal_fakes.baremetal_maintenance,
+            baremetal_fakes.baremetal_port_address,
+            baremetal_fakes.baremetal_portgroup_uuid,
+        ), )
+        self.assertEqual(datalist, tuple(data))
+
+    def test_baremetal_list_where(self) -> None:
+        arglist = [
+            '--where', 'properties/memory_mb > 1024',
+        ]
+        verifylist = [
+            ('where', 'properties/memory_mb > 1024'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        # DisplayCommandBase.take_action() returns two tuples
+        self.cmd.take_action(parsed_args)
+
+        kwargs = {
+            'marker': None,
+            'limit': None,
+            'where': 'properties/memory_mb > 1024',
+        }
+
+        self.baremetal_mock.node.list.assert_called_with(
+            **kwargs
+        )
+
+
+    def test_baremetal_list_columns(self) -> None:
+        self.baremetal_mock.current_api_version = '1.99'
+        arglist = ['--long', '-c', 'UUID', '-c', 'Provisioning State',
+                   '-c', 'uuid']
+        parsed_args = self.check_parser(self.cmd, arglist, [('long', True)])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=None, detail=False,
+            fields=['uuid', 'provision_state'])
+        self.assertEqual(['uuid', 'provision_state'], list(columns))
+        self.assertEqual(['uuid', 'provision_state'], parsed_args.columns)
+        self.assertEqual(((baremetal_fakes.baremetal_uuid,
+                           baremetal_fakes.baremetal_provision_state),),
+                         tuple(data))
+
+    def test_baremetal_list_columns_unknown(self) -> None:
+        self.baremetal_mock.current_api_version = '1.99'
+        arglist = ['-c', 'uuid', '-c', 'ports']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=None)
+        self.assertEqual(['uuid', 'ports'], parsed_args.columns)
+
+    def test_baremetal_list_columns_old_version(self) -> None:
+        self.baremetal_mock.current_api_version = '1.6'
+        arglist = ['--long', '-c', 'uuid']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=None, detail=True)
+
+    def test_baremetal_list_all_pages(self) -> None:
+        second = baremetal_fakes.FakeBaremetalResource(
+            None, dict(baremetal_fakes.BAREMETAL, uuid='uuid-2'),
+            loaded=True)
+        self.baremetal_mock.node.list.side_effect = [
+            self.baremetal_mock.node.list.return_value + [second],
+            [],
+        ]
+        arglist = ['--limit', '0']
+        parsed_args = self.check_parser(self.cmd, arglist, [('limit', 0)])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # Only the first page is fetched until the rows are consumed.
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=None)
+        self.assertEqual([baremetal_fakes.baremetal_uuid, 'uuid-2'],
+                         [row[0] for row in data])
+        self.baremetal_mock.node.list.assert_called_with(
+            marker='uuid-2', limit=None)
+
+    def test_baremetal_list_sort(self) -> None:
+        second = baremetal_fakes.FakeBaremetalResource(
+            None, dict(baremetal_fakes.BAREMETAL, uuid='uuid-0'),
+            loaded=True)
+        self.baremetal_mock.node.list.return_value.append(second)
+        arglist = ['--limit', '0', '--sort', 'uuid']
+        parsed_args = self.check_parser(self.cmd, arglist, [('limit', 0)])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=0)
+        self.assertEqual(['uuid-0', baremetal_fakes.baremetal_uuid],
+                         [row[0] for row in data])
+
+    def _node(self, uuid: str, provision_state: str,
+              power_state: str = 'power off') -> Any:
+        return baremetal_fakes.FakeBaremetalResource(
+            None, dict(baremetal_fakes.BAREMETAL, uuid=uuid,
+                       provision_state=provision_state,
+                       power_state=power_state),
+            loaded=True)
+
+    def _polls(self, *polls: list[Any]) -> None:
+        # Every poll lists all nodes, then asks for the next page.
+        pages = iter(polls)
+
+        def _list(marker: str | None = None, **kwargs: Any) -> list[Any]:
+            return [] if marker else next(pages)
+
+        self.baremetal_mock.node.list.side_effect = _list
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_baremetal_list_watch(self, mock_sleep: mock.Mock) -> None:
+        self._polls(
+            [self._node('uuid-1', 'available')],
+            [self._node('uuid-1', 'available'),
+             self._node('uuid-2', 'enroll')],
+            [self._node('uuid-1', 'deploying', 'power on'),
+             self._node('uuid-2', 'enroll')],
+            [self._node('uuid-1', 'deploying', 'power on')],
+        )
+        mock_sleep.side_effect = [None, None, None, KeyboardInterrupt()]
+        self.cmd.produce_output = mock.Mock()  # type: ignore[method-assign]
+        self.app.stderr = io.StringIO()
+        arglist = ['--watch']
+        parsed_args = self.check_parser(self.cmd, arglist, [('watch', 5)])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual([], data)
+        self.assertEqual(
+            [mock.call(marker=None, limit=None),
+             mock.call(marker='uuid-1', limit=None)],
+            self.baremetal_mock.node.list.call_args_list[:2])
+        mock_sleep.assert_called_with(5)
+        rows = [[row[0] for row in call[0][2]]
+                for call in self.cmd.produce_output.call_args_list]
+        self.assertEqual([['uuid-1'], ['uuid-2'], ['uuid-1']], rows)
+        self.assertEqual('Node uuid-2 was deleted\n',
+                         self.app.stderr.getvalue())
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_baremetal_list_watch_fields(self,
+                                         mock_sleep: mock.Mock) -> None:
+        self._polls([self._node('uuid-1', 'available')])
+        mock_sleep.side_effect = KeyboardInterrupt()
+        self.cmd.produce_output = mock.Mock()  # type: ignore[method-assign]
+        arglist = ['--watch', '--fields', 'name', '--limit', '10']
+        parsed_args = self.check_parser(self.cmd, arglist, [('watch', 5)])
+
+        self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.node.list.assert_called_once_with(
+            marker=None, limit=10, detail=False,
+            fields=['name', 'uuid', 'provision_state', 'power_state'])
+        self.assertEqual([('name',)],
+                         [call[0][1] for call in
+                          self.cmd.produce_output.call_args_list])
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_baremetal_list_watch_summary(self,
+                                          mock_sleep: mock.Mock) -> None:
+        self.baremetal_mock.current_api_version = '1.99'
+        self._polls(
+            [self._node('uuid-1', 'available'),
+             self._node('uuid-2', 'available')],
+            [self._node('uuid-1', 'available'),
+             self._node('uuid-2', 'available')],
+            [self._node('uuid-1', 'available'),
+             self._node('uuid-2', 'deploying', 'power on')],
+        )
+        mock_sleep.side_effect = [None, None, KeyboardInterrupt()]
+        self.cmd.produce_output = mock.Mock()  # type: ignore[method-assign]
+        arglist = ['--watch', '2', '--watch-summary', '-c', 'name']
+        parsed_args = self.check_parser(self.cmd, arglist, [('watch', 2)])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['provision_state', 'power_state', 'count'],
+                         columns)
+        self.assertEqual([], parsed_args.columns)
+        self.baremetal_mock.node.list.assert_any_call(
+            marker=None, limit=None, detail=False,
+            fields=['provision_state', 'power_state', 'uuid'])
+        self.assertEqual(
+            [mock.call(parsed_args, columns,
+                       [('available', 'power off', 2)]),
+             mock.call(parsed_args, columns,
+                       [('available', 'power off', 1),
+                        ('deploying', 'power on', 1)])],
+            self.cmd.produce_output.call_args_list)
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_baremetal_list_watch_interrupted(self,
+                                              mock_sleep: mock.Mock) -> None:
+        self._polls([self._node('uuid-1', 'available')])
+        mock_sleep.side_effect = KeyboardInterrupt()
+        arglist = ['--watch', '-f', 'json']
+        parsed_args = self.check_parser(self.cmd, arglist, [('watch', 5)])
+
+        with mock.patch.object(lister.Lister, 'produce_output',
+                               autospec=True) as mock_produce:
+            columns, data = self.cmd.take_action(parsed_args)
+            self.assertEqual(1, mock_produce.call_count)
+            # cliff outputs the result of the command after take_action.
+            self.assertEqual(
+                0, self.cmd.produce_output(parsed_args, columns, data))
+        self.assertEqual(1, mock_produce.call_count)
+        self.assertEqual(['uuid-1'],
+                         [row[0] for row in mock_produce.call_args[0][3]])
+
+    def test_baremetal_list_watch_invalid(self) -> None:
+        for arglist in (['--watch', '0'], ['--watch-summary'],
+                        ['--watch', '--with-ports']):
+            parsed_args = self.check_parser(self.cmd, arglist, [])
+            self.assertRaises(exc.CommandError, self.cmd.take_action,
+                              parsed_args)
+
+
+class TestBaremetalSummary(TestBaremetal):
+
+    def setUp(self) -> None:
+        super(TestBaremetalSummary, self).setUp()
+        self.baremetal_mock.current_api_version = '1.99'
+        self.baremetal_mock.node.summary.return_value = {
+            ('available', 'rack2'): 3,
+            ('active', None): 1,
+            ('active', 'rack1'): 5,
+        }
+        self.cmd = baremetal_node.SummaryBaremetalNode(self.app, None)
+
+    def test_baremetal_node_summary(self) -> None:
+        arglist = ['--group-by', 'provision_state, conductor_group',
+                   '--provision-state', 'active',
+                   '--provision-state', 'available', '--no-maintenance']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['provision_state', 'conductor_group', 'count'],
+                         columns)
+        self.assertEqual([('active', None, 1), ('active', 'rack1', 5),
+                          ('available', 'rack2', 3)], data)
+        self.baremetal_mock.node.summary.assert_called_once_with(
+            ['provision_state', 'conductor_group'],
+            provision_state=['active', 'available'], maintenance=False)
+
+    def test_baremetal_node_summary_default(self) -> None:
+        parsed_args = self.check_parser(self.cmd, [], [])
+        self.cmd.take_action(parsed_args)
+        self.baremetal_mock.node.summary.assert_called_once_with(
+            ['provision_state'])
+
+    def test_baremetal_node_summary_invalid_field(self) -> None:
+        parsed_args = self.check_parser(
+            self.cmd, ['--group-by', 'provision_state,foo/bar'], [])
+        self.assertRaisesRegex(exc.CommandError, 'Invalid --group-by fields: '
+                               'foo/bar', self.cmd.take_action, parsed_args)
+        self.assertFalse(self.baremetal_mock.node.summary.called)
+
+    def test_baremetal_node_summary_old_api(self) -> None:
+        self.baremetal_mock.current_api_version = '1.6'
+        parsed_args = self.check_parser(self.cmd, [], [])
+        self.assertRaises(exc.CommandError, self.cmd.take_action,
+                          parsed_args)
+
 
 class TestBaremetalMaintenanceSet(TestBaremetal):
     def setUp(self) -> None:
@@ -2167,6 +2567,36 @@ class TestDeployBaremetalProvisionState(TestBaremetal):
             configdrive='path/to/drive', rescue_password=None,
             servicesteps=None, runbook=None, disable_ramdisk=None)
 
+    def test_deploy_baremetal_provision_state_resume(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'journal')
+        arglist = ['node1', 'node2', '--resume', path]
+        verifylist = [('nodes', ['node1', 'node2']), ('resume', path)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.baremetal_mock.node.set_provision_state.side_effect = [
+            None, exc.ClientException]
+        self.assertRaises(exc.ClientException,
+                          self.cmd.take_action, parsed_args)
+
+        self.baremetal_mock.node.set_provision_state.reset_mock()
+        self.baremetal_mock.node.set_provision_state.side_effect = None
+        self.cmd.take_action(parsed_args)
+        self.baremetal_mock.node.set_provision_state.assert_called_once_with(
+            'node2', 'active',
+            cleansteps=None, deploysteps=None,
+            configdrive=None, rescue_password=None,
+            servicesteps=None, runbook=None, disable_ramdisk=None)
+
+        # A different provision state is not skipped
+        undeploy = baremetal_node.UndeployBaremetalNode(self.app, None)
+        parsed_args = self.check_parser(undeploy, arglist, [])
+        self.baremetal_mock.node.set_provision_state.reset_mock()
+        undeploy.take_action(parsed_args)
+        self.assertEqual(
+            2, self.baremetal_mock.node.set_provision_state.call_count)
+
     def test_deploy_baremetal_provision_state_active_and_configdrive_dict(
             self) -> None:
         arglist = ['node_uuid',
@@ -874,6 +874,20 @@ class TestBaremetalPortList(TestBaremetalPort):
 
         self.cmd = baremetal_port.ListBaremetalPort(self.app, None)
 
+    def test_baremetal_port_list_columns(self) -> None:
+        self.baremetal_mock.current_api_version = '1.99'
+        arglist = ['--long', '-c', 'Address']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.baremetal_mock.port.list.assert_called_once_with(
+            marker=None, limit=None, detail=False, fields=['address'])
+        self.assertEqual(['address'], list(columns))
+        self.assertEqual(['address'], parsed_args.columns)
+        self.assertEqual(((baremetal_fakes.baremetal_port_address,),),
+                         tuple(data))
+
     def test_baremetal_port_list(self) -> None:
         arglist = []
         verifylist = []
@@ -925,6 +939,28 @@ class TestBaremetalPortList(TestBaremetalPort):
         }
         self.baremetal_mock.port.list.assert_called_with(**kwargs)
 
+    def test_baremetal_port_list_parallel_by(self) -> None:
+        arglist = ['--parallel-by', 'shard', '--limit', '0']
+        verifylist = [('parallel_by', 'shard')]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.cmd.take_action(parsed_args)
+
+        kwargs = {
+            'parallel_by': 'shard',
+            'marker': None,
+            'limit': 0,
+        }
+        self.baremetal_mock.port.list.assert_called_with(**kwargs)
+
+    def test_baremetal_port_list_parallel_by_invalid(self) -> None:
+        arglist = ['--parallel-by', 'owner']
+        verifylist: list[tuple[str, object]] = []
+
+        self.assertRaises(osctestutils.ParserException,
+                          self.check_parser,
+                          self.cmd, arglist, verifylist)
+
     def test_baremetal_port_list_portgroup(self) -> None:
         arglist = ['--port-group', baremetal_fakes.baremetal_portgroup_uuid]
         verifylist = [('portgroup', baremetal_fakes.baremetal_portgroup_uuid)]
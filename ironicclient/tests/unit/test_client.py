@@ -38,6 +38,7 @@ class ClientTest(utils.BaseTestCase):
         expected_interface: str | list[str] | None = None,
         additional_headers: dict[str, str] | None = None,
         global_request_id: str | None = None,
+        hooks: list[Any] | None = None,
         **kwargs: Any,
     ) -> v1.Client:
         session = mock_cloud_region.return_value.get_session.return_value
@@ -46,7 +47,7 @@ class ClientTest(utils.BaseTestCase):
 
         client = iroclient.get_client(
             '1', additional_headers=additional_headers,
-            global_request_id=global_request_id, **kwargs)
+            global_request_id=global_request_id, hooks=hooks, **kwargs)
 
         expected_version = kwargs.pop('os_ironic_api_version', None)
         kwargs.pop('interface', None)
@@ -109,6 +110,12 @@ class ClientTest(utils.BaseTestCase):
         self.assertEqual(req_id, client.http_client.global_request_id)
         self.assertEqual({'foo': 'bar'}, client.http_client.additional_headers)
 
+    def test_get_client_hooks(self) -> None:
+        hook = mock.Mock()
+        client = self._test_get_client(
+            auth='none', endpoint='http://localhost:6385/v1', hooks=[hook])
+        self.assertEqual((hook,), client.http_client._hooks)
+
     def test_get_client_with_auth_token_endpoint(self) -> None:
         kwargs = {
             'endpoint': 'http://localhost:6385/v1',
@@ -0,0 +1,187 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from typing import Any
+from unittest import mock
+
+import fixtures
+
+import ironicclient
+from ironicclient import daemon
+from ironicclient.osc.v1 import baremetal_node
+from ironicclient import shell
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import node
+
+
+class DaemonTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(DaemonTest, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'daemon.sock')
+        self.stdout = io.StringIO()
+        self.stderr = io.StringIO()
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
+        self.useFixture(fixtures.MonkeyPatch('sys.stderr', self.stderr))
+
+    def _serve_one(self, server: daemon.Server) -> None:
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+
+    def test_run(self) -> None:
+        def _execute(argv: list[str], env: dict[str, str], cwd: str,
+                     stdout: io.TextIOBase, stderr: io.TextIOBase) -> int:
+            self.assertEqual(['node', 'list'], argv)
+            self.assertEqual(os.getcwd(), cwd)
+            self.assertEqual(dict(os.environ), env)
+            stdout.write('nodes\n')
+            stderr.write('warning\n')
+            return 3
+
+        server = daemon.Server(self.path, 5)
+        server.execute = _execute  # type: ignore[method-assign]
+        self._serve_one(server)
+
+        self.assertEqual(3, daemon.run(['node', 'list'], self.path))
+        self.assertEqual('nodes\n', self.stdout.getvalue())
+        self.assertEqual('warning\n', self.stderr.getvalue())
+
+    @mock.patch.object(daemon, '_connect', autospec=True)
+    def test_run_in_process(self, mock_connect: mock.Mock) -> None:
+        self.assertIsNone(daemon.run([], self.path))
+        self.assertIsNone(daemon.run(['node', 'create', '-'], self.path))
+        self.assertFalse(mock_connect.called)
+
+    @mock.patch.object(daemon, '_start', autospec=True)
+    def test_run_no_daemon(self, mock_start: mock.Mock) -> None:
+        mock_start.side_effect = ConnectionRefusedError()
+        self.assertIsNone(daemon.run(['node', 'list'], self.path))
+        mock_start.assert_called_once_with(self.path)
+
+    @mock.patch.object(daemon, '_App', autospec=True)
+    def test_execute(self, mock_app: mock.Mock) -> None:
+        stdout = io.StringIO()
+        env = {'OS_CLOUD': 'test-cloud'}
+
+        def _run(argv: list[str]) -> int:
+            self.assertEqual(env, dict(os.environ))
+            self.assertEqual('/', os.getcwd())
+            sys.stdout.write('nodes\n')
+            return 0
+
+        mock_app.return_value.run.side_effect = _run
+        saved_env = dict(os.environ)
+        server = daemon.Server(self.path, 5)
+        self.addCleanup(server.server_close)
+
+        code = server.execute(['node', 'list'], env, '/', stdout,
+                              io.StringIO())
+        self.assertEqual(0, code)
+        self.assertEqual('nodes\n', stdout.getvalue())
+        mock_app.assert_called_once_with(server.clients)
+        self.assertEqual(saved_env, dict(os.environ))
+        self.assertIs(self.stdout, sys.stdout)
+
+    @mock.patch.object(daemon, '_App', autospec=True)
+    def test_execute_exit(self, mock_app: mock.Mock) -> None:
+        mock_app.return_value.run.side_effect = SystemExit(2)
+        server = daemon.Server(self.path, 5)
+        self.addCleanup(server.server_close)
+        self.assertEqual(2, server.execute(['node', '--wrong'], {}, '/',
+                                           io.StringIO(), io.StringIO()))
+
+    def test_serve_until_idle(self) -> None:
+        daemon.serve(self.path, 0.01)
+        self.assertFalse(os.path.exists(self.path))
+
+    @mock.patch.object(shell.ClientManager, '_create_ironic_client',
+                       autospec=True)
+    def test_client_reused(self, mock_create: mock.Mock) -> None:
+        mock_create.side_effect = lambda manager: mock.Mock()
+        clients: dict[str, Any] = {}
+        options = argparse.Namespace(os_baremetal_api_version='1.99',
+                                     max_retries=5, retry_interval=2)
+        cloud_region = mock.Mock(config={'auth': {'token': 'abcd'}})
+
+        first = daemon._ClientManager(cloud_region, options, clients)
+        second = daemon._ClientManager(cloud_region, options, clients)
+        self.assertIs(first.baremetal, second.baremetal)
+        self.assertEqual(1, mock_create.call_count)
+
+        cloud_region = mock.Mock(config={'auth': {'token': 'efgh'}})
+        third = daemon._ClientManager(cloud_region, options, clients)
+        self.assertIsNot(first.baremetal, third.baremetal)
+        self.assertEqual(2, mock_create.call_count)
+
+    def _request(self, argv: list[str]) -> tuple[int, str]:
+        # NOTE: daemon.run cannot be used, the server replaces sys.stdout
+        # of this process while executing a command.
+        request = {'argv': argv, 'env': {}, 'cwd': os.getcwd()}
+        output = []
+        with daemon._connect(self.path) as sock, \
+                sock.makefile('rwb') as stream:
+            stream.write(json.dumps(request).encode() + b'\n')
+            stream.flush()
+            for line in stream:
+                message = json.loads(line)
+                if 'exit' in message:
+                    return message['exit'], ''.join(output)
+                if message['stream'] == 'stdout':
+                    output.append(message['data'])
+        self.fail('no exit code received')
+
+    @mock.patch.object(shell.CommandManager, 'load_commands', autospec=True)
+    @mock.patch.object(shell.ClientManager, '_create_ironic_client',
+                       autospec=True)
+    def test_execute_commands(self, mock_create: mock.Mock,
+                              mock_load: mock.Mock) -> None:
+        mock_load.side_effect = lambda manager, namespace: (
+            manager.add_command('node list',
+                                baremetal_node.ListBaremetalNode))
+        ironic = mock_create.return_value
+        ironic.current_api_version = '1.99'
+        ironic.node.list.return_value = [
+            node.Node(None, {'uuid': 'node-1', 'name': 'node-1'},
+                      loaded=True)]
+        server = daemon.Server(self.path, 5)
+
+        def _serve() -> None:
+            for _request in range(3):
+                server.handle_request()
+
+        thread = threading.Thread(target=_serve)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        argv = ['--os-endpoint', 'http://localhost:6385', '--os-auth-type',
+                'none', 'node', 'list', '-c', 'UUID', '-f', 'value']
+
+        with mock.patch.dict(ironicclient.__dict__,
+                             {'__version__': '1.2.3'}):
+            code, output = self._request(['--version'])
+        self.assertEqual((0, '1.2.3\n'), (code, output.split(' ', 1)[1]))
+        for _attempt in range(2):
+            self.assertEqual((0, 'node-1\n'), self._request(argv))
+        # NOTE: the client of the first command is reused by the second.
+        self.assertEqual(1, mock_create.call_count)
+        self.assertEqual(2, ironic.node.list.call_count)
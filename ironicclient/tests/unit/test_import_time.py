@@ -0,0 +1,73 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+from ironicclient.tests.unit import utils
+
+# Modules imported by the standalone CLI before a command is run.
+_STARTUP_MODULES: str = (
+    'import ironicclient.shell, ironicclient.osc.v1.baremetal_port')
+# Modules that must only be imported by the commands that need them.
+_HEAVY_MODULES: tuple[str, ...] = (
+    'ironicclient.client',
+    'ironicclient.osc.v1.baremetal_node',
+    'ironicclient.v1.create_resources',
+    'jsonschema',
+    'sqlite3',
+)
+# Modules that the shell module must not import. They are still imported
+# when the argument parser is built and by osc-lib in command modules.
+_SDK_MODULES: tuple[str, ...] = (
+    'dogpile',
+    'openstack',
+    'yaml',
+)
+_BUDGET_ENV: str = 'IRONICCLIENT_IMPORT_TIME_BUDGET'
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, '-c', code], check=True,
+                          capture_output=True, text=True).stdout
+
+
+def _loaded(imports: str) -> list[str]:
+    return _run('import sys; %s; print("\\n".join(sys.modules))'
+                % imports).split()
+
+
+class ImportTimeTest(utils.BaseTestCase):
+
+    def test_heavy_modules_not_imported(self) -> None:
+        loaded = _loaded(_STARTUP_MODULES)
+        for name in _HEAVY_MODULES:
+            self.assertNotIn(name, loaded)
+
+    def test_sdk_not_imported_by_shell(self) -> None:
+        loaded = _loaded('import ironicclient.shell')
+        for name in _SDK_MODULES:
+            self.assertNotIn(name, loaded)
+
+    def test_import_time_budget(self) -> None:
+        budget = os.environ.get(_BUDGET_ENV)
+        if not budget:
+            self.skipTest('%s is not set' % _BUDGET_ENV)
+        start = time.monotonic()
+        _run(_STARTUP_MODULES)
+        elapsed = time.monotonic() - start
+        self.assertLessEqual(elapsed, float(budget),
+                             'Startup imports took %.3f seconds' % elapsed)
@@ -0,0 +1,177 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import pstats
+from unittest import mock
+
+import fixtures
+
+import ironicclient
+from ironicclient.common import filecache
+from ironicclient.common import timing
+from ironicclient import shell
+from ironicclient.tests.unit import utils
+
+
+class ClientManagerTest(utils.BaseTestCase):
+
+    @mock.patch.object(shell.ClientManager, '_create_ironic_client',
+                       autospec=True)
+    def test_timings(self, mock_create: mock.Mock) -> None:
+        timings = timing.Timings()
+        manager = shell.ClientManager(mock.Mock(), argparse.Namespace(),
+                                      timings)
+
+        self.assertIs(timings, manager.baremetal.http_client.timings)
+        self.assertIn(timing.CLIENT_SETUP, timings.phases)
+
+    @mock.patch.object(shell.ClientManager, '_create_ironic_client',
+                       autospec=True)
+    def test_no_timings(self, mock_create: mock.Mock) -> None:
+        mock_create.return_value.http_client.timings = timing.Timings()
+        manager = shell.ClientManager(mock.Mock(), argparse.Namespace())
+        self.assertIsNone(manager.baremetal.http_client.timings)
+
+    def _create_with_auth_cache(
+        self, cached_state: str | None,
+    ) -> tuple[mock.Mock, mock.Mock]:
+        self.useFixture(fixtures.EnvironmentVariable(
+            filecache.AUTH_CACHE_ENV_VAR, 'true'))
+        cloud_region = mock.Mock()
+        session = cloud_region.get_session.return_value
+        session.auth.get_cache_id.return_value = 'abcd'
+        session.auth.get_auth_state.return_value = '{"token": "new"}'
+
+        def get_endpoint(service_type: str) -> str:
+            # The endpoint is looked up with the cached token and catalog.
+            if cached_state is None:
+                self.assertFalse(session.auth.set_auth_state.called)
+            else:
+                session.auth.set_auth_state.assert_called_once_with(
+                    cached_state)
+            self.assertFalse(session.auth.get_access.called)
+            return 'http://ironic:6385'
+
+        cloud_region.get_endpoint.side_effect = get_endpoint
+        options = argparse.Namespace(os_baremetal_api_version='1.80',
+                                     max_retries=5, retry_interval=2)
+        manager = shell.ClientManager(cloud_region, options)
+
+        with mock.patch.object(shell.client, 'Client',
+                               autospec=True) as mock_client:
+            mock_client.return_value = mock.Mock()
+            self.assertIs(mock_client.return_value, manager.baremetal)
+        mock_client.assert_called_once_with(
+            os_ironic_api_version='1.80', allow_api_version_downgrade=False,
+            session=session,
+            region_name=cloud_region.get_region_name.return_value,
+            endpoint_override='http://ironic:6385', max_retries=5,
+            retry_interval=2)
+        session.auth.get_access.assert_called_once_with(session)
+        return cloud_region, session
+
+    @mock.patch.object(filecache, 'save_auth_data', autospec=True)
+    @mock.patch.object(filecache, 'retrieve_auth_data', autospec=True)
+    def test_auth_cache_hit(self, mock_retrieve: mock.Mock,
+                            mock_save: mock.Mock) -> None:
+        mock_retrieve.return_value = '{"token": "new"}'
+        self._create_with_auth_cache('{"token": "new"}')
+        mock_retrieve.assert_called_once_with('auth:abcd')
+        self.assertFalse(mock_save.called)
+
+    @mock.patch.object(filecache, 'save_auth_data', autospec=True)
+    @mock.patch.object(filecache, 'retrieve_auth_data', autospec=True)
+    def test_auth_cache_miss(self, mock_retrieve: mock.Mock,
+                             mock_save: mock.Mock) -> None:
+        mock_retrieve.return_value = None
+        self._create_with_auth_cache(None)
+        mock_save.assert_called_once_with('auth:abcd', '{"token": "new"}')
+
+
+class AppTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(AppTest, self).setUp()
+        self.app = shell.App()
+        self.stderr = io.StringIO()
+        self.app.stderr = self.stderr
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'profile')
+
+    def _initialize(self, argv: list[str]) -> None:
+        parser = self.app.build_option_parser('', None)
+        self.app.options = parser.parse_args(argv)
+        with mock.patch.object(self.app, 'config', autospec=True), \
+                mock.patch.object(self.app, '_configure_ironic_logging',
+                                  autospec=True):
+            self.app.initialize_app([])
+
+    def test_version(self) -> None:
+        stdout = io.StringIO()
+        with mock.patch.dict(ironicclient.__dict__,
+                             {'__version__': '1.2.3'}), \
+                mock.patch('sys.stdout', stdout):
+            self.assertRaises(SystemExit, self.app.parser.parse_known_args,
+                              ['--version'])
+        self.assertEqual('%s 1.2.3\n' % self.app.parser.prog,
+                         stdout.getvalue())
+
+    def test_help_lists_version_once(self) -> None:
+        self.assertEqual(
+            1, self.app.parser.format_help().count('  --version'))
+
+    def test_timing(self) -> None:
+        self._initialize(['--timing'])
+        self.assertIs(self.app.timings, self.app.client_manager.timings)
+        cmd = mock.Mock()
+
+        self.app.prepare_to_run_command(cmd)
+        self.app.clean_up(cmd, 0, None)
+
+        output = self.stderr.getvalue()
+        self.assertIn('startup', output)
+        self.assertIn('total', output)
+        self.assertIsNone(self.app.timings)
+
+    def test_run_with_timing(self) -> None:
+        self.app.stdout = io.StringIO()
+        # 'complete' is built into cliff and does not call the API.
+        result = self.app.run(['--timing', '--os-endpoint',
+                               'http://localhost:6385', 'complete'])
+        self.assertEqual(0, result)
+        output = self.stderr.getvalue()
+        self.assertIn('startup', output)
+        self.assertIn('total', output)
+        self.assertIsNone(self.app.timings)
+
+    def test_profile(self) -> None:
+        self._initialize(['--profile', self.path])
+        cmd = mock.Mock()
+        self.app.prepare_to_run_command(cmd)
+        self.app.clean_up(cmd, 0, None)
+
+        self.assertIsNotNone(pstats.Stats(self.path))
+        self.assertEqual('', self.stderr.getvalue())
+
+    def test_no_timing(self) -> None:
+        self._initialize([])
+        cmd = mock.Mock()
+        self.app.prepare_to_run_command(cmd)
+        self.app.clean_up(cmd, 0, None)
+        self.assertIsNone(self.app.client_manager.timings)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual('', self.stderr.getvalue())
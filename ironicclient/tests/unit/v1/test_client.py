@@ -25,6 +25,13 @@ class ClientTest(utils.BaseTestCase):
 
     session = mock.sentinel.session
 
+    def setUp(self) -> None:
+        super(ClientTest, self).setUp()
+        patcher = mock.patch.object(filecache, 'retrieve_version_range',
+                                    autospec=True, return_value=None)
+        self.mock_retrieve_range = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_client_user_api_version(
         self, http_client_mock: mock.MagicMock,
     ) -> None:
@@ -101,14 +108,48 @@ class ClientTest(utils.BaseTestCase):
             os_ironic_api_version=client.DEFAULT_VER,
             api_version_select_state='default')
 
+    def test_client_cached_version_range(
+        self, http_client_mock: mock.MagicMock,
+    ) -> None:
+        endpoint = 'http://ironic:6385'
+        self.mock_retrieve_range.return_value = ('1.1', '1.50')
+
+        client.Client(endpoint, session=self.session,
+                      os_ironic_api_version=http.LATEST_VERSION,
+                      allow_api_version_downgrade=True)
+
+        self.mock_retrieve_range.assert_called_once_with(host='ironic',
+                                                         port='6385')
+        use_version_range = http_client_mock.return_value.use_version_range
+        use_version_range.assert_called_once_with('1.1', '1.50')
+
+    def test_client_user_api_version_no_version_range(
+        self, http_client_mock: mock.MagicMock,
+    ) -> None:
+        client.Client('http://ironic:6385', session=self.session,
+                      os_ironic_api_version='1.15')
+
+        self.assertFalse(self.mock_retrieve_range.called)
+        self.assertFalse(
+            http_client_mock.return_value.use_version_range.called)
+
     def test_client_cache_version_no_endpoint_as_arg(
         self, http_client_mock: mock.MagicMock,
     ) -> None:
+        http_client_mock.return_value.endpoint_trimmed = 'http://ironic:6385'
+        self.mock_retrieve_range.return_value = ('1.1', '1.50')
+
         client.Client(session='fake_session', insecure=True)
+
         http_client_mock.assert_called_once_with(
             session='fake_session', insecure=True,
             os_ironic_api_version=client.DEFAULT_VER,
             api_version_select_state='default')
+        # NOTE: the version range is looked up for the resolved endpoint.
+        self.mock_retrieve_range.assert_called_once_with(host='ironic',
+                                                         port='6385')
+        use_version_range = http_client_mock.return_value.use_version_range
+        use_version_range.assert_called_once_with('1.1', '1.50')
 
     def test_client_initialized_managers(
         self, http_client_mock: mock.MagicMock,
@@ -13,10 +13,17 @@
 from __future__ import annotations
 
 import builtins
+from collections.abc import Iterator
+import copy
+import os
+import tempfile
+import time
+from typing import Any
 from unittest import mock
 
 import jsonschema
 
+from ironicclient.common import journal
 from ironicclient import exc
 from ironicclient.tests.unit import utils
 from ironicclient.v1 import create_resources
@@ -93,7 +100,7 @@ class CreateResourcesTest(utils.BaseTestCase):
 
     @mock.patch.object(create_resources, 'create_nodes', autospec=True)
     @mock.patch.object(create_resources, 'create_chassis', autospec=True)
-    @mock.patch.object(jsonschema, 'validate', autospec=True)
+    @mock.patch.object(jsonschema.Draft4Validator, 'validate', autospec=True)
     @mock.patch.object(create_resources, 'load_from_file',
                        side_effect=[valid_json], autospec=True)
     def test_create_resources(
@@ -108,7 +115,7 @@ class CreateResourcesTest(utils.BaseTestCase):
         mock_load.assert_has_calls([
             mock.call('file.json')
         ])
-        mock_validate.assert_called_once_with(valid_json, mock.ANY)
+        mock_validate.assert_called_once_with(mock.ANY, valid_json)
         mock_chassis.assert_called_once_with(self.client,
                                              valid_json['chassis'])
         mock_nodes.assert_called_once_with(self.client,
@@ -116,7 +123,7 @@ class CreateResourcesTest(utils.BaseTestCase):
 
     @mock.patch.object(create_resources, 'create_nodes', autospec=True)
     @mock.patch.object(create_resources, 'create_chassis', autospec=True)
-    @mock.patch.object(jsonschema, 'validate', autospec=True)
+    @mock.patch.object(jsonschema.Draft4Validator, 'validate', autospec=True)
     @mock.patch.object(create_resources, 'load_from_file',
                        side_effect=exc.ClientException, autospec=True)
     def test_create_resources_cannot_read_schema(
@@ -137,7 +144,7 @@ class CreateResourcesTest(utils.BaseTestCase):
 
     @mock.patch.object(create_resources, 'create_nodes', autospec=True)
     @mock.patch.object(create_resources, 'create_chassis', autospec=True)
-    @mock.patch.object(jsonschema, 'validate',
+    @mock.patch.object(jsonschema.Draft4Validator, 'validate',
                        side_effect=jsonschema.ValidationError(''),
                        autospec=True)
     @mock.patch.object(create_resources, 'load_from_file',
@@ -156,14 +163,14 @@ class CreateResourcesTest(utils.BaseTestCase):
         mock_load.assert_has_calls([
             mock.call('file.json')
         ])
-        mock_validate.assert_called_once_with(schema_pov_invalid_json,
-                                              mock.ANY)
+        mock_validate.assert_called_once_with(mock.ANY,
+                                              schema_pov_invalid_json)
         self.assertFalse(mock_chassis.called)
         self.assertFalse(mock_nodes.called)
 
     @mock.patch.object(create_resources, 'create_nodes', autospec=True)
     @mock.patch.object(create_resources, 'create_chassis', autospec=True)
-    @mock.patch.object(jsonschema, 'validate',
+    @mock.patch.object(jsonschema.Draft4Validator, 'validate',
                        side_effect=[None, jsonschema.ValidationError('')],
                        autospec=True)
     @mock.patch.object(create_resources, 'load_from_file',
@@ -184,15 +191,15 @@ class CreateResourcesTest(utils.BaseTestCase):
             mock.call('file.json'), mock.call('file2.json')
         ])
         mock_validate.assert_has_calls([
-            mock.call(valid_json, mock.ANY),
-            mock.call(schema_pov_invalid_json, mock.ANY)
+            mock.call(mock.ANY, valid_json),
+            mock.call(mock.ANY, schema_pov_invalid_json)
         ])
         self.assertFalse(mock_chassis.called)
         self.assertFalse(mock_nodes.called)
 
     @mock.patch.object(create_resources, 'create_nodes', autospec=True)
     @mock.patch.object(create_resources, 'create_chassis', autospec=True)
-    @mock.patch.object(jsonschema, 'validate', autospec=True)
+    @mock.patch.object(jsonschema.Draft4Validator, 'validate', autospec=True)
     @mock.patch.object(create_resources, 'load_from_file',
                        side_effect=[ironic_pov_invalid_json], autospec=True)
     def test_create_resources_ironic_fails_to_create(
@@ -211,13 +218,206 @@ class CreateResourcesTest(utils.BaseTestCase):
         mock_load.assert_has_calls([
             mock.call('file.json')
         ])
-        mock_validate.assert_called_once_with(ironic_pov_invalid_json,
-                                              mock.ANY)
+        mock_validate.assert_called_once_with(mock.ANY,
+                                              ironic_pov_invalid_json)
         mock_chassis.assert_called_once_with(self.client, [])
         mock_nodes.assert_called_once_with(
             self.client, ironic_pov_invalid_json['nodes'])
 
 
+class CreateResourcesParallelTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(CreateResourcesParallelTest, self).setUp()
+        self.client = mock.MagicMock()
+        self.client.chassis.create.return_value = mock.Mock(uuid='chassis')
+        self.client.node.create.side_effect = [mock.Mock(uuid='node-1'),
+                                               mock.Mock(uuid='node-2')]
+        self.client.portgroup.create.return_value = mock.Mock(uuid='pg')
+        self.client.port.create.return_value = mock.Mock(uuid='port')
+
+    @mock.patch.object(create_resources, 'create_nodes', autospec=True)
+    @mock.patch.object(create_resources, 'create_chassis', autospec=True)
+    @mock.patch.object(create_resources, 'load_from_file', autospec=True)
+    def test_create_resources(
+            self,
+            mock_load: mock.MagicMock,
+            mock_chassis: mock.MagicMock,
+            mock_nodes: mock.MagicMock,
+    ) -> None:
+        resources: dict[str, Any] = copy.deepcopy(valid_json)
+        resources['chassis'][0]['nodes'][0]['traits'] = ['CUSTOM_A']
+        resources['nodes'][0].pop('chassis_uuid')
+        mock_load.return_value = resources
+        self.client.node.create.side_effect = None
+        self.client.node.create.return_value = mock.Mock(uuid='node')
+
+        create_resources.create_resources(self.client, ['file.json'],
+                                          max_workers=4)
+
+        self.assertFalse(mock_chassis.called)
+        self.assertFalse(mock_nodes.called)
+        self.client.chassis.create.assert_called_once_with(
+            description='testing resources import')
+        self.assertEqual(2, self.client.node.create.call_count)
+        self.client.node.create.assert_any_call(
+            driver='agent_ssh', extra={'kv1': True, 'vk1': None},
+            properties={'a': 'c'}, chassis_uuid='chassis')
+        self.client.node.set_traits.assert_called_once_with('node',
+                                                            ['CUSTOM_A'])
+        self.client.portgroup.create.assert_called_once_with(
+            address='00:00:00:00:00:02', name='portgroup1', node_uuid='node')
+        self.assertCountEqual([
+            mock.call(address='00:00:00:00:00:01', extra={'a': 'b'},
+                      node_uuid='node'),
+            mock.call(address='00:00:00:00:00:03', node_uuid='node',
+                      portgroup_uuid='pg'),
+        ], self.client.port.create.call_args_list)
+
+    def test_node_waits_for_chassis(self) -> None:
+        calls = []
+
+        def _create_chassis(**kwargs: object) -> mock.Mock:
+            time.sleep(0.1)
+            calls.append('chassis')
+            return mock.Mock(uuid='chassis')
+
+        def _create_node(**kwargs: object) -> mock.Mock:
+            calls.append('node')
+            return mock.Mock(uuid='node')
+
+        self.client.chassis.create.side_effect = _create_chassis
+        self.client.node.create.side_effect = _create_node
+        creator = create_resources._ParallelCreator(self.client, 4)
+
+        errors = creator.run([{'chassis': [{'uuid': 'chassis'}]},
+                              {'nodes': [{'chassis_uuid': 'chassis'}]}])
+
+        self.assertEqual([], errors)
+        self.assertEqual(['chassis', 'node'], calls)
+
+    @mock.patch.object(create_resources, 'load_from_file', autospec=True)
+    def test_create_resources_errors(self, mock_load: mock.MagicMock) -> None:
+        mock_load.return_value = {
+            'nodes': [
+                {'driver': 'fake', 'name': 'bad',
+                 'ports': [{'address': '00:00:00:00:00:01'}]},
+                {'driver': 'fake', 'name': 'good',
+                 'ports': [{'address': '00:00:00:00:00:02',
+                            'node_uuid': 'other-node'}]},
+            ],
+        }
+        self.client.node.create.side_effect = [
+            exc.ClientException('cannot create that'),
+            mock.Mock(uuid='node-2')]
+
+        self.assertRaisesRegex(exc.ClientException, 'cannot create that',
+                               create_resources.create_resources,
+                               self.client, ['file.json'], max_workers=1)
+        self.assertFalse(self.client.port.create.called)
+
+        self.client.node.create.side_effect = [
+            exc.ClientException('cannot create that'),
+            mock.Mock(uuid='node-2')]
+        self.assertRaisesRegex(exc.ClientException,
+                               '(?s)cannot create that.*different node UUID'
+                               '|different node UUID.*cannot create that',
+                               create_resources.create_resources,
+                               self.client, ['file.json'], max_workers=2)
+        self.assertFalse(self.client.port.create.called)
+
+
+class CreateResourcesJournalTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(CreateResourcesJournalTest, self).setUp()
+        self.client = mock.MagicMock()
+        self.client.chassis.create.return_value = mock.Mock(uuid='chassis')
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'journal.ndjson')
+
+    @mock.patch.object(create_resources, 'load_from_file', autospec=True)
+    def test_resume(self, mock_load: mock.MagicMock) -> None:
+        resources = {
+            'chassis': [{'description': 'rack',
+                         'nodes': [{'driver': 'fake',
+                                    'ports': [{'address': 'address-1'}]}]}],
+            'nodes': [{'driver': 'fake'}, {'driver': 'fake'}],
+        }
+        mock_load.side_effect = lambda _f: copy.deepcopy(resources)
+        uuids = iter(['node-1', 'node-2'])
+
+        def _create_node(**params: Any) -> mock.Mock:
+            if params.get('chassis_uuid'):
+                raise exc.ClientException('boom')
+            return mock.Mock(uuid=next(uuids))
+
+        self.client.node.create.side_effect = _create_node
+
+        with journal.Journal(self.path) as bulk_journal:
+            self.assertRaises(exc.ClientException,
+                              create_resources.create_resources,
+                              self.client, ['file.json'],
+                              journal=bulk_journal)
+        self.assertEqual(1, self.client.chassis.create.call_count)
+        self.assertEqual(3, self.client.node.create.call_count)
+
+        self.client.reset_mock()
+        self.client.node.create.side_effect = [mock.Mock(uuid='node-3')]
+        self.client.port.create.side_effect = None
+        self.client.port.create.return_value = mock.Mock(uuid='port')
+        with journal.Journal(self.path) as bulk_journal:
+            create_resources.create_resources(self.client, ['file.json'],
+                                              journal=bulk_journal)
+
+        self.assertFalse(self.client.chassis.create.called)
+        self.client.node.create.assert_called_once_with(
+            driver='fake', chassis_uuid='chassis')
+        self.client.port.create.assert_called_once_with(
+            address='address-1', node_uuid='node-3')
+
+        self.client.reset_mock()
+        with journal.Journal(self.path) as bulk_journal:
+            create_resources.create_resources(self.client, ['file.json'],
+                                              max_workers=4,
+                                              journal=bulk_journal)
+        self.assertFalse(self.client.chassis.create.called)
+        self.assertFalse(self.client.node.create.called)
+        self.assertFalse(self.client.port.create.called)
+
+    @mock.patch.object(create_resources, 'load_from_file', autospec=True)
+    def test_resume_traits(self, mock_load: mock.MagicMock) -> None:
+        resources = {
+            'nodes': [{'driver': 'fake', 'traits': ['CUSTOM_1'],
+                       'ports': [{'address': 'address-1'}]}],
+        }
+        mock_load.side_effect = lambda _f: copy.deepcopy(resources)
+        self.client.node.create.return_value = mock.Mock(uuid='node-1')
+        self.client.node.set_traits.side_effect = exc.ClientException('boom')
+
+        with journal.Journal(self.path) as bulk_journal:
+            self.assertRaises(exc.ClientException,
+                              create_resources.create_resources,
+                              self.client, ['file.json'],
+                              journal=bulk_journal)
+        self.client.node.create.assert_called_once_with(driver='fake')
+        self.assertFalse(self.client.port.create.called)
+
+        self.client.reset_mock()
+        self.client.node.set_traits.side_effect = None
+        self.client.port.create.return_value = mock.Mock(uuid='port')
+        with journal.Journal(self.path) as bulk_journal:
+            create_resources.create_resources(self.client, ['file.json'],
+                                              journal=bulk_journal)
+
+        self.assertFalse(self.client.node.create.called)
+        self.client.node.set_traits.assert_called_once_with(
+            'node-1', ['CUSTOM_1'])
+        self.client.port.create.assert_called_once_with(
+            address='address-1', node_uuid='node-1')
+
+
 class LoadFromFileTest(utils.BaseTestCase):
 
     @mock.patch.object(builtins, 'open',
@@ -267,6 +467,125 @@ class LoadFromFileTest(utils.BaseTestCase):
             create_resources.load_from_file, fname)
 
 
+class IterFromFileTest(utils.BaseTestCase):
+
+    @mock.patch.object(builtins, 'open',
+                       mock.mock_open(read_data='{"a": "b"}\n\n{"c": 1}\n'))
+    def test_ndjson(self) -> None:
+        res = create_resources.iter_from_file('abc.ndjson')
+        self.assertEqual({'a': 'b'}, next(res))
+        self.assertEqual([{'c': 1}], list(res))
+
+    @mock.patch.object(builtins, 'open',
+                       mock.mock_open(read_data='{"a": "b"}\n{{bbb\n'))
+    def test_ndjson_invalid(self) -> None:
+        res = create_resources.iter_from_file('abc.jsonl')
+        self.assertEqual({'a': 'b'}, next(res))
+        self.assertRaisesRegex(exc.ClientException,
+                               'Line 2 in file "abc.jsonl" is invalid',
+                               next, res)
+
+    @mock.patch.object(builtins, 'open',
+                       mock.mock_open(read_data='---\na: b\n---\n---\nc: 1'))
+    def test_yaml_multiple_documents(self) -> None:
+        res = create_resources.iter_from_file('abc.yaml')
+        self.assertEqual([{'a': 'b'}, {'c': 1}], list(res))
+
+    @mock.patch.object(builtins, 'open',
+                       mock.mock_open(read_data='{"a": "b"}'))
+    def test_json(self) -> None:
+        res = create_resources.iter_from_file('abc.json')
+        self.assertEqual([{'a': 'b'}], list(res))
+
+    @mock.patch.object(builtins, 'open', autospec=True)
+    def test_ioerror(self, mock_open: mock.MagicMock) -> None:
+        mock_open.side_effect = IOError('file does not exist')
+        self.assertRaisesRegex(exc.ClientException, 'Cannot read file',
+                               list,
+                               create_resources.iter_from_file('abc.ndjson'))
+
+
+@mock.patch.object(create_resources, 'iter_from_file', autospec=True)
+class IterResourcesTest(utils.BaseTestCase):
+
+    def test_iter_resources(self, mock_iter: mock.MagicMock) -> None:
+        def _iter(filename: str) -> Iterator[dict[str, Any]]:
+            yield valid_json
+            yield schema_pov_invalid_json
+            if filename == 'file2.ndjson':
+                raise exc.ClientException('cannot read')
+            yield ironic_pov_invalid_json
+
+        mock_iter.side_effect = _iter
+        errors: list[Exception] = []
+
+        res = create_resources.iter_resources(
+            ['file1.ndjson', 'file2.ndjson'], errors)
+
+        self.assertIs(valid_json, next(res))
+        self.assertEqual([], errors)
+        self.assertEqual([ironic_pov_invalid_json, valid_json], list(res))
+        self.assertEqual(3, len(errors))
+        self.assertIn('Document 2 in file "file1.ndjson" is invalid',
+                      str(errors[0]))
+        self.assertIn('Document 2 in file "file2.ndjson" is invalid',
+                      str(errors[1]))
+        self.assertEqual('cannot read', str(errors[2]))
+
+    @mock.patch.object(create_resources, 'create_nodes', autospec=True)
+    @mock.patch.object(create_resources, 'create_chassis', autospec=True)
+    def test_create_resources_stream(
+            self,
+            mock_chassis: mock.MagicMock,
+            mock_nodes: mock.MagicMock,
+            mock_iter: mock.MagicMock,
+    ) -> None:
+        created: list[object] = []
+
+        def _iter(filename: str) -> Iterator[dict[str, Any]]:
+            yield valid_json
+            # The first document is processed before the next one is read
+            self.assertEqual([valid_json['nodes']], created)
+            yield schema_pov_invalid_json
+
+        mock_iter.side_effect = _iter
+        mock_chassis.return_value = []
+
+        def _create_nodes(client: object,
+                          nodes: list[object]) -> list[Exception]:
+            created.append(nodes)
+            return []
+
+        mock_nodes.side_effect = _create_nodes
+
+        self.assertRaisesRegex(exc.ClientException,
+                               'Document 2 in file "file.ndjson" is invalid',
+                               create_resources.create_resources,
+                               mock.sentinel.client, ['file.ndjson'],
+                               stream=True)
+        mock_chassis.assert_called_once_with(mock.sentinel.client,
+                                             valid_json['chassis'])
+
+    def test_create_resources_stream_parallel(
+            self, mock_iter: mock.MagicMock) -> None:
+        client = mock.MagicMock()
+        client.node.create.side_effect = lambda **params: mock.Mock(
+            uuid=params['name'])
+        mock_iter.return_value = (
+            {'nodes': [{'name': 'node-%d' % i,
+                        'ports': [{'address': 'address-%d' % i}]}]}
+            for i in range(100))
+
+        create_resources.create_resources(client, ['file.ndjson'],
+                                          max_workers=2, stream=True)
+
+        self.assertEqual(100, client.node.create.call_count)
+        self.assertCountEqual(
+            [mock.call(address='address-%d' % i, node_uuid='node-%d' % i)
+             for i in range(100)],
+            client.port.create.call_args_list)
+
+
 class CreateMethodsTest(utils.BaseTestCase):
 
     def setUp(self) -> None:
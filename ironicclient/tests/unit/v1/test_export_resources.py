@@ -0,0 +1,144 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from typing import Any
+from unittest import mock
+
+import fixtures
+import yaml
+
+from ironicclient import exc
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import chassis
+from ironicclient.v1 import create_resources
+from ironicclient.v1 import export_resources
+from ironicclient.v1 import node
+from ironicclient.v1 import port
+from ironicclient.v1 import portgroup
+
+
+CHASSIS = {'uuid': 'chassis-1', 'description': 'rack 1', 'extra': {},
+           'created_at': '2026-01-01T00:00:00+00:00'}
+NODES = [
+    {'uuid': 'node-1', 'name': 'node-1', 'driver': 'ipmi',
+     'chassis_uuid': 'chassis-1', 'traits': ['CUSTOM_A'],
+     'driver_info': {'ipmi_address': '1.2.3.4',
+                     'ipmi_password': '******'},
+     'provision_state': 'active', 'instance_uuid': 'instance',
+     'owner': None},
+    {'uuid': 'node-2', 'name': 'node-2', 'driver': 'redfish',
+     'chassis_uuid': None, 'traits': []},
+]
+PORTGROUP = {'uuid': 'pg-1', 'name': 'bond0', 'node_uuid': 'node-1',
+             'address': 'aa:aa:aa:aa:aa:00', 'mode': 'active-backup'}
+PORTS = [
+    {'uuid': 'port-1', 'address': 'aa:aa:aa:aa:aa:01',
+     'node_uuid': 'node-1', 'portgroup_uuid': 'pg-1', 'pxe_enabled': True},
+    {'uuid': 'port-2', 'address': 'aa:aa:aa:aa:aa:02',
+     'node_uuid': 'node-1', 'portgroup_uuid': None, 'pxe_enabled': False},
+]
+
+
+def _list(resource_class: Any, items: list[dict[str, Any]]) -> mock.Mock:
+    resources = [resource_class(None, dict(item), loaded=True)
+                 for item in items]
+
+    def _page(marker: str | None = None, **kwargs: Any) -> list[Any]:
+        uuids = [item['uuid'] for item in items]
+        return resources[uuids.index(marker) + 1 if marker else 0:]
+
+    return mock.Mock(side_effect=_page)
+
+
+class ExportResourcesTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(ExportResourcesTest, self).setUp()
+        self.client = mock.Mock()
+        self.client.chassis.list = _list(chassis.Chassis, [CHASSIS])
+        self.client.node.list = _list(node.Node, NODES)
+        self.client.portgroup.list = _list(portgroup.Portgroup, [PORTGROUP])
+        self.client.port.list = _list(port.Port, PORTS)
+
+    def test_iter_export(self) -> None:
+        result = list(export_resources.iter_export(self.client))
+
+        self.assertEqual([
+            {'chassis': [{'uuid': 'chassis-1', 'description': 'rack 1',
+                          'extra': {}}]},
+            {'nodes': [{
+                'uuid': 'node-1', 'name': 'node-1', 'driver': 'ipmi',
+                'chassis_uuid': 'chassis-1', 'traits': ['CUSTOM_A'],
+                'driver_info': {'ipmi_address': '1.2.3.4'},
+                'portgroups': [{
+                    'uuid': 'pg-1', 'name': 'bond0',
+                    'address': 'aa:aa:aa:aa:aa:00', 'mode': 'active-backup',
+                    'ports': [{'uuid': 'port-1',
+                               'address': 'aa:aa:aa:aa:aa:01',
+                               'pxe_enabled': True}],
+                }],
+                'ports': [{'uuid': 'port-2', 'address': 'aa:aa:aa:aa:aa:02',
+                           'pxe_enabled': False}],
+            }]},
+            {'nodes': [{'uuid': 'node-2', 'name': 'node-2',
+                        'driver': 'redfish', 'traits': []}]},
+        ], result)
+        for listing in (self.client.chassis.list, self.client.node.list,
+                        self.client.portgroup.list, self.client.port.list):
+            listing.assert_any_call(limit=None, detail=True)
+        self.assertFalse(self.client.node.list_ports.called)
+
+    def test_export_valid_for_create(self) -> None:
+        validator = create_resources._get_validator()
+        for description in export_resources.iter_export(self.client):
+            validator.validate(description)
+
+    def test_export_ndjson(self) -> None:
+        output = io.StringIO()
+        self.assertEqual(3, export_resources.export_resources(self.client,
+                                                              output))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual({'chassis': [{'uuid': 'chassis-1',
+                                       'description': 'rack 1',
+                                       'extra': {}}]},
+                         json.loads(lines[0]))
+
+    def test_export_yaml(self) -> None:
+        output = io.StringIO()
+        self.assertEqual(3, export_resources.export_resources(
+            self.client, output, fmt='yaml'))
+        documents = list(yaml.safe_load_all(output.getvalue()))
+        self.assertEqual(list(export_resources.iter_export(self.client)),
+                         documents)
+
+    def test_export_load_round_trip(self) -> None:
+        expected = list(export_resources.iter_export(self.client))
+        path = self.useFixture(fixtures.TempDir()).path
+        for fmt, extension in (('ndjson', 'ndjson'), ('yaml', 'yaml')):
+            filename = os.path.join(path, 'fleet.%s' % extension)
+            with open(filename, 'w') as output:
+                export_resources.export_resources(self.client, output,
+                                                  fmt=fmt)
+            self.assertEqual(expected,
+                             create_resources.load_resources([filename]))
+
+    def test_export_invalid_format(self) -> None:
+        self.assertRaisesRegex(exc.InvalidAttribute, 'xml',
+                               export_resources.export_resources,
+                               self.client, io.StringIO(), fmt='xml')
+        self.assertFalse(self.client.chassis.list.called)
@@ -0,0 +1,119 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+from unittest import mock
+
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import join
+from ironicclient.v1 import node
+from ironicclient.v1 import port
+from ironicclient.v1 import portgroup
+
+
+NODE1 = {'uuid': 'node-1', 'name': 'first'}
+NODE2 = {'uuid': 'node-2', 'name': 'second'}
+PORTGROUP = {'uuid': 'pg-1', 'name': 'bond0', 'node_uuid': 'node-1'}
+PORT1 = {'uuid': 'port-1', 'address': 'aa:aa:aa:aa:aa:01',
+         'node_uuid': 'node-1', 'portgroup_uuid': 'pg-1'}
+PORT2 = {'uuid': 'port-2', 'address': 'aa:aa:aa:aa:aa:02',
+         'node_uuid': 'node-1', 'portgroup_uuid': None}
+PORT3 = {'uuid': 'port-3', 'address': 'aa:aa:aa:aa:aa:03',
+         'node_uuid': 'node-3', 'portgroup_uuid': None}
+
+
+class JoinTest(utils.BaseTestCase):
+
+    def test_index_by(self) -> None:
+        self.assertEqual({'node-1': [PORT1, PORT2], 'node-3': [PORT3]},
+                         join.index_by([PORT1, PORT2, PORT3], 'node_uuid'))
+        self.assertEqual({'pg-1': [PORT1]},
+                         join.index_by([PORT1, PORT2, PORT3],
+                                       'portgroup_uuid'))
+
+    def test_join_nodes(self) -> None:
+        result = join.join_nodes([NODE1, NODE2], [PORT1, PORT2, PORT3],
+                                 [PORTGROUP])
+        self.assertEqual([
+            dict(NODE1, ports=[PORT1, PORT2],
+                 portgroups=[dict(PORTGROUP, ports=[PORT1])]),
+            dict(NODE2, ports=[], portgroups=[]),
+        ], result)
+
+    def test_list_nodes_with_ports(self) -> None:
+        client = mock.Mock()
+        client.node.list.return_value = [
+            node.Node(None, dict(NODE1), loaded=True)]
+        client.port.list.return_value = [
+            port.Port(None, dict(p), loaded=True) for p in (PORT1, PORT3)]
+        client.portgroup.list.return_value = [
+            portgroup.Portgroup(None, dict(PORTGROUP), loaded=True)]
+
+        result = join.list_nodes_with_ports(
+            client, port_fields=['address'], fields=['name'],
+            provision_state='active')
+
+        client.node.list.assert_called_once_with(
+            limit=0, fields=['name', 'uuid'], provision_state='active')
+        client.port.list.assert_called_once_with(
+            limit=0, fields=['address', 'uuid', 'node_uuid',
+                             'portgroup_uuid'])
+        client.portgroup.list.assert_called_once_with(limit=0, detail=True)
+        self.assertEqual([
+            dict(NODE1, ports=[PORT1],
+                 portgroups=[dict(PORTGROUP, ports=[PORT1])]),
+        ], result)
+
+    def _client(self) -> mock.Mock:
+        client = mock.Mock()
+        client.node.list.return_value = [
+            node.Node(None, dict(n), loaded=True) for n in (NODE1, NODE2)]
+        client.port.list.side_effect = lambda node=None, **kw: [
+            port.Port(None, dict(p), loaded=True)
+            for p in (PORT1, PORT2, PORT3)
+            if node is None or p['node_uuid'] == node]
+        client.portgroup.list.return_value = []
+        return client
+
+    def test_list_nodes_with_ports_one_page(self) -> None:
+        client = self._client()
+
+        result = join.list_nodes_with_ports(client, port_fields=['address'],
+                                            limit=None)
+
+        client.node.list.assert_called_once_with(limit=None)
+        client.port.list.assert_has_calls([
+            mock.call(node=n['uuid'], limit=0,
+                      fields=['address', 'uuid', 'node_uuid',
+                              'portgroup_uuid'])
+            for n in (NODE1, NODE2)], any_order=True)
+        self.assertEqual(2, client.port.list.call_count)
+        self.assertEqual(2, client.portgroup.list.call_count)
+        self.assertEqual([
+            dict(NODE1, ports=[PORT1, PORT2], portgroups=[]),
+            dict(NODE2, ports=[], portgroups=[]),
+        ], result)
+
+    def test_list_nodes_with_ports_one_page_scan(self) -> None:
+        client = self._client()
+
+        result = join.list_nodes_with_ports(client, scan_threshold=2,
+                                            limit=None)
+
+        client.node.list.assert_called_once_with(limit=None)
+        client.port.list.assert_called_once_with(limit=0, detail=True)
+        client.portgroup.list.assert_called_once_with(limit=0, detail=True)
+        self.assertEqual([
+            dict(NODE1, ports=[PORT1, PORT2], portgroups=[]),
+            dict(NODE2, ports=[], portgroups=[]),
+        ], result)
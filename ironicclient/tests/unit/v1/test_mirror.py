@@ -0,0 +1,183 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Any
+from unittest import mock
+
+from ironicclient import exc
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import mirror
+from ironicclient.v1 import node
+from ironicclient.v1 import port
+
+
+NODE1 = {'uuid': '66666666-7777-8888-9999-000000000000',
+         'name': 'node-1',
+         'provision_state': 'available',
+         'properties': {'memory_mb': 4096},
+         'created_at': '2024-01-01T00:00:00+00:00',
+         'updated_at': None}
+NODE2 = {'uuid': '66666666-7777-8888-9999-111111111111',
+         'name': 'node-2',
+         'provision_state': 'active',
+         'properties': {'memory_mb': 65536},
+         'created_at': '2024-01-01T00:00:00+00:00',
+         'updated_at': '2024-02-01T00:00:00+00:00'}
+PORT = {'uuid': '11111111-2222-3333-4444-555555555555',
+        'address': 'aa:bb:cc:dd:ee:ff',
+        'node_uuid': NODE1['uuid'],
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'updated_at': None}
+
+
+def _nodes(*items: dict[str, Any]) -> list[node.Node]:
+    return [node.Node(None, dict(i), loaded=True) for i in items]
+
+
+class FleetMirrorTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(FleetMirrorTest, self).setUp()
+        self.client = mock.Mock()
+        self.client.node.list.return_value = _nodes(NODE1, NODE2)
+        self.client.port.list.return_value = [
+            port.Port(None, dict(PORT), loaded=True)]
+        self.mirror = mirror.FleetMirror(self.client, ':memory:',
+                                         resources=['nodes', 'ports'],
+                                         page_size=2)
+        self.addCleanup(self.mirror.close)
+
+    def test_invalid_resource(self) -> None:
+        self.assertRaises(exc.InvalidAttribute, mirror.FleetMirror,
+                          self.client, ':memory:', resources=['nodes', 'vifs'])
+
+    def test_invalid_page_size(self) -> None:
+        self.assertRaises(exc.InvalidAttribute, mirror.FleetMirror,
+                          self.client, ':memory:', page_size=0)
+
+    def test_initial_sync(self) -> None:
+        stats = self.mirror.sync()
+
+        self.assertEqual({'nodes': 2, 'ports': 1}, stats)
+        self.client.node.list.assert_called_once_with(limit=0, detail=True)
+        self.client.port.list.assert_called_once_with(limit=0, detail=True)
+        self.assertFalse(self.client.chassis.list.called)
+        self.assertEqual(2, self.mirror.count('nodes'))
+        self.assertEqual(NODE1, self.mirror.get('nodes', NODE1['uuid']))
+
+    def test_query(self) -> None:
+        self.mirror.sync()
+
+        result = self.mirror.query(
+            'nodes', "json_extract(data, '$.properties.memory_mb') > ?",
+            (8192,))
+        self.assertEqual([NODE2], result)
+        result = self.mirror.query('nodes', order_by='name DESC', limit=1)
+        self.assertEqual([NODE2], result)
+        result = self.mirror.query('ports', 'node_uuid = ?', (NODE1['uuid'],))
+        self.assertEqual([PORT], result)
+
+    def test_query_not_mirrored(self) -> None:
+        self.assertRaises(exc.InvalidAttribute, self.mirror.query, 'chassis')
+
+    def test_incremental_sync(self) -> None:
+        self.mirror.sync()
+        self.client.node.list.reset_mock()
+
+        updated = dict(NODE1, provision_state='deploying',
+                       updated_at='2024-03-01T00:00:00+00:00')
+        created = dict(NODE1, uuid='66666666-7777-8888-9999-222222222222',
+                       name='node-3', created_at='2024-03-02T00:00:00+00:00')
+        self.client.node.list.side_effect = [
+            # sorted by updated_at
+            _nodes(updated),
+            # sorted by created_at
+            _nodes(created, NODE2),
+        ]
+
+        stats = self.mirror.sync()
+
+        self.assertEqual(2, stats['nodes'])
+        self.client.node.list.assert_has_calls([
+            mock.call(limit=2, marker=None, sort_key='updated_at',
+                      sort_dir='desc', detail=True),
+            mock.call(limit=2, marker=None, sort_key='created_at',
+                      sort_dir='desc', detail=True),
+        ])
+        self.assertEqual(3, self.mirror.count('nodes'))
+        node = self.mirror.get('nodes', NODE1['uuid'])
+        assert node is not None
+        self.assertEqual('deploying', node['provision_state'])
+
+    def test_incremental_sync_next_page(self) -> None:
+        self.mirror.sync()
+        self.client.node.list.reset_mock()
+
+        newer = [dict(NODE2, uuid='uuid-%d' % i,
+                      updated_at='2024-03-0%dT00:00:00+00:00' % (9 - i))
+                 for i in range(3)]
+        self.client.node.list.side_effect = [
+            _nodes(newer[0], newer[1]),
+            _nodes(newer[2]),
+            _nodes(NODE2),
+        ]
+
+        self.mirror.sync()
+
+        self.client.node.list.assert_has_calls([
+            mock.call(limit=2, marker=None, sort_key='updated_at',
+                      sort_dir='desc', detail=True),
+            mock.call(limit=2, marker='uuid-1', sort_key='updated_at',
+                      sort_dir='desc', detail=True),
+            mock.call(limit=2, marker=None, sort_key='created_at',
+                      sort_dir='desc', detail=True),
+        ])
+        self.assertEqual(5, self.mirror.count('nodes'))
+
+    def test_incremental_sync_prune(self) -> None:
+        self.mirror.sync()
+        self.client.node.list.reset_mock()
+        self.client.node.list.side_effect = [
+            _nodes(NODE2), _nodes(NODE2),
+            _nodes({'uuid': NODE2['uuid']}),
+        ]
+
+        stats = self.mirror.sync(prune=True)
+
+        self.assertEqual(2, stats['nodes'])
+        self.client.node.list.assert_called_with(limit=0, fields=['uuid'])
+        self.assertIsNone(self.mirror.get('nodes', NODE1['uuid']))
+
+    def test_full_sync(self) -> None:
+        self.mirror.sync()
+        self.client.node.list.reset_mock()
+        self.client.node.list.return_value = _nodes(NODE2)
+
+        self.mirror.sync(full=True)
+
+        self.client.node.list.assert_called_once_with(limit=0, detail=True)
+        self.assertEqual(1, self.mirror.count('nodes'))
+
+    def test_persistent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'mirror.sqlite')
+            with mirror.FleetMirror(self.client, path,
+                                    resources=['nodes']) as first:
+                first.sync()
+            self.assertTrue(os.path.exists(path))
+            with mirror.FleetMirror(self.client, path,
+                                    resources=['nodes']) as second:
+                self.assertEqual(2, second.count('nodes'))
@@ -26,6 +26,7 @@ from ironicclient.common import utils as common_utils
 from ironicclient import exc
 from ironicclient.tests.unit import utils
 from ironicclient.v1 import node
+from ironicclient.v1 import resolver
 from ironicclient.v1 import volume_connector
 from ironicclient.v1 import volume_target
 
@@ -43,8 +44,9 @@ NODE1 = {'uuid': '66666666-7777-8888-9999-000000000000',
          'extra': {},
          'conductor_group': 'in-the-closet-to-the-left',
          'parent_node': None}
+INSTANCE_UUID: str = '66666666-7777-8888-9999-222222222222'
 NODE2 = {'uuid': '66666666-7777-8888-9999-111111111111',
-         'instance_uuid': '66666666-7777-8888-9999-222222222222',
+         'instance_uuid': INSTANCE_UUID,
          'chassis_uuid': 'aaaaaaaa-1111-bbbb-2222-cccccccccccc',
          'maintenance': True,
          'driver': 'fake too',
@@ -135,6 +137,8 @@ CREATE_WITH_UUID = copy.deepcopy(NODE1)
 del CREATE_WITH_UUID['maintenance']
 del CREATE_WITH_UUID['provision_state']
 
+UNKNOWN_INSTANCE = '66666666-7777-8888-9999-333333333333'
+
 fake_responses = {
     '/v1/nodes':
     {
@@ -161,6 +165,14 @@ fake_responses = {
             {"nodes": [NODE1]}
         ),
     },
+    '/v1/nodes/?fields=uuid,name,instance_uuid,power_state,'
+    'provision_state,maintenance,driver':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE1, NODE2]}
+        ),
+    },
     '/v1/nodes/?associated=False':
     {
         'GET': (
@@ -224,6 +236,104 @@ fake_responses = {
             {"nodes": [NODE1]},
         )
     },
+    '/v1/nodes/?provision_state=active':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE2]},
+        )
+    },
+    '/v1/nodes/?provision_state=error':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE1, NODE2]},
+        )
+    },
+    '/v1/nodes/?marker=%s&provision_state=error' % NODE2['uuid']:
+    {
+        'GET': (
+            {},
+            {"nodes": []},
+        )
+    },
+    '/v1/nodes/?marker=%s&provision_state=active' % NODE2['uuid']:
+    {
+        'GET': (
+            {},
+            {"nodes": []},
+        )
+    },
+    '/v1/nodes/?fields=name,uuid&provision_state=available':
+    {
+        'GET': (
+            {},
+            {"nodes": [{'uuid': NODE1['uuid'], 'name': NODE1['name']}]},
+        )
+    },
+    '/v1/nodes/?fields=name,uuid&provision_state=active':
+    {
+        'GET': (
+            {},
+            {"nodes": [{'uuid': NODE2['uuid'], 'name': None}]},
+        )
+    },
+    '/v1/nodes/detail?sort_key=uuid&sort_dir=desc&provision_state=available':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE1]},
+        )
+    },
+    '/v1/nodes/detail?sort_key=uuid&sort_dir=desc&provision_state=active':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE2]},
+        )
+    },
+    '/v1/shards':
+    {
+        'GET': (
+            {},
+            {"shards": [{'name': 'myshard', 'count': 1}]},
+        )
+    },
+    '/v1/nodes/?shard=myshard':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE2]},
+        )
+    },
+    '/v1/nodes/?sharded=False':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE1]},
+        )
+    },
+    '/v1/nodes/?sharded=True&shard=myshard':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE2]},
+        )
+    },
+    '/v1/nodes/?conductor_group=':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE1]},
+        )
+    },
+    '/v1/nodes/?conductor_group=group':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE2]},
+        )
+    },
     '/v1/nodes/?owner=%s' % NODE2['owner']:
     {
         'GET': (
@@ -315,6 +425,53 @@ fake_responses = {
             {"children": [NODE2['uuid']]}
         )
     },
+    '/v1/nodes/detail?instance_uuid=%s' % UNKNOWN_INSTANCE:
+    {
+        'GET': (
+            {},
+            {"nodes": []},
+        )
+    },
+    '/v1/nodes/?instance_uuid=%s&fields=uuid,name,instance_uuid' %
+    UNKNOWN_INSTANCE:
+    {
+        'GET': (
+            {},
+            {"nodes": []},
+        )
+    },
+    '/v1/nodes/?instance_uuid=%s&fields=uuid,name,instance_uuid' %
+    NODE2['instance_uuid']:
+    {
+        'GET': (
+            {},
+            {"nodes": [{'uuid': NODE2['uuid'], 'name': None,
+                        'instance_uuid': NODE2['instance_uuid']}]},
+        )
+    },
+    '/v1/nodes/?fields=uuid,name,instance_uuid&associated=True':
+    {
+        'GET': (
+            {},
+            {"nodes": [{'uuid': NODE2['uuid'], 'name': None,
+                        'instance_uuid': NODE2['instance_uuid']}]},
+        )
+    },
+    '/v1/nodes/detail?associated=True':
+    {
+        'GET': (
+            {},
+            {"nodes": [NODE2]},
+        )
+    },
+    '/v1/nodes/?fields=uuid,instance_uuid&associated=True':
+    {
+        'GET': (
+            {},
+            {"nodes": [{'uuid': NODE2['uuid'],
+                        'instance_uuid': NODE2['instance_uuid']}]},
+        )
+    },
     '/v1/nodes/detail?instance_uuid=%s' % NODE2['instance_uuid']:
     {
         'GET': (
@@ -337,6 +494,13 @@ fake_responses = {
             UPDATED_NODE,
         ),
     },
+    '/v1/nodes/%s?fields=uuid,name' % NODE1['name']:
+    {
+        'GET': (
+            {},
+            {'uuid': NODE1['uuid'], 'name': NODE1['name']},
+        ),
+    },
     '/v1/nodes/%s?fields=uuid,extra' % NODE1['uuid']:
     {
         'GET': (
@@ -936,6 +1100,171 @@ class NodeManagerTest(testtools.TestCase):
         self.assertThat(nodes, HasLength(1))
         self.assertEqual(NODE1['uuid'], getattr(nodes[0], 'uuid'))
 
+    def test_node_list_provision_state_multiple(self) -> None:
+        nodes = self.mgr.list(provision_state=['available', 'active',
+                                               'available'])
+        expect = [
+            ('GET', '/v1/nodes/?provision_state=active', {}, None),
+            ('GET', '/v1/nodes/?provision_state=available', {}, None),
+        ]
+        self.assertEqual(expect, sorted(self.api.calls))
+        self.assertEqual([NODE1['uuid'], NODE2['uuid']],
+                         [n.uuid for n in nodes])
+
+    def test_node_list_provision_state_multiple_duplicates(self) -> None:
+        nodes = self.mgr.list(provision_state=['error', 'active'])
+        self.assertThat(self.api.calls, HasLength(2))
+        self.assertEqual([NODE1['uuid'], NODE2['uuid']],
+                         [n.uuid for n in nodes])
+
+    def test_node_list_provision_state_multiple_limit(self) -> None:
+        nodes = self.mgr.list(provision_state=('error', 'active'), limit=0)
+        self.assertThat(nodes, HasLength(2))
+        # The first pages are requested concurrently, the next ones by the
+        # merge.
+        self.assertEqual(
+            [('GET', '/v1/nodes/?provision_state=active', {}, None),
+             ('GET', '/v1/nodes/?provision_state=error', {}, None)],
+            sorted(self.api.calls[:2]))
+        self.assertEqual(
+            [('GET', '/v1/nodes/?marker=%s&provision_state=active'
+              % NODE2['uuid'], {}, None),
+             ('GET', '/v1/nodes/?marker=%s&provision_state=error'
+              % NODE2['uuid'], {}, None)],
+            sorted(self.api.calls[2:]))
+        nodes = self.mgr.list(provision_state={'error'}, limit=None)
+        self.assertThat(nodes, HasLength(2))
+
+    def test_node_list_provision_state_multiple_iter(self) -> None:
+        nodes = common_utils.iter_list(self.mgr.list,
+                                       provision_state=('error', 'active'))
+        # Only the first pages are requested before iterating.
+        self.assertThat(self.api.calls, HasLength(2))
+        self.assertEqual(NODE1['uuid'], next(nodes).uuid)
+        self.assertEqual([NODE2['uuid']], [n.uuid for n in nodes])
+        self.assertThat(self.api.calls, HasLength(4))
+
+    def test_node_list_provision_state_multiple_sorted(self) -> None:
+        nodes = self.mgr.list(provision_state=['available', 'active'],
+                              detail=True, sort_key='uuid', sort_dir='desc')
+        self.assertThat(self.api.calls, HasLength(2))
+        self.assertEqual([NODE2['uuid'], NODE1['uuid']],
+                         [n.uuid for n in nodes])
+
+    def test_node_list_provision_state_multiple_fields(self) -> None:
+        nodes = self.mgr.list(provision_state=['available', 'active'],
+                              fields=['name'])
+        self.assertEqual(
+            ['/v1/nodes/?fields=name,uuid&provision_state=active',
+             '/v1/nodes/?fields=name,uuid&provision_state=available'],
+            sorted(call[1] for call in self.api.calls))
+        self.assertEqual([NODE1['uuid'], NODE2['uuid']],
+                         [n.uuid for n in nodes])
+
+    def test_node_list_provision_state_empty(self) -> None:
+        self.assertEqual([], self.mgr.list(provision_state=[]))
+        self.assertEqual([], self.api.calls)
+
+    def test_node_list_parallel_by_shard(self) -> None:
+        nodes = self.mgr.list(parallel_by='shard')
+        self.assertEqual(('GET', '/v1/shards', {}, None), self.api.calls[0])
+        self.assertEqual(
+            [('GET', '/v1/nodes/?shard=myshard', {}, None),
+             ('GET', '/v1/nodes/?sharded=False', {}, None)],
+            sorted(self.api.calls[1:]))
+        self.assertEqual([NODE2['uuid'], NODE1['uuid']],
+                         [n.uuid for n in nodes])
+
+    @mock.patch.object(common_utils, 'DEFAULT_PAGE_SIZE', 1)
+    def test_node_list_parallel_by_shard_one_page(self) -> None:
+        # Every shard returns a page, only one page is returned in total.
+        nodes = self.mgr.list(parallel_by='shard')
+        self.assertThat(self.api.calls, HasLength(3))
+        self.assertThat(nodes, HasLength(1))
+
+    def test_node_list_parallel_by_shard_sharded(self) -> None:
+        nodes = self.mgr.list(parallel_by='shard', sharded=True)
+        self.assertEqual(
+            [('GET', '/v1/shards', {}, None),
+             ('GET', '/v1/nodes/?sharded=True&shard=myshard', {}, None)],
+            self.api.calls)
+        self.assertThat(nodes, HasLength(1))
+
+    def test_node_list_parallel_by_shard_given(self) -> None:
+        nodes = self.mgr.list(parallel_by='shard', shards=['myshard'])
+        self.assertEqual(
+            [('GET', '/v1/nodes/?shard=myshard', {}, None)],
+            self.api.calls)
+        self.assertThat(nodes, HasLength(1))
+
+    def test_node_list_conductor_groups(self) -> None:
+        nodes = self.mgr.list(conductor_group=['', 'group'])
+        self.assertEqual(
+            [('GET', '/v1/nodes/?conductor_group=', {}, None),
+             ('GET', '/v1/nodes/?conductor_group=group', {}, None)],
+            sorted(self.api.calls))
+        self.assertEqual([NODE1['uuid'], NODE2['uuid']],
+                         [n.uuid for n in nodes])
+
+    def test_node_list_parallel_by_invalid(self) -> None:
+        for value in ('owner', 'conductor_group'):
+            self.assertRaises(exc.InvalidAttribute, self.mgr.list,
+                              parallel_by=value)
+        self.assertEqual([], self.api.calls)
+
+    def test_node_list_where_pushdown(self) -> None:
+        nodes = self.mgr.list(where='provision_state == available')
+        expect = [
+            ('GET', '/v1/nodes/?provision_state=available', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(nodes, HasLength(1))
+        self.assertEqual(NODE1['uuid'], getattr(nodes[0], 'uuid'))
+
+    def test_node_list_where_local(self) -> None:
+        nodes = self.mgr.list(
+            detail=True,
+            where='properties/num_cpu > 2 and driver =~ "too$"')
+        expect = [
+            ('GET', '/v1/nodes/detail', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(nodes, HasLength(1))
+        self.assertEqual(NODE2['uuid'], getattr(nodes[0], 'uuid'))
+
+    def test_node_list_where_adds_fields(self) -> None:
+        nodes = self.mgr.list(where='driver == fake or driver == none')
+        expect = [
+            ('GET', '/v1/nodes/?fields=uuid,name,instance_uuid,power_state,'
+             'provision_state,maintenance,driver', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(nodes, HasLength(1))
+        self.assertEqual(NODE1['uuid'], getattr(nodes[0], 'uuid'))
+
+    def test_node_list_where_requested_fields(self) -> None:
+        nodes = self.mgr.list(fields=['uuid', 'extra'],
+                              where='extra/foo == bar')
+        expect = [
+            ('GET', '/v1/nodes/?fields=uuid,extra', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(nodes, HasLength(0))
+
+    def test_node_list_where_conflicting_filter(self) -> None:
+        nodes = self.mgr.list(provision_state='available',
+                              where='provision_state == active')
+        expect = [
+            ('GET', '/v1/nodes/?provision_state=available', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(nodes, HasLength(0))
+
+    def test_node_list_where_invalid(self) -> None:
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list,
+                          where='provision_state ==')
+        self.assertEqual([], self.api.calls)
+
     def test_node_list_owner(self) -> None:
         nodes = self.mgr.list(owner=NODE2['owner'])
         expect = [
@@ -1119,6 +1448,45 @@ class NodeManagerTest(testtools.TestCase):
         self.assertRaises(exc.InvalidAttribute, self.mgr.list,
                           detail=True, fields=['uuid', 'extra'])
 
+    def test_node_summary(self) -> None:
+        def _node(uuid: str, state: str, group: str, arch: str) -> node.Node:
+            return node.Node(self.mgr, {'uuid': uuid,
+                                        'provision_state': state,
+                                        'conductor_group': group,
+                                        'properties': {'cpu_arch': arch}},
+                             loaded=True)
+
+        pages = [[_node('1', 'active', '', 'x86_64'),
+                  _node('2', 'active', 'rack1', 'x86_64')],
+                 [_node('3', 'active', '', 'aarch64'),
+                  _node('4', 'available', '', 'x86_64')],
+                 [_node('5', 'active', '', 'x86_64')]]
+        with mock.patch.object(self.mgr, 'list', autospec=True,
+                               side_effect=pages) as mock_list:
+            counts = self.mgr.summary(
+                ['provision_state', 'conductor_group', 'properties/cpu_arch',
+                 'properties/missing'], maintenance=False)
+
+        self.assertEqual({('active', '', 'x86_64', None): 2,
+                          ('active', 'rack1', 'x86_64', None): 1,
+                          ('active', '', 'aarch64', None): 1,
+                          ('available', '', 'x86_64', None): 1},
+                         dict(counts))
+        fields = ['provision_state', 'conductor_group', 'properties', 'uuid']
+        mock_list.assert_has_calls([
+            mock.call(limit=None, fields=fields, maintenance=False),
+            mock.call(limit=None, fields=fields, maintenance=False,
+                      marker='2'),
+            mock.call(limit=None, fields=fields, maintenance=False,
+                      marker='4'),
+        ])
+
+    def test_node_summary_invalid(self) -> None:
+        self.assertRaises(exc.InvalidAttribute, self.mgr.summary, [])
+        self.assertRaises(exc.InvalidAttribute, self.mgr.summary,
+                          ['provision_state'], detail=True)
+        self.assertEqual([], self.api.calls)
+
     def test_node_show(self) -> None:
         node = self.mgr.get(NODE1['uuid'])
         expect = [
@@ -1127,6 +1495,70 @@ class NodeManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertEqual(NODE1['uuid'], node.uuid)
 
+    def test_node_get_by_instance_uuids(self) -> None:
+        found, missing = self.mgr.get_by_instance_uuids(
+            [INSTANCE_UUID, UNKNOWN_INSTANCE])
+        self.assertEqual(
+            [('GET', '/v1/nodes/?instance_uuid=%s&fields=uuid,name,'
+              'instance_uuid' % INSTANCE_UUID, {}, None),
+             ('GET', '/v1/nodes/?instance_uuid=%s&fields=uuid,name,'
+              'instance_uuid' % UNKNOWN_INSTANCE, {}, None)],
+            sorted(self.api.calls))
+        self.assertEqual(NODE2['uuid'], found[INSTANCE_UUID].uuid)
+        self.assertEqual([UNKNOWN_INSTANCE], missing)
+
+    def test_node_get_by_instance_uuids_detail(self) -> None:
+        found, missing = self.mgr.get_by_instance_uuids(
+            [INSTANCE_UUID, UNKNOWN_INSTANCE], detail=True)
+        self.assertEqual(
+            [('GET', '/v1/nodes/detail?instance_uuid=%s' %
+              INSTANCE_UUID, {}, None),
+             ('GET', '/v1/nodes/detail?instance_uuid=%s' %
+              UNKNOWN_INSTANCE, {}, None)],
+            sorted(self.api.calls))
+        self.assertEqual(NODE2['driver'],
+                         found[INSTANCE_UUID].driver)
+        self.assertEqual([UNKNOWN_INSTANCE], missing)
+
+    def test_node_get_by_instance_uuids_scan(self) -> None:
+        found, missing = self.mgr.get_by_instance_uuids(
+            [INSTANCE_UUID, UNKNOWN_INSTANCE], scan_threshold=2)
+        self.assertEqual(
+            [('GET', '/v1/nodes/?fields=uuid,name,instance_uuid'
+              '&associated=True', {}, None)],
+            self.api.calls)
+        self.assertEqual(NODE2['uuid'], found[INSTANCE_UUID].uuid)
+        self.assertEqual([UNKNOWN_INSTANCE], missing)
+
+    def test_node_get_by_instance_uuids_scan_fields(self) -> None:
+        found, missing = self.mgr.get_by_instance_uuids(
+            [INSTANCE_UUID, UNKNOWN_INSTANCE], fields=['uuid'],
+            scan_threshold=2)
+        self.assertEqual(
+            [('GET', '/v1/nodes/?fields=uuid,instance_uuid&associated=True',
+              {}, None)],
+            self.api.calls)
+        self.assertEqual(NODE2['uuid'], found[INSTANCE_UUID].uuid)
+        self.assertEqual([UNKNOWN_INSTANCE], missing)
+
+    def test_node_get_by_instance_uuids_scan_detail(self) -> None:
+        found, missing = self.mgr.get_by_instance_uuids(
+            [INSTANCE_UUID, UNKNOWN_INSTANCE], detail=True,
+            scan_threshold=2)
+        self.assertEqual(
+            [('GET', '/v1/nodes/detail?associated=True', {}, None)],
+            self.api.calls)
+        self.assertEqual(NODE2['driver'],
+                         found[INSTANCE_UUID].driver)
+        self.assertEqual([UNKNOWN_INSTANCE], missing)
+
+    def test_node_get_by_instance_uuids_detail_and_fields(self) -> None:
+        self.assertRaises(exc.InvalidAttribute,
+                          self.mgr.get_by_instance_uuids,
+                          [INSTANCE_UUID], fields=['uuid'],
+                          detail=True)
+        self.assertEqual([], self.api.calls)
+
     def test_node_show_by_instance(self) -> None:
         node = self.mgr.get_by_instance_uuid(NODE2['instance_uuid'])
         expect = [
@@ -1176,6 +1608,44 @@ class NodeManagerTest(testtools.TestCase):
         ]
         self.assertEqual(expect, self.api.calls)
 
+    def test_name_cache_list(self) -> None:
+        self.mgr.name_cache = resolver.NameCache()
+        self.mgr.list()
+        self.api.calls = []
+        self.assertEqual(NODE1['uuid'], self.mgr.resolve(NODE1['name']))
+        self.assertEqual([], self.api.calls)
+
+    def test_resolve(self) -> None:
+        self.assertEqual(NODE1['uuid'], self.mgr.resolve(NODE1['name']))
+        expect = [
+            ('GET', '/v1/nodes/%s?fields=uuid,name' % NODE1['name'], {},
+             None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+
+    def test_resolve_populates_cache(self) -> None:
+        self.mgr.name_cache = resolver.NameCache()
+        self.assertEqual(NODE1['uuid'], self.mgr.resolve(NODE1['name']))
+        self.assertEqual(NODE1['uuid'], self.mgr.resolve(NODE1['name']))
+        self.assertThat(self.api.calls, HasLength(1))
+
+    def test_name_cache_update(self) -> None:
+        self.mgr.name_cache = resolver.NameCache()
+        self.mgr.name_cache.record('old-name', NODE1['uuid'])
+        patch = {'op': 'replace',
+                 'value': NODE1['name'],
+                 'path': '/name'}
+        self.mgr.update(node_id=NODE1['uuid'], patch=patch)
+        self.assertIsNone(self.mgr.name_cache.get('old-name'))
+        self.assertEqual(NODE1['uuid'],
+                         self.mgr.name_cache.get(NODE1['name']))
+
+    def test_name_cache_delete(self) -> None:
+        self.mgr.name_cache = resolver.NameCache()
+        self.mgr.name_cache.record(NODE1['name'], NODE1['uuid'])
+        self.mgr.delete(node_id=NODE1['uuid'])
+        self.assertIsNone(self.mgr.name_cache.get(NODE1['name']))
+
     def test_update(self) -> None:
         patch = {'op': 'replace',
                  'value': NEW_DRIVER,
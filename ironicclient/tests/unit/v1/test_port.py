@@ -16,17 +16,22 @@
 from __future__ import annotations
 
 import copy
+from unittest import mock
 
 import testtools
 from testtools.matchers import HasLength
 
+from ironicclient.common import utils as common_utils
 from ironicclient import exc
 from ironicclient.tests.unit import utils
 import ironicclient.v1.port
 
-PORT = {'uuid': '11111111-2222-3333-4444-555555555555',
+ADDRESS: str = 'AA:BB:CC:DD:EE:FF'
+UUID: str = '11111111-2222-3333-4444-555555555555'
+
+PORT = {'uuid': UUID,
         'node_uuid': '55555555-4444-3333-2222-111111111111',
-        'address': 'AA:BB:CC:DD:EE:FF',
+        'address': ADDRESS,
         'pxe_enabled': True,
         'local_link_connection': {},
         'portgroup_uuid': '55555555-4444-3333-2222-111111111111',
@@ -55,7 +60,38 @@ UPDATED_PORT = copy.deepcopy(PORT)
 NEW_ADDR = 'AA:AA:AA:AA:AA:AA'
 UPDATED_PORT['address'] = NEW_ADDR
 
+UNSHARDED_NODE = '66666666-7777-8888-9999-000000000000'
+UNKNOWN_ADDRESS = '11:22:33:44:55:66'
+
 fake_responses = {
+    '/v1/shards':
+    {
+        'GET': (
+            {},
+            {"shards": [{'name': 'shard1', 'count': 1}]},
+        )
+    },
+    '/v1/ports/?shard=shard1':
+    {
+        'GET': (
+            {},
+            {"ports": [PORT]},
+        )
+    },
+    '/v1/nodes/?limit=1&fields=uuid&sharded=False':
+    {
+        'GET': (
+            {},
+            {"nodes": [{'uuid': UNSHARDED_NODE}]},
+        )
+    },
+    '/v1/ports/detail?address=%s' % UNKNOWN_ADDRESS:
+    {
+        'GET': (
+            {},
+            {"ports": []},
+        ),
+    },
     '/v1/ports':
     {
         'GET': (
@@ -191,6 +227,67 @@ class PortManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertEqual(1, len(ports))
 
+    def _use_shards(self) -> None:
+        responses = copy.deepcopy(fake_responses)
+        responses['/v1/nodes/?limit=1&fields=uuid&sharded=False'] = {
+            'GET': ({}, {"nodes": []}),
+        }
+        responses['/v1/ports/?shard=shard2'] = {
+            'GET': ({}, {"ports": [PORT2]}),
+        }
+        responses['/v1/shards'] = {
+            'GET': ({}, {"shards": [{'name': 'shard1', 'count': 1},
+                                    {'name': 'shard2', 'count': 1}]}),
+        }
+        self.api = utils.FakeAPI(responses)
+        self.mgr = ironicclient.v1.port.PortManager(self.api)
+
+    def test_ports_list_parallel_by_shard(self) -> None:
+        self._use_shards()
+        ports = self.mgr.list(parallel_by='shard', limit=0)
+        expect = [
+            ('GET', '/v1/shards', {}, None),
+            ('GET', '/v1/nodes/?limit=1&fields=uuid&sharded=False', {},
+             None),
+        ]
+        self.assertEqual(expect, self.api.calls[:2])
+        self.assertEqual(
+            [('GET', '/v1/ports/?shard=shard1', {}, None),
+             ('GET', '/v1/ports/?shard=shard2', {}, None)],
+            sorted(self.api.calls[2:]))
+        self.assertEqual([PORT['uuid'], PORT2['uuid']],
+                         [p.uuid for p in ports])
+
+    @mock.patch.object(common_utils, 'DEFAULT_PAGE_SIZE', 1)
+    def test_ports_list_parallel_by_shard_one_page(self) -> None:
+        # Every shard returns a page, only one page is returned in total.
+        self._use_shards()
+        ports = self.mgr.list(parallel_by='shard')
+        self.assertThat(self.api.calls, HasLength(4))
+        self.assertThat(ports, HasLength(1))
+
+    def test_ports_list_parallel_by_shard_unsharded_nodes(self) -> None:
+        ports = self.mgr.list(parallel_by='shard', limit=0)
+        expect = [
+            ('GET', '/v1/shards', {}, None),
+            ('GET', '/v1/nodes/?limit=1&fields=uuid&sharded=False', {},
+             None),
+            ('GET', '/v1/ports', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual([PORT['uuid']], [p.uuid for p in ports])
+
+    def test_ports_list_parallel_by_shard_given(self) -> None:
+        ports = self.mgr.list(parallel_by='shard', shards=['shard1'])
+        self.assertEqual([('GET', '/v1/ports/?shard=shard1', {}, None)],
+                         self.api.calls)
+        self.assertEqual(1, len(ports))
+
+    def test_ports_list_parallel_by_invalid(self) -> None:
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list,
+                          parallel_by='conductor_group')
+        self.assertEqual([], self.api.calls)
+
     def test_ports_list_by_address(self) -> None:
         ports = self.mgr.list(address=PORT['address'])
         expect = [
@@ -312,6 +409,36 @@ class PortManagerTest(testtools.TestCase):
         self.assertEqual(PORT['is_smartnic'], port.is_smartnic)
         self.assertEqual(PORT['name'], port.name)
 
+    def test_ports_get_by_addresses(self) -> None:
+        found, missing = self.mgr.get_by_addresses(
+            [ADDRESS, UNKNOWN_ADDRESS, ADDRESS])
+        self.assertEqual(
+            [('GET', '/v1/ports/detail?address=%s' % UNKNOWN_ADDRESS,
+              {}, None),
+             ('GET', '/v1/ports/detail?address=%s' % ADDRESS,
+              {}, None)],
+            sorted(self.api.calls))
+        self.assertEqual([ADDRESS], list(found))
+        self.assertEqual(UUID, found[ADDRESS].uuid)
+        self.assertEqual([UNKNOWN_ADDRESS], missing)
+
+    def test_ports_get_by_addresses_scan(self) -> None:
+        found, missing = self.mgr.get_by_addresses(
+            [ADDRESS.lower(), UNKNOWN_ADDRESS], scan_threshold=2)
+        self.assertEqual([('GET', '/v1/ports/detail', {}, None)],
+                         self.api.calls)
+        self.assertEqual(UUID, found[ADDRESS.lower()].uuid)
+        self.assertEqual([UNKNOWN_ADDRESS], missing)
+
+    def test_ports_get_by_addresses_scan_fields(self) -> None:
+        found, missing = self.mgr.get_by_addresses(
+            [ADDRESS], fields=['uuid'], scan_threshold=1)
+        self.assertEqual(
+            [('GET', '/v1/ports/?fields=uuid,address', {}, None)],
+            self.api.calls)
+        self.assertEqual(UUID, found[ADDRESS].uuid)
+        self.assertEqual([], missing)
+
     def test_ports_show_by_address(self) -> None:
         port = self.mgr.get_by_address(PORT['address'])
         expect = [
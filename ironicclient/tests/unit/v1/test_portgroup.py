@@ -22,16 +22,19 @@ import testtools
 from ironicclient.tests.unit import utils
 import ironicclient.v1.portgroup
 
+ADDRESS: str = 'AA:BB:CC:DD:EE:FF'
+ADDRESS2: str = 'AA:AA:AA:BB:BB:BB'
+
 PORTGROUP = {'uuid': '11111111-2222-3333-4444-555555555555',
              'name': 'Portgroup-name',
              'node_uuid': '66666666-7777-8888-9999-000000000000',
-             'address': 'AA:BB:CC:DD:EE:FF',
+             'address': ADDRESS,
              'extra': {}}
 
 PORTGROUP2 = {'uuid': '55555555-4444-3333-2222-111111111111',
               'name': 'Portgroup2-name',
               'node_uuid': '66666666-7777-8888-9999-000000000000',
-              'address': 'AA:AA:AA:BB:BB:BB',
+              'address': ADDRESS2,
               'extra': {}}
 
 NODE1 = {'uuid': '66666666-7777-8888-9999-000000000000',
@@ -249,6 +252,26 @@ class PortgroupManagerTest(testtools.TestCase):
             self.api.responses['/v1/portgroups/%s'
                                % PORTGROUP['uuid']]['GET'])
 
+    def test_portgroups_get_by_addresses(self) -> None:
+        found, missing = self.mgr.get_by_addresses([ADDRESS])
+        self.assertEqual(
+            [('GET', '/v1/portgroups/detail?address=%s' % ADDRESS,
+              {}, None)],
+            self.api.calls)
+        self.assertEqual(PORTGROUP['uuid'], found[ADDRESS].uuid)
+        self.assertEqual([], missing)
+
+    def test_portgroups_get_by_addresses_scan(self) -> None:
+        found, missing = self.mgr.get_by_addresses(
+            [ADDRESS, ADDRESS2.lower(), '11:22:33:44:55:66'],
+            scan_threshold=3)
+        self.assertEqual([('GET', '/v1/portgroups/detail', {}, None)],
+                         self.api.calls)
+        self.assertEqual(PORTGROUP['uuid'], found[ADDRESS].uuid)
+        self.assertEqual(PORTGROUP2['uuid'],
+                         found[ADDRESS2.lower()].uuid)
+        self.assertEqual(['11:22:33:44:55:66'], missing)
+
     def test_portgroups_show_by_address(self) -> None:
         portgroup = self.mgr.get_by_address(PORTGROUP['address'])
         expect = [
@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+from ironicclient import exc
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import node
+from ironicclient.v1 import query
+
+
+NODE = {
+    'uuid': '66666666-7777-8888-9999-000000000000',
+    'name': 'gpu-1',
+    'provision_state': 'available',
+    'maintenance': False,
+    'instance_uuid': None,
+    'properties': {'memory_mb': 131072, 'cpus': '64'},
+    'extra': {'rack': 'A'},
+    'traits': ['CUSTOM_GPU', 'CUSTOM_FAST'],
+}
+
+
+class QueryTest(utils.BaseTestCase):
+
+    def _check(self, expression: str, expected: bool = True) -> None:
+        self.assertEqual(expected, query.parse(expression)(NODE),
+                         expression)
+
+    def test_comparisons(self) -> None:
+        self._check('provision_state == available')
+        self._check('provision_state = "available"')
+        self._check('provision_state != available', False)
+        self._check('properties/memory_mb > 65536')
+        self._check('properties.memory_mb <= 65536', False)
+        self._check('properties/memory_mb >= 131072')
+        self._check('properties/memory_mb < 1e6')
+        self._check('maintenance == false')
+        self._check('name =~ "^gpu-\\d+$"')
+        self._check('name =~ cpu', False)
+
+    def test_string_to_number(self) -> None:
+        self._check('properties/cpus > 32')
+        self._check('properties/cpus == 64')
+        self._check('name > 1', False)
+
+    def test_missing_and_null(self) -> None:
+        self._check('instance_uuid == null')
+        self._check('properties/local_gb == null')
+        self._check('properties/local_gb != null', False)
+        self._check('properties/local_gb > 0', False)
+        self._check('properties/memory_mb/nested == 1', False)
+
+    def test_in_and_contains(self) -> None:
+        self._check('provision_state in [active, available]')
+        self._check("provision_state in ('active', 'deploying')", False)
+        self._check('provision_state not in [active, deploying]')
+        self._check('traits contains CUSTOM_GPU')
+        self._check('traits contains CUSTOM_SLOW', False)
+        self._check('name contains gpu')
+        self._check('extra contains rack')
+
+    def test_boolean_operators(self) -> None:
+        self._check('properties/memory_mb > 65536 and traits contains '
+                    'CUSTOM_GPU and extra/rack == A')
+        self._check('provision_state == active or extra/rack == A')
+        self._check('not provision_state == active')
+        self._check('not (provision_state == available or maintenance == '
+                    'true)', False)
+        self._check('provision_state == active or provision_state == '
+                    'available and extra/rack == B', False)
+        self._check('(provision_state == active or provision_state == '
+                    'available) AND NOT extra/rack == B')
+
+    def test_resource(self) -> None:
+        predicate = query.parse('extra/rack == A')
+        self.assertTrue(predicate(node.Node(None, dict(NODE), loaded=True)))
+        self.assertEqual(
+            [NODE], predicate.filter([NODE, dict(NODE, extra={})]))
+
+    def test_fields(self) -> None:
+        predicate = query.parse('properties/memory_mb > 1 or not '
+                                '(extra/rack == A and name == x)')
+        self.assertEqual({'properties', 'extra', 'name'}, predicate.fields)
+
+    def test_invalid(self) -> None:
+        for expression in ['', 'name', 'name ==', '== name',
+                           'name == a and', '(name == a', 'name == a)',
+                           'name in a', 'name not == a', 'name > null',
+                           'name =~ "("', 'name == "a', 'name in [a b]']:
+            self.assertRaises(exc.InvalidAttribute, query.parse, expression)
+
+    def test_parse_compiled(self) -> None:
+        compiled = query.parse('name == a')
+        self.assertIs(compiled, query.parse(compiled))
+
+
+class PushdownTest(utils.BaseTestCase):
+
+    def test_all_pushed(self) -> None:
+        params, remainder = query.parse(
+            'provision_state == active and maintenance == true and '
+            'instance_uuid != null and shard in [a, b]'
+        ).pushdown(query.NODE_FILTERS)
+        self.assertEqual({'provision_state': 'active',
+                          'maintenance': 'True',
+                          'associated': 'True',
+                          'shard': 'a,b'}, params)
+        self.assertIsNone(remainder)
+
+    def test_partially_pushed(self) -> None:
+        predicate = query.parse('provision_state == active and '
+                                'properties/memory_mb > 1024')
+        params, remainder = predicate.pushdown(query.NODE_FILTERS)
+        self.assertEqual({'provision_state': 'active'}, params)
+        assert remainder is not None
+        self.assertEqual({'properties'}, remainder.fields)
+        self.assertTrue(remainder({'properties': {'memory_mb': 2048}}))
+
+    def test_not_pushed(self) -> None:
+        for expression in ['provision_state == active or driver == ipmi',
+                           'not provision_state == active',
+                           'provision_state != active',
+                           'maintenance == yes',
+                           'driver == 42',
+                           'properties/driver == ipmi',
+                           'driver in [ipmi, redfish]']:
+            predicate = query.parse(expression)
+            params, remainder = predicate.pushdown(query.NODE_FILTERS)
+            self.assertEqual({}, params, expression)
+            self.assertIs(predicate, remainder)
+
+    def test_duplicate_and_excluded(self) -> None:
+        params, remainder = query.parse(
+            'driver == ipmi and driver == redfish and owner == me'
+        ).pushdown(query.NODE_FILTERS, exclude=['owner'])
+        self.assertEqual({'driver': 'ipmi'}, params)
+        assert remainder is not None
+        self.assertTrue(remainder({'driver': 'redfish', 'owner': 'me'}))
+        self.assertFalse(remainder({'driver': 'redfish', 'owner': 'you'}))
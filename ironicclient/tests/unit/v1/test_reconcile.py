@@ -0,0 +1,292 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+from typing import Any
+from unittest import mock
+
+from ironicclient import exc
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import chassis
+from ironicclient.v1 import create_resources
+from ironicclient.v1 import join
+from ironicclient.v1 import reconcile
+
+
+CHASSIS = {'uuid': 'chassis-1', 'description': 'rack 1', 'extra': {}}
+PORT = {'uuid': 'port-1', 'address': 'aa:aa:aa:aa:aa:01',
+        'node_uuid': 'node-1', 'portgroup_uuid': None,
+        'pxe_enabled': True}
+OTHER_PORT = {'uuid': 'port-2', 'address': 'aa:aa:aa:aa:aa:02',
+              'node_uuid': 'node-1', 'portgroup_uuid': None,
+              'pxe_enabled': True}
+NODE = {'uuid': 'node-1', 'name': 'node-1', 'driver': 'ipmi',
+        'chassis_uuid': 'chassis-1', 'traits': ['CUSTOM_A'],
+        'driver_info': {'ipmi_address': '1.2.3.4',
+                        'ipmi_password': '******'},
+        'ports': [PORT, OTHER_PORT], 'portgroups': []}
+OTHER_NODE = {'uuid': 'node-2', 'name': 'node-2', 'driver': 'ipmi',
+              'chassis_uuid': None, 'traits': [], 'driver_info': {},
+              'ports': [], 'portgroups': []}
+
+
+def _desired() -> dict[str, Any]:
+    return {
+        'chassis': [{
+            'description': 'rack 1',
+            'nodes': [{
+                'name': 'node-1', 'driver': 'ipmi',
+                'driver_info': {'ipmi_address': '1.2.3.4',
+                                'ipmi_password': 'secret'},
+                'traits': ['CUSTOM_A'],
+                'ports': [{'address': 'AA:AA:AA:AA:AA:01',
+                           'pxe_enabled': True}],
+            }],
+        }],
+        'nodes': [{'name': 'node-2', 'driver': 'ipmi'}],
+    }
+
+
+class MakePatchTest(utils.BaseTestCase):
+
+    def test_no_changes(self) -> None:
+        self.assertEqual([], reconcile.make_patch(
+            {'uuid': 'x', 'driver': 'ipmi', 'extra': {'a': 1, 'b': 2}},
+            {'uuid': 'y', 'driver': 'ipmi', 'extra': {'a': 1}}))
+
+    def test_changes(self) -> None:
+        self.assertEqual([
+            {'op': 'replace', 'path': '/driver', 'value': 'redfish'},
+            {'op': 'add', 'path': '/extra/a~1b', 'value': 2},
+            {'op': 'add', 'path': '/extra/c~0', 'value': 3},
+            {'op': 'add', 'path': '/resource_class', 'value': 'gold'},
+        ], reconcile.make_patch(
+            {'driver': 'ipmi', 'extra': {'a/b': 1}},
+            {'driver': 'redfish', 'extra': {'a/b': 2, 'c~': 3},
+             'resource_class': 'gold'}))
+
+    def test_address(self) -> None:
+        self.assertEqual([], reconcile.make_patch(
+            {'address': 'aa:bb:cc:dd:ee:ff'},
+            {'address': 'AA:BB:CC:DD:EE:FF'}))
+        self.assertEqual(
+            [{'op': 'replace', 'path': '/address',
+              'value': '11:bb:cc:dd:ee:ff'}],
+            reconcile.make_patch({'address': 'aa:bb:cc:dd:ee:ff'},
+                                 {'address': '11:bb:cc:dd:ee:ff'}))
+
+    def test_masked(self) -> None:
+        self.assertEqual([], reconcile.make_patch(
+            {'driver_info': {'password': '******'}},
+            {'driver_info': {'password': 'secret'}}))
+
+
+@mock.patch.object(join, 'list_nodes_with_ports', autospec=True)
+class PlanTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(PlanTest, self).setUp()
+        self.client = mock.Mock()
+        self.client.chassis.list.return_value = [
+            chassis.Chassis(None, dict(CHASSIS), loaded=True)]
+
+    def test_up_to_date(self, mock_list: mock.Mock) -> None:
+        mock_list.return_value = [NODE, OTHER_NODE]
+        self.assertEqual([], reconcile.plan(self.client, [_desired()]))
+        self.client.chassis.list.assert_called_once_with(limit=0, detail=True)
+        mock_list.assert_called_once_with(self.client, detail=True)
+
+    def test_changes(self, mock_list: mock.Mock) -> None:
+        mock_list.return_value = [NODE]
+        desired = _desired()
+        node = desired['chassis'][0]['nodes'][0]
+        node['driver'] = 'redfish'
+        node['traits'] = ['CUSTOM_B']
+        node['ports'][0]['pxe_enabled'] = False
+        node['portgroups'] = [{'name': 'bond0',
+                               'ports': [{'address': 'aa:aa:aa:aa:aa:03'}]}]
+
+        actions = reconcile.plan(self.client, [desired])
+
+        self.assertEqual([
+            'update node node-1: replace /driver, set traits',
+            'create portgroup bond0 on node node-1',
+            'create port aa:aa:aa:aa:aa:03 on node node-1',
+            'update port AA:AA:AA:AA:AA:01 on node node-1: '
+            'replace /pxe_enabled',
+            'create node node-2',
+        ], [str(a) for a in actions])
+        self.assertEqual(['CUSTOM_B'], actions[0].traits)
+        self.assertEqual({'name': 'bond0', 'node_uuid': 'node-1'},
+                         actions[1].params)
+        self.assertEqual({'address': 'aa:aa:aa:aa:aa:03',
+                          'node_uuid': 'node-1'}, actions[2].params)
+        self.assertEqual({'portgroup_uuid': actions[1]},
+                         actions[2].parents)
+
+    def test_new_chassis(self, mock_list: mock.Mock) -> None:
+        mock_list.return_value = []
+        self.client.chassis.list.return_value = []
+        desired = {'chassis': [{'description': 'rack 2',
+                                'nodes': [{'name': 'node-3'}]}]}
+
+        actions = reconcile.plan(self.client, [desired])
+
+        self.assertEqual(['create chassis rack 2', 'create node node-3'],
+                         [str(a) for a in actions])
+        self.assertEqual({'chassis_uuid': actions[0]}, actions[1].parents)
+
+    def test_existing_node_new_chassis(self, mock_list: mock.Mock) -> None:
+        mock_list.return_value = [OTHER_NODE]
+        desired = {'chassis': [{'description': 'rack 2',
+                                'nodes': [{'name': 'node-2'}]}]}
+
+        actions = reconcile.plan(self.client, [desired])
+
+        self.assertEqual(['create chassis rack 2',
+                          'update node node-2: replace /chassis_uuid'],
+                         [str(a) for a in actions])
+        self.assertEqual('node-2', actions[1].uuid)
+        self.assertEqual([], actions[1].patch)
+        self.assertEqual({'chassis_uuid': actions[0]}, actions[1].parents)
+
+    def test_delete(self, mock_list: mock.Mock) -> None:
+        mock_list.return_value = [NODE, OTHER_NODE]
+        desired = _desired()
+        del desired['nodes']
+
+        actions = reconcile.plan(self.client, [desired], delete=True)
+
+        self.assertEqual(['delete port aa:aa:aa:aa:aa:02',
+                          'delete node node-2'],
+                         [str(a) for a in actions])
+        self.assertEqual(['port-2', 'node-2'], [a.uuid for a in actions])
+
+
+class ApplyTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(ApplyTest, self).setUp()
+        self.client = mock.Mock()
+
+    def test_apply(self) -> None:
+        self.client.chassis.create.return_value = mock.Mock(uuid='chassis-2')
+        self.client.node.create.return_value = mock.Mock(uuid='node-3')
+        new_chassis = reconcile.Action('create', 'chassis', 'rack 2',
+                                       params={'description': 'rack 2'})
+        actions = [
+            reconcile.Action('delete', 'port', 'old', uuid='port-2'),
+            reconcile.Action('create', 'node', 'node-3',
+                             params={'name': 'node-3'},
+                             parents={'chassis_uuid': new_chassis}),
+            new_chassis,
+            reconcile.Action('update', 'node', 'node-1', uuid='node-1',
+                             patch=[{'op': 'add', 'path': '/driver',
+                                     'value': 'redfish'}],
+                             traits=['CUSTOM_B']),
+        ]
+
+        self.assertEqual([], reconcile.apply(self.client, actions))
+
+        self.client.chassis.create.assert_called_once_with(
+            description='rack 2')
+        self.client.node.create.assert_called_once_with(
+            name='node-3', chassis_uuid='chassis-2')
+        self.client.node.update.assert_called_once_with(
+            'node-1', [{'op': 'add', 'path': '/driver', 'value': 'redfish'}])
+        self.client.node.set_traits.assert_called_once_with(
+            'node-1', ['CUSTOM_B'])
+        self.client.port.delete.assert_called_once_with('port-2')
+        self.assertEqual('node-3', actions[1].uuid)
+
+    def test_apply_new_parent(self) -> None:
+        self.client.chassis.create.return_value = mock.Mock(uuid='chassis-2')
+        new_chassis = reconcile.Action('create', 'chassis', 'rack 2',
+                                       params={'description': 'rack 2'})
+        actions = [
+            reconcile.Action('update', 'node', 'node-2', uuid='node-2',
+                             parents={'chassis_uuid': new_chassis}),
+            new_chassis,
+        ]
+
+        self.assertEqual([], reconcile.apply(self.client, actions))
+
+        self.client.node.update.assert_called_once_with(
+            'node-2', [{'op': 'replace', 'path': '/chassis_uuid',
+                        'value': 'chassis-2'}])
+
+    def test_apply_errors(self) -> None:
+        self.client.chassis.create.side_effect = exc.BadRequest('boom')
+        self.client.node.delete.side_effect = exc.Conflict('busy')
+        new_chassis = reconcile.Action('create', 'chassis', 'rack 2',
+                                       params={'description': 'rack 2'})
+        actions = [
+            new_chassis,
+            reconcile.Action('create', 'node', 'node-3',
+                             params={'name': 'node-3'},
+                             parents={'chassis_uuid': new_chassis}),
+            reconcile.Action('delete', 'node', 'node-2', uuid='node-2'),
+        ]
+
+        errors = reconcile.apply(self.client, actions)
+
+        self.assertEqual(3, len(errors))
+        self.assertIn('rack 2', str(errors[0]))
+        self.assertIn('Cannot create node node-3 because create chassis '
+                      'rack 2 failed', str(errors[1]))
+        self.assertIn('Unable to delete node node-2', str(errors[2]))
+        self.assertFalse(self.client.node.create.called)
+
+
+@mock.patch.object(reconcile, 'apply', autospec=True)
+@mock.patch.object(reconcile, 'plan', autospec=True)
+@mock.patch.object(create_resources, 'load_resources', autospec=True)
+class ReconcileResourcesTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(ReconcileResourcesTest, self).setUp()
+        self.client = mock.Mock()
+        self.action = reconcile.Action('create', 'node', 'node-3')
+
+    def test_reconcile(self, mock_load: mock.Mock, mock_plan: mock.Mock,
+                       mock_apply: mock.Mock) -> None:
+        mock_plan.return_value = [self.action]
+        mock_apply.return_value = []
+        output = mock.Mock()
+
+        result = reconcile.reconcile_resources(
+            self.client, ['file.yaml'], delete=True, output=output)
+
+        self.assertEqual([self.action], result)
+        mock_load.assert_called_once_with(['file.yaml'])
+        mock_plan.assert_called_once_with(
+            self.client, mock_load.return_value, delete=True)
+        mock_apply.assert_called_once_with(self.client, [self.action],
+                                           max_workers=8)
+        output.assert_called_once_with('create node node-3')
+
+    def test_dry_run(self, mock_load: mock.Mock, mock_plan: mock.Mock,
+                     mock_apply: mock.Mock) -> None:
+        mock_plan.return_value = [self.action]
+        result = reconcile.reconcile_resources(
+            self.client, ['file.yaml'], dry_run=True)
+        self.assertEqual([self.action], result)
+        self.assertFalse(mock_apply.called)
+
+    def test_errors(self, mock_load: mock.Mock, mock_plan: mock.Mock,
+                    mock_apply: mock.Mock) -> None:
+        mock_plan.return_value = [self.action]
+        mock_apply.return_value = [exc.ClientException('boom')]
+        self.assertRaisesRegex(exc.ClientException, 'boom',
+                               reconcile.reconcile_resources,
+                               self.client, ['file.yaml'])
@@ -0,0 +1,147 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from ironicclient.tests.unit import utils
+from ironicclient.v1 import node
+from ironicclient.v1 import resolver
+
+
+UUID1 = '66666666-7777-8888-9999-000000000000'
+UUID2 = '66666666-7777-8888-9999-111111111111'
+
+
+class NameCacheTest(utils.BaseTestCase):
+
+    def setUp(self) -> None:
+        super(NameCacheTest, self).setUp()
+        self.cache = resolver.NameCache()
+
+    def test_record(self) -> None:
+        self.cache.record('node-1', UUID1)
+        self.assertEqual(UUID1, self.cache.get('node-1'))
+        self.assertEqual(UUID2, self.cache.get(UUID2))
+        self.assertIsNone(self.cache.get('node-2'))
+
+    def test_record_nodes(self) -> None:
+        self.cache.record_nodes([
+            node.Node(None, {'uuid': UUID1, 'name': 'node-1'}, loaded=True),
+            {'uuid': UUID2, 'name': None},
+            {'uuid': UUID2},
+        ])
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(UUID1, self.cache.get('node-1'))
+
+    def test_rename(self) -> None:
+        self.cache.record('node-1', UUID1)
+        self.cache.record('new-name', UUID1)
+        self.assertIsNone(self.cache.get('node-1'))
+        self.assertEqual(UUID1, self.cache.get('new-name'))
+        self.cache.record(None, UUID1)
+        self.assertIsNone(self.cache.get('new-name'))
+
+    def test_name_reused(self) -> None:
+        self.cache.record('node-1', UUID1)
+        self.cache.record('node-1', UUID2)
+        self.assertEqual(UUID2, self.cache.get('node-1'))
+        self.cache.record('node-2', UUID1)
+        self.assertEqual(UUID2, self.cache.get('node-1'))
+
+    def test_invalidate(self) -> None:
+        self.cache.record('node-1', UUID1)
+        self.cache.record('node-2', UUID2)
+        self.cache.invalidate('node-1')
+        self.cache.invalidate(UUID2)
+        self.assertEqual(0, len(self.cache))
+
+    @mock.patch.object(time, 'time', autospec=True)
+    def test_max_age(self, mock_time: mock.Mock) -> None:
+        cache = resolver.NameCache(max_age=60)
+        mock_time.return_value = 1000.0
+        cache.record('node-1', UUID1)
+        mock_time.return_value = 1050.0
+        self.assertEqual(UUID1, cache.get('node-1'))
+        mock_time.return_value = 1061.0
+        self.assertIsNone(cache.get('node-1'))
+
+    def test_persistent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'cache', 'names.json')
+            with resolver.NameCache(path) as cache:
+                cache.record('node-1', UUID1)
+            self.assertTrue(os.path.exists(path))
+            cache = resolver.NameCache(path)
+            self.assertEqual(UUID1, cache.get('node-1'))
+
+    def test_corrupted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'names.json')
+            with open(path, 'w') as fp:
+                fp.write('{"version": 1, ')
+            cache = resolver.NameCache(path)
+            self.assertEqual(0, len(cache))
+
+    def test_malformed_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'names.json')
+            with open(path, 'w') as fp:
+                json.dump({'version': resolver._FORMAT_VERSION,
+                           'entries': {'node-1': [UUID1, 1000.0],
+                                       'node-2': UUID2,
+                                       'node-3': [UUID2, 'yesterday'],
+                                       'node-4': None,
+                                       'node-5': [42, 1000.0]}}, fp)
+            cache = resolver.NameCache(path)
+            self.assertEqual(UUID1, cache.get('node-1'))
+            for name in ('node-2', 'node-3', 'node-4', 'node-5'):
+                self.assertIsNone(cache.get(name))
+
+    def test_save_unchanged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'names.json')
+            with resolver.NameCache(path) as cache:
+                cache.record('node-1', UUID1)
+            with mock.patch.object(tempfile, 'mkstemp',
+                                   wraps=tempfile.mkstemp) as mock_mkstemp:
+                with resolver.NameCache(path) as cache:
+                    cache.record('node-1', UUID1)
+                    cache.record(None, UUID2)
+                    cache.invalidate('node-2')
+                self.assertFalse(mock_mkstemp.called)
+                with resolver.NameCache(path) as cache:
+                    cache.record('node-1', UUID2)
+                self.assertTrue(mock_mkstemp.called)
+
+    @mock.patch.object(time, 'time', autospec=True)
+    def test_save_refreshed(self, mock_time: mock.Mock) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'names.json')
+            mock_time.return_value = 1000.0
+            with resolver.NameCache(path, max_age=60) as cache:
+                cache.record('node-1', UUID1)
+            mock_time.return_value = 1020.0
+            with resolver.NameCache(path, max_age=60) as cache:
+                cache.record('node-1', UUID1)
+            mock_time.return_value = 1050.0
+            with resolver.NameCache(path, max_age=60) as cache:
+                cache.record('node-1', UUID1)
+            mock_time.return_value = 1100.0
+            # Refreshed at 1050, not only at 1000.
+            cache = resolver.NameCache(path, max_age=60)
+            self.assertEqual(UUID1, cache.get('node-1'))
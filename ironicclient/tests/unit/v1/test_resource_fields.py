@@ -94,3 +94,17 @@ class ResourceTest(testtools.TestCase):
             KeyError,
             resource_fields.Resource,
             ['item1', 'unknown_id'])
+
+    def test_fields_for_columns(self) -> None:
+        foo = resource_fields.Resource(['item1', '2nd_item', 'item_3'],
+                                       override_labels={'item_3': 'Three'})
+        self.assertEqual(['item_3', 'item1'],
+                         foo.fields_for_columns(['three', 'item1']))
+        self.assertEqual(['2nd_item'],
+                         foo.fields_for_columns(['A second item',
+                                                 '2nd_item']))
+        self.assertEqual([], foo.fields_for_columns([]))
+
+    def test_fields_for_columns_unknown(self) -> None:
+        foo = resource_fields.Resource(['item1', '2nd_item'])
+        self.assertIsNone(foo.fields_for_columns(['item1', 'item_3']))
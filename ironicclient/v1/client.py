@@ -98,10 +98,31 @@ class Client(object):
                 kwargs['api_version_select_state'] = "default"
                 kwargs['os_ironic_api_version'] = DEFAULT_VER
 
+        # NOTE: an explicit version requested by the user is used as it is,
+        # in all other cases the version can be picked from the cached
+        # version range of the server without negotiating it.
+        use_version_range = (
+            kwargs['api_version_select_state'] != 'user'
+            or kwargs['os_ironic_api_version'] == 'latest'
+            or isinstance(kwargs['os_ironic_api_version'], list))
+
         if endpoint_override:
             kwargs['endpoint_override'] = endpoint_override
         self.http_client = http._construct_http_client(*args, **kwargs)
 
+        if use_version_range:
+            # NOTE: without an endpoint override, the endpoint is resolved
+            # from the service catalog (or its cache) by the HTTP client.
+            host, netport = http.get_server(
+                endpoint_override
+                or getattr(self.http_client, 'endpoint_trimmed', None))
+            version_range = None
+            if host is not None and netport is not None:
+                version_range = filecache.retrieve_version_range(
+                    host=host, port=netport)
+            if version_range:
+                self.http_client.use_version_range(*version_range)
+
         self.chassis = chassis.ChassisManager(self.http_client)
         self.node = node.NodeManager(self.http_client)
         self.port = port.PortManager(self.http_client)
@@ -12,17 +12,25 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import collections
+from collections.abc import Callable, Iterable, Iterator
+from concurrent import futures
 import functools
+import hashlib
 import json
+import logging
+import threading
 from typing import Any, cast
 
 import jsonschema
 import yaml
 
+from ironicclient.common import journal as journal_module
 from ironicclient import exc
 from ironicclient.v1 import client as v1_client
 
+LOG: logging.Logger = logging.getLogger(__name__)
+
 _CREATE_SCHEMA: dict[str, object] = {
     "$schema": "http://json-schema.org/draft-04/schema#",
     "description": "Schema for ironic resources file",
@@ -44,32 +52,72 @@ _CREATE_SCHEMA: dict[str, object] = {
     "additionalProperties": False
 }
 
+# Extensions of JSON files with one resources description per line.
+_NDJSON_EXTENSIONS: tuple[str, ...] = ('.ndjson', '.jsonl')
+
+# Keys of resources descriptions containing other resources.
+_NESTED_KEYS: frozenset[str] = frozenset(['nodes', 'portgroups', 'ports'])
+
+# How many top-level resources per worker are scheduled in advance.
+_SCHEDULED_PER_WORKER: int = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator() -> Any:
+    """Get a validator of resources descriptions, compiled only once."""
+    return jsonschema.Draft4Validator(_CREATE_SCHEMA)
+
 
 def create_resources(
     client: v1_client.Client,
     filenames: list[str],
+    max_workers: int = 1,
+    stream: bool = False,
+    journal: journal_module.Journal | None = None,
 ) -> None:
-    """Create resources using their JSON or YAML descriptions.
+    """Create resources using their JSON, NDJSON or YAML descriptions.
 
     :param client: an instance of ironic client;
-    :param filenames: a list of filenames containing JSON or YAML resources
-        definitions.
+    :param filenames: a list of filenames containing JSON, NDJSON or YAML
+        resources definitions, see :func:`iter_from_file` for the supported
+        formats.
+    :param max_workers: the maximum number of resources to create
+        concurrently. By default resources are created one by one. Otherwise
+        each resource is created as soon as the resource it belongs to
+        (chassis, node or port group) is created.
+    :param stream: whether to start creating resources while reading the
+        files instead of loading and validating all of them first, see
+        :func:`iter_resources`. Invalid descriptions are then reported
+        together with creation errors.
+    :param journal: optional journal to record created resources in. Resources
+        already created according to the journal are not created again, so
+        an interrupted creation can be resumed by repeating it with the same
+        files and journal.
     :raises: ClientException if any operation during files processing/resource
         creation fails.
     """
     errors: list[Exception] = []
-    resources: list[dict[str, object]] = []
-    for resource_file in filenames:
-        try:
-            resource = load_from_file(resource_file)
-            jsonschema.validate(resource, _CREATE_SCHEMA)
-            resources.append(resource)
-        except (exc.ClientException, jsonschema.ValidationError) as e:
-            errors.append(e)
+    resources: Iterable[dict[str, object]]
+    if stream:
+        resources = iter_resources(filenames, errors)
+    else:
+        resources = load_resources(filenames)
+    if max_workers > 1 or journal is not None:
+        creator = _ParallelCreator(client, max_workers, journal=journal)
+        errors.extend(creator.run(resources))
+    else:
+        errors.extend(_create_serially(client, resources))
     if errors:
-        raise exc.ClientException('While validating the resources file(s), the'
-                                  ' following error(s) were encountered:\n%s' %
+        raise exc.ClientException('During resources creation, the following '
+                                  'error(s) were encountered:\n%s' %
                                   '\n'.join(str(e) for e in errors))
+
+
+def _create_serially(
+    client: v1_client.Client,
+    resources: Iterable[dict[str, object]],
+) -> list[Exception]:
+    errors: list[Exception] = []
     for r in resources:
         errors.extend(create_chassis(
             client,
@@ -77,10 +125,104 @@ def create_resources(
         errors.extend(create_nodes(
             client,
             cast(list[dict[str, object]], r.get('nodes', []))))
+    return errors
+
+
+def load_resources(filenames: list[str]) -> list[dict[str, object]]:
+    """Load and validate resources descriptions from files.
+
+    :param filenames: a list of filenames containing JSON, NDJSON or YAML
+        resources definitions, see :func:`iter_from_file` for the supported
+        formats.
+    :returns: a list of dictionaries, one per document.
+    :raises: ClientException if any of the files cannot be loaded or is not
+        valid.
+    """
+    errors: list[Exception] = []
+    resources = list(iter_resources(filenames, errors))
     if errors:
-        raise exc.ClientException('During resources creation, the following '
-                                  'error(s) were encountered:\n%s' %
+        raise exc.ClientException('While validating the resources file(s), the'
+                                  ' following error(s) were encountered:\n%s' %
                                   '\n'.join(str(e) for e in errors))
+    return resources
+
+
+def iter_resources(
+    filenames: list[str],
+    errors: list[Exception],
+) -> Iterator[dict[str, object]]:
+    """Load and validate resources descriptions from files lazily.
+
+    Unlike :func:`load_resources`, the files are read incrementally and every
+    document is yielded as soon as it is validated, see
+    :func:`iter_from_file` for the supported formats. Invalid documents are
+    skipped, a file that cannot be read or parsed is skipped from the point
+    of the error.
+
+    :param filenames: a list of filenames containing JSON, NDJSON or YAML
+        resources definitions.
+    :param errors: a list to append encountered errors to.
+    :returns: an iterator over valid documents.
+    """
+    validator = _get_validator()
+    for resource_file in filenames:
+        try:
+            for index, resource in enumerate(iter_from_file(resource_file)):
+                try:
+                    validator.validate(resource)
+                except jsonschema.ValidationError as e:
+                    errors.append(exc.ClientException(
+                        'Document %(index)d in file "%(file)s" is invalid '
+                        'due to error: %(err)s' %
+                        {'index': index + 1, 'file': resource_file,
+                         'err': e}))
+                    continue
+                yield resource
+        except exc.ClientException as e:
+            errors.append(e)
+
+
+def iter_from_file(filename: str) -> Iterator[dict[str, object]]:
+    """Deserialize JSON or YAML documents from file one by one.
+
+    NDJSON files (with .ndjson or .jsonl extension) contain one JSON document
+    per line, YAML files may contain several documents separated by
+    ``---``. Both are read incrementally. A JSON file contains exactly one
+    document and is loaded at once.
+
+    :param filename: name of the file containing JSON, NDJSON or YAML.
+    :returns: an iterator over dictionaries deserialized from the file.
+    :raises: ClientException if the file can not be loaded or if its contents
+        is not a valid JSON, NDJSON or YAML, or if the file extension is not
+        supported.
+    """
+    if not filename.endswith(_NDJSON_EXTENSIONS + ('.yaml',)):
+        yield load_from_file(filename)
+        return
+
+    line_number = 0
+    try:
+        with open(filename) as f:
+            if filename.endswith('.yaml'):
+                for document in yaml.safe_load_all(f):
+                    if document is not None:
+                        yield cast(dict[str, object], document)
+                return
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield cast(dict[str, object], json.loads(line))
+    except IOError as e:
+        raise exc.ClientException('Cannot read file "%(file)s" due to '
+                                  'error: %(err)s' %
+                                  {'err': e, 'file': filename})
+    except ValueError as e:
+        raise exc.ClientException('Line %(line)d in file "%(file)s" is '
+                                  'invalid due to error: %(err)s' %
+                                  {'line': line_number, 'err': e,
+                                   'file': filename})
+    except yaml.YAMLError as e:
+        raise exc.ClientException('File "%(file)s" is invalid due to error: '
+                                  '%(err)s' % {'err': e, 'file': filename})
 
 
 def load_from_file(filename: str) -> dict[str, object]:
@@ -185,6 +327,23 @@ def create_single_node(
     return cast(str, ret.uuid)
 
 
+@create_single_handler('node')
+def _set_single_node_traits(
+    client: v1_client.Client, **params: Any,
+) -> str:
+    """Call the client to set the traits of a created node.
+
+    :param client: ironic client instance.
+    :param params: the "uuid" of the node and its "traits".
+    :returns: UUID of the node or None in case of exception, and an
+        exception, if it appears.
+    """
+    if params.get('traits'):
+        client.node.set_traits(params['uuid'],
+                               cast(list[str], params['traits']))
+    return cast(str, params['uuid'])
+
+
 @create_single_handler('port')
 def create_single_port(
     client: v1_client.Client, **params: Any,
@@ -255,6 +414,78 @@ def create_single_chassis(
     return cast(str, ret.uuid)
 
 
+def _check_port(
+    port: dict[str, object],
+    node_uuid: str,
+    portgroup_uuid: str | None = None,
+) -> Exception | None:
+    """Check and set the node and port group UUIDs of a port.
+
+    :returns: an exception if the port belongs to another node or port group.
+    """
+    port_node_uuid = port.get('node_uuid')
+    if port_node_uuid and port_node_uuid != node_uuid:
+        return exc.ClientException(
+            'Cannot create a port as part of node %(node_uuid)s '
+            'because the port %(port)s has a different node UUID '
+            'specified.',
+            {'node_uuid': node_uuid,
+             'port': port})
+    port['node_uuid'] = node_uuid
+    if portgroup_uuid:
+        port_portgroup_uuid = port.get('portgroup_uuid')
+        if port_portgroup_uuid and port_portgroup_uuid != portgroup_uuid:
+            return exc.ClientException(
+                'Cannot create a port as part of port group '
+                '%(portgroup_uuid)s because the port %(port)s has a '
+                'different port group UUID specified.',
+                {'portgroup_uuid': portgroup_uuid,
+                 'port': port})
+        port['portgroup_uuid'] = portgroup_uuid
+    return None
+
+
+def _check_portgroup(
+    portgroup: dict[str, object],
+    node_uuid: str,
+) -> Exception | None:
+    """Check and set the node UUID of a port group.
+
+    :returns: an exception if the port group belongs to another node.
+    """
+    portgroup_node_uuid = portgroup.get('node_uuid')
+    if portgroup_node_uuid and portgroup_node_uuid != node_uuid:
+        return exc.ClientException(
+            'Cannot create a port group as part of node %(node_uuid)s '
+            'because the port group %(portgroup)s has a different node '
+            'UUID specified.',
+            {'node_uuid': node_uuid,
+             'portgroup': portgroup})
+    portgroup['node_uuid'] = node_uuid
+    return None
+
+
+def _check_node(
+    node: dict[str, object],
+    chassis_uuid: str | None = None,
+) -> Exception | None:
+    """Check and set the chassis UUID of a node.
+
+    :returns: an exception if the node belongs to another chassis.
+    """
+    if chassis_uuid is not None:
+        node_chassis_uuid = node.get('chassis_uuid')
+        if node_chassis_uuid and node_chassis_uuid != chassis_uuid:
+            return exc.ClientException(
+                'Cannot create a node as part of chassis %(chassis_uuid)s '
+                'because the node %(node)s has a different chassis UUID '
+                'specified.' %
+                {'chassis_uuid': chassis_uuid,
+                 'node': node})
+        node['chassis_uuid'] = chassis_uuid
+    return None
+
+
 def create_ports(
     client: v1_client.Client,
     port_list: list[dict[str, object]],
@@ -273,28 +504,9 @@ def create_ports(
     """
     errors: list[Exception] = []
     for port in port_list:
-        port_node_uuid = port.get('node_uuid')
-        if port_node_uuid and port_node_uuid != node_uuid:
-            errors.append(exc.ClientException(
-                'Cannot create a port as part of node %(node_uuid)s '
-                'because the port %(port)s has a different node UUID '
-                'specified.',
-                {'node_uuid': node_uuid,
-                 'port': port}))
-            continue
-        port['node_uuid'] = node_uuid
-        if portgroup_uuid:
-            port_portgroup_uuid = port.get('portgroup_uuid')
-            if port_portgroup_uuid and port_portgroup_uuid != portgroup_uuid:
-                errors.append(exc.ClientException(
-                    'Cannot create a port as part of port group '
-                    '%(portgroup_uuid)s because the port %(port)s has a '
-                    'different port group UUID specified.',
-                    {'portgroup_uuid': portgroup_uuid,
-                     'port': port}))
-                continue
-            port['portgroup_uuid'] = portgroup_uuid
-        port_uuid, error = create_single_port(client, **port)
+        error = _check_port(port, node_uuid, portgroup_uuid)
+        if error is None:
+            port_uuid, error = create_single_port(client, **port)
         if error:
             errors.append(error)
     return errors
@@ -316,16 +528,10 @@ def create_portgroups(
     """
     errors: list[Exception] = []
     for portgroup in portgroup_list:
-        portgroup_node_uuid = portgroup.get('node_uuid')
-        if portgroup_node_uuid and portgroup_node_uuid != node_uuid:
-            errors.append(exc.ClientException(
-                'Cannot create a port group as part of node %(node_uuid)s '
-                'because the port group %(portgroup)s has a different node '
-                'UUID specified.',
-                {'node_uuid': node_uuid,
-                 'portgroup': portgroup}))
+        error = _check_portgroup(portgroup, node_uuid)
+        if error is not None:
+            errors.append(error)
             continue
-        portgroup['node_uuid'] = node_uuid
         portgroup_uuid, error = create_single_portgroup(client, **portgroup)
         if error:
             errors.append(error)
@@ -357,17 +563,10 @@ def create_nodes(
     """
     errors: list[Exception] = []
     for node in node_list:
-        if chassis_uuid is not None:
-            node_chassis_uuid = node.get('chassis_uuid')
-            if node_chassis_uuid and node_chassis_uuid != chassis_uuid:
-                errors.append(exc.ClientException(
-                    'Cannot create a node as part of chassis %(chassis_uuid)s '
-                    'because the node %(node)s has a different chassis UUID '
-                    'specified.' %
-                    {'chassis_uuid': chassis_uuid,
-                     'node': node}))
-                continue
-            node['chassis_uuid'] = chassis_uuid
+        error = _check_node(node, chassis_uuid)
+        if error is not None:
+            errors.append(error)
+            continue
         node_uuid, error = create_single_node(client, **node)
         if error:
             errors.append(error)
@@ -415,3 +614,253 @@ def create_chassis(
                 cast(list[dict[str, object]], nodes),
                 chassis_uuid=chassis_uuid))
     return errors
+
+
+class _ParallelCreator(object):
+    """Create resources concurrently, respecting their dependencies.
+
+    Chassis and nodes without chassis are created first. Once a chassis is
+    created, its nodes are scheduled; once a node is created (and its traits
+    are set), its port groups and ports outside of port groups are
+    scheduled; once a port group is created, its ports are scheduled. All
+    resources share one pool of workers, so independent branches progress
+    concurrently while the number of requests in flight stays bounded.
+
+    Resources descriptions are consumed lazily: only a limited number of
+    top-level resources (chassis and nodes without chassis) are scheduled
+    at a time, so that descriptions can be streamed.
+
+    If a journal is provided, every creation is recorded in it, and
+    resources already created according to it are skipped (their children
+    are still processed using the recorded UUIDs). Nodes are recorded as
+    soon as they exist, so that only their traits are set when resuming
+    after a failure to set them.
+
+    :param client: ironic client instance.
+    :param max_workers: the maximum number of concurrent requests.
+    :param journal: optional journal of created resources.
+    """
+
+    def __init__(
+        self,
+        client: v1_client.Client,
+        max_workers: int,
+        journal: journal_module.Journal | None = None,
+    ) -> None:
+        self.client = client
+        self.journal = journal
+        self.errors: list[Exception] = []
+        self._keys: collections.Counter[str] = collections.Counter()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._failure: BaseException | None = None
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(
+            max_workers * _SCHEDULED_PER_WORKER)
+
+    def run(
+        self,
+        resources: Iterable[dict[str, object]],
+    ) -> list[Exception]:
+        """Create the resources.
+
+        :param resources: resources descriptions as loaded by
+            :func:`load_resources` or :func:`iter_resources`.
+        :returns: array of exceptions encountered during creation.
+        """
+        chassis_futures: list[futures.Future[None]] = []
+        with self._executor:
+            for r in resources:
+                for chassis in cast(list[dict[str, object]],
+                                    r.get('chassis', [])):
+                    chassis_futures.append(
+                        self._spawn_top_level(self._create_chassis, chassis))
+                for node in cast(list[dict[str, object]],
+                                 r.get('nodes', [])):
+                    if node.get('chassis_uuid') and chassis_futures:
+                        # NOTE: the node may refer to a chassis described
+                        # earlier (e.g. in an export), let it be created.
+                        futures.wait(chassis_futures)
+                        chassis_futures = []
+                    self._spawn_top_level(self._create_node, node, None)
+            self._wait()
+        if self._failure is not None:
+            raise self._failure
+        return self.errors
+
+    def _spawn_top_level(
+        self,
+        func: Callable[..., None],
+        *args: Any,
+    ) -> futures.Future[None]:
+        self._slots.acquire()
+        future = self._spawn(func, *args)
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def _spawn(
+        self,
+        func: Callable[..., None],
+        *args: Any,
+    ) -> futures.Future[None]:
+        with self._lock:
+            self._pending += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: futures.Future[None]) -> None:
+        with self._idle:
+            if future.exception() is not None and self._failure is None:
+                self._failure = future.exception()
+            self._pending -= 1
+            if not self._pending:
+                self._idle.notify_all()
+
+    def _wait(self) -> None:
+        # NOTE: tasks spawn their children before finishing, so there are no
+        # pending tasks only when everything is done.
+        with self._idle:
+            while self._pending:
+                self._idle.wait()
+
+    def _add_error(self, error: Exception) -> None:
+        with self._lock:
+            self.errors.append(error)
+
+    def _create_single(
+        self,
+        resource_type: str,
+        create_method: Callable[..., tuple[str | None, Exception | None]],
+        params: dict[str, object],
+    ) -> tuple[str | None, Exception | None]:
+        if self.journal is None:
+            return create_method(self.client, **params)
+
+        key = self._journal_key(resource_type, params)
+        uuid = self.journal.get(key)
+        if uuid is not None:
+            LOG.debug('Skipping %(type)s %(uuid)s already created according '
+                      'to the journal', {'type': resource_type, 'uuid': uuid})
+            return uuid, None
+        uuid, error = create_method(self.client, **params)
+        self.journal.record(key, uuid=uuid, error=error)
+        return uuid, error
+
+    def _journal_key(
+        self,
+        resource_type: str,
+        params: dict[str, object],
+    ) -> str:
+        # NOTE: parent UUIDs are already set in params, so the key also
+        # identifies the parent resource.
+        description = {key: value for key, value in params.items()
+                       if key not in _NESTED_KEYS}
+        key = '%s:%s' % (resource_type, hashlib.sha256(
+            json.dumps(description, sort_keys=True,
+                       default=str).encode()).hexdigest())
+        with self._lock:
+            # Distinguish resources with identical descriptions.
+            index = self._keys[key]
+            self._keys[key] += 1
+        if index:
+            key = '%s:%d' % (key, index)
+        return key
+
+    def _create_single_node(
+        self,
+        node: dict[str, object],
+    ) -> tuple[str | None, Exception | None]:
+        if self.journal is None or not node.get('traits'):
+            return self._create_single('node', create_single_node, node)
+
+        # NOTE: the node is recorded as soon as it exists, so that resuming
+        # after a failure to set its traits does not create it again.
+        key = self._journal_key('node', node)
+        node_uuid = self.journal.get(key)
+        if node_uuid is not None:
+            LOG.debug('Skipping node %s already created according to the '
+                      'journal', node_uuid)
+            return node_uuid, None
+        node_uuid = self.journal.get_created(key)
+        if node_uuid is None:
+            node_uuid, error = create_single_node(
+                self.client, **dict(node, traits=None))
+            if node_uuid is None:
+                self.journal.record(key, error=error)
+                return None, error
+            self.journal.record(key, uuid=node_uuid, partial=True)
+        else:
+            LOG.debug('Setting the traits of node %s created according to '
+                      'the journal', node_uuid)
+        _uuid, error = _set_single_node_traits(
+            self.client, uuid=node_uuid, traits=node['traits'])
+        self.journal.record(key, uuid=node_uuid, error=error)
+        if error is not None:
+            return None, error
+        return node_uuid, None
+
+    def _create_chassis(self, chassis: dict[str, object]) -> None:
+        chassis_uuid, error = self._create_single(
+            'chassis', create_single_chassis, chassis)
+        if error:
+            self._add_error(error)
+        # Chassis UUID == None means that chassis creation failed, don't
+        # create the nodes inside it
+        if chassis_uuid is not None:
+            for node in cast(list[dict[str, object]],
+                             chassis.get('nodes') or []):
+                self._spawn(self._create_node, node, chassis_uuid)
+
+    def _create_node(
+        self,
+        node: dict[str, object],
+        chassis_uuid: str | None,
+    ) -> None:
+        node_uuid: str | None = None
+        error = _check_node(node, chassis_uuid)
+        if error is None:
+            node_uuid, error = self._create_single_node(node)
+        if error:
+            self._add_error(error)
+        # Node UUID == None means that node creation failed, don't
+        # create the port(group)s inside it
+        if node_uuid is None:
+            return
+        for portgroup in cast(list[dict[str, object]],
+                              node.get('portgroups') or []):
+            self._spawn(self._create_portgroup, portgroup, node_uuid)
+        for port in cast(list[dict[str, object]], node.get('ports') or []):
+            self._spawn(self._create_port, port, node_uuid, None)
+
+    def _create_portgroup(
+        self,
+        portgroup: dict[str, object],
+        node_uuid: str,
+    ) -> None:
+        portgroup_uuid: str | None = None
+        error = _check_portgroup(portgroup, node_uuid)
+        if error is None:
+            portgroup_uuid, error = self._create_single(
+                'portgroup', create_single_portgroup, portgroup)
+        if error:
+            self._add_error(error)
+        if portgroup_uuid is None:
+            return
+        for port in cast(list[dict[str, object]],
+                         portgroup.get('ports') or []):
+            self._spawn(self._create_port, port, node_uuid, portgroup_uuid)
+
+    def _create_port(
+        self,
+        port: dict[str, object],
+        node_uuid: str,
+        portgroup_uuid: str | None,
+    ) -> None:
+        error = _check_port(port, node_uuid, portgroup_uuid)
+        if error is None:
+            _port_uuid, error = self._create_single(
+                'port', create_single_port, port)
+        if error:
+            self._add_error(error)
@@ -0,0 +1,171 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Export of bare metal resources.
+
+The export is the inverse of :mod:`ironicclient.v1.create_resources`: it
+produces resources descriptions in the same schema, one description per
+chassis or node, which can be fed back to ``baremetal create``. Nodes are
+streamed page by page and written as soon as they are received, only the
+(projected) port groups and ports are kept in memory to join them locally
+with their nodes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import json
+import logging
+from typing import Any, TextIO
+
+import yaml
+
+from ironicclient.common.i18n import _
+from ironicclient.common import utils
+from ironicclient import exc
+from ironicclient.v1 import chassis as chassis_module
+from ironicclient.v1 import client as v1_client
+from ironicclient.v1 import join
+from ironicclient.v1 import node as node_module
+from ironicclient.v1 import port as port_module
+from ironicclient.v1 import portgroup as portgroup_module
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+FORMATS: tuple[str, ...] = ('ndjson', 'yaml')
+"""Supported output formats."""
+
+# Value returned by the API instead of secrets, such as BMC passwords.
+_MASKED = '******'
+
+
+def _project(
+    item: dict[str, Any],
+    attributes: Iterable[str],
+) -> dict[str, Any]:
+    """Keep only the fields accepted on creation.
+
+    Empty fields and masked secrets are dropped: the latter cannot be
+    exported and must be set again after importing.
+    """
+    result = {}
+    for attr in attributes:
+        value = item.get(attr)
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            value = {key: val for key, val in value.items()
+                     if val != _MASKED}
+        result[attr] = value
+    return result
+
+
+def iter_export(client: v1_client.Client) -> Iterator[dict[str, Any]]:
+    """Export all chassis, nodes, port groups and ports.
+
+    Chassis are exported first, so that nodes can refer to them by
+    ``chassis_uuid`` on import. Every node is exported with its traits, its
+    port groups and its ports (ports of a port group are nested in it).
+
+    :param client: an instance of ironic client.
+    :returns: an iterator over resources descriptions in the format
+        accepted by :func:`ironicclient.v1.create_resources.create_resources`,
+        each with one chassis or one node.
+    """
+    for chassis in utils.iter_list(client.chassis.list, detail=True):
+        yield {'chassis': [_project(
+            chassis.to_dict(),
+            chassis_module.ChassisManager._creation_attributes)]}
+
+    ports_by_node = join.index_by(
+        (_project(port.to_dict(), port_module.PortManager._creation_attributes)
+         for port in utils.iter_list(client.port.list, detail=True)),
+        'node_uuid')
+    portgroups_by_node = join.index_by(
+        (_project(portgroup.to_dict(),
+                  portgroup_module.PortgroupManager._creation_attributes)
+         for portgroup in utils.iter_list(client.portgroup.list,
+                                          detail=True)),
+        'node_uuid')
+    LOG.debug('Exporting nodes with ports of %(ports)d nodes and port groups '
+              'of %(portgroups)d nodes',
+              {'ports': len(ports_by_node),
+               'portgroups': len(portgroups_by_node)})
+
+    attributes = node_module.NodeManager._creation_attributes + ['traits']
+    for node in utils.iter_list(client.node.list, detail=True):
+        description = _project(node.to_dict(), attributes)
+        portgroups: dict[Any, dict[str, Any]] = {}
+        for portgroup in portgroups_by_node.pop(node.uuid, []):
+            portgroup.pop('node_uuid')
+            portgroups[portgroup.get('uuid')] = portgroup
+        standalone: list[dict[str, Any]] = []
+        for port in ports_by_node.pop(node.uuid, []):
+            port.pop('node_uuid')
+            parent = portgroups.get(port.pop('portgroup_uuid', None))
+            if parent is not None:
+                parent.setdefault('ports', []).append(port)
+            else:
+                standalone.append(port)
+        if portgroups:
+            description['portgroups'] = list(portgroups.values())
+        if standalone:
+            description['ports'] = standalone
+        yield {'nodes': [description]}
+
+
+def write_resources(
+    resources: Iterable[dict[str, Any]],
+    output: TextIO,
+    fmt: str = 'ndjson',
+) -> int:
+    """Write resources descriptions incrementally.
+
+    :param resources: resources descriptions.
+    :param output: the file to write to.
+    :param fmt: the output format: ``ndjson`` for one JSON document per line
+        or ``yaml`` for a YAML stream with one document per description.
+    :returns: the number of written descriptions.
+    :raises: InvalidAttribute if the format is not supported.
+    """
+    if fmt not in FORMATS:
+        raise exc.InvalidAttribute(
+            _('Unsupported export format %(fmt)s, supported are: '
+              '%(supported)s') % {'fmt': fmt,
+                                  'supported': ', '.join(FORMATS)})
+    count = 0
+    for description in resources:
+        if fmt == 'ndjson':
+            output.write(json.dumps(description, separators=(',', ':'))
+                         + '\n')
+        else:
+            output.write(yaml.safe_dump(description, explicit_start=True,
+                                        default_flow_style=False))
+        count += 1
+    return count
+
+
+def export_resources(
+    client: v1_client.Client,
+    output: TextIO,
+    fmt: str = 'ndjson',
+) -> int:
+    """Export all resources to a file.
+
+    :param client: an instance of ironic client.
+    :param output: the file to write to.
+    :param fmt: the output format, see :func:`write_resources`.
+    :returns: the number of written descriptions.
+    """
+    count = write_resources(iter_export(client), output, fmt)
+    LOG.debug('Exported %d resources descriptions', count)
+    return count
@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Local joins of bare metal resources.
+
+Listing the ports of every node with ``NodeManager.list_ports`` takes one
+request per node. The helpers in this module fetch nodes, port groups and
+ports with one (paginated) listing each and join them locally using hash
+indexes on ``node_uuid`` and ``portgroup_uuid``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+import logging
+from typing import Any
+
+from ironicclient.common import base
+from ironicclient.common import utils
+from ironicclient.v1 import client as v1_client
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+# Fields always fetched since they are required for joining.
+PORT_JOIN_FIELDS: tuple[str, ...] = ('uuid', 'node_uuid', 'portgroup_uuid')
+PORTGROUP_JOIN_FIELDS: tuple[str, ...] = ('uuid', 'node_uuid')
+
+
+def index_by(
+    items: Iterable[dict[str, Any]],
+    key: str,
+) -> dict[Any, list[dict[str, Any]]]:
+    """Build a hash index of resources.
+
+    :param items: resources as dictionaries.
+    :param key: the field to index by.
+    :returns: a dictionary mapping values of the field to lists of resources
+        with this value, in the original order. Resources with an empty
+        value are skipped.
+    """
+    index: dict[Any, list[dict[str, Any]]] = {}
+    for item in items:
+        value = item.get(key)
+        if value is not None:
+            index.setdefault(value, []).append(item)
+    return index
+
+
+def join_nodes(
+    nodes: Iterable[dict[str, Any]],
+    ports: Iterable[dict[str, Any]],
+    portgroups: Iterable[dict[str, Any]] = (),
+) -> list[dict[str, Any]]:
+    """Join nodes with their ports and port groups.
+
+    :param nodes: nodes as dictionaries, must contain ``uuid``.
+    :param ports: ports as dictionaries, must contain ``node_uuid`` and
+        ``portgroup_uuid``.
+    :param portgroups: port groups as dictionaries, must contain ``uuid``
+        and ``node_uuid``.
+    :returns: a list of nodes with an additional ``ports`` key (the list of
+        ports of the node) and ``portgroups`` key (the list of port groups
+        of the node, each with a ``ports`` key with its ports). Ports and
+        port groups of other nodes are ignored.
+    """
+    ports = list(ports)
+    ports_by_node = index_by(ports, 'node_uuid')
+    ports_by_portgroup = index_by(ports, 'portgroup_uuid')
+    portgroups_by_node = index_by(portgroups, 'node_uuid')
+
+    result = []
+    for node in nodes:
+        node_portgroups = [
+            dict(portgroup,
+                 ports=ports_by_portgroup.get(portgroup['uuid'], []))
+            for portgroup in portgroups_by_node.get(node['uuid'], [])
+        ]
+        result.append(dict(node,
+                           ports=ports_by_node.get(node['uuid'], []),
+                           portgroups=node_portgroups))
+    return result
+
+
+def _with_fields(
+    fields: Sequence[str] | None,
+    required: Sequence[str],
+) -> dict[str, Any]:
+    if fields is None:
+        return {'detail': True}
+    return {'fields': list(fields) + [f for f in required if f not in fields]}
+
+
+def _list_for_nodes(
+    list_func: Callable[..., Sequence[base.Resource]],
+    nodes: Sequence[base.Resource],
+    scan_threshold: int,
+    **params: Any,
+) -> list[base.Resource]:
+    if len(nodes) >= scan_threshold:
+        return list(list_func(limit=0, **params))
+    pages = utils.run_concurrently(
+        lambda uuid: list_func(node=uuid, limit=0, **params),
+        [getattr(item, 'uuid') for item in nodes])
+    return [item for page in pages for item in page]
+
+
+def list_nodes_with_ports(
+    client: v1_client.Client,
+    port_fields: Sequence[str] | None = None,
+    portgroup_fields: Sequence[str] | None = None,
+    scan_threshold: int = utils.DEFAULT_SCAN_THRESHOLD,
+    **node_params: Any,
+) -> list[dict[str, Any]]:
+    """List nodes with their ports and port groups.
+
+    When all nodes are listed, nodes, ports and port groups are fetched
+    concurrently with one (paginated) listing each, then joined locally,
+    see :func:`join_nodes`. When only some nodes are listed (``limit`` is
+    not 0 or ``marker`` is set), the nodes are fetched first and the ports
+    and port groups of each of them are listed, unless there are at least
+    ``scan_threshold`` nodes.
+
+    :param client: an instance of ironic client.
+    :param port_fields: fields of ports to fetch, all by default. The
+        fields required for joining are always fetched.
+    :param portgroup_fields: fields of port groups to fetch, all by default.
+        The fields required for joining are always fetched.
+    :param scan_threshold: the number of listed nodes from which all ports
+        and port groups are listed instead of the ones of each node.
+    :param node_params: arguments to ``NodeManager.list``. ``limit``
+        defaults to 0 (all nodes).
+    :returns: a list of nodes as dictionaries, see :func:`join_nodes`.
+    """
+    node_params.setdefault('limit', 0)
+    node_fields = node_params.get('fields')
+    if node_fields is not None and 'uuid' not in node_fields:
+        node_params['fields'] = list(node_fields) + ['uuid']
+    port_params = _with_fields(port_fields, PORT_JOIN_FIELDS)
+    portgroup_params = _with_fields(portgroup_fields, PORTGROUP_JOIN_FIELDS)
+
+    nodes: Sequence[base.Resource]
+    ports: Sequence[base.Resource]
+    portgroups: Sequence[base.Resource]
+    if node_params['limit'] == 0 and node_params.get('marker') is None:
+        listings: Sequence[Callable[[], Sequence[base.Resource]]] = [
+            lambda: client.node.list(**node_params),
+            lambda: client.port.list(limit=0, **port_params),
+            lambda: client.portgroup.list(limit=0, **portgroup_params),
+        ]
+        nodes, ports, portgroups = utils.run_concurrently(
+            lambda listing: listing(), listings)
+    else:
+        nodes = client.node.list(**node_params)
+        ports = _list_for_nodes(client.port.list, nodes, scan_threshold,
+                                **port_params)
+        portgroups = _list_for_nodes(client.portgroup.list, nodes,
+                                     scan_threshold, **portgroup_params)
+    LOG.debug('Joining %(nodes)d nodes with %(ports)d ports and '
+              '%(portgroups)d port groups',
+              {'nodes': len(nodes), 'ports': len(ports),
+               'portgroups': len(portgroups)})
+    return join_nodes((item.to_dict() for item in nodes),
+                      (item.to_dict() for item in ports),
+                      (item.to_dict() for item in portgroups))
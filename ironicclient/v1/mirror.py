@@ -0,0 +1,310 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Local SQLite mirror of bare metal resources.
+
+The mirror keeps a copy of chassis, nodes, port groups, ports and
+allocations in a SQLite database, so that queries the API cannot express
+(for example, on keys of ``properties`` or ``extra``) can be evaluated
+locally. After the initial snapshot, only resources created or updated
+since the previous synchronization are fetched from the API.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+import json
+import logging
+import sqlite3
+from typing import Any, NamedTuple
+
+from ironicclient.common import base
+from ironicclient.common.i18n import _
+from ironicclient import exc
+from ironicclient.v1 import client as v1_client
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE: int = 1000
+"""Number of resources requested per page during an incremental sync."""
+
+_SCHEMA_VERSION: int = 1
+
+
+class _Table(NamedTuple):
+    manager: str
+    columns: tuple[str, ...]
+    detail: bool = True
+
+
+_TABLES: dict[str, _Table] = {
+    'chassis': _Table('chassis', ()),
+    'nodes': _Table('node', (
+        'name', 'instance_uuid', 'provision_state', 'power_state', 'driver',
+        'conductor_group', 'resource_class', 'chassis_uuid', 'owner',
+        'lessee', 'shard', 'maintenance', 'parent_node')),
+    'portgroups': _Table('portgroup', ('name', 'address', 'node_uuid')),
+    'ports': _Table('port', ('address', 'node_uuid', 'portgroup_uuid')),
+    'allocations': _Table('allocation', (
+        'name', 'node_uuid', 'state', 'resource_class', 'owner'),
+        detail=False),
+}
+
+RESOURCES: tuple[str, ...] = tuple(_TABLES)
+
+
+def _changed_at(item: dict[str, Any]) -> str | None:
+    """Return the last modification time of a resource."""
+    return item.get('updated_at') or item.get('created_at')
+
+
+class FleetMirror(object):
+    """A local SQLite mirror of the bare metal fleet.
+
+    :param client: an instance of ironic client.
+    :param path: path to the SQLite database file, ``:memory:`` keeps the
+        mirror in memory only.
+    :param resources: resource types to mirror, a subset of
+        :data:`RESOURCES`. Defaults to all of them.
+    :param page_size: number of resources requested per page when looking
+        for changes.
+    """
+
+    def __init__(
+        self,
+        client: v1_client.Client,
+        path: str,
+        resources: Sequence[str] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        if resources is None:
+            resources = RESOURCES
+        invalid = set(resources) - set(RESOURCES)
+        if invalid:
+            raise exc.InvalidAttribute(
+                _('Unsupported resource type(s) %(invalid)s, supported are: '
+                  '%(valid)s') % {'invalid': ', '.join(sorted(invalid)),
+                                  'valid': ', '.join(RESOURCES)})
+        if page_size <= 0:
+            raise exc.InvalidAttribute(
+                _('Page size must be positive, got %s') % page_size)
+
+        self.client = client
+        self.path = path
+        self.resources = tuple(r for r in RESOURCES if r in resources)
+        self.page_size = page_size
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> FleetMirror:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _create_schema(self) -> None:
+        conn = self.connection
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, _SCHEMA_VERSION):
+            LOG.debug('Mirror %(path)s has schema version %(old)s, '
+                      'recreating it with version %(new)s',
+                      {'path': self.path, 'old': version,
+                       'new': _SCHEMA_VERSION})
+            for name in list(_TABLES) + ['sync_state']:
+                conn.execute('DROP TABLE IF EXISTS %s' % name)
+
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS sync_state ('
+                         'resource TEXT PRIMARY KEY, '
+                         'watermark TEXT)')
+            for name, table in _TABLES.items():
+                columns = ''.join(', %s' % c for c in table.columns)
+                conn.execute('CREATE TABLE IF NOT EXISTS %s ('
+                             'uuid TEXT PRIMARY KEY%s, '
+                             'changed_at TEXT, '
+                             'data TEXT NOT NULL)' % (name, columns))
+                for column in table.columns:
+                    conn.execute('CREATE INDEX IF NOT EXISTS %(t)s_%(c)s '
+                                 'ON %(t)s (%(c)s)' % {'t': name, 'c': column})
+            conn.execute('PRAGMA user_version = %d' % _SCHEMA_VERSION)
+
+    def _check_resource(self, resource: str) -> None:
+        if resource not in self.resources:
+            raise exc.InvalidAttribute(
+                _('Resource type %(res)s is not mirrored, mirrored are: '
+                  '%(valid)s') % {'res': resource,
+                                  'valid': ', '.join(self.resources)})
+
+    def _list(self, resource: str, **kwargs: Any) -> list[base.Resource]:
+        table = _TABLES[resource]
+        manager = getattr(self.client, table.manager)
+        if table.detail and 'fields' not in kwargs:
+            kwargs['detail'] = True
+        result: list[base.Resource] = manager.list(**kwargs)
+        return result
+
+    def _store(self, resource: str, items: Iterable[dict[str, Any]]) -> int:
+        table = _TABLES[resource]
+        placeholders = ', '.join('?' * (len(table.columns) + 3))
+        query = ('INSERT OR REPLACE INTO %s (uuid%s, changed_at, data) '
+                 'VALUES (%s)' % (resource,
+                                  ''.join(', %s' % c for c in table.columns),
+                                  placeholders))
+        rows = [
+            (item['uuid'],
+             *(item.get(c) for c in table.columns),
+             _changed_at(item),
+             json.dumps(item))
+            for item in items
+        ]
+        self.connection.executemany(query, rows)
+        return len(rows)
+
+    def _get_watermark(self, resource: str) -> str | None:
+        row = self.connection.execute(
+            'SELECT watermark FROM sync_state WHERE resource = ?',
+            (resource,)).fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, resource: str) -> None:
+        self.connection.execute(
+            'INSERT OR REPLACE INTO sync_state (resource, watermark) '
+            'SELECT ?, MAX(changed_at) FROM %s' % resource, (resource,))
+
+    def _snapshot(self, resource: str) -> int:
+        items = [i.to_dict() for i in self._list(resource, limit=0)]
+        self.connection.execute('DELETE FROM %s' % resource)
+        return self._store(resource, items)
+
+    def _fetch_changes(self, resource: str, watermark: str) -> int:
+        count = 0
+        # NOTE: updated_at is empty for resources that were never
+        # modified after creation, hence the second pass on created_at.
+        for sort_key in ('updated_at', 'created_at'):
+            marker = None
+            while True:
+                page = [i.to_dict() for i in self._list(
+                    resource, limit=self.page_size, marker=marker,
+                    sort_key=sort_key, sort_dir='desc')]
+                changed = []
+                done = len(page) < self.page_size
+                for item in page:
+                    timestamp = item.get(sort_key)
+                    if timestamp is None:
+                        continue
+                    if timestamp < watermark:
+                        done = True
+                        break
+                    changed.append(item)
+                count += self._store(resource, changed)
+                if done or not page:
+                    break
+                marker = page[-1]['uuid']
+        return count
+
+    def _prune(self, resource: str) -> int:
+        existing = {i.uuid for i in self._list(resource, limit=0,
+                                                fields=['uuid'])}
+        stored = {row[0] for row in self.connection.execute(
+            'SELECT uuid FROM %s' % resource)}
+        removed = stored - existing
+        self.connection.executemany(
+            'DELETE FROM %s WHERE uuid = ?' % resource,
+            ((uuid,) for uuid in removed))
+        return len(removed)
+
+    def sync(self, full: bool = False, prune: bool = False) -> dict[str, int]:
+        """Synchronize the mirror with the API.
+
+        The first synchronization of each resource type fetches all
+        resources. Subsequent ones only fetch resources sorted by their
+        modification time until reaching the ones seen during the previous
+        synchronization.
+
+        :param full: re-fetch all resources instead of only the changed ones.
+        :param prune: also remove resources deleted since the previous
+            synchronization. Requires listing the UUIDs of all resources
+            and is implied by ``full``.
+        :returns: a dictionary mapping resource types to the number of
+            fetched (and for pruning, removed) resources.
+        """
+        stats = {}
+        for resource in self.resources:
+            with self.connection:
+                watermark = self._get_watermark(resource)
+                if full or watermark is None:
+                    LOG.debug('Taking a full snapshot of %s', resource)
+                    count = self._snapshot(resource)
+                else:
+                    LOG.debug('Fetching %(res)s changed since %(mark)s',
+                              {'res': resource, 'mark': watermark})
+                    count = self._fetch_changes(resource, watermark)
+                    if prune:
+                        count += self._prune(resource)
+                self._set_watermark(resource)
+            stats[resource] = count
+        return stats
+
+    def query(
+        self,
+        resource: str,
+        where: str | None = None,
+        params: Sequence[Any] = (),
+        order_by: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query mirrored resources.
+
+        Columns ``uuid``, ``changed_at`` and the indexed fields of each
+        resource type can be used directly, other fields can be accessed
+        via the SQLite JSON functions on the ``data`` column, e.g.
+        ``json_extract(data, '$.properties.memory_mb') > ?``.
+
+        :param resource: resource type, one of :data:`RESOURCES`.
+        :param where: optional SQL condition.
+        :param params: parameters for placeholders in ``where``.
+        :param order_by: optional SQL ordering expression.
+        :param limit: optional maximum number of results.
+        :returns: a list of resources as dictionaries.
+        """
+        self._check_resource(resource)
+        query = 'SELECT data FROM %s' % resource
+        if where:
+            query += ' WHERE %s' % where
+        if order_by:
+            query += ' ORDER BY %s' % order_by
+        if limit is not None:
+            query += ' LIMIT %d' % int(limit)
+        return [json.loads(row[0])
+                for row in self.connection.execute(query, tuple(params))]
+
+    def get(self, resource: str, uuid: str) -> dict[str, Any] | None:
+        """Get one mirrored resource by its UUID.
+
+        :param resource: resource type, one of :data:`RESOURCES`.
+        :param uuid: UUID of the resource.
+        :returns: the resource as a dictionary or None if it is not mirrored.
+        """
+        result = self.query(resource, 'uuid = ?', (uuid,))
+        return result[0] if result else None
+
+    def count(self, resource: str) -> int:
+        """Return the number of mirrored resources of the given type."""
+        self._check_resource(resource)
+        result: int = self.connection.execute(
+            'SELECT COUNT(*) FROM %s' % resource).fetchone()[0]
+        return result
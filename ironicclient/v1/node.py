@@ -14,7 +14,12 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import builtins
+import collections
+from collections.abc import Callable, Iterable, Iterator
+import inspect
+import itertools
+import json
 import logging
 import os
 from typing import Any, cast
@@ -26,6 +31,9 @@ from ironicclient.common.i18n import _
 from ironicclient.common import utils
 from ironicclient import exc
 from ironicclient.v1 import port
+from ironicclient.v1 import query
+from ironicclient.v1 import resolver
+from ironicclient.v1 import shard
 from ironicclient.v1 import volume_connector
 from ironicclient.v1 import volume_target
 
@@ -40,6 +48,30 @@ _power_states: dict[str, str] = {
 
 LOG: logging.Logger = logging.getLogger(__name__)
 _DEFAULT_POLL_INTERVAL: int = 2
+# Fields returned when listing nodes without 'detail' or 'fields'.
+_LIST_FIELDS: list[str] = ['uuid', 'name', 'instance_uuid', 'power_state',
+                           'provision_state', 'maintenance']
+# Fields returned by get_by_instance_uuids without 'detail' or 'fields'.
+_INSTANCE_FIELDS: list[str] = ['uuid', 'name', 'instance_uuid']
+# Filters that accept a list of values, executed as one query per value.
+_MULTI_VALUE_FILTERS: tuple[str, ...] = (
+    'provision_state', 'driver', 'resource_class', 'chassis', 'fault',
+    'conductor_group', 'conductor', 'owner', 'lessee', 'parent_node',
+    'instance_name')
+# Values of 'parallel_by' supported when listing nodes.
+PARALLEL_BY: tuple[str, ...] = ('shard',)
+
+
+def _group_value(item: Any, path: tuple[str, ...]) -> Any:
+    value: Any = item._info
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    if isinstance(value, (dict, list)):
+        # NOTE: make the value hashable and easy to print.
+        return json.dumps(value, sort_keys=True)
+    return value
 
 
 class Node(base.Resource):
@@ -64,6 +96,8 @@ class NodeManager(base.CreateManager[Node]):
         'owner', 'lessee', 'shard', 'description',
         'instance_name',
     ]
+    name_cache: resolver.NameCache | None = None
+    """Optional cache of node names, see :mod:`ironicclient.v1.resolver`."""
     _resource_name: str = 'nodes'
 
     def list_ports(
@@ -336,9 +370,42 @@ class NodeManager(base.CreateManager[Node]):
         os_ironic_api_version: str | None = None,
         global_request_id: str | None = None,
     ) -> Node | None:
-        return self._get(resource_id=node_id, fields=fields,
+        node = self._get(resource_id=node_id, fields=fields,
                          os_ironic_api_version=os_ironic_api_version,
                          global_request_id=global_request_id)
+        if self.name_cache is not None and node is not None:
+            self.name_cache.record_nodes([node])
+        return node
+
+    def resolve(
+        self,
+        node_ident: str,
+        os_ironic_api_version: str | None = None,
+        global_request_id: str | None = None,
+    ) -> str:
+        """Translate a node name or UUID to a UUID.
+
+        Uses :attr:`name_cache` if set, otherwise or if the name is not
+        cached, fetches the node.
+
+        :param node_ident: The name or UUID of the node.
+        :param os_ironic_api_version: String version (e.g. "1.35") to use for
+            the request.  If not specified, the client's default is used.
+        :param global_request_id: String containing global request ID header
+            value (in form "req-<UUID>") to use for the request.
+        :returns: The UUID of the node.
+        :raises: NotFound if the node does not exist.
+        """
+        if self.name_cache is not None:
+            uuid = self.name_cache.get(node_ident)
+            if uuid is not None:
+                return uuid
+        node = self.get(node_ident, fields=['uuid', 'name'],
+                        os_ironic_api_version=os_ironic_api_version,
+                        global_request_id=global_request_id)
+        if node is None:
+            raise exc.NotFound()
+        return cast(str, node.uuid)
 
     def get_by_instance_uuid(
         self,
@@ -361,10 +428,73 @@ class NodeManager(base.CreateManager[Node]):
         # filtering by instance_uuid returns a collection
         # of one node if successful.
         if len(nodes) == 1:
+            if self.name_cache is not None:
+                self.name_cache.record_nodes(nodes)
             return nodes[0]
         else:
             raise exc.NotFound()
 
+    def get_by_instance_uuids(
+        self,
+        instance_uuids: Iterable[str],
+        fields: list[str] | None = None,
+        scan_threshold: int = utils.DEFAULT_SCAN_THRESHOLD,
+        os_ironic_api_version: str | None = None,
+        global_request_id: str | None = None,
+        detail: bool = False,
+    ) -> tuple[dict[str, Node], list[str]]:
+        """Get nodes associated with the specified instances.
+
+        Fewer than ``scan_threshold`` instances are looked up concurrently,
+        otherwise all associated nodes are listed once and matched locally.
+        Only the UUID, name and instance UUID of the nodes are fetched unless
+        ``fields`` or ``detail`` is passed, which keeps the listing cheap.
+
+        :param instance_uuids: UUIDs of instances.
+        :param fields: Optional, a list with a specified set of fields
+                       of the resource to be returned. Can not be used
+                       when 'detail' is set.
+        :param scan_threshold: Optional, the number of instances starting
+            with which all associated nodes are listed.
+        :param os_ironic_api_version: String version (e.g. "1.35") to use for
+            the request.  If not specified, the client's default is used.
+        :param global_request_id: String containing global request ID header
+            value (in form "req-<UUID>") to use for the request.
+        :param detail: Optional, boolean whether to return detailed
+            information about nodes.
+
+        :returns: a tuple (dictionary mapping instance UUIDs to :class:`Node`
+            objects, list of instance UUIDs without a node).
+        :raises: InvalidAttribute if both ``fields`` and ``detail`` are
+            passed.
+
+        """
+        if detail and fields:
+            raise exc.InvalidAttribute(
+                _("Can't fetch a subset of fields "
+                  "with 'detail' set"))
+
+        list_fields: list[str] | None = None
+        if not detail:
+            list_fields = list(fields or _INSTANCE_FIELDS)
+            if 'instance_uuid' not in list_fields:
+                list_fields.append('instance_uuid')
+
+        def _get(instance_uuid: str) -> Node:
+            return self.get_by_instance_uuid(
+                instance_uuid, fields=list_fields,
+                os_ironic_api_version=os_ironic_api_version,
+                global_request_id=global_request_id)
+
+        def _list() -> list[Node]:
+            return self.list(associated=True, limit=0, detail=detail,
+                             fields=list_fields,
+                             os_ironic_api_version=os_ironic_api_version,
+                             global_request_id=global_request_id)
+
+        return utils.bulk_get(instance_uuids, _get, _list, 'instance_uuid',
+                              scan_threshold=scan_threshold)
+
     def delete(
         self,
         node_id: str,
@@ -375,6 +505,8 @@ class NodeManager(base.CreateManager[Node]):
             resource_id=node_id,
             os_ironic_api_version=os_ironic_api_version,
             global_request_id=global_request_id)
+        if self.name_cache is not None:
+            self.name_cache.invalidate(node_id)
 
     def update(
         self,
@@ -388,7 +520,7 @@ class NodeManager(base.CreateManager[Node]):
         params: dict[str, bool] = {}
         if reset_interfaces is not None:
             params['reset_interfaces'] = reset_interfaces
-        return self._update(
+        node = self._update(
             resource_id=node_id,
             patch=patch,  # type: ignore[arg-type]
             method=http_method,
@@ -396,6 +528,12 @@ class NodeManager(base.CreateManager[Node]):
             global_request_id=global_request_id,
             params=params,
         )
+        if self.name_cache is not None and http_method == 'PATCH':
+            # The node may have been renamed.
+            self.name_cache.invalidate(node_id)
+            if node is not None:
+                self.name_cache.record_nodes([node])
+        return node
 
     def vendor_passthru(
         self,
@@ -1343,24 +1481,26 @@ class NodeManager(base.CreateManager[Node]):
         sort_key: str | None = None,
         sort_dir: str | None = None,
         fields: list[str] | None = None,
-        provision_state: str | None = None,
-        driver: str | None = None,
-        resource_class: str | None = None,
-        chassis: str | None = None,
-        fault: str | None = None,
+        provision_state: str | list[str] | None = None,
+        driver: str | list[str] | None = None,
+        resource_class: str | list[str] | None = None,
+        chassis: str | list[str] | None = None,
+        fault: str | list[str] | None = None,
         os_ironic_api_version: str | None = None,
-        conductor_group: str | None = None,
-        conductor: str | None = None,
-        owner: str | None = None,
+        conductor_group: str | list[str] | None = None,
+        conductor: str | list[str] | None = None,
+        owner: str | list[str] | None = None,
         retired: bool | str | None = None,
-        lessee: str | None = None,
+        lessee: str | list[str] | None = None,
         shards: list[str] | None = None,
         sharded: bool | str | None = None,
-        parent_node: str | None = None,
+        parent_node: str | list[str] | None = None,
         include_children: bool | None = None,
         description_contains: str | None = None,
         global_request_id: str | None = None,
-        instance_name: str | None = None,
+        instance_name: str | list[str] | None = None,
+        where: str | query.Query | None = None,
+        parallel_by: str | None = None,
     ) -> list[Node]:
         """Retrieve a list of nodes.
 
@@ -1444,9 +1584,43 @@ class NodeManager(base.CreateManager[Node]):
                                  with description contains specified value.
         :param instance_name: Optional. String value to get only nodes with
                                the given instance_name set.
+        :param where: Optional. A query expression (see
+                      :mod:`ironicclient.v1.query`) to filter nodes with.
+                      Conditions supported by the API are sent to the server,
+                      the rest is evaluated locally. If the expression is
+                      evaluated locally, ``limit`` applies to the number of
+                      nodes fetched from the server, not to the result.
         :returns: A list of nodes.
 
+        The ``provision_state``, ``driver``, ``resource_class``, ``chassis``,
+        ``fault``, ``conductor_group``, ``conductor``, ``owner``, ``lessee``,
+        ``parent_node`` and ``instance_name`` filters also accept a list of
+        values to get nodes matching any of them. One query is run per
+        value (per combination of values if several filters are lists),
+        and the results are merged, de-duplicated and, if ``sort_key`` is
+        set, kept in the requested order. The first pages of the queries
+        are requested concurrently, further pages only as the merge reaches
+        them. The merged nodes are returned as a list once all of them are
+        fetched, use :func:`~ironicclient.common.utils.iter_list` to iterate
+        over them as they are received.
+
+        :param parallel_by: Optional, only 'shard' is supported. Discovers
+            the shards first and lists nodes of each of them concurrently,
+            which is faster than one long chain of pages for large
+            deployments (especially with ``limit=0``). Nodes without a shard
+            are listed as well. ``limit`` applies to all shards together,
+            if it is None at most
+            :data:`~ironicclient.common.utils.DEFAULT_PAGE_SIZE` nodes are
+            returned. To list several conductor groups concurrently, pass a
+            list of them as ``conductor_group``.
         """
+        # NOTE: must be the first statement to only capture the arguments.
+        arguments = dict(locals())
+        del arguments['self']
+        merged = self._merged(arguments)
+        if merged is not None:
+            return list(merged)
+
         if limit is not None:
             limit = int(limit)
 
@@ -1494,20 +1668,198 @@ class NodeManager(base.CreateManager[Node]):
         if instance_name is not None:
             filters.append('instance_name=%s' % instance_name)
 
+        remainder = None
+        if where is not None:
+            used = [f.split('=', 1)[0] for f in filters]
+            pushed, remainder = query.parse(where).pushdown(
+                query.NODE_FILTERS, exclude=used)
+            filters.extend('%s=%s' % item for item in pushed.items())
+            if remainder is not None and not detail:
+                # Make sure the fields used locally are fetched.
+                requested = fields if fields is not None else _LIST_FIELDS
+                missing = sorted(remainder.fields - set(requested))
+                if missing:
+                    filters = [f for f in filters
+                               if not f.startswith('fields=')]
+                    filters.append('fields=%s' % ','.join(
+                        list(requested) + missing))
+
         path = ''
         if detail:
             path += 'detail'
         if filters:
             path += '?' + '&'.join(filters)
         if limit is None:
-            return self._list(
+            nodes = self._list(
                 self._path(path), "nodes",
                 os_ironic_api_version=os_ironic_api_version,
                 global_request_id=global_request_id,
             )
         else:
-            return self._list_pagination(
+            nodes = self._list_pagination(
                 self._path(path), "nodes", limit=limit,
                 os_ironic_api_version=os_ironic_api_version,
                 global_request_id=global_request_id,
             )
+        if self.name_cache is not None:
+            self.name_cache.record_nodes(nodes)
+        if remainder is not None:
+            nodes = remainder.filter(nodes)
+        return nodes
+
+    def _iter_merged(self, **kwargs: Any) -> Iterator[Node] | None:
+        """Stream the nodes of a listing that merges several queries.
+
+        Used by :func:`~ironicclient.common.utils.iter_list` to return the
+        merged nodes as they are received instead of all at once.
+
+        :param kwargs: arguments to :meth:`list`.
+        :returns: an iterator over the merged nodes or None if the listing
+            is a single query.
+        """
+        bound = inspect.signature(self.list).bind(**kwargs)
+        bound.apply_defaults()
+        return self._merged(dict(bound.arguments))
+
+    def _merged(self, arguments: dict[str, Any]) -> Iterator[Node] | None:
+        multi_valued = {name: arguments[name] for name in _MULTI_VALUE_FILTERS
+                        if isinstance(arguments[name], (list, tuple, set))}
+        if multi_valued or arguments['parallel_by'] is not None:
+            return self._list_multi_valued(arguments, multi_valued)
+        return None
+
+    def _list_multi_valued(
+        self,
+        arguments: dict[str, Any],
+        multi_valued: dict[str, Any],
+    ) -> Iterator[Node]:
+        """Run one list query per combination of filter values and partition.
+
+        The first pages of all queries are requested concurrently, the next
+        pages of a query only once its previous page is merged, so no more
+        pages than needed for ``limit`` are requested. ``limit`` applies to
+        the merged nodes; if it is None, every query returns one page and at
+        most :data:`~ironicclient.common.utils.DEFAULT_PAGE_SIZE` nodes are
+        returned in total.
+
+        :param arguments: all arguments to :meth:`list`.
+        :param multi_valued: filters with a list of values.
+        :returns: an iterator over merged and de-duplicated nodes.
+        """
+        names = list(multi_valued)
+        partitions = self._partitions(arguments)
+        arguments['parallel_by'] = None
+        combinations = [
+            dict(zip(names, values), **partition)
+            for values in itertools.product(
+                *(list(dict.fromkeys(multi_valued[name])) for name in names))
+            for partition in partitions
+        ]
+        sort_key = arguments['sort_key']
+        limit = arguments['limit']
+        if limit is None:
+            # Every query returns one page, return one page in total.
+            limit = utils.DEFAULT_PAGE_SIZE
+        limit = int(limit)
+
+        # The UUID is required for de-duplication, the sorting key for
+        # merging. Avoid lazy loading nodes to get them.
+        if not arguments['detail']:
+            requested = arguments['fields']
+            if requested is None:
+                requested = _LIST_FIELDS
+            missing = [field for field in ('uuid', sort_key)
+                       if field and field not in requested]
+            if missing:
+                arguments['fields'] = list(requested) + missing
+
+        def _query(combination: dict[str, Any]) -> Iterator[Node]:
+            # NOTE: only the first page is requested here, the next ones
+            # when the merge reaches them.
+            return utils.iter_list(self.list, **dict(arguments, **combination))
+
+        LOG.debug('Listing nodes with %d concurrent queries',
+                  len(combinations))
+        results = utils.run_concurrently(_query, combinations)
+        return utils.merge_resources(results, sort_key,
+                                     arguments['sort_dir'], limit)
+
+    def _partitions(
+        self,
+        arguments: dict[str, Any],
+    ) -> builtins.list[dict[str, Any]]:
+        """Split a node listing according to its 'parallel_by' argument.
+
+        :param arguments: all arguments to :meth:`list`.
+        :returns: a list of additional filters, one per query.
+        :raises: InvalidAttribute if 'parallel_by' is not supported.
+        """
+        parallel_by = arguments['parallel_by']
+        if parallel_by is None:
+            return [{}]
+        if parallel_by not in PARALLEL_BY:
+            raise exc.InvalidAttribute(
+                _("Listing nodes in parallel by %(value)s is not supported, "
+                  "supported are: %(valid)s") %
+                {'value': parallel_by, 'valid': ', '.join(PARALLEL_BY)})
+
+        request_args = {
+            'os_ironic_api_version': arguments['os_ironic_api_version'],
+            'global_request_id': arguments['global_request_id'],
+        }
+        if arguments['shards'] is not None:
+            return [{'shards': [name]} for name in arguments['shards']]
+        sharded = arguments['sharded']
+        if sharded is not None and not strutils.bool_from_string(
+                sharded, strict=True):
+            return [{}]
+        partitions: list[dict[str, Any]] = [
+            {'shards': [item.name]}
+            for item in shard.ShardManager(self.api).list(**request_args)
+        ]
+        if sharded is None:
+            partitions.append({'sharded': False})
+        return partitions
+
+    def summary(
+        self,
+        group_by: builtins.list[str],
+        **filters: Any,
+    ) -> collections.Counter[tuple[Any, ...]]:
+        """Count nodes grouped by the values of some of their fields.
+
+        Only the fields used for grouping are fetched, page by page, and the
+        nodes are counted as their page is received without being retained.
+
+        :param group_by: A list of node fields to group nodes by. Nested
+            fields are separated with '/', e.g. ``properties/cpu_arch``,
+            in which case the whole top-level field is fetched.
+        :param filters: Other arguments to :meth:`list` except for
+            ``detail``, ``fields``, ``limit`` and ``marker``. Lists of
+            filter values, ``parallel_by`` and ``where`` expressions that
+            are not fully evaluated by the server require all nodes to be
+            fetched before counting.
+        :returns: A :class:`collections.Counter` mapping tuples of values
+            (in the order of ``group_by``, None for missing values) to the
+            number of nodes. Lists and dictionaries are converted to JSON.
+        :raises: InvalidAttribute if ``group_by`` is empty or ``filters``
+            contains unsupported arguments.
+        """
+        if not group_by:
+            raise exc.InvalidAttribute(
+                _("At least one field to group nodes by is required"))
+        unsupported = sorted(set(filters) & {'detail', 'fields', 'limit',
+                                             'marker'})
+        if unsupported:
+            raise exc.InvalidAttribute(
+                _("Unsupported arguments for a node summary: %s")
+                % ', '.join(unsupported))
+
+        paths = [tuple(field.split('/')) for field in group_by]
+        fields = list(dict.fromkeys(path[0] for path in paths))
+        counts: collections.Counter[tuple[Any, ...]] = collections.Counter()
+        for item in utils.iter_list(self.list, limit=0, fields=fields,
+                                    **filters):
+            counts[tuple(_group_value(item, path) for path in paths)] += 1
+        return counts
+
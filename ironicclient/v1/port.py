@@ -16,12 +16,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+import logging
 from typing import Any
 
 from ironicclient.common import base
 from ironicclient.common.i18n import _
 from ironicclient.common import utils
 from ironicclient import exc
+from ironicclient.v1 import shard
+
+LOG: logging.Logger = logging.getLogger(__name__)
+# Values of 'parallel_by' supported when listing ports.
+PARALLEL_BY: tuple[str, ...] = ('shard',)
 
 
 class Port(base.Resource):
@@ -78,6 +85,38 @@ class PortManager(base.CreateManager[Port]):
         else:
             raise exc.NotFound()
 
+    def get_by_addresses(
+        self,
+        addresses: Iterable[str],
+        fields: list[str] | None = None,
+        scan_threshold: int = utils.DEFAULT_SCAN_THRESHOLD,
+        os_ironic_api_version: str | None = None,
+        global_request_id: str | None = None,
+    ) -> tuple[dict[str, Port], list[str]]:
+        """Get ports with the specified MAC addresses.
+
+        Fewer than ``scan_threshold`` addresses are looked up concurrently,
+        otherwise all ports are listed once and matched locally.
+
+        :param addresses: MAC addresses of ports.
+        :param fields: Optional, a list with a specified set of fields
+                       of the resource to be returned.
+        :param scan_threshold: Optional, the number of addresses starting
+            with which all ports are listed.
+        :param os_ironic_api_version: String version (e.g. "1.35") to use for
+            the request.  If not specified, the client's default is used.
+        :param global_request_id: String containing global request ID header
+            value (in form "req-<UUID>") to use for the request.
+
+        :returns: a tuple (dictionary mapping addresses to :class:`Port`
+            objects, list of addresses that were not found).
+
+        """
+        return utils.get_by_addresses(
+            self, addresses, fields=fields, scan_threshold=scan_threshold,
+            os_ironic_api_version=os_ironic_api_version,
+            global_request_id=global_request_id)
+
     def delete(
         self,
         port_id: str,
@@ -117,6 +156,8 @@ class PortManager(base.CreateManager[Port]):
         portgroup: str | None = None,
         os_ironic_api_version: str | None = None,
         global_request_id: str | None = None,
+        shards: list[str] | None = None,
+        parallel_by: str | None = None,
     ) -> list[Port]:
         """Retrieve a list of ports.
 
@@ -158,9 +199,27 @@ class PortManager(base.CreateManager[Port]):
         :param global_request_id: String containing global request ID header
             value (in form "req-<UUID>") to use for the request.
 
+        :param shards: Optional, a list of shards. Used to get ports of
+                       nodes in these shards.
+
+        :param parallel_by: Optional, only 'shard' is supported. Discovers
+            the shards first and lists ports of each of them concurrently,
+            which is faster than one long chain of pages for large
+            deployments (especially with ``limit=0``). Ports are listed in
+            one query if some nodes are not in a shard. ``limit`` applies
+            to all shards together, if it is None at most
+            :data:`~ironicclient.common.utils.DEFAULT_PAGE_SIZE` ports are
+            returned.
+
         :returns: A list of ports.
 
         """
+        if parallel_by is not None:
+            # NOTE: only the arguments are defined at this point.
+            arguments = dict(locals())
+            del arguments['self']
+            return list(self._list_parallel(arguments))
+
         if limit is not None:
             limit = int(limit)
 
@@ -177,6 +236,8 @@ class PortManager(base.CreateManager[Port]):
             filters.append('node=%s' % node)
         if portgroup is not None:
             filters.append('portgroup=%s' % portgroup)
+        if shards is not None:
+            filters.append('shard=%s' % ','.join(shards))
 
         path = ''
         if detail:
@@ -198,3 +259,65 @@ class PortManager(base.CreateManager[Port]):
                 os_ironic_api_version=os_ironic_api_version,
                 global_request_id=global_request_id,
             )
+
+    def _list_parallel(self, arguments: dict[str, Any]) -> Iterator[Port]:
+        """List ports of each shard concurrently.
+
+        :param arguments: all arguments to :meth:`list`.
+        :returns: an iterator over merged and de-duplicated ports.
+        :raises: InvalidAttribute if 'parallel_by' is not supported.
+        """
+        # NOTE: imported here since the node module imports this one.
+        from ironicclient.v1 import node as v1_node
+
+        if arguments['parallel_by'] not in PARALLEL_BY:
+            raise exc.InvalidAttribute(
+                _("Listing ports in parallel by %(value)s is not supported, "
+                  "supported are: %(valid)s") %
+                {'value': arguments['parallel_by'],
+                 'valid': ', '.join(PARALLEL_BY)})
+        arguments['parallel_by'] = None
+
+        request_args = {
+            'os_ironic_api_version': arguments['os_ironic_api_version'],
+            'global_request_id': arguments['global_request_id'],
+        }
+        partitions: list[dict[str, Any]]
+        if arguments['shards'] is not None:
+            partitions = [{'shards': [name]} for name in arguments['shards']]
+        elif arguments['node'] is not None or arguments['address'] is not None:
+            partitions = [{}]
+        else:
+            partitions = [
+                {'shards': [item.name]}
+                for item in shard.ShardManager(self.api).list(**request_args)
+            ]
+            # Ports cannot be filtered by the absence of a shard, list all
+            # ports in one query if any node is not in a shard.
+            if partitions and v1_node.NodeManager(self.api).list(
+                    sharded=False, fields=['uuid'], limit=1, **request_args):
+                LOG.debug('Some nodes are not in a shard, listing ports '
+                          'in one query')
+                partitions = [{}]
+
+        sort_key = arguments['sort_key']
+        limit = arguments['limit']
+        if limit is None:
+            # Every query returns one page, return one page in total.
+            limit = utils.DEFAULT_PAGE_SIZE
+        limit = int(limit)
+        if not arguments['detail']:
+            requested = arguments['fields'] or ['uuid', 'address']
+            missing = [field for field in ('uuid', sort_key)
+                       if field and field not in requested]
+            if missing:
+                arguments['fields'] = list(requested) + missing
+
+        def _query(partition: dict[str, Any]) -> list[Port]:
+            return self.list(**dict(arguments, **partition))
+
+        LOG.debug('Listing ports with %d concurrent queries',
+                  len(partitions))
+        results = utils.run_concurrently(_query, partitions)
+        return utils.merge_resources(results, sort_key,
+                                     arguments['sort_dir'], limit)
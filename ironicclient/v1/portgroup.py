@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from ironicclient.common import base
@@ -104,6 +105,38 @@ class PortgroupManager(base.CreateManager[Portgroup]):
         else:
             raise exc.NotFound()
 
+    def get_by_addresses(
+        self,
+        addresses: Iterable[str],
+        fields: list[str] | None = None,
+        scan_threshold: int = utils.DEFAULT_SCAN_THRESHOLD,
+        os_ironic_api_version: str | None = None,
+        global_request_id: str | None = None,
+    ) -> tuple[dict[str, Portgroup], list[str]]:
+        """Get port groups with the specified MAC addresses.
+
+        Fewer than ``scan_threshold`` addresses are looked up concurrently,
+        otherwise all port groups are listed once and matched locally.
+
+        :param addresses: MAC addresses of port groups.
+        :param fields: Optional, a list with a specified set of fields
+                       of the resource to be returned.
+        :param scan_threshold: Optional, the number of addresses starting
+            with which all port groups are listed.
+        :param os_ironic_api_version: String version (e.g. "1.35") to use for
+            the request.  If not specified, the client's default is used.
+        :param global_request_id: String containing global request ID header
+            value (in form "req-<UUID>") to use for the request.
+
+        :returns: a tuple (dictionary mapping addresses to :class:`Portgroup`
+            objects, list of addresses that were not found).
+
+        """
+        return utils.get_by_addresses(
+            self, addresses, fields=fields, scan_threshold=scan_threshold,
+            os_ironic_api_version=os_ironic_api_version,
+            global_request_id=global_request_id)
+
     def delete(
         self,
         portgroup_id: str,
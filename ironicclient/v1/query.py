@@ -0,0 +1,481 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Client-side query expressions for listed resources.
+
+An expression consists of comparisons joined with ``and``, ``or`` and
+``not`` (in the order of increasing precedence) and grouped with
+parentheses. A comparison has the form ``<field> <operator> <value>``:
+
+* ``<field>`` is a field name, nested fields are separated with ``/`` or
+  ``.``, e.g. ``properties/memory_mb`` or ``extra.rack``.
+* ``<operator>`` is one of ``==`` (or ``=``), ``!=``, ``<``, ``<=``, ``>``,
+  ``>=``, ``=~`` (regular expression search), ``in`` and ``not in`` (the
+  value is a list, e.g. ``[active, available]``) or ``contains`` (the field
+  is a list or a string containing the value).
+* ``<value>`` is a number, ``true``, ``false``, ``null``, a quoted string or
+  any other word, which is treated as a string.
+
+For example::
+
+    properties/memory_mb > 65536 and traits contains CUSTOM_GPU
+        and extra/rack == "A"
+
+A missing field is treated as ``null``, ordering comparisons with ``null``
+are false. When comparing a string field with a number, the field is
+converted to a number.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import operator
+import re
+from typing import Any
+
+from ironicclient.common.i18n import _
+from ironicclient import exc
+
+Predicate = Callable[[Any], bool]
+
+# Node fields that can be filtered on the server side, mapped to the API
+# query parameter and the expected value type.
+NODE_FILTERS: dict[str, tuple[str, type]] = {
+    'chassis_uuid': ('chassis_uuid', str),
+    'conductor': ('conductor', str),
+    'conductor_group': ('conductor_group', str),
+    'driver': ('driver', str),
+    'fault': ('fault', str),
+    'instance_name': ('instance_name', str),
+    'lessee': ('lessee', str),
+    'maintenance': ('maintenance', bool),
+    'owner': ('owner', str),
+    'parent_node': ('parent_node', str),
+    'provision_state': ('provision_state', str),
+    'resource_class': ('resource_class', str),
+    'retired': ('retired', bool),
+    'shard': ('shard', str),
+}
+
+_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        | (?P<op>==|!=|<=|>=|=~|<|>|=)
+        | (?P<punct>[()\[\],])
+        | (?P<word>[^\s()\[\],=!<>"']+)
+    )''', re.VERBOSE)
+
+_NUMBER_RE = re.compile(r'^-?\d+(\.\d+)?([eE][-+]?\d+)?$')
+
+_KEYWORDS = {'and', 'or', 'not', 'in', 'contains'}
+_CONSTANTS: dict[str, Any] = {'true': True, 'false': False, 'null': None}
+
+_ORDERING: dict[str, Callable[[Any, Any], bool]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+_MISSING = object()
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if match is None or match.end() == position:
+            raise exc.InvalidAttribute(
+                _('Invalid query expression %(expr)r at position %(pos)d') %
+                {'expr': expression, 'pos': position})
+        kind = match.lastgroup
+        assert kind is not None
+        value = match.group(kind)
+        if kind == 'op' and value == '=':
+            value = '=='
+        elif kind == 'word' and value.lower() in _KEYWORDS:
+            kind = 'keyword'
+            value = value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def _literal(kind: str, value: str) -> Any:
+    if kind == 'string':
+        return re.sub(r'\\(["\'\\])', r'\1', value[1:-1])
+    if value.lower() in _CONSTANTS:
+        return _CONSTANTS[value.lower()]
+    if _NUMBER_RE.match(value):
+        if '.' in value or 'e' in value.lower():
+            return float(value)
+        return int(value)
+    return value
+
+
+def _extract(item: Any, path: tuple[str, ...]) -> Any:
+    value = item if isinstance(item, dict) else getattr(item, '_info', {})
+    for key in path:
+        if not isinstance(value, dict):
+            return _MISSING
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _coerce(value: Any, expected: Any) -> Any:
+    """Convert a string field to a number when comparing with a number."""
+    if (isinstance(expected, (int, float))
+            and not isinstance(expected, bool)
+            and isinstance(value, str)):
+        try:
+            return float(value)
+        except ValueError:
+            return _MISSING
+    return value
+
+
+class _Comparison(object):
+
+    def __init__(self, path: tuple[str, ...], op: str, value: Any) -> None:
+        self.path = path
+        self.op = op
+        self.value = value
+
+    def fields(self) -> set[str]:
+        return {self.path[0]}
+
+    def compile(self) -> Predicate:
+        path, op, expected = self.path, self.op, self.value
+
+        if op in ('==', '!='):
+            negate = op == '!='
+
+            def _equal(item: Any) -> bool:
+                value = _extract(item, path)
+                if value is _MISSING:
+                    value = None
+                return bool(_coerce(value, expected) == expected) != negate
+            return _equal
+
+        if op in _ORDERING:
+            compare = _ORDERING[op]
+
+            def _order(item: Any) -> bool:
+                value = _coerce(_extract(item, path), expected)
+                if value is _MISSING or value is None:
+                    return False
+                try:
+                    return compare(value, expected)
+                except TypeError:
+                    return False
+            return _order
+
+        if op == '=~':
+            regex = re.compile(str(expected))
+
+            def _search(item: Any) -> bool:
+                value = _extract(item, path)
+                return (isinstance(value, str)
+                        and regex.search(value) is not None)
+            return _search
+
+        if op == 'in':
+            choices = list(expected)
+
+            def _in(item: Any) -> bool:
+                value = _extract(item, path)
+                if value is _MISSING:
+                    value = None
+                return any(_coerce(value, c) == c for c in choices)
+            return _in
+
+        if op == 'contains':
+            def _contains(item: Any) -> bool:
+                value = _extract(item, path)
+                if isinstance(value, str):
+                    return str(expected) in value
+                if isinstance(value, (list, dict)):
+                    return expected in value
+                return False
+            return _contains
+
+        raise AssertionError('unknown operator %s' % op)
+
+
+class _Not(object):
+
+    def __init__(self, operand: _Node) -> None:
+        self.operand = operand
+
+    def fields(self) -> set[str]:
+        return self.operand.fields()
+
+    def compile(self) -> Predicate:
+        inner = self.operand.compile()
+        return lambda item: not inner(item)
+
+
+class _And(object):
+
+    def __init__(self, operands: list[_Node]) -> None:
+        self.operands = operands
+
+    def fields(self) -> set[str]:
+        return set().union(*(o.fields() for o in self.operands))
+
+    def compile(self) -> Predicate:
+        compiled = [o.compile() for o in self.operands]
+        return lambda item: all(p(item) for p in compiled)
+
+
+class _Or(_And):
+
+    def compile(self) -> Predicate:
+        compiled = [o.compile() for o in self.operands]
+        return lambda item: any(p(item) for p in compiled)
+
+
+_Node = _Comparison | _Not | _And | _Or
+
+
+class _Parser(object):
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _error(self, message: str) -> exc.InvalidAttribute:
+        return exc.InvalidAttribute(
+            _('Invalid query expression %(expr)r: %(msg)s') %
+            {'expr': self.expression, 'msg': message})
+
+    def _peek(self) -> tuple[str, str] | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self) -> tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise self._error(_('unexpected end of expression'))
+        self.position += 1
+        return token
+
+    def _accept(self, kind: str, value: str | None = None) -> bool:
+        token = self._peek()
+        if token and token[0] == kind and value in (None, token[1]):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: str) -> None:
+        if not self._accept(kind, value):
+            token = self._peek()
+            raise self._error(_('expected %(exp)r, got %(got)r') %
+                              {'exp': value,
+                               'got': token[1] if token else _('the end')})
+
+    def parse(self) -> _Node:
+        result = self._parse_or()
+        token = self._peek()
+        if token is not None:
+            raise self._error(_('unexpected %r') % token[1])
+        return result
+
+    def _parse_or(self) -> _Node:
+        operands = [self._parse_and()]
+        while self._accept('keyword', 'or'):
+            operands.append(self._parse_and())
+        return operands[0] if len(operands) == 1 else _Or(operands)
+
+    def _parse_and(self) -> _Node:
+        operands = [self._parse_not()]
+        while self._accept('keyword', 'and'):
+            operands.append(self._parse_not())
+        return operands[0] if len(operands) == 1 else _And(operands)
+
+    def _parse_not(self) -> _Node:
+        if self._accept('keyword', 'not'):
+            return _Not(self._parse_not())
+        if self._accept('punct', '('):
+            result = self._parse_or()
+            self._expect('punct', ')')
+            return result
+        return self._parse_comparison()
+
+    def _parse_comparison(self) -> _Node:
+        kind, field = self._next()
+        if kind != 'word':
+            raise self._error(_('expected a field name, got %r') % field)
+        path = tuple(p for p in re.split(r'[/.]', field) if p)
+        if not path:
+            raise self._error(_('invalid field name %r') % field)
+
+        kind, op = self._next()
+        negate = False
+        if kind == 'keyword' and op == 'not':
+            negate = True
+            kind, op = self._next()
+            if (kind, op) != ('keyword', 'in'):
+                raise self._error(_("expected 'in' after 'not'"))
+        if kind == 'keyword' and op == 'in':
+            node: _Node = _Comparison(path, op, self._parse_list())
+            return _Not(node) if negate else node
+        if kind not in ('op', 'keyword') or op in ('and', 'or', 'not'):
+            raise self._error(_('expected an operator after %r') % field)
+
+        kind, value = self._next()
+        if kind not in ('word', 'string'):
+            raise self._error(_('expected a value, got %r') % value)
+        literal = _literal(kind, value)
+        if op in _ORDERING and literal is None:
+            raise self._error(_('cannot compare with null using %s') % op)
+        if op == '=~':
+            try:
+                re.compile(str(literal))
+            except re.error as e:
+                raise self._error(_('invalid regular expression: %s') % e)
+        return _Comparison(path, op, literal)
+
+    def _parse_list(self) -> list[Any]:
+        closing = ']' if self._accept('punct', '[') else None
+        if closing is None:
+            self._expect('punct', '(')
+            closing = ')'
+        values = []
+        while True:
+            kind, value = self._next()
+            if kind not in ('word', 'string'):
+                raise self._error(_('expected a value, got %r') % value)
+            values.append(_literal(kind, value))
+            if self._accept('punct', closing):
+                return values
+            self._expect('punct', ',')
+
+
+class Query(object):
+    """A compiled query expression.
+
+    The expression is parsed and compiled once, the resulting object can be
+    called with resources (or dictionaries) to evaluate it.
+
+    :param expression: the query expression, see the module documentation.
+    :raises: InvalidAttribute if the expression is invalid.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self._root = _Parser(expression).parse()
+        self._predicate = self._root.compile()
+
+    @classmethod
+    def _from_nodes(cls, expression: str, nodes: list[_Node]) -> Query:
+        result = cls.__new__(cls)
+        result.expression = expression
+        result._root = nodes[0] if len(nodes) == 1 else _And(nodes)
+        result._predicate = result._root.compile()
+        return result
+
+    def __call__(self, item: Any) -> bool:
+        return self._predicate(item)
+
+    def __repr__(self) -> str:
+        return '<Query %r>' % self.expression
+
+    @property
+    def fields(self) -> set[str]:
+        """Top-level fields required to evaluate the expression."""
+        return self._root.fields()
+
+    def filter(self, items: Iterable[Any]) -> list[Any]:
+        """Return the items matching the expression."""
+        return [item for item in items if self._predicate(item)]
+
+    def pushdown(
+        self,
+        filters: dict[str, tuple[str, type]],
+        exclude: Iterable[str] = (),
+    ) -> tuple[dict[str, str], Query | None]:
+        """Split the expression into server-side filters and a remainder.
+
+        Only top-level ``and`` conditions of the form ``<field> == <value>``
+        (and ``<field> in [...]`` for shards) can be evaluated by the server.
+
+        :param filters: a mapping of supported fields to the API query
+            parameters and value types, e.g. :data:`NODE_FILTERS`.
+        :returns: a tuple (parameters, remainder) where parameters is a
+            dictionary of API query parameters and remainder is the query
+            to evaluate locally or None if nothing remains.
+        """
+        conjuncts = (self._root.operands if isinstance(self._root, _And)
+                     and not isinstance(self._root, _Or) else [self._root])
+        params: dict[str, str] = {}
+        exclude = set(exclude)
+        remainder: list[_Node] = []
+        for node in conjuncts:
+            pushed = self._push_one(node, filters)
+            if (pushed is None or pushed[0] in params
+                    or pushed[0] in exclude):
+                remainder.append(node)
+            else:
+                params[pushed[0]] = pushed[1]
+        if not remainder:
+            return params, None
+        if not params:
+            return params, self
+        return params, self._from_nodes(self.expression, remainder)
+
+    @staticmethod
+    def _push_one(
+        node: _Node,
+        filters: dict[str, tuple[str, type]],
+    ) -> tuple[str, str] | None:
+        if not isinstance(node, _Comparison) or len(node.path) != 1:
+            return None
+        field = node.path[0]
+        if field == 'instance_uuid' and node.value is None:
+            if node.op == '==':
+                return 'associated', 'False'
+            if node.op == '!=':
+                return 'associated', 'True'
+        if field not in filters:
+            return None
+        param, kind = filters[field]
+        if node.op == '==':
+            values = [node.value]
+        elif node.op == 'in' and field == 'shard':
+            # NOTE: the API accepts several comma-separated shards.
+            values = node.value
+        else:
+            return None
+        if not values or not all(type(v) is kind for v in values):
+            return None
+        if kind is str and any(',' in v or not v for v in values):
+            return None
+        return param, ','.join(str(v) for v in values)
+
+
+def parse(expression: str | Query) -> Query:
+    """Parse and compile a query expression.
+
+    :param expression: the query expression or an already compiled query.
+    :returns: a :class:`Query` object.
+    :raises: InvalidAttribute if the expression is invalid.
+    """
+    if isinstance(expression, Query):
+        return expression
+    return Query(expression)
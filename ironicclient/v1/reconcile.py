@@ -0,0 +1,449 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Reconciliation of bare metal resources with their descriptions.
+
+Uses the same JSON or YAML descriptions as :mod:`create_resources`, but
+instead of creating everything, compares them with the current state of the
+resources (fetched with a few bulk listings) and computes a plan: resources
+to create, JSON patches for resources that differ and, optionally,
+resources to delete. The plan is then applied with bounded concurrency.
+
+Resources are matched by UUID if it is specified, otherwise chassis by
+description, nodes by name, port groups by name or address and ports by
+address (the latter two only among the resources of the same node).
+
+Keys of dictionary fields (e.g. ``driver_info`` or ``extra``) that are not
+in the descriptions are left intact. Values masked by the API (such as
+passwords in ``driver_info``) are never considered different.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+from typing import Any, cast
+
+from ironicclient.common import utils
+from ironicclient import exc
+from ironicclient.v1 import client as v1_client
+from ironicclient.v1 import create_resources
+from ironicclient.v1 import join
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+# Resource types in the order of creation.
+RESOURCE_TYPES: tuple[str, ...] = ('chassis', 'node', 'portgroup', 'port')
+
+_MANAGERS: dict[str, str] = {'chassis': 'chassis', 'node': 'node',
+                             'portgroup': 'portgroup', 'port': 'port'}
+
+_CREATE_METHODS: dict[
+    str, Callable[..., tuple[str | None, Exception | None]]
+] = {
+    'chassis': create_resources.create_single_chassis,
+    'node': create_resources.create_single_node,
+    'portgroup': create_resources.create_single_portgroup,
+    'port': create_resources.create_single_port,
+}
+
+# Nested resources, not fields.
+_NESTED: frozenset[str] = frozenset(['nodes', 'portgroups', 'ports'])
+
+_MASKED_VALUE: str = '******'
+
+
+def _escape(key: str) -> str:
+    """Escape a key for using in a JSON pointer."""
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def make_patch(
+    current: dict[str, Any],
+    desired: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Compute a JSON patch that makes a resource match its description.
+
+    :param current: the current resource as a dictionary.
+    :param desired: the description of the resource.
+    :returns: a list of JSON patch operations, empty if nothing differs.
+    """
+    patch = []
+    for field, value in desired.items():
+        if field == 'uuid':
+            continue
+        current_value = current.get(field)
+        if isinstance(value, dict) and isinstance(current_value, dict):
+            for key, sub_value in value.items():
+                current_sub_value = current_value.get(key)
+                if (current_sub_value != sub_value
+                        and current_sub_value != _MASKED_VALUE):
+                    patch.append({'op': 'add',
+                                  'path': '/%s/%s' % (field, _escape(key)),
+                                  'value': sub_value})
+        elif (field == 'address' and isinstance(value, str)
+              and isinstance(current_value, str)):
+            # MAC addresses are case-insensitive.
+            if current_value.lower() != value.lower():
+                patch.append({'op': 'replace', 'path': '/address',
+                              'value': value})
+        elif current_value != value:
+            patch.append({'op': 'add' if field not in current else 'replace',
+                          'path': '/%s' % field,
+                          'value': value})
+    return patch
+
+
+class Action(object):
+    """A single change in a reconciliation plan.
+
+    :param op: the operation: 'create', 'update' or 'delete'.
+    :param resource_type: one of :data:`RESOURCE_TYPES`.
+    :param ident: a human-readable identifier of the resource.
+    :param uuid: the UUID of an existing resource, set on successful
+        creation for new resources.
+    :param params: the attributes of a resource to create.
+    :param patch: the JSON patch of a resource to update.
+    :param traits: the traits to set on a node, if they differ.
+    :param parents: maps fields of a resource to create or update to the
+        actions creating the resources they refer to. The fields of a
+        resource to update are replaced once these resources exist.
+    """
+
+    def __init__(
+        self,
+        op: str,
+        resource_type: str,
+        ident: str,
+        uuid: str | None = None,
+        params: dict[str, Any] | None = None,
+        patch: list[dict[str, Any]] | None = None,
+        traits: list[str] | None = None,
+        parents: dict[str, Action] | None = None,
+    ) -> None:
+        self.op = op
+        self.resource_type = resource_type
+        self.ident = ident
+        self.uuid = uuid
+        self.params = params or {}
+        self.patch = patch or []
+        self.traits = traits
+        self.parents = parents or {}
+
+    def __str__(self) -> str:
+        result = '%s %s %s' % (self.op, self.resource_type, self.ident)
+        changes = ['%(op)s %(path)s' % item for item in self.patch]
+        if self.op == 'update':
+            changes.extend('replace /%s' % field for field in self.parents)
+        if self.traits is not None:
+            changes.append('set traits')
+        if changes:
+            result += ': ' + ', '.join(changes)
+        return result
+
+    def __repr__(self) -> str:
+        return '<Action %s>' % self
+
+
+class _Planner(object):
+
+    def __init__(
+        self,
+        chassis: list[dict[str, Any]],
+        nodes: list[dict[str, Any]],
+    ) -> None:
+        self.chassis = chassis
+        self.nodes = nodes
+        self.chassis_index = self._index(chassis, 'description')
+        self.node_index = self._index(nodes, 'name')
+        self.actions: list[Action] = []
+        self.seen: set[str] = set()
+
+    @staticmethod
+    def _index(
+        items: list[dict[str, Any]],
+        *keys: str,
+    ) -> dict[tuple[str, Any], dict[str, Any]]:
+        index = {}
+        for item in items:
+            for key in ('uuid',) + keys:
+                value = item.get(key)
+                if value:
+                    if key == 'address':
+                        value = value.lower()
+                    index[(key, value)] = item
+        return index
+
+    @staticmethod
+    def _match(
+        index: dict[tuple[str, Any], dict[str, Any]],
+        desired: dict[str, Any],
+        *keys: str,
+    ) -> dict[str, Any] | None:
+        for key in ('uuid',) + keys:
+            value = desired.get(key)
+            if value:
+                if key == 'address':
+                    value = value.lower()
+                match = index.get((key, value))
+                # NOTE: a UUID, if specified, is authoritative.
+                if match is not None or key == 'uuid':
+                    return match
+        return None
+
+    def _plan(
+        self,
+        resource_type: str,
+        desired: dict[str, Any],
+        current: dict[str, Any] | None,
+        ident: str,
+        parents: dict[str, Action | str | None],
+    ) -> Action | str:
+        """Plan creation or update of one resource.
+
+        :returns: the creating action or the UUID of the existing resource.
+        """
+        params = {key: value for key, value in desired.items()
+                  if key not in _NESTED}
+        parent_actions = {}
+        for field, parent in parents.items():
+            if isinstance(parent, Action):
+                parent_actions[field] = parent
+            elif parent is not None:
+                params[field] = parent
+
+        if current is None:
+            action = Action('create', resource_type, ident, params=params,
+                            parents=parent_actions)
+            self.actions.append(action)
+            return action
+
+        uuid = cast(str, current['uuid'])
+        self.seen.add(uuid)
+        traits = params.pop('traits', None)
+        patch = make_patch(current, params)
+        if traits is not None and sorted(traits) == sorted(
+                current.get('traits') or []):
+            traits = None
+        if patch or traits is not None or parent_actions:
+            self.actions.append(Action('update', resource_type, ident,
+                                       uuid=uuid, patch=patch, traits=traits,
+                                       parents=parent_actions))
+        return uuid
+
+    def plan_chassis(self, desired: dict[str, Any]) -> None:
+        current = self._match(self.chassis_index, desired, 'description')
+        ident = (desired.get('uuid') or desired.get('description')
+                 or '<new>')
+        chassis = self._plan('chassis', desired, current, ident, {})
+        for node in desired.get('nodes') or []:
+            self.plan_node(node, chassis)
+
+    def plan_node(
+        self,
+        desired: dict[str, Any],
+        chassis: Action | str | None = None,
+    ) -> None:
+        current = self._match(self.node_index, desired, 'name')
+        ident = desired.get('name') or desired.get('uuid') or '<new>'
+        parents: dict[str, Action | str | None] = {}
+        if chassis is not None:
+            parents['chassis_uuid'] = chassis
+        node = self._plan('node', desired, current, ident, parents)
+
+        current_portgroups = current['portgroups'] if current else []
+        current_ports = current['ports'] if current else []
+        portgroup_index = self._index(current_portgroups, 'name', 'address')
+        port_index = self._index(current_ports, 'address')
+        for portgroup in desired.get('portgroups') or []:
+            pg_current = self._match(portgroup_index, portgroup,
+                                     'name', 'address')
+            pg_ident = '%s on node %s' % (
+                portgroup.get('name') or portgroup.get('address')
+                or portgroup.get('uuid') or '<new>', ident)
+            pg = self._plan('portgroup', portgroup, pg_current, pg_ident,
+                            {'node_uuid': node})
+            for port in portgroup.get('ports') or []:
+                self._plan_port(port, port_index, ident, node, pg)
+        for port in desired.get('ports') or []:
+            self._plan_port(port, port_index, ident, node, None)
+
+    def _plan_port(
+        self,
+        desired: dict[str, Any],
+        index: dict[tuple[str, Any], dict[str, Any]],
+        node_ident: str,
+        node: Action | str,
+        portgroup: Action | str | None,
+    ) -> None:
+        current = self._match(index, desired, 'address')
+        ident = '%s on node %s' % (
+            desired.get('address') or desired.get('uuid'), node_ident)
+        parents: dict[str, Action | str | None] = {'node_uuid': node}
+        if portgroup is not None:
+            parents['portgroup_uuid'] = portgroup
+        self._plan('port', desired, current, ident, parents)
+
+    def plan_deletions(self) -> None:
+        deletions: list[Action] = []
+        for node in self.nodes:
+            for port in node['ports']:
+                if port['uuid'] not in self.seen:
+                    deletions.append(Action(
+                        'delete', 'port', port.get('address') or port['uuid'],
+                        uuid=port['uuid']))
+            for portgroup in node['portgroups']:
+                if portgroup['uuid'] not in self.seen:
+                    deletions.append(Action(
+                        'delete', 'portgroup',
+                        portgroup.get('name') or portgroup['uuid'],
+                        uuid=portgroup['uuid']))
+            if node['uuid'] not in self.seen:
+                deletions.append(Action(
+                    'delete', 'node', node.get('name') or node['uuid'],
+                    uuid=node['uuid']))
+        for chassis in self.chassis:
+            if chassis['uuid'] not in self.seen:
+                deletions.append(Action('delete', 'chassis', chassis['uuid'],
+                                        uuid=chassis['uuid']))
+        self.actions.extend(deletions)
+
+
+def plan(
+    client: v1_client.Client,
+    resources: Iterable[dict[str, Any]],
+    delete: bool = False,
+) -> list[Action]:
+    """Compute the changes required to match the descriptions.
+
+    :param client: an instance of ironic client.
+    :param resources: resources descriptions as loaded by
+        :func:`create_resources.load_resources`.
+    :param delete: also delete resources that are not described. Only use
+        it when the descriptions cover the whole deployment.
+    :returns: a list of :class:`Action` objects.
+    """
+    chassis = [item.to_dict()
+               for item in client.chassis.list(limit=0, detail=True)]
+    nodes = join.list_nodes_with_ports(client, detail=True)
+    planner = _Planner(chassis, nodes)
+    for resource in resources:
+        for item in resource.get('chassis') or []:
+            planner.plan_chassis(item)
+        for item in resource.get('nodes') or []:
+            planner.plan_node(item)
+    if delete:
+        planner.plan_deletions()
+    return planner.actions
+
+
+def _execute(client: v1_client.Client, action: Action) -> Exception | None:
+    parent_uuids = {}
+    for field, parent in action.parents.items():
+        if parent.uuid is None:
+            return exc.ClientException(
+                'Cannot %(action)s because %(parent)s failed' %
+                {'action': action, 'parent': parent})
+        parent_uuids[field] = parent.uuid
+
+    if action.op == 'create':
+        action.uuid, error = _CREATE_METHODS[action.resource_type](
+            client, **dict(action.params, **parent_uuids))
+        return error
+
+    manager = getattr(client, _MANAGERS[action.resource_type])
+    try:
+        if action.op == 'delete':
+            manager.delete(action.uuid)
+        else:
+            patch = action.patch + [
+                {'op': 'replace', 'path': '/%s' % field, 'value': uuid}
+                for field, uuid in parent_uuids.items()]
+            if patch:
+                manager.update(action.uuid, patch)
+            if action.traits is not None:
+                client.node.set_traits(cast(str, action.uuid), action.traits)
+    except Exception as e:
+        return exc.ClientException(
+            'Unable to %(action)s. The error is: %(error)s' %
+            {'action': action, 'error': e})
+    return None
+
+
+def apply(
+    client: v1_client.Client,
+    actions: list[Action],
+    max_workers: int = utils.DEFAULT_MAX_WORKERS,
+) -> list[Exception]:
+    """Apply a reconciliation plan.
+
+    Creations and updates are applied for chassis, nodes, port groups and
+    ports in this order, deletions in the reverse order. Changes of the
+    same resource type are applied concurrently.
+
+    :param client: an instance of ironic client.
+    :param actions: the plan as returned by :func:`plan`.
+    :param max_workers: the maximum number of concurrent requests.
+    :returns: a list of errors encountered.
+    """
+    phases = [[a for a in actions
+               if a.resource_type == resource_type and a.op != 'delete']
+              for resource_type in RESOURCE_TYPES]
+    phases.extend([a for a in actions
+                   if a.resource_type == resource_type and a.op == 'delete']
+                  for resource_type in reversed(RESOURCE_TYPES))
+
+    errors: list[Exception] = []
+    for phase in phases:
+        results = utils.run_concurrently(
+            lambda action: _execute(client, action), phase,
+            max_workers=max_workers)
+        errors.extend(error for error in results if error is not None)
+    return errors
+
+
+def reconcile_resources(
+    client: v1_client.Client,
+    filenames: list[str],
+    delete: bool = False,
+    dry_run: bool = False,
+    max_workers: int = utils.DEFAULT_MAX_WORKERS,
+    output: Callable[[str], Any] | None = None,
+) -> list[Action]:
+    """Make resources match their JSON, NDJSON or YAML descriptions.
+
+    :param client: an instance of ironic client.
+    :param filenames: a list of filenames containing JSON, NDJSON or YAML
+        resources definitions, see :func:`create_resources.load_resources`.
+    :param delete: also delete resources that are not described.
+    :param dry_run: only compute the plan, do not apply it.
+    :param max_workers: the maximum number of concurrent requests.
+    :param output: optional function to call with each line of the plan.
+    :returns: the plan as a list of :class:`Action` objects.
+    :raises: ClientException if any operation during files processing or
+        applying the plan fails.
+    """
+    resources = create_resources.load_resources(filenames)
+    actions = plan(client, resources, delete=delete)
+    LOG.debug('Reconciliation plan has %d action(s)', len(actions))
+    if output is not None:
+        for action in actions:
+            output(str(action))
+    if dry_run:
+        return actions
+
+    errors = apply(client, actions, max_workers=max_workers)
+    if errors:
+        raise exc.ClientException('During resources reconciliation, the '
+                                  'following error(s) were encountered:\n%s' %
+                                  '\n'.join(str(e) for e in errors))
+    return actions
@@ -0,0 +1,190 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of node names to UUIDs.
+
+The cache is opt-in: assign an instance of :class:`NameCache` to the
+``name_cache`` attribute of a ``NodeManager``. It is then populated from
+every node returned by list and get calls, updated on renames and used by
+``NodeManager.resolve`` to translate names without extra requests.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+from oslo_utils import uuidutils
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION: int = 1
+
+
+class NameCache(object):
+    """A cache of node names to UUIDs.
+
+    :param path: optional path to a JSON file to load the cache from and to
+        save it to with :meth:`save`. Use one file per deployment.
+    :param max_age: optional age in seconds after which entries are ignored.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        self.path = path
+        self.max_age = max_age
+        # name -> (uuid, time of recording)
+        self._entries: dict[str, tuple[str, float]] = {}
+        # uuid -> name, to drop the old name on renames
+        self._names: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path is not None:
+            self._load(path)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            LOG.warning('Ignoring unreadable name cache %(path)s: %(err)s',
+                        {'path': path, 'err': e})
+            return
+        if not isinstance(data, dict) or data.get('version') != \
+                _FORMAT_VERSION:
+            LOG.debug('Ignoring name cache %s in an unknown format', path)
+            return
+        entries = data.get('entries')
+        if not isinstance(entries, dict):
+            LOG.debug('Ignoring name cache %s without entries', path)
+            return
+        for name, entry in entries.items():
+            # Malformed entries (e.g. edited by hand) are treated as misses.
+            try:
+                uuid, recorded = entry
+                recorded = float(recorded)
+            except (TypeError, ValueError):
+                LOG.debug('Ignoring malformed entry %(name)s in name cache '
+                          '%(path)s', {'name': name, 'path': path})
+                continue
+            if not isinstance(uuid, str):
+                continue
+            self._entries[name] = (uuid, recorded)
+            self._names[uuid] = name
+
+    def save(self) -> None:
+        """Save the cache to its file if it was modified."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            data = {'version': _FORMAT_VERSION,
+                    'entries': {name: list(entry)
+                                for name, entry in self._entries.items()}}
+            self._dirty = False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first to never leave a partial cache.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(data, fp)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def __enter__(self) -> NameCache:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.save()
+
+    def record(self, name: str | None, uuid: str) -> None:
+        """Record the current name of a node.
+
+        :param name: the name of the node, None if it has no name.
+        :param uuid: the UUID of the node.
+        """
+        now = time.time()
+        with self._lock:
+            old_name = self._names.pop(uuid, None)
+            if old_name is not None and old_name != name:
+                self._entries.pop(old_name, None)
+                self._dirty = True
+            if name:
+                previous = self._entries.get(name)
+                if previous is None or previous[0] != uuid:
+                    if previous is not None:
+                        # The name now belongs to another node.
+                        self._names.pop(previous[0], None)
+                    self._dirty = True
+                elif (self.max_age is not None
+                      and now - previous[1] > self.max_age / 2):
+                    # Save the refreshed entry before it expires.
+                    self._dirty = True
+                self._entries[name] = (uuid, now)
+                self._names[uuid] = name
+
+    def record_nodes(self, nodes: Iterable[Any]) -> None:
+        """Record names of nodes if they are known.
+
+        :param nodes: nodes as resources or dictionaries. Nodes without
+            the ``uuid`` or ``name`` field are skipped.
+        """
+        for node in nodes:
+            info = getattr(node, '_info', node)
+            if 'uuid' in info and 'name' in info:
+                self.record(info['name'], info['uuid'])
+
+    def invalidate(self, ident: str) -> None:
+        """Forget a node.
+
+        :param ident: the name or UUID of the node.
+        """
+        with self._lock:
+            entry = self._entries.pop(ident, None)
+            if entry is not None:
+                self._names.pop(entry[0], None)
+            name = self._names.pop(ident, None)
+            if name is not None:
+                self._entries.pop(name, None)
+            if entry is not None or name is not None:
+                self._dirty = True
+
+    def get(self, ident: str) -> str | None:
+        """Translate a node identifier to a UUID using the cache only.
+
+        :param ident: the name or UUID of the node.
+        :returns: the UUID or None if the name is not known.
+        """
+        if uuidutils.is_uuid_like(ident):
+            return ident
+        entry = self._entries.get(ident)
+        if entry is None:
+            return None
+        if self.max_age is not None and time.time() - entry[1] > self.max_age:
+            return None
+        return entry[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -143,6 +143,8 @@ class Resource(object):
         'local_link_connection': 'Local Link Connection',
         'pxe_enabled': 'PXE boot enabled',
         'portgroup_uuid': 'Portgroup UUID',
+        'portgroups': 'Port Groups',
+        'ports': 'Ports',
         'bios_interface': 'BIOS Interface',
         'boot_interface': 'Boot Interface',
         'console_interface': 'Console Interface',
@@ -247,6 +249,29 @@ class Resource(object):
     def sort_labels(self) -> tuple[str, ...]:
         return self._sort_labels
 
+    def fields_for_columns(self, columns: Iterable[str]) -> list[str] | None:
+        """Map output columns back to fields of this resource.
+
+        :param columns: output columns, as requested with ``-c``. Each one
+            is either a field or a label of this resource (case
+            insensitive).
+        :returns: the list of fields in the order of ``columns`` or None if
+            any of the columns is not a field of this resource.
+        """
+        by_column: dict[str, str] = {}
+        for field, label in zip(self._fields, self._labels):
+            by_column[label.lower()] = field
+            by_column[field.lower()] = field
+
+        result: list[str] = []
+        for column in columns:
+            match = by_column.get(column.lower())
+            if match is None:
+                return None
+            if match not in result:
+                result.append(match)
+        return result
+
 
 # Chassis
 CHASSIS_DETAILED_RESOURCE = Resource(